@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Benchmark event-loop lag and request latency of sync vs async DB routes.
+
+Serves a mixed load (balance, round history, payment history and TON
+deposits) in process through httpx's ASGI transport against a seeded
+SQLite file. "sync" mounts the routes as they were before the async
+stack: async handlers calling the synchronous repositories, which block
+the event loop for every query. "async" mounts the real routes on
+aiosqlite. A probe task sleeps 1 ms in a loop and records how late it
+wakes up, which is the delay every WebSocket tick in the worker sees.
+
+Usage:
+    python3 benchmarks/bench_async_db.py [--requests 4000] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# (method, path, json body); weights of the mix
+MIX = [
+    (("GET", "/user/balance", None), 4),
+    (("GET", "/game/history", None), 2),
+    (("GET", "/payments/history", None), 2),
+    (("POST", "/payments/deposit", {"amount": "1.5", "currency": "TON"}), 1),
+]
+
+
+def percentile(values, q):
+    """Get the q-th percentile of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] if ordered else 0.0
+
+
+def seed(users: int, rounds: int, payments_per_user: int):
+    """Create the schema and seed users, crashed rounds and payments."""
+    from datetime import datetime, timedelta, timezone
+    
+    from src.database.connection import SessionLocal, init_db
+    from src.database.models.game import GameRound, GameRoundStatus
+    from src.database.models.payment import Payment, PaymentMethod, PaymentStatus, PaymentType
+    from src.database.models.user import User
+    
+    init_db()
+    db = SessionLocal()
+    db.add_all(User(telegram_user_id=i, balance_ton=Decimal("100")) for i in range(1, users + 1))
+    now = datetime.now(timezone.utc)
+    db.add_all(
+        GameRound(server_seed_hash=f"{i:064x}", status=GameRoundStatus.CRASHED,
+                  crash_multiplier=Decimal("1.5"), started_at=now - timedelta(seconds=10 * i),
+                  crashed_at=now - timedelta(seconds=10 * i - 5))
+        for i in range(rounds)
+    )
+    db.add_all(
+        Payment(user_id=user_id, payment_type=PaymentType.DEPOSIT, payment_method=PaymentMethod.TON,
+                amount=Decimal("10"), currency="TON", net_amount=Decimal("10"),
+                status=PaymentStatus.COMPLETED)
+        for user_id in range(1, users + 1) for _ in range(payments_per_user)
+    )
+    db.commit()
+    db.close()
+
+
+def sync_routes(pool_size: int):
+    """
+    The game, user and payments routes as they were on synchronous sessions.
+    
+    Sessions come from a pooled engine: the default SQLite engine shares
+    one connection (StaticPool), which concurrent requests would corrupt.
+    The pool holds a connection per client, since a handler waiting for a
+    connection blocks the loop that would return one.
+    """
+    from fastapi import APIRouter, Depends
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, sessionmaker
+    
+    from src.api.middleware.auth import get_current_user
+    from src.api.schemas.game import RoundHistory
+    from src.api.schemas.payments import DepositRequest, DepositResponse, PaymentHistory
+    from src.api.schemas.user import UserBalance
+    from src.database.connection import DATABASE_URL
+    from src.database.repositories.game_repo import GameRoundRepository
+    from src.database.repositories.payment_repo import PaymentMethod, PaymentRepository
+    from src.database.repositories.user_repo import UserRepository
+    from src.payments.ton.integration import TONIntegration
+    
+    sessions = sessionmaker(bind=create_engine(DATABASE_URL, pool_size=pool_size,
+                                               connect_args={"check_same_thread": False}))
+    
+    def get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    router = APIRouter()
+    
+    @router.get("/user/balance", response_model=UserBalance)
+    async def get_balance(current_user: dict = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+        user = UserRepository(db).get_by_id(current_user["id"])
+        return UserBalance(balance_ton=user.balance_ton, balance_stars=user.balance_stars)
+    
+    @router.get("/game/history", response_model=list[RoundHistory])
+    async def get_history(limit: int = 100, current_user: dict = Depends(get_current_user),
+                          db: Session = Depends(get_db)):
+        return [
+            RoundHistory(round_id=r.id, crash_multiplier=r.crash_multiplier or Decimal("0"),
+                         started_at=r.started_at or r.created_at,
+                         crashed_at=r.crashed_at or r.created_at, total_bets=r.total_bets)
+            for r in GameRoundRepository(db).get_latest_rounds(limit)
+        ]
+    
+    @router.get("/payments/history", response_model=list[PaymentHistory])
+    async def get_payment_history(current_user: dict = Depends(get_current_user),
+                                  db: Session = Depends(get_db)):
+        return [
+            PaymentHistory(payment_id=p.id, payment_type=p.payment_type.value,
+                           payment_method=p.payment_method.value, amount=p.amount,
+                           currency=p.currency, status=p.status.value,
+                           created_at=p.created_at, completed_at=p.completed_at)
+            for p in PaymentRepository(db).get_user_payments(current_user["id"])
+        ]
+    
+    @router.post("/payments/deposit", response_model=DepositResponse)
+    async def create_deposit(deposit_request: DepositRequest,
+                             current_user: dict = Depends(get_current_user),
+                             db: Session = Depends(get_db)):
+        address = await TONIntegration().create_deposit_address(current_user["id"])
+        payment = PaymentRepository(db).create_deposit(
+            current_user["id"], deposit_request.amount, deposit_request.currency,
+            PaymentMethod.TON, ton_address=address
+        )
+        return DepositResponse(payment_id=payment.id, address=address, amount=payment.amount,
+                               currency=payment.currency, status=payment.status.value,
+                               created_at=payment.created_at)
+    
+    return router
+
+
+def build_app(variant: str, users: int, concurrency: int):
+    """Build an app serving the sync or async routes, authenticating users at random."""
+    from fastapi import FastAPI
+    
+    from src.api.middleware.auth import get_current_user
+    from src.api.routes import game, payments, user
+    
+    app = FastAPI()
+    if variant == "sync":
+        app.include_router(sync_routes(concurrency))
+    else:
+        for module in (game, payments, user):
+            app.include_router(module.router)
+    
+    async def current_user():
+        user_id = random.randint(1, users)
+        return {"id": user_id, "telegram_user_id": user_id}
+    
+    app.dependency_overrides[get_current_user] = current_user
+    return app
+
+
+async def run(variant: str, args) -> dict:
+    """Serve the mixed load and measure latency and loop lag."""
+    import httpx
+    
+    from src.database.async_connection import dispose_async_engine
+    
+    app = build_app(variant, args.users, args.concurrency)
+    requests = random.Random(1).choices([r for r, _ in MIX], [w for _, w in MIX], k=args.requests)
+    latencies = []
+    lags = []
+    done = asyncio.Event()
+    
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+    
+    async def client(client_requests, http):
+        for method, path, body in client_requests:
+            start = time.perf_counter()
+            response = await http.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await client(requests[:args.concurrency], http)  # warm up connections
+        latencies.clear()
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(client(requests[i::args.concurrency], http)
+                               for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+    await dispose_async_engine()
+    
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "lag_p50_ms": percentile(lags, 50) * 1e3,
+        "lag_p99_ms": percentile(lags, 99) * 1e3,
+        "lag_max_ms": max(lags) * 1e3 if lags else 0.0,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--payments-per-user", type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        seed(args.users, args.rounds, args.payments_per_user)
+        
+        print(f"{args.requests} requests, {args.concurrency} concurrent clients")
+        print(f"{'routes':8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'lag p50':>8} {'lag p99':>8} {'lag max':>8}")
+        for variant in ("sync", "async"):
+            r = asyncio.run(run(variant, args))
+            print(f"{variant:8} {r['rps']:8.0f} {r['p50_ms']:8.2f} {r['p99_ms']:8.2f} "
+                  f"{r['lag_p50_ms']:8.2f} {r['lag_p99_ms']:8.2f} {r['lag_max_ms']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
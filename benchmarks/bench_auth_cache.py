@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark access token resolution with and without the identity cache.
+
+Resolves tokens of N users against a SQLite database: cold (JWT decode
+plus a user query, as every request did before the cache) and warm
+(identity cache hit). Also times Mini App init data verification: HMAC
+check and parse vs a verified-digest cache hit.
+
+Usage:
+    python3 benchmarks/bench_auth_cache.py [--users 1000] [--passes 20]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--passes", type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("SECRET_KEY", "bench-secret-key-0123456789abcdef")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        from src.api.middleware.auth import create_access_token, resolve_token
+        from src.database.connection import SessionLocal, init_db
+        from src.database.models.user import User
+        from src.services.identity import InitDataVerifier, get_identity_cache
+        from src.services.identity.telegram_init_data import derive_secret_key, sign_init_data
+        
+        init_db()
+        db = SessionLocal()
+        db.add_all(User(telegram_user_id=i) for i in range(1, args.users + 1))
+        db.commit()
+        tokens = [create_access_token(i) for i in range(1, args.users + 1)]
+        cache = get_identity_cache()
+        
+        cold = 0.0
+        for _ in range(args.passes):
+            cache.clear()
+            start = time.perf_counter()
+            for token in tokens:
+                resolve_token(token, db)
+            cold += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(args.passes):
+            for token in tokens:
+                resolve_token(token, db)
+        warm = time.perf_counter() - start
+        db.close()
+    
+    bot_token = "123456:bench-bot-token"
+    init_data = []
+    for i in range(1, args.users + 1):
+        fields = {"user": json.dumps({"id": i, "first_name": "Bench"}),
+                  "auth_date": str(int(time.time())), "query_id": f"AAE{i}"}
+        fields["hash"] = sign_init_data(fields, derive_secret_key(bot_token))
+        init_data.append(urlencode(fields))
+    
+    verify_cold = 0.0
+    for _ in range(args.passes):
+        verifier = InitDataVerifier(bot_token)
+        start = time.perf_counter()
+        for data in init_data:
+            verifier.verify(data)
+        verify_cold += time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(args.passes):
+        for data in init_data:
+            verifier.verify(data)
+    verify_warm = time.perf_counter() - start
+    
+    n = args.users * args.passes
+    print(f"{n} resolutions ({args.users} users)")
+    print(f"token cold (decode + query):  {cold / n * 1e6:8.1f} us each")
+    print(f"token warm (cache hit):       {warm / n * 1e6:8.1f} us each ({cold / warm:.0f}x)")
+    print(f"init data cold (HMAC + parse): {verify_cold / n * 1e6:7.1f} us each")
+    print(f"init data warm (digest hit):   {verify_warm / n * 1e6:7.1f} us each "
+          f"({verify_cold / verify_warm:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark auto cashout checks: legacy full scan vs heap scheduler.
+
+Usage:
+    python3 benchmarks/bench_auto_cashout.py [--sizes 1000 10000 100000] [--ticks 200]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.models.game import BetStatus
+from src.game.engine.bet_manager import BetManager
+
+
+def legacy_check_auto_cashouts(active_bets: dict, current_multiplier: Decimal) -> list:
+    """Auto cashout check as it was before the scheduler (full scan per tick)."""
+    cashed_out = []
+    for user_id, bets in list(active_bets.items()):
+        for bet in bets[:]:
+            if bet["status"] != BetStatus.ACTIVE:
+                continue
+            auto_cashout = bet.get("auto_cashout_multiplier")
+            if auto_cashout and current_multiplier >= auto_cashout:
+                bet["cashed_out"] = True
+                bet["cashed_out_multiplier"] = current_multiplier
+                bet["payout"] = bet["amount"] * current_multiplier
+                bet["status"] = BetStatus.CASHED_OUT
+                cashed_out.append(bet)
+                active_bets[user_id].remove(bet)
+    return cashed_out
+
+
+def build_targets(size: int, seed: int) -> list:
+    """Draw `size` auto cashout targets."""
+    rng = random.Random(seed)
+    # Popular targets cluster at 1.5x and 2x, the rest spread up to 20x
+    return [
+        rng.choice([Decimal("1.50"), Decimal("2.00"), Decimal(rng.randint(101, 2000)).scaleb(-2)])
+        for _ in range(size)
+    ]
+
+
+def build_legacy_bets(targets: list) -> dict:
+    """Build the legacy {user_id: [bet_dict]} structure with active bets."""
+    return {
+        user_id: [{
+            "user_id": user_id,
+            "round_id": 1,
+            "amount": Decimal("1.0"),
+            "currency": "TON",
+            "auto_cashout_multiplier": target,
+            "status": BetStatus.ACTIVE,
+            "placed_at": datetime.utcnow(),
+            "cashed_out": False,
+            "cashed_out_multiplier": None,
+            "payout": None,
+        }]
+        for user_id, target in enumerate(targets)
+    }
+
+
+def build_manager(targets: list) -> BetManager:
+    """Create a bet manager with active auto cashout bets."""
+    manager = BetManager()
+    for user_id, target in enumerate(targets):
+        manager.place_bet(user_id, 1, Decimal("1.0"), "TON", target)
+    manager.activate_bets(1)
+    return manager
+
+
+def run(size: int, ticks: int) -> dict:
+    """Run both implementations over the same tick sequence."""
+    multipliers = [Decimal(100 + i * 5).scaleb(-2) for i in range(ticks)]
+    
+    targets = build_targets(size, seed=size)
+    
+    legacy = build_legacy_bets(targets)
+    start = time.perf_counter()
+    legacy_count = 0
+    for multiplier in multipliers:
+        legacy_count += len(legacy_check_auto_cashouts(legacy, multiplier))
+    legacy_s = time.perf_counter() - start
+    
+    heap = build_manager(targets)
+    start = time.perf_counter()
+    heap_count = 0
+    for multiplier in multipliers:
+        heap_count += len(heap.check_auto_cashouts(multiplier))
+    heap_s = time.perf_counter() - start
+    
+    assert legacy_count == heap_count, (legacy_count, heap_count)
+    
+    return {
+        "bets": size,
+        "ticks": ticks,
+        "cashouts": heap_count,
+        "legacy_ms_per_tick": legacy_s / ticks * 1000,
+        "heap_ms_per_tick": heap_s / ticks * 1000,
+        "speedup": legacy_s / heap_s if heap_s else float("inf"),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+    
+    print(f"{'bets':>8} {'cashouts':>9} {'legacy ms/tick':>15} {'heap ms/tick':>13} {'speedup':>8}")
+    for size in args.sizes:
+        result = run(size, args.ticks)
+        print(f"{result['bets']:>8} {result['cashouts']:>9} "
+              f"{result['legacy_ms_per_tick']:>15.3f} {result['heap_ms_per_tick']:>13.3f} "
+              f"{result['speedup']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark batch round verification: verify_round loop vs batch verifier.
+
+Usage:
+    python3 benchmarks/bench_batch_verifier.py [--rounds 1000000] [--workers 8]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.game.engine.batch_verifier import verify_rounds
+from src.game.engine.provably_fair import ProvablyFair
+
+
+def build_rounds(count: int):
+    """Build `count` honestly played rounds."""
+    server_seeds = [ProvablyFair.hash_seed(str(i)) for i in range(count)]
+    client_seeds = [None] * count
+    round_ids = list(range(1, count + 1))
+    crash_points = [
+        ProvablyFair.calculate_crash_point(ProvablyFair.combine_seeds(seed, None, round_id))
+        for seed, round_id in zip(server_seeds, round_ids)
+    ]
+    seed_hashes = [ProvablyFair.hash_seed(seed) for seed in server_seeds]
+    return server_seeds, client_seeds, round_ids, crash_points, seed_hashes
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--legacy-sample", type=int, default=20_000)
+    args = parser.parse_args()
+    
+    rounds = build_rounds(args.rounds)
+    server_seeds, client_seeds, round_ids, crash_points, seed_hashes = rounds
+    
+    sample = min(args.legacy_sample, args.rounds)
+    start = time.perf_counter()
+    for i in range(sample):
+        assert ProvablyFair.verify_round(seed_hashes[i], server_seeds[i], client_seeds[i],
+                                         round_ids[i], crash_points[i])
+    legacy_rate = sample / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    mismatches = verify_rounds(*rounds, workers=args.workers)
+    batch_s = time.perf_counter() - start
+    assert mismatches == [], mismatches[:5]
+    
+    print(f"verify_round loop: {legacy_rate:,.0f} rounds/s "
+          f"(~{args.rounds / legacy_rate:.1f} s for {args.rounds:,})")
+    print(f"batch verifier:    {args.rounds / batch_s:,.0f} rounds/s "
+          f"({batch_s:.1f} s for {args.rounds:,}, {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark round bet storage: legacy per-bet dicts vs columnar store.
+
+Usage:
+    python3 benchmarks/bench_bet_store.py [--sizes 1000 10000 50000]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.models.game import BetStatus
+from src.game.engine.bet_manager import BetManager
+
+
+def build_legacy(size: int) -> dict:
+    """Place `size` bets the way the dict-based bet manager stored them."""
+    active_bets = {}
+    for user_id in range(size):
+        active_bets.setdefault(user_id, []).append({
+            "user_id": user_id,
+            "round_id": 1,
+            "amount": Decimal("1.5"),
+            "currency": "TON",
+            "auto_cashout_multiplier": Decimal("2.00") if user_id % 2 else None,
+            "status": BetStatus.ACTIVE,
+            "placed_at": datetime.utcnow(),
+            "cashed_out": False,
+            "cashed_out_multiplier": None,
+            "payout": None,
+        })
+    return active_bets
+
+
+def legacy_crash(active_bets: dict):
+    """Crash settlement as it was before the columnar store."""
+    for bets in active_bets.values():
+        for bet in bets:
+            if bet["status"] == BetStatus.ACTIVE:
+                bet["status"] = BetStatus.CRASHED
+
+
+def build_columnar(size: int) -> BetManager:
+    """Place `size` bets in the columnar bet manager."""
+    manager = BetManager()
+    for user_id in range(size):
+        manager.place_bet(user_id, 1, Decimal("1.5"), "TON",
+                          Decimal("2.00") if user_id % 2 else None)
+    manager.activate_bets(1)
+    return manager
+
+
+def measure(build, size: int):
+    """Return (result, bytes allocated) of a build function."""
+    tracemalloc.start()
+    result = build(size)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, allocated
+
+
+def run(size: int) -> dict:
+    """Run both layouts for one round size."""
+    legacy, legacy_bytes = measure(build_legacy, size)
+    start = time.perf_counter()
+    legacy_crash(legacy)
+    legacy_s = time.perf_counter() - start
+    
+    manager, columnar_bytes = measure(build_columnar, size)
+    start = time.perf_counter()
+    manager.crash_all_bets(1)
+    columnar_s = time.perf_counter() - start
+    
+    return {
+        "bets": size,
+        "legacy_bytes_per_bet": legacy_bytes / size,
+        "columnar_bytes_per_bet": columnar_bytes / size,
+        "legacy_crash_ms": legacy_s * 1000,
+        "columnar_crash_ms": columnar_s * 1000,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+    
+    print(f"{'bets':>8} {'legacy B/bet':>13} {'columnar B/bet':>15} "
+          f"{'legacy crash ms':>16} {'columnar crash ms':>18}")
+    for size in args.sizes:
+        result = run(size)
+        print(f"{result['bets']:>8} {result['legacy_bytes_per_bet']:>13.0f} "
+              f"{result['columnar_bytes_per_bet']:>15.0f} "
+              f"{result['legacy_crash_ms']:>16.3f} {result['columnar_crash_ms']:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Measure bet and cashout round-trip latency: HTTP POST vs /ws/game commands.
+
+Starts a server in a subprocess (file SQLite database, funded users, the
+broadcast ticker and a tick loop persisting cashouts), then for each path
+plays rounds in which every user places a bet during the countdown and
+cashes out right after the round begins. HTTP requests reuse a keep-alive
+connection; WebSocket commands go over one authenticated socket per user.
+
+Usage:
+    python3 benchmarks/bench_cashout_latency.py [--users 50] [--rounds 10]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+TELEGRAM_ID_BASE = 1_000_000
+
+
+def build_app(users: int):
+    """Build the app with round control endpoints for the benchmark."""
+    from contextlib import asynccontextmanager
+    from decimal import Decimal
+    
+    from fastapi import FastAPI
+    
+    from src.api.routes import game, websocket
+    from src.database.connection import SessionLocal, init_db
+    from src.database.models.user import User
+    from src.game.engine.crash_engine import CrashEngine, RoundState
+    from src.workers.game import round_manager as round_manager_module
+    from src.workers.game.round_manager import RoundManager, get_round_manager
+    
+    init_db()
+    db = SessionLocal()
+    db.add_all(User(telegram_user_id=TELEGRAM_ID_BASE + i, balance_ton=Decimal("1000000"))
+               for i in range(users))
+    db.commit()
+    db.close()
+    round_manager_module._round_manager = RoundManager(
+        SessionLocal(), crash_engine=CrashEngine(countdown_seconds=0)
+    )
+    round_manager = get_round_manager()
+    
+    async def tick_loop():
+        """Persist cashouts and settle crashes like the round loop does."""
+        while True:
+            if round_manager.crash_engine.round_state == RoundState.ACTIVE:
+                round_manager.tick()
+            await asyncio.sleep(round_manager.tick_interval_ms / 1000)
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        tasks = [asyncio.create_task(websocket.run_round_ticker(round_manager)),
+                 asyncio.create_task(tick_loop())]
+        yield
+        for task in tasks:
+            task.cancel()
+    
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(game.router)
+    app.include_router(websocket.router)
+    
+    @app.post("/bench/round")
+    async def next_round():
+        round_manager.flush_cashouts()
+        round_manager.start_round()
+        return {"round_id": round_manager.current_round_id}
+    
+    @app.post("/bench/begin")
+    async def begin():
+        round_manager.begin_round()
+        return {"round_id": round_manager.current_round_id}
+    
+    return app
+
+
+def serve(users: int, port: int):
+    """Run the benchmark server."""
+    import uvicorn
+    
+    uvicorn.run(build_app(users), host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    """Pick a free TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentiles(samples) -> dict:
+    """p50/p90/p99/max of millisecond samples."""
+    samples = sorted(samples)
+    
+    def pick(q: float) -> float:
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+    
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": samples[-1],
+            "mean": statistics.fmean(samples)}
+
+
+async def run_http(http, tokens, rounds: int) -> dict:
+    """Play rounds over HTTP POST /game/bet and /game/cashout."""
+    bets, cashouts = [], []
+    for _ in range(rounds):
+        await http.post("/bench/round")
+        for token in tokens:
+            start = time.perf_counter()
+            response = await http.post("/game/bet", json={"amount": "1", "currency": "TON"},
+                                       headers={"Authorization": f"Bearer {token}"})
+            bets.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+        await http.post("/bench/begin")
+        for token in tokens:
+            start = time.perf_counter()
+            response = await http.post("/game/cashout",
+                                       headers={"Authorization": f"Bearer {token}"})
+            cashouts.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+    return {"bet": bets, "cashout": cashouts}
+
+
+async def command(ws, message: dict, ack_type: str) -> dict:
+    """Send a command and wait for its ack, skipping broadcast frames."""
+    import orjson
+    
+    await ws.send(orjson.dumps(message).decode())
+    while True:
+        reply = orjson.loads(await ws.recv())
+        if reply.get("type") == ack_type:
+            assert reply["ok"], reply
+            return reply
+
+
+async def run_ws(http, port: int, tokens, rounds: int) -> dict:
+    """Play rounds over place_bet/cashout commands on /ws/game."""
+    import websockets
+    
+    sockets = []
+    for user_id, token in enumerate(tokens, 1):
+        ws = await websockets.connect(
+            f"ws://127.0.0.1:{port}/ws/game?user_id={user_id}&token={token}", max_queue=None
+        )
+        await ws.recv()
+        sockets.append(ws)
+    
+    bets, cashouts, server = [], [], []
+    try:
+        for _ in range(rounds):
+            await http.post("/bench/round")
+            for ws in sockets:
+                start = time.perf_counter()
+                await command(ws, {"type": "place_bet", "amount": "1", "currency": "TON"},
+                              "place_bet_ack")
+                bets.append((time.perf_counter() - start) * 1000)
+            await http.post("/bench/begin")
+            for ws in sockets:
+                start = time.perf_counter()
+                ack = await command(ws, {"type": "cashout"}, "cashout_ack")
+                cashouts.append((time.perf_counter() - start) * 1000)
+                server.append(ack["sent_at"] - ack["received_at"])
+    finally:
+        for ws in sockets:
+            await ws.close()
+    return {"bet": bets, "cashout": cashouts, "server_cashout": server}
+
+
+async def measure(port: int, users: int, rounds: int) -> dict:
+    """Run both paths against the server."""
+    import httpx
+    
+    from src.api.middleware.auth import create_access_token
+    
+    tokens = [create_access_token(TELEGRAM_ID_BASE + i) for i in range(users)]
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+        # Warm up both paths
+        await run_http(http, tokens[:5], 1)
+        await run_ws(http, port, tokens[:5], 1)
+        return {
+            "http": await run_http(http, tokens, rounds),
+            "ws": await run_ws(http, port, tokens, rounds),
+        }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--port", type=int)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.users, args.port)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "bench"),
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+        }
+        os.environ.update(env)
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", "--users", str(args.users), "--port", str(port)],
+            env=env,
+        )
+        try:
+            deadline = time.time() + 30
+            while time.time() < deadline:
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                    break
+                except OSError:
+                    time.sleep(0.2)
+            results = asyncio.run(measure(port, args.users, args.rounds))
+        finally:
+            server.terminate()
+            server.wait()
+    
+    print(f"{args.users} users x {args.rounds} rounds per path (round trip, ms)")
+    print(f"{'path':>6} {'command':>8} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7}")
+    for path in ("http", "ws"):
+        for name in ("bet", "cashout"):
+            stats = percentiles(results[path][name])
+            print(f"{path:>6} {name:>8} {stats['p50']:>7.2f} {stats['p90']:>7.2f} "
+                  f"{stats['p99']:>7.2f} {stats['max']:>7.2f}")
+    server_stats = percentiles(results["ws"]["server_cashout"])
+    print(f"ws cashout server-side (ack sent_at - received_at): "
+          f"p50 {server_stats['p50']:.0f} ms, p99 {server_stats['p99']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark cashout settlement: per-cashout commits vs one batch transaction.
+
+Usage:
+    python3 benchmarks/bench_cashout_settlement.py [--cashouts 2000]
+"""
+import argparse
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.connection import Base
+from src.database.models.game import Bet, BetStatus, GameRound, GameRoundStatus
+from src.database.models.user import User
+from src.database.repositories.game_repo import BetRepository
+from src.game.engine.balance_manager import BalanceManager
+
+TICK_BUDGET_MS = 100
+
+
+def build_tick(cashouts: int):
+    """Create a database and the cashed out bet dicts of one tick."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    
+    db.add_all(User(telegram_user_id=user_id) for user_id in range(1, cashouts + 1))
+    round_obj = GameRound(server_seed_hash="0" * 64, status=GameRoundStatus.ACTIVE)
+    db.add(round_obj)
+    db.flush()
+    bets = [
+        Bet(user_id=user_id, round_id=round_obj.id, amount_ton=Decimal("1.0"),
+            currency="TON", status=BetStatus.ACTIVE)
+        for user_id in range(1, cashouts + 1)
+    ]
+    db.add_all(bets)
+    db.commit()
+    
+    tick = [{
+        "user_id": bet.user_id,
+        "round_id": round_obj.id,
+        "bet_id": bet.id,
+        "amount": Decimal("1.0"),
+        "currency": "TON",
+        "cashed_out_multiplier": Decimal("2.00"),
+        "payout": Decimal("2.0"),
+    } for bet in bets]
+    return db, tick
+
+
+def legacy_settle(db, tick: list):
+    """Cashout settlement as it was before settle_cashouts."""
+    balance_manager = BalanceManager(db)
+    bet_repo = BetRepository(db)
+    for bet_data in tick:
+        balance_manager.add_balance(
+            bet_data["user_id"], bet_data["payout"], "TON",
+            bet_id=bet_data["bet_id"], round_id=bet_data["round_id"]
+        )
+        bet_repo.cashout_bet(bet_data["bet_id"], bet_data["cashed_out_multiplier"],
+                             bet_data["payout"], None)
+
+
+def batch_settle(db, tick: list):
+    """Settle the whole tick in one transaction."""
+    BalanceManager(db).settle_cashouts(tick)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cashouts", type=int, default=2_000)
+    parser.add_argument("--ticks", type=int, default=10)
+    args = parser.parse_args()
+    
+    db, tick = build_tick(args.cashouts)
+    start = time.perf_counter()
+    legacy_settle(db, tick)
+    legacy_ms = (time.perf_counter() - start) * 1000
+    db.close()
+    
+    # The round loop is long-lived, so statements are compiled after the
+    # first tick; replay the same tick and report the median
+    db, tick = build_tick(args.cashouts)
+    batch_settle(db, tick)
+    timings = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        batch_settle(db, tick)
+        timings.append((time.perf_counter() - start) * 1000)
+    cashed_out = db.query(Bet).filter(Bet.status == BetStatus.CASHED_OUT).count()
+    assert cashed_out == args.cashouts, cashed_out
+    db.close()
+    
+    batch_ms = statistics.median(timings)
+    print(f"  legacy: {args.cashouts} cashouts in {legacy_ms:.1f} ms")
+    print(f"   batch: {args.cashouts} cashouts in {batch_ms:.1f} ms median, "
+          f"{max(timings):.1f} ms max (tick budget {TICK_BUDGET_MS} ms)")
+
+
+if __name__ == "__main__":
+    main()
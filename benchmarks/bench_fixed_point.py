@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark crash point and multiplier math: Decimal vs integer fixed-point.
+
+Usage:
+    python3 benchmarks/bench_fixed_point.py [--seeds 200000]
+"""
+import argparse
+import hashlib
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.game.engine import fixed_point
+from src.game.engine.provably_fair import ProvablyFair
+
+
+def time_calls(func, args_list) -> float:
+    """Return microseconds per call."""
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=200_000)
+    args = parser.parse_args()
+    
+    seeds = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(args.seeds)]
+    house_edge = Decimal("0.01")
+    
+    crash_decimal = time_calls(ProvablyFair.calculate_crash_point_reference,
+                               [(seed, house_edge) for seed in seeds])
+    crash_integer = time_calls(fixed_point.crash_point_hundredths,
+                               [(seed, house_edge) for seed in seeds])
+    
+    crash_point = Decimal("50.00")
+    ticks = [(crash_point, ms) for ms in range(args.seeds)]
+    tick_decimal = time_calls(ProvablyFair.calculate_multiplier_at_time_reference, ticks)
+    tick_integer = time_calls(
+        fixed_point.multiplier_at,
+        [(5000, ms * fixed_point.NS_PER_MS) for ms in range(args.seeds)]
+    )
+    
+    print(f"{'operation':>12} {'decimal us':>11} {'integer us':>11} {'speedup':>8}")
+    for name, decimal_us, integer_us in (
+        ("crash point", crash_decimal, crash_integer),
+        ("multiplier", tick_decimal, tick_integer),
+    ):
+        print(f"{name:>12} {decimal_us:>11.3f} {integer_us:>11.3f} {decimal_us / integer_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
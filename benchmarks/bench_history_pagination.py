@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark deep history pages: OFFSET vs keyset cursors.
+
+Seeds one heavy user with N payments (plus background users) into a
+SQLite file and times a 100-row page at increasing depths, fetched with
+LIMIT/OFFSET and with PaymentRepository.get_user_payments and a cursor
+(one index range scan on (user_id, created_at, id)). Also prints the
+query plan of the keyset query.
+
+Usage:
+    python3 benchmarks/bench_history_pagination.py [--rows 500000] [--page 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def seed(rows: int, background_users: int):
+    """Create the schema and seed the heavy user's payments."""
+    from sqlalchemy import insert
+    
+    from src.database.connection import SessionLocal, init_db
+    from src.database.models.payment import Payment, PaymentMethod, PaymentStatus, PaymentType
+    from src.database.models.user import User
+    
+    init_db()
+    db = SessionLocal()
+    db.add_all(User(telegram_user_id=i) for i in range(1, background_users + 2))
+    db.commit()
+    start = datetime(2026, 1, 1)
+    batch = []
+    for i in range(rows + background_users * 100):
+        user_id = 1 if i < rows else 2 + i % background_users
+        batch.append({
+            "user_id": user_id, "payment_type": PaymentType.DEPOSIT,
+            "payment_method": PaymentMethod.TON, "amount": Decimal("1"), "currency": "TON",
+            "fee_amount": Decimal("0"), "net_amount": Decimal("1"),
+            "status": PaymentStatus.COMPLETED,
+            # Several payments per timestamp, so ties are broken by id
+            "created_at": start + timedelta(seconds=i // 4),
+        })
+        if len(batch) == 50_000:
+            db.execute(insert(Payment), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Payment), batch)
+    db.commit()
+    db.close()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--background-users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        from sqlalchemy import desc, text
+        
+        from src.database.connection import SessionLocal, engine
+        from src.database.models.payment import Payment
+        from src.database.pagination import encode_cursor, keyset_page
+        from src.database.repositories.payment_repo import PaymentRepository
+        
+        start = time.perf_counter()
+        seed(args.rows, args.background_users)
+        print(f"seeded {args.rows} payments for one user in {time.perf_counter() - start:.1f}s")
+        
+        db = SessionLocal()
+        repo = PaymentRepository(db)
+        user_query = db.query(Payment).filter(Payment.user_id == 1)
+        
+        def timed(fetch):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                rows = fetch()
+                db.expunge_all()
+            return (time.perf_counter() - start) / args.repeat * 1e3, rows
+        
+        print(f"{'depth':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for depth in (0, args.rows // 100, args.rows // 10, args.rows // 2, args.rows - args.page):
+            cursor = None
+            if depth:
+                before = user_query.order_by(desc(Payment.created_at), desc(Payment.id)) \
+                    .offset(depth - 1).first()
+                cursor = encode_cursor(before.created_at, before.id)
+            offset_ms, offset_rows = timed(lambda: user_query.order_by(
+                desc(Payment.created_at), desc(Payment.id)).offset(depth).limit(args.page).all())
+            keyset_ms, keyset_rows = timed(lambda: repo.get_user_payments(
+                1, limit=args.page, cursor=cursor))
+            assert [p.id for p in offset_rows] == [p.id for p in keyset_rows]
+            print(f"{depth:8} {offset_ms:10.2f} {keyset_ms:10.2f}")
+        
+        query = keyset_page(user_query, Payment.created_at, Payment.id,
+                            encode_cursor(datetime(2026, 1, 2), 10**9), args.page)
+        compiled = query.statement.compile(engine, compile_kwargs={"literal_binds": True})
+        with engine.connect() as conn:
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+        print("keyset plan:", "; ".join(row[-1] for row in plan))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
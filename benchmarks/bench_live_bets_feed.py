@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark the live bets feed: per-tick cost against round size.
+
+Fills a round with N players, then measures one tick with a fixed number
+of new bets and cashouts: recording the events, draining the deltas and
+encoding both frames. The cost should not grow with N.
+
+Usage:
+    python3 benchmarks/bench_live_bets_feed.py [--changes 50] [--ticks 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api.routes.websocket import encode_frame
+from src.game.engine.bet_manager import BetManager
+
+
+def measure(players: int, changes: int, ticks: int) -> float:
+    """Median microseconds per tick for a round of players."""
+    manager = BetManager()
+    for user_id in range(players):
+        manager.place_bet(user_id, 1, Decimal(1 + user_id % 97), "TON")
+    manager.activate_bets(1)
+    manager.live_feed.drain()
+    
+    # Each tick adds changes/2 late bets and cashes out changes/2 players
+    samples = []
+    next_user = players
+    for tick in range(ticks):
+        start = time.perf_counter()
+        store = manager.round_stores[1]
+        for _ in range(changes // 2):
+            slot = store.add(next_user, Decimal("3"), "TON")
+            manager.live_feed.bet_placed(store, slot)
+            next_user += 1
+        for offset in range(changes // 2):
+            manager.cashout_bet(tick * changes + offset, Decimal("1.50"))
+        full, top = manager.live_feed.drain()
+        encode_frame({"type": "live_bets", "data": full})
+        encode_frame({"type": "top_bets", "data": top})
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--changes", type=int, default=50, help="Events per tick")
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+    
+    print(f"{args.changes} events per tick")
+    print(f"{'players':>9} {'us per tick':>12}")
+    for players in (1_000, 10_000, 100_000):
+        print(f"{players:>9} {measure(players, args.changes, args.ticks):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark the rate limiter at 100k distinct keys.
+
+Sends requests from N distinct keys (random order, every key seen) through
+the token bucket RateLimiter and through the previous list-of-datetimes
+limiter behind one asyncio.Lock, reporting time per check and the memory
+each keeps.
+
+Usage:
+    python3 benchmarks/bench_rate_limit.py [--keys 100000] [--requests 1000000]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api.middleware.rate_limit import RateLimiter, RatePolicy
+
+
+class ListRateLimiter:
+    """The previous limiter: a list of request times per key."""
+    
+    def __init__(self):
+        self.requests = defaultdict(list)
+        self.lock = asyncio.Lock()
+    
+    async def check_rate_limit(self, key: str, max_requests: int, window_seconds: int) -> bool:
+        async with self.lock:
+            now = datetime.utcnow()
+            window_start = now - timedelta(seconds=window_seconds)
+            self.requests[key] = [t for t in self.requests[key] if t > window_start]
+            if len(self.requests[key]) >= max_requests:
+                return False
+            self.requests[key].append(now)
+            return True
+
+
+async def run(limiter, keys) -> float:
+    """Seconds for all checks."""
+    policy = RatePolicy("default", 100, 60)
+    start = time.perf_counter()
+    if isinstance(limiter, RateLimiter):
+        for key in keys:
+            limiter.try_acquire(key, policy)
+    else:
+        for key in keys:
+            await limiter.check_rate_limit(key, 100, 60)
+    return time.perf_counter() - start
+
+
+def measure_memory(factory, keys) -> int:
+    """Bytes held by a limiter after all checks (a separate, traced run)."""
+    tracemalloc.start()
+    limiter = factory()
+    asyncio.run(run(limiter, keys))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    rng = random.Random(1)
+    names = [f"ip_10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.keys)]
+    keys = names + [rng.choice(names) for _ in range(args.requests - args.keys)]
+    rng.shuffle(keys)
+    
+    print(f"{len(keys)} checks over {args.keys} keys")
+    for name, factory in (("token bucket", lambda: RateLimiter(max_keys=args.keys)),
+                          ("list (previous)", ListRateLimiter)):
+        elapsed = asyncio.run(run(factory(), keys))
+        memory = measure_memory(factory, keys)
+        print(f"{name:>16}: {elapsed / len(keys) * 1e9:7.0f} ns/check, "
+              f"{memory / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark /game/history polling: database per request vs the round history cache.
+
+Seeds crashed rounds into a SQLite file and polls the endpoint in process
+through httpx's ASGI transport. "query" is the route as it was (latest
+rounds queried, hydrated as ORM objects and validated on every request);
+"cached" serves the pre-encoded body from the in-memory round history;
+"304" polls with If-None-Match, as clients do between crashes.
+
+Usage:
+    python3 benchmarks/bench_round_history.py [--rounds 10000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def seed(rounds: int):
+    """Create the schema and seed crashed rounds."""
+    from datetime import datetime, timedelta
+    
+    from src.database.connection import SessionLocal, init_db
+    from src.database.models.game import GameRound, GameRoundStatus
+    
+    init_db()
+    db = SessionLocal()
+    now = datetime.utcnow()
+    db.add_all(
+        GameRound(server_seed_hash=f"{i:064x}", status=GameRoundStatus.CRASHED,
+                  crash_multiplier=Decimal("1.50"), started_at=now - timedelta(seconds=10 * i),
+                  crashed_at=now - timedelta(seconds=10 * i - 5), total_bets=i % 50)
+        for i in range(rounds)
+    )
+    db.commit()
+    db.close()
+
+
+def query_route():
+    """The history route as it was: a query and ORM hydration per request."""
+    from fastapi import APIRouter, Depends
+    from sqlalchemy.ext.asyncio import AsyncSession
+    
+    from src.api.middleware.auth import get_current_user
+    from src.api.schemas.game import RoundHistory
+    from src.database.async_connection import get_async_db
+    from src.database.repositories.game_repo import AsyncGameRoundRepository
+    
+    router = APIRouter()
+    
+    @router.get("/game/history", response_model=list[RoundHistory])
+    async def get_history(limit: int = 100, current_user: dict = Depends(get_current_user),
+                          db: AsyncSession = Depends(get_async_db)):
+        return [
+            RoundHistory(round_id=r.id, crash_multiplier=r.crash_multiplier or Decimal("0"),
+                         started_at=r.started_at or r.created_at,
+                         crashed_at=r.crashed_at or r.created_at, total_bets=r.total_bets)
+            for r in await AsyncGameRoundRepository(db).get_latest_rounds(limit)
+        ]
+    
+    return router
+
+
+async def run(variant: str, requests: int, limit: int) -> float:
+    """Poll the endpoint and return seconds per request."""
+    import httpx
+    from fastapi import FastAPI
+    
+    from src.api.middleware.auth import get_current_user
+    from src.api.routes import game
+    from src.database.async_connection import dispose_async_engine
+    
+    app = FastAPI()
+    app.include_router(query_route() if variant == "query" else game.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "telegram_user_id": 1}
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        response = await http.get("/game/history", params={"limit": limit})
+        headers = {"If-None-Match": response.headers["ETag"]} if variant == "304" else {}
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await http.get("/game/history", params={"limit": limit}, headers=headers)
+        elapsed = time.perf_counter() - start
+    await dispose_async_engine()
+    return elapsed / requests
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        seed(args.rounds)
+        
+        print(f"{args.requests} requests, limit={args.limit}, {args.rounds} rounds in the database")
+        results = {variant: asyncio.run(run(variant, args.requests, args.limit))
+                   for variant in ("query", "cached", "304")}
+        for variant, seconds in results.items():
+            print(f"{variant:8} {seconds * 1e6:9.1f} us/request "
+                  f"({results['query'] / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
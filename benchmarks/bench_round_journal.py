@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark the round journal: bet path append cost and recovery time.
+
+Recovery (opening the journal and replaying it) is measured with
+--history-rounds settled rounds ahead of the interrupted one in the same
+segment, as on a worker that has been running for a while.
+
+Usage:
+    python3 benchmarks/bench_round_journal.py [--bets 50000] [--tick-bets 500]
+        [--history-rounds 2000] [--history-bets 500]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.game.engine.bet_store import RoundBetStore
+from src.game.engine.round_journal import RoundJournal, replay
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bets", type=int, default=50_000)
+    parser.add_argument("--tick-bets", type=int, default=500,
+                        help="Bets between flushes (one flush per round loop tick)")
+    parser.add_argument("--history-rounds", type=int, default=2000,
+                        help="Settled rounds journaled before the interrupted one")
+    parser.add_argument("--history-bets", type=int, default=500)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "round_journal.bin"
+        journal = RoundJournal(path, segment_bytes=1 << 40)
+        for round_id in range(1, args.history_rounds + 1):
+            journal.round_created(round_id, "ab" * 32, 250)
+            store = RoundBetStore(round_id)
+            for user_id in range(args.history_bets):
+                journal.bet_placed(store, store.add(user_id, Decimal("1.5"), "TON", None))
+            journal.crash(round_id, 250)
+            journal.round_settled(round_id)
+        
+        round_id = args.history_rounds + 1
+        journal.round_created(round_id, "ab" * 32, 250)
+        
+        store = RoundBetStore(round_id)
+        latencies = []
+        for user_id in range(args.bets):
+            slot = store.add(user_id, Decimal("1.5"), "TON", Decimal("2.5") if user_id % 2 else None)
+            store.bet_id[slot] = user_id + 1
+            
+            start = time.perf_counter_ns()
+            journal.bet_placed(store, slot)
+            latencies.append(time.perf_counter_ns() - start)
+            
+            if user_id % args.tick_bets == 0:
+                journal.flush()
+        
+        journal.round_started(round_id)
+        for user_id in range(0, args.bets, 10):
+            journal.cashout(round_id, user_id, 150)
+        journal.close()
+        
+        events = path.stat().st_size // 64
+        start = time.perf_counter()
+        RoundJournal(path, segment_bytes=1 << 40).close()
+        open_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        state = replay(path)
+        replay_ms = (time.perf_counter() - start) * 1000
+        assert len(state.store) == args.bets
+    
+    latencies.sort()
+    print(f"bet path append: p50 {statistics.median(latencies) / 1000:.2f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] / 1000:.2f} us, "
+          f"max {latencies[-1] / 1000:.2f} us")
+    print(f"recovery of {events:,} events ({args.bets:,} in the last round): "
+          f"open {open_ms:.1f} ms, replay {replay_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark crash settlement: per-bet repository calls vs set-based settle_round.
+
+Usage:
+    python3 benchmarks/bench_round_settlement.py [--bets 5000]
+"""
+import argparse
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.connection import Base
+from src.database.models.game import Bet, BetStatus, GameRound, GameRoundStatus
+from src.database.models.user import User
+from src.database.repositories.game_repo import GameRoundRepository, BetRepository
+
+
+def build_round(bets: int):
+    """Create a database with one active round holding `bets` active bets."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    
+    db.add_all(User(telegram_user_id=user_id) for user_id in range(1, bets + 1))
+    round_obj = GameRound(server_seed_hash="0" * 64, status=GameRoundStatus.ACTIVE)
+    db.add(round_obj)
+    db.flush()
+    db.add_all(
+        Bet(user_id=user_id, round_id=round_obj.id, amount_ton=Decimal("1.0"),
+            currency="TON", status=BetStatus.ACTIVE)
+        for user_id in range(1, bets + 1)
+    )
+    db.commit()
+    return db, round_obj.id
+
+
+def legacy_settle(db, round_id: int):
+    """Crash settlement as it was before settle_round."""
+    round_repo = GameRoundRepository(db)
+    bet_repo = BetRepository(db)
+    round_repo.crash_round(round_id, Decimal("1.50"), "1" * 64, 1000)
+    for bet in bet_repo.get_active_bets_by_round(round_id):
+        bet_repo.crash_bet(bet.id)
+
+
+def bulk_settle(db, round_id: int):
+    """Set-based crash settlement."""
+    GameRoundRepository(db).settle_round(round_id, Decimal("1.50"), "1" * 64, 1000)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bets", type=int, default=5_000)
+    args = parser.parse_args()
+    
+    for name, settle in (("legacy", legacy_settle), ("bulk", bulk_settle)):
+        db, round_id = build_round(args.bets)
+        start = time.perf_counter()
+        settle(db, round_id)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        crashed = db.query(Bet).filter(Bet.status == BetStatus.CRASHED).count()
+        assert crashed == args.bets, crashed
+        print(f"{name:>8}: {args.bets} bets settled in {elapsed_ms:.1f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Load test /ws/game: per-connection update loops vs the broadcast ticker.
+
+Starts a server per mode in a subprocess, opens the requested number of
+WebSocket connections and reports the server's CPU time per 1k
+connections (Linux, read from /proc) and the bytes sent. Modes: the old
+per-connection loop ("legacy"), the ticker with JSON clients ("ticker")
+and the ticker with binary protocol clients ("binary").
+
+Usage:
+    python3 benchmarks/bench_ws_broadcast.py [--connections 1000] [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+MODES = ("legacy", "ticker", "binary")
+
+
+def build_app(mode: str):
+    """Build an app serving /ws/game with an active round."""
+    from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    
+    from src.api.routes import websocket
+    from src.database.connection import Base
+    from src.game.engine.crash_engine import CrashEngine
+    from src.workers.game.round_manager import RoundManager
+    
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    round_manager = RoundManager(sessionmaker(bind=engine)(),
+                                 crash_engine=CrashEngine(countdown_seconds=0))
+    round_manager.start_round()
+    round_manager.begin_round()
+    
+    if mode in ("ticker", "binary"):
+        @asynccontextmanager
+        async def lifespan(app):
+            task = asyncio.create_task(websocket.run_round_ticker(round_manager))
+            yield
+            task.cancel()
+        
+        app = FastAPI(lifespan=lifespan)
+        app.include_router(websocket.router)
+        return app
+    
+    app = FastAPI()
+    
+    @app.websocket("/ws/game")
+    async def legacy_game(ws: WebSocket, user_id: int):
+        """The handler before the ticker: one update loop per connection."""
+        await ws.accept()
+        try:
+            await ws.send_json({"type": "connected", "user_id": user_id,
+                                "timestamp": datetime.utcnow().isoformat()})
+            while True:
+                await ws.send_json({"type": "round_update",
+                                    "data": round_manager.get_round_status()})
+                await asyncio.sleep(0.1)
+        except WebSocketDisconnect:
+            pass
+    
+    return app
+
+
+def serve(mode: str, port: int):
+    """Run the server for one mode."""
+    import uvicorn
+    
+    uvicorn.run(build_app(mode), host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    """Pick a free TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process."""
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def hold_connections(port: int, count: int, seconds: float, pid: int,
+                           binary: bool) -> dict:
+    """Open connections, drain their frames and measure server CPU."""
+    import websockets
+    
+    from src.api.schemas.ws_frames import BINARY_SUBPROTOCOL
+    
+    frames = 0
+    received_bytes = 0
+    subprotocols = [BINARY_SUBPROTOCOL] if binary else None
+    
+    async def client(user_id: int):
+        nonlocal frames, received_bytes
+        async with websockets.connect(f"ws://127.0.0.1:{port}/ws/game?user_id={user_id}",
+                                      subprotocols=subprotocols, max_queue=None) as ws:
+            async for frame in ws:
+                frames += 1
+                received_bytes += len(frame)
+    
+    clients = []
+    for user_id in range(count):
+        clients.append(asyncio.create_task(client(user_id)))
+        if user_id % 100 == 99:
+            await asyncio.sleep(0.05)
+    await asyncio.sleep(2)
+    
+    frames = received_bytes = 0
+    cpu_start, wall_start = cpu_seconds(pid), time.perf_counter()
+    await asyncio.sleep(seconds)
+    cpu_used, wall = cpu_seconds(pid) - cpu_start, time.perf_counter() - wall_start
+    received, received_bytes_total = frames, received_bytes
+    
+    for task in clients:
+        task.cancel()
+    await asyncio.gather(*clients, return_exceptions=True)
+    
+    return {
+        "cpu_percent": cpu_used / wall * 100,
+        "cpu_percent_per_1k": cpu_used / wall * 100 * 1000 / count,
+        "frames_per_s": received / wall,
+        "bytes_per_s": received_bytes_total / wall,
+    }
+
+
+def run(mode: str, count: int, seconds: float) -> dict:
+    """Load test one mode."""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", mode, "--port", str(port)],
+        env={**os.environ, "SECRET_KEY": os.environ.get("SECRET_KEY", "bench")},
+    )
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.2)
+        return asyncio.run(hold_connections(port, count, seconds, server.pid, mode == "binary"))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--serve", choices=MODES)
+    parser.add_argument("--port", type=int)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+    
+    print(f"{'mode':>8} {'server cpu %':>13} {'cpu % per 1k':>13} {'frames/s':>10} {'KB/s':>9}")
+    for mode in MODES:
+        result = run(mode, args.connections, args.seconds)
+        print(f"{mode:>8} {result['cpu_percent']:>13.1f} {result['cpu_percent_per_1k']:>13.1f} "
+              f"{result['frames_per_s']:>10.0f} {result['bytes_per_s'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
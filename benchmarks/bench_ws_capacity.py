@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""Load-test /ws/game with simulated players and write a JSON capacity report.
+
+Seeds funded users, starts the API server (src.api.main with its round
+loop) in a subprocess on localhost, then ramps up N WebSocket clients and
+keeps them connected for the measurement window. Each client follows a
+player strategy:
+
+    watcher  only watches the round
+    cashout  bets during the countdown, cashes out at a random target
+    auto     bets with an auto cashout target, never sends cashout
+    holder   bets and rides the round to the crash
+
+Measured over the window (after the ramp): round_update inter-arrival
+gaps and their jitter against the tick interval, place_bet/cashout round
+trip and server-side latency, dropped connections, server CPU and RSS
+(from /proc) and the generator's own CPU, which should stay well below
+saturation for the numbers to mean anything. The server's /metrics
+snapshot is attached.
+
+Runs on SQLite by default; pass --database-url for a local Postgres.
+
+Usage:
+    python3 benchmarks/bench_ws_capacity.py [--clients 1000] [--ramp 10] [--duration 60]
+        [--mix watcher=0.6,cashout=0.25,auto=0.1,holder=0.05] [--binary 0.0]
+        [--database-url postgresql://localhost/crash_bench] [--output reports/ws_capacity.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+STRATEGIES = ("watcher", "cashout", "auto", "holder")
+TELEGRAM_ID_BASE = 2_000_000
+
+
+def parse_mix(text: str) -> dict:
+    """Parse "watcher=0.6,cashout=0.4" into normalized strategy weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in STRATEGIES:
+            raise argparse.ArgumentTypeError(f"Unknown strategy: {name}")
+        mix[name] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("Strategy weights must add up to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def percentiles(samples) -> dict:
+    """p50/p90/p99/max/mean of samples, or None without samples."""
+    if not samples:
+        return None
+    samples = sorted(samples)
+    
+    def pick(q: float) -> float:
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))], 3)
+    
+    return {"count": len(samples), "p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99),
+            "max": round(samples[-1], 3), "mean": round(statistics.fmean(samples), 3)}
+
+
+def read_process(pid: int):
+    """
+    Read CPU seconds and RSS bytes of a process from /proc.
+    
+    Returns:
+        (cpu_seconds, rss_bytes) or None where /proc is unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the command name; utime and stime are fields 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    cpu_s = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return cpu_s, resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def free_port() -> int:
+    """Pick a free TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def raise_file_limit():
+    """Raise the open files limit (inherited by the server) to the hard limit."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def seed_users(count: int, balance: str):
+    """Create (or top up) count funded users; returns their Telegram IDs."""
+    from decimal import Decimal
+    
+    from src.database.connection import SessionLocal, init_db
+    from src.database.models.user import User
+    
+    init_db()
+    telegram_ids = [TELEGRAM_ID_BASE + i for i in range(count)]
+    db = SessionLocal()
+    try:
+        existing = {
+            user.telegram_user_id: user
+            for user in db.query(User).filter(User.telegram_user_id.in_(telegram_ids))
+        }
+        for user in existing.values():
+            user.balance_ton = Decimal(balance)
+        db.add_all(User(telegram_user_id=telegram_id, balance_ton=Decimal(balance))
+                   for telegram_id in telegram_ids if telegram_id not in existing)
+        db.commit()
+    finally:
+        db.close()
+    return telegram_ids
+
+
+class Recorder:
+    """Samples collected by every client, only while recording."""
+    
+    def __init__(self):
+        """Initialize recorder."""
+        self.recording = False
+        self.gaps_ms = []
+        self.json_frames = 0
+        self.binary_frames = 0
+        self.bytes_received = 0
+        self.commands = {name: {"sent": 0, "ok": 0, "errors": 0, "rtt_ms": [], "server_ms": []}
+                         for name in ("place_bet", "cashout")}
+        self.connect_ms = []
+        self.connect_failures = 0
+        self.close_codes = {}
+
+
+class LoadClient:
+    """One simulated player on its own socket."""
+    
+    def __init__(self, index: int, strategy: str, binary: bool, token: str,
+                 args: argparse.Namespace, recorder: Recorder):
+        """
+        Initialize load client.
+        
+        Args:
+            index: Client number
+            strategy: One of STRATEGIES
+            binary: Whether to negotiate the binary protocol
+            token: JWT access token
+            args: Benchmark options
+            recorder: Shared sample recorder
+        """
+        self.index = index
+        self.strategy = strategy
+        self.binary = binary
+        self.token = token
+        self.args = args
+        self.recorder = recorder
+        self.rng = random.Random(args.seed * 1_000_003 + index)
+        self.request_ids = itertools.count(1)
+        self.pending = {}
+        self.ws = None
+        self.last_frame_at = None
+        self.bet_round = None
+        self.holding = False
+        self.cashout_sent = False
+        self.target = None
+    
+    async def run(self, port: int, start_at: float, stop: asyncio.Event):
+        """Connect at start_at, play until stop is set, then close."""
+        import websockets
+        from src.api.schemas.ws_frames import BINARY_SUBPROTOCOL
+        
+        await asyncio.sleep(max(0.0, start_at - time.perf_counter()))
+        recorder = self.recorder
+        started = time.perf_counter()
+        try:
+            self.ws = await asyncio.wait_for(websockets.connect(
+                f"ws://127.0.0.1:{port}/ws/game?user_id={self.index}&token={self.token}",
+                subprotocols=[BINARY_SUBPROTOCOL] if self.binary else None,
+                max_queue=None, open_timeout=None,
+            ), timeout=self.args.connect_timeout)
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+            recorder.connect_failures += 1
+            return
+        recorder.connect_ms.append((time.perf_counter() - started) * 1000)
+        
+        reader = asyncio.create_task(self.read())
+        await asyncio.wait([reader, asyncio.create_task(stop.wait())],
+                           return_when=asyncio.FIRST_COMPLETED)
+        if reader.done():
+            code = self.ws.close_code
+            recorder.close_codes[code] = recorder.close_codes.get(code, 0) + 1
+        else:
+            await self.ws.close()
+            reader.cancel()
+    
+    async def read(self):
+        """Read frames until the socket closes, acting on round updates."""
+        import orjson
+        import websockets
+        
+        recorder = self.recorder
+        try:
+            async for raw in self.ws:
+                now = time.perf_counter()
+                if recorder.recording:
+                    recorder.bytes_received += len(raw)
+                if isinstance(raw, bytes):
+                    if recorder.recording:
+                        recorder.binary_frames += 1
+                    continue
+                
+                message = orjson.loads(raw)
+                message_type = message.get("type")
+                if message_type == "round_update":
+                    if recorder.recording:
+                        recorder.json_frames += 1
+                        if self.last_frame_at is not None:
+                            recorder.gaps_ms.append((now - self.last_frame_at) * 1000)
+                    self.last_frame_at = now
+                    await self.on_round(message["data"])
+                elif message_type in ("place_bet_ack", "cashout_ack"):
+                    self.on_ack(message, now)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+    
+    async def on_round(self, status: dict):
+        """Follow the strategy on a round update."""
+        state = status.get("status")
+        if state == "countdown":
+            if self.strategy != "watcher" and status["round_id"] != self.bet_round:
+                self.bet_round = status["round_id"]
+                self.holding = self.cashout_sent = False
+                if self.rng.random() < self.args.bet_probability:
+                    low, high = self.args.cashout_range
+                    self.target = round(self.rng.uniform(low, high), 2)
+                    # Spread bets over the first part of the countdown like real players
+                    asyncio.get_running_loop().call_later(
+                        self.rng.uniform(0, self.args.bet_spread), self.place_bet
+                    )
+        elif state == "active":
+            if (self.strategy == "cashout" and self.holding and not self.cashout_sent
+                    and (status.get("multiplier") or 0) >= self.target):
+                self.cashout_sent = True
+                await self.send("cashout", {})
+        elif state == "crashed":
+            self.holding = False
+    
+    def place_bet(self):
+        """Send the bet for the current round."""
+        message = {"amount": self.args.bet_amount, "currency": "TON"}
+        if self.strategy == "auto":
+            message["auto_cashout"] = str(self.target)
+        asyncio.ensure_future(self.send("place_bet", message))
+    
+    async def send(self, command: str, message: dict):
+        """Send a command and remember when it left."""
+        import orjson
+        import websockets
+        
+        request_id = next(self.request_ids)
+        self.pending[request_id] = (command, time.perf_counter())
+        if self.recorder.recording:
+            self.recorder.commands[command]["sent"] += 1
+        try:
+            await self.ws.send(orjson.dumps(
+                {"type": command, "request_id": request_id, **message}
+            ).decode())
+        except websockets.exceptions.ConnectionClosed:
+            self.pending.pop(request_id, None)
+    
+    def on_ack(self, ack: dict, now: float):
+        """Record a command ack."""
+        command, sent = self.pending.pop(ack.get("request_id"), (None, None))
+        if command is None:
+            return
+        if command == "place_bet" and ack["ok"]:
+            self.holding = True
+        if not self.recorder.recording:
+            return
+        stats = self.recorder.commands[command]
+        if ack["ok"]:
+            stats["ok"] += 1
+            stats["rtt_ms"].append((now - sent) * 1000)
+            stats["server_ms"].append(ack["sent_at"] - ack["received_at"])
+        else:
+            stats["errors"] += 1
+
+
+async def sample_resources(pid: int, interval_s: float, stop: asyncio.Event) -> dict:
+    """Sample server CPU and RSS plus the generator's CPU until stop is set."""
+    cpu_percent, rss, generator_percent = [], [], []
+    previous = read_process(pid)
+    previous_at = time.perf_counter()
+    previous_own = time.process_time()
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval_s)
+        except asyncio.TimeoutError:
+            pass
+        current, now, own = read_process(pid), time.perf_counter(), time.process_time()
+        elapsed = now - previous_at
+        if current and previous and elapsed > 0:
+            cpu_percent.append((current[0] - previous[0]) / elapsed * 100)
+            rss.append(current[1] / 2**20)
+        generator_percent.append((own - previous_own) / elapsed * 100)
+        previous, previous_at, previous_own = current, now, own
+    return {
+        "server_cpu_percent": percentiles(cpu_percent),
+        "server_rss_mb": ({"start": round(rss[0], 1), "max": round(max(rss), 1),
+                           "end": round(rss[-1], 1)} if rss else None),
+        "generator_cpu_percent": percentiles(generator_percent),
+    }
+
+
+async def measure(port: int, pid: int, tokens, strategies, binary, args) -> dict:
+    """Ramp up the clients, record the measurement window and collect results."""
+    import httpx
+    
+    recorder = Recorder()
+    stop = asyncio.Event()
+    ramp_start = time.perf_counter() + 0.5
+    clients = [LoadClient(index, strategy, is_binary, token, args, recorder)
+               for index, (strategy, is_binary, token)
+               in enumerate(zip(strategies, binary, tokens), 1)]
+    tasks = [asyncio.create_task(client.run(port, ramp_start + args.ramp * i / len(clients), stop))
+             for i, client in enumerate(clients)]
+    
+    await asyncio.sleep(max(0.0, ramp_start + args.ramp - time.perf_counter()) + args.settle)
+    connect_ms, connect_failures = recorder.connect_ms, recorder.connect_failures
+    recorder.recording = True
+    sampling_stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_resources(pid, args.sample_interval, sampling_stop))
+    window_start = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    recorder.recording = False
+    window_s = time.perf_counter() - window_start
+    sampling_stop.set()
+    resources = await sampler
+    
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+        server_metrics = (await http.get("/metrics")).json()
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    
+    json_clients = sum(1 for client in clients if not client.binary and client.ws)
+    tick_ms = args.tick_ms
+    return {
+        "connections": {
+            "target": len(clients),
+            "connected": len(connect_ms),
+            "failed": connect_failures,
+            "closed_by_server": {str(code): count
+                                 for code, count in sorted(recorder.close_codes.items(),
+                                                           key=lambda item: str(item[0]))},
+            "connect_ms": percentiles(connect_ms),
+        },
+        "ticks": {
+            "interval_ms": tick_ms,
+            "json_frames": recorder.json_frames,
+            "json_frames_per_client_s": (round(recorder.json_frames / json_clients / window_s, 2)
+                                         if json_clients else None),
+            "binary_frames": recorder.binary_frames,
+            "gap_ms": percentiles(recorder.gaps_ms),
+            "jitter_ms": percentiles([abs(gap - tick_ms) for gap in recorder.gaps_ms]),
+            "late_gaps": sum(1 for gap in recorder.gaps_ms if gap > 2 * tick_ms),
+        },
+        "bytes_received_per_s": round(recorder.bytes_received / window_s),
+        "commands": {
+            name: {
+                "sent": stats["sent"],
+                "ok": stats["ok"],
+                "errors": stats["errors"],
+                "rtt_ms": percentiles(stats["rtt_ms"]),
+                "server_ms": percentiles(stats["server_ms"]),
+            }
+            for name, stats in recorder.commands.items()
+        },
+        "resources": resources,
+        "server_metrics": server_metrics,
+        "window_s": round(window_s, 2),
+    }
+
+
+def revision() -> str:
+    """Git revision of the tree under test, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--ramp", type=float, default=10.0, help="Seconds to connect every client")
+    parser.add_argument("--settle", type=float, default=2.0,
+                        help="Seconds between the ramp and the measurement window")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measurement window seconds")
+    parser.add_argument("--mix", type=parse_mix,
+                        default=parse_mix("watcher=0.6,cashout=0.25,auto=0.1,holder=0.05"),
+                        help="Strategy weights, e.g. watcher=0.6,cashout=0.4")
+    parser.add_argument("--binary", type=float, default=0.0,
+                        help="Share of clients negotiating the binary protocol")
+    parser.add_argument("--bet-probability", type=float, default=0.8,
+                        help="Chance a betting player bets in a round")
+    parser.add_argument("--bet-amount", default="1")
+    parser.add_argument("--bet-spread", type=float, default=2.0,
+                        help="Bets are placed within this many seconds of the countdown start")
+    parser.add_argument("--cashout-range", type=float, nargs=2, default=(1.2, 3.0),
+                        metavar=("LOW", "HIGH"), help="Cashout target range")
+    parser.add_argument("--tick-ms", type=float, default=100.0,
+                        help="Server tick interval the jitter is measured against")
+    parser.add_argument("--connect-timeout", type=float, default=30.0)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", default=None,
+                        help="Database to run against (default: a temporary SQLite file)")
+    parser.add_argument("--output", type=Path, default=None, help="Write the report here")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    names = list(args.mix)
+    strategies = rng.choices(names, weights=[args.mix[name] for name in names], k=args.clients)
+    binary = [rng.random() < args.binary for _ in range(args.clients)]
+    raise_file_limit()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "bench"),
+            "DATABASE_URL": args.database_url or f"sqlite:///{tmp}/bench.db",
+            "ROUND_MANAGER_ENABLED": "true",
+            "WS_FANOUT_BACKEND": "local",
+            "SEED_CHAIN_PATH": f"{tmp}/seed_chain.bin",
+            "SEED_CHAIN_LENGTH": "100000",
+            "ROUND_JOURNAL_PATH": f"{tmp}/round_journal.bin",
+        }
+        os.environ.update(env)
+        from src.api.middleware.auth import create_access_token
+        
+        tokens = [create_access_token(telegram_id)
+                  for telegram_id in seed_users(args.clients, "1000000")]
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.api.main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--log-level", "warning"],
+            cwd=project_root, env=env,
+        )
+        try:
+            deadline = time.time() + 60
+            while time.time() < deadline:
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                    break
+                except OSError:
+                    time.sleep(0.2)
+            results = asyncio.run(measure(port, server.pid, tokens, strategies, binary, args))
+        finally:
+            server.terminate()
+            server.wait()
+    
+    report = {
+        "revision": revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": env["DATABASE_URL"].split(":", 1)[0],
+        },
+        "config": {
+            "clients": args.clients,
+            "ramp_s": args.ramp,
+            "duration_s": args.duration,
+            "mix": {name: round(weight, 4) for name, weight in sorted(args.mix.items())},
+            "strategies": {name: strategies.count(name) for name in sorted(args.mix)},
+            "binary_clients": sum(binary),
+            "bet_probability": args.bet_probability,
+            "bet_amount": args.bet_amount,
+            "cashout_range": list(args.cashout_range),
+            "seed": args.seed,
+        },
+        **results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
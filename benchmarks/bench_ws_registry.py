@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark a WebSocket reconnect storm against the connection registry.
+
+Connects N sockets, then disconnects and reconnects all of them in random
+order (a deploy or network blip), and compares the ConnectionManager with
+the previous list-based bookkeeping (list.append / list.remove).
+
+Usage:
+    python3 benchmarks/bench_ws_registry.py [--connections 50000] [--tabs 2]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api.routes.websocket import ConnectionManager
+
+
+class NullWebSocket:
+    """WebSocket stand-in discarding frames."""
+    
+    async def accept(self, subprotocol=None):
+        pass
+    
+    async def send_text(self, data: str):
+        pass
+    
+    async def send_bytes(self, data: bytes):
+        pass
+    
+    async def close(self, code: int = 1000):
+        pass
+
+
+def list_storm(sockets, order) -> float:
+    """Reconnect storm with the previous list bookkeeping, in seconds."""
+    active_connections = list(sockets)
+    user_connections = {user_id: socket for user_id, socket in enumerate(sockets)}
+    
+    start = time.perf_counter()
+    for index in order:
+        active_connections.remove(sockets[index])
+        user_connections.pop(index, None)
+    for index in order:
+        active_connections.append(sockets[index])
+        user_connections[index] = sockets[index]
+    return time.perf_counter() - start
+
+
+async def registry_storm(sockets, users, order) -> dict:
+    """Reconnect storm through the ConnectionManager."""
+    connections = ConnectionManager()
+    
+    start = time.perf_counter()
+    for socket, user_id in zip(sockets, users):
+        await connections.connect(socket, user_id)
+        connections.authenticate(socket, user_id)
+    connect_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for index in order:
+        connections.disconnect(sockets[index], users[index])
+    disconnect_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for index in order:
+        await connections.connect(sockets[index], users[index])
+        connections.authenticate(sockets[index], users[index])
+    reconnect_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    sent = sum(connections.send_to_user(user_id, {"type": "balance"}) for user_id in set(users))
+    targeted_s = time.perf_counter() - start
+    
+    assert len(connections.registry) == len(sockets) and sent == len(sockets)
+    for socket, user_id in zip(sockets, users):
+        connections.disconnect(socket, user_id)
+    await asyncio.sleep(0)
+    
+    return {
+        "connect_s": connect_s,
+        "disconnect_s": disconnect_s,
+        "reconnect_s": reconnect_s,
+        "targeted_s": targeted_s,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=50_000)
+    parser.add_argument("--tabs", type=int, default=2, help="Sockets per user")
+    parser.add_argument("--skip-list", action="store_true",
+                        help="Skip the quadratic list baseline")
+    args = parser.parse_args()
+    
+    sockets = [NullWebSocket() for _ in range(args.connections)]
+    users = [index // args.tabs for index in range(args.connections)]
+    order = list(range(args.connections))
+    random.Random(1).shuffle(order)
+    
+    result = asyncio.run(registry_storm(sockets, users, order))
+    n = args.connections
+    print(f"{n} connections, {args.tabs} per user")
+    print(f"registry connect:      {result['connect_s'] * 1000:8.1f} ms "
+          f"({result['connect_s'] / n * 1e6:.2f} us each)")
+    print(f"registry disconnect:   {result['disconnect_s'] * 1000:8.1f} ms "
+          f"({result['disconnect_s'] / n * 1e6:.2f} us each)")
+    print(f"registry reconnect:    {result['reconnect_s'] * 1000:8.1f} ms "
+          f"({result['reconnect_s'] / n * 1e6:.2f} us each)")
+    print(f"send to every user:    {result['targeted_s'] * 1000:8.1f} ms")
+    
+    if not args.skip_list:
+        list_s = list_storm(sockets, order)
+        storm_s = result["disconnect_s"] + result["reconnect_s"]
+        print(f"list disconnect+reconnect: {list_s * 1000:8.1f} ms "
+              f"(registry {storm_s * 1000:.1f} ms, {list_s / storm_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Report the import time of the API process, module by module.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters
+(cold import, best of --runs), then prints the total and the slowest
+modules by cumulative and by self time, plus the time per top-level
+package. With --budget-ms it exits 1 when the import is slower, and
+with --forbid it exits 1 when any of the given modules is imported
+(e.g. a heavy dependency that should only load on first use).
+
+Usage:
+    python3 scripts/import_time_report.py [--module src.api.main] [--top 20]
+        [--budget-ms 300] [--forbid aiohttp src.economics.analytics] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str) -> list:
+    """
+    Import a module in a fresh interpreter and parse -X importtime.
+    
+    Args:
+        module: Module to import
+    
+    Returns:
+        [(module, self_us, cumulative_us, depth)] in import order
+    """
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Importing must not touch a real database
+        env.setdefault("DATABASE_URL", f"sqlite:///{tmp}/import_time.db")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=project_root, env=env, capture_output=True, text=True,
+        )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def build_report(rows: list, module: str, top: int) -> dict:
+    """Summarize import times: total, slowest modules and packages."""
+    total_us = next(cumulative for name, _, cumulative, depth in rows
+                    if name == module and depth == 0)
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    
+    def ms(us):
+        return round(us / 1000, 1)
+    
+    return {
+        "module": module,
+        "total_ms": ms(total_us),
+        "modules_imported": len(rows),
+        "slowest_cumulative": [{"module": n, "ms": ms(c)} for n, _, c, _ in
+                               sorted(rows, key=lambda r: -r[2])[:top]],
+        "slowest_self": [{"module": n, "ms": ms(s)} for n, s, _, _ in
+                         sorted(rows, key=lambda r: -r[1])[:top]],
+        "packages": [{"package": p, "ms": ms(us)} for p, us in
+                     sorted(packages.items(), key=lambda kv: -kv[1])[:top]],
+    }
+
+
+def main():
+    """Run the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.api.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--forbid", nargs="*", default=[])
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    rows = min(runs, key=lambda r: next(c for n, _, c, d in r if n == args.module and d == 0))
+    report = build_report(rows, args.module, args.top)
+    imported = {name for name, _, _, _ in rows}
+    report["forbidden_imported"] = sorted(
+        name for name in imported
+        if any(name == f or name.startswith(f + ".") for f in args.forbid)
+    )
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {args.module}: {report['total_ms']} ms "
+              f"({report['modules_imported']} modules, best of {args.runs})")
+        for title, key, label in (("slowest (cumulative)", "slowest_cumulative", "module"),
+                                  ("slowest (self)", "slowest_self", "module"),
+                                  ("by package (self)", "packages", "package")):
+            print(f"\n{title}:")
+            for entry in report[key]:
+                print(f"  {entry['ms']:8.1f} ms  {entry[label]}")
+        if report["forbidden_imported"]:
+            print(f"\nforbidden modules imported: {', '.join(report['forbidden_imported'])}")
+    
+    failed = bool(report["forbidden_imported"])
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"\nover budget: {report['total_ms']} ms > {args.budget_ms} ms", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Create missing tables and indexes in DATABASE_URL.
+
+Run once per deploy, before starting API workers with
+DB_INIT_ON_STARTUP=false, so workers do not each run the schema check at
+startup.
+
+Usage:
+    python3 scripts/init_db.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Import every model so its table is registered on Base.metadata
+import src.database.models  # noqa: F401
+from src.database.connection import DATABASE_URL, init_db
+
+
+def main():
+    """Create the schema."""
+    start = time.perf_counter()
+    init_db()
+    print(f"Schema ready in {DATABASE_URL.split('@')[-1]} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
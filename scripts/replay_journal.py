@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Print round journal events and the round state at an offset.
+
+Usage:
+    python3 scripts/replay_journal.py [--path data/round_journal.bin] [--start 0] [--stop N] [--state]
+
+Prints one JSON line per event between --start and --stop; with --state
+the state of the last round replayed up to --stop is printed instead.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import get_round_journal_path
+from src.game.engine.bet_store import STATUSES
+from src.game.engine.round_journal import iter_events, replay
+
+
+def main():
+    """Run the replayer."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", type=Path, default=get_round_journal_path())
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--stop", type=int, default=None)
+    parser.add_argument("--state", action="store_true")
+    args = parser.parse_args()
+    
+    if not args.state:
+        for event in iter_events(args.path, args.start, args.stop):
+            print(json.dumps(event))
+        return
+    
+    state = replay(args.path, args.stop)
+    store = state.store
+    statuses = {}
+    if store is not None:
+        for code in store.status[:len(store)].tolist():
+            name = STATUSES[code].value
+            statuses[name] = statuses.get(name, 0) + 1
+    
+    print(json.dumps({
+        "offset": state.offset,
+        "round_id": state.round_id,
+        "in_flight": state.in_flight,
+        "crash_hundredths": state.crash_hundredths,
+        "started_at_ns": state.started_at_ns,
+        "crashed_at_ns": state.crashed_at_ns,
+        "settled": state.settled,
+        "bets": statuses,
+        "unsettled_cashouts": len(state.unsettled_cashouts),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Simulate the crash point distribution and the realised house edge.
+
+Usage:
+    python3 scripts/simulate_house_edge.py [--rounds 200000000] [--house-edge 0.01 0.02]
+        [--workers 8] [--seed 1] [--arrow reports/crash_distribution.arrow]
+
+Prints a JSON report per house edge; with --arrow the per-multiplier
+table (CDF, survival, realised house edge) is written as an Arrow file,
+suffixed with the house edge when several are simulated.
+"""
+import argparse
+import json
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.economics.game.crash_simulator import CrashSimulator
+
+
+def main():
+    """Run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200_000_000)
+    parser.add_argument("--house-edge", type=Decimal, nargs="+", default=[Decimal("0.01")])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--arrow", type=Path, default=None)
+    args = parser.parse_args()
+    
+    for house_edge in args.house_edge:
+        start = time.perf_counter()
+        simulator = CrashSimulator(house_edge, workers=args.workers).simulate(args.rounds, args.seed)
+        report = simulator.report()
+        report["elapsed_s"] = round(time.perf_counter() - start, 2)
+        
+        if args.arrow:
+            path = args.arrow
+            if len(args.house_edge) > 1:
+                path = path.with_name(f"{path.stem}_{house_edge}{path.suffix}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            simulator.write_arrow(path)
+            report["arrow"] = str(path)
+        
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Verify every crashed round in game_rounds.
+
+Usage:
+    python3 scripts/verify_rounds.py [--workers 8] [--batch-size 50000] [--from-id 0]
+
+Prints one JSON line per mismatch and a summary line; exits 1 if any
+round fails verification.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.connection import engine
+from src.database.models.game import GameRound, GameRoundStatus
+from src.game.engine.batch_verifier import iter_mismatches
+
+
+def read_batches(batch_size: int, from_id: int, counter: dict):
+    """Read crashed rounds with revealed seeds in id order."""
+    last_id = from_id
+    with engine.connect() as conn:
+        while True:
+            rows = conn.execute(
+                select(
+                    GameRound.id, GameRound.server_seed, GameRound.client_seed,
+                    GameRound.crash_multiplier, GameRound.server_seed_hash,
+                )
+                .where(
+                    GameRound.id > last_id,
+                    GameRound.status == GameRoundStatus.CRASHED,
+                    GameRound.server_seed.isnot(None),
+                )
+                .order_by(GameRound.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return
+            
+            last_id = rows[-1].id
+            counter["rounds"] += len(rows)
+            yield (
+                [row.server_seed for row in rows],
+                [row.client_seed for row in rows],
+                [row.id for row in rows],
+                [row.crash_multiplier for row in rows],
+                [row.server_seed_hash for row in rows],
+            )
+
+
+def main():
+    """Run the verifier."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--from-id", type=int, default=0)
+    args = parser.parse_args()
+    
+    counter = {"rounds": 0}
+    mismatches = 0
+    start = time.perf_counter()
+    for mismatch in iter_mismatches(read_batches(args.batch_size, args.from_id, counter), args.workers):
+        mismatches += 1
+        print(json.dumps(mismatch))
+    
+    print(json.dumps({
+        "verified": counter["rounds"],
+        "mismatches": mismatches,
+        "seconds": round(time.perf_counter() - start, 2),
+    }))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
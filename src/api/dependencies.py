@@ -0,0 +1,17 @@
+"""Dependencies shared by the API routes."""
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.workers.game.round_manager import RoundManager
+
+
+def get_round_manager() -> "RoundManager":
+    """
+    Get the process-wide round manager.
+    
+    The round manager module loads the game engine and numpy, so it is
+    imported on first use rather than when the routes are.
+    """
+    from src.workers.game import round_manager
+    
+    return round_manager.get_round_manager()
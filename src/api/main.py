@@ -1,24 +1,146 @@
 """Main FastAPI application."""
+import asyncio
+import contextlib
+import fcntl
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.config import (
+    get_db_init_on_startup,
+    get_rate_limit_backend,
+    get_rate_limit_max_keys,
+    get_redis_url,
+    get_round_journal_path,
+    get_round_manager_enabled,
+    get_seed_chain_length,
+    get_seed_chain_path,
+    get_ws_fanout_backend,
+)
+from src.database.async_connection import dispose_async_engine
 from src.database.connection import init_db
+from src.api.middleware import rate_limit
+from src.api.middleware.rate_limit import create_rate_limiter, rate_limit_middleware
 from src.api.middleware.security import setup_cors, security_headers_middleware
-from src.api.routes import auth, game, payments, user
+from src.api.routes import auth, game, payments, user, websocket
+from src.api.routes.websocket import run_round_ticker
 from src.api.routes.bonuses import bonuses
 from src.api.routes.referrals import referrals
 from src.api.routes.leaderboard import leaderboard
+from src.game.engine.round_history import get_round_history
+from src.services.identity import get_identity_cache, get_init_data_verifier
+from src.services.metrics import get_metrics
+from src.services.realtime import (
+    RemoteRoundManager,
+    RoundCommandServer,
+    create_fanout_backend,
+    use_fanout_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the round loop, the broadcast ticker and the fan-out relay for the lifetime of the process."""
+    # The round manager and its journal load numpy, so they are imported
+    # when the process starts serving rather than with the app
+    from src.game.engine.round_journal import RoundJournal
+    from src.workers.game.round_manager import (
+        acquire_round_loop_lock,
+        get_round_manager,
+        use_round_manager,
+    )
+    
+    if get_db_init_on_startup():
+        # Create missing tables and indexes (off when scripts/init_db.py runs at
+        # deploy), one worker at a time so they do not race on CREATE TABLE
+        init_lock_path = get_round_journal_path().with_suffix(".init.lock")
+        init_lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(init_lock_path, "a") as init_lock:
+            fcntl.flock(init_lock.fileno(), fcntl.LOCK_EX)
+            init_db()
+    round_loop_lock = None
+    if get_round_manager_enabled():
+        # One round loop per journal and seed chain: under --workers N the
+        # first worker leads and the others relay and forward commands to it
+        round_loop_lock = acquire_round_loop_lock(get_round_journal_path().with_suffix(".lock"))
+    round_loop_enabled = round_loop_lock is not None
+    # Derive the Mini App init data key once, before the first request
+    get_init_data_verifier()
+    
+    limiter = create_rate_limiter(get_rate_limit_backend(), get_redis_url(),
+                                  get_rate_limit_max_keys())
+    rate_limit.use_rate_limiter(limiter)
+    
+    fanout = create_fanout_backend(get_ws_fanout_backend(), get_redis_url(),
+                                   get_round_journal_path().with_suffix(".sock"),
+                                   hub=round_loop_enabled)
+    if not round_loop_enabled and not fanout.distributed:
+        # Round updates, bans and the replies to forwarded commands would
+        # never reach this worker
+        raise RuntimeError(
+            "This worker does not run the round loop and WS_FANOUT_BACKEND=local "
+            "does not reach the one that does: use unix (one host) or redis"
+        )
+    await fanout.start()
+    use_fanout_backend(fanout)
+    websocket.manager.use_fanout(fanout)
+    # Bans on any worker drop the user's cached tokens here too
+    fanout.subscribe(get_identity_cache().deliver_invalidation)
+    if round_loop_enabled:
+        round_manager = get_round_manager()
+        # Bets and cashouts arriving on other workers are run here
+        RoundCommandServer(round_manager, fanout)
+    else:
+        # Only the round loop holds the round: commands go to it, status
+        # comes from its round updates
+        round_manager = RemoteRoundManager(fanout)
+        use_round_manager(round_manager)
+        if get_round_manager_enabled():
+            logger.warning("Round loop already running in another process, relaying only")
+    
+    tasks = [asyncio.create_task(run_round_ticker(round_manager, publish=round_loop_enabled))]
+    if round_loop_enabled:
+        # Every crash is appended as it happens, so history never goes stale
+        get_round_history().refresh_seconds = None
+        round_manager.journal = RoundJournal(get_round_journal_path())
+        round_manager.recover()
+        tasks.append(asyncio.create_task(
+            round_manager.load_seed_chain(get_seed_chain_path(), get_seed_chain_length())
+        ))
+        tasks.append(asyncio.create_task(round_manager.process_rounds()))
+    
+    yield
+    
+    if round_loop_enabled:
+        round_manager.stop()
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    if round_loop_enabled:
+        round_manager.journal.close()
+        round_loop_lock.close()
+    await fanout.stop()
+    await limiter.close()
+    await dispose_async_engine()
 
-# Initialize database
-init_db()
 
 # Create FastAPI app
 app = FastAPI(
     title="Crash Game API",
     description="Telegram Mini App Crash Game API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Add rate limiting middleware (added first so it runs innermost and 429
+# responses still get CORS and security headers)
+app.middleware("http")(rate_limit_middleware)
+
 # Setup CORS
 setup_cors(app)
 
@@ -33,6 +155,7 @@ app.include_router(user.router)
 app.include_router(bonuses.router)
 app.include_router(referrals.router)
 app.include_router(leaderboard.router)
+app.include_router(websocket.router)
 
 
 @app.get("/")
@@ -45,3 +168,9 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process metrics (round settlement time, etc.)."""
+    return get_metrics().snapshot()
@@ -1,17 +1,29 @@
 """Authentication middleware."""
-from fastapi import Request, HTTPException, status
+from fastapi import Depends, Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
-import jwt
+from functools import lru_cache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Callable, Optional, Tuple
 from datetime import datetime, timedelta
 
 from src.config import get_secret_key
-from src.database.connection import get_db
-from src.database.repositories.user_repo import UserRepository
+from src.database.async_connection import AsyncSessionLocal, get_async_db
+from src.database.repositories.user_repo import AsyncUserRepository, UserRepository
+from src.services.identity import get_identity_cache, get_init_data_verifier
 
 
 security = HTTPBearer()
 
+# Credential -> (Telegram user ID, Unix expiry) or None if invalid
+Claims = Callable[[str], Optional[Tuple[int, Optional[float]]]]
+
+
+@lru_cache(maxsize=None)
+def signing_key() -> str:
+    """Get the JWT signing key (read from the environment once)."""
+    return get_secret_key()
+
 
 def create_access_token(telegram_user_id: int, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -35,35 +47,150 @@ def create_access_token(telegram_user_id: int, expires_delta: Optional[timedelta
         "iat": datetime.utcnow(),
     }
     
-    token = jwt.encode(payload, get_secret_key(), algorithm="HS256")
+    # jwt loads the cryptography backends, so it is imported on first use
+    import jwt
+    
+    token = jwt.encode(payload, signing_key(), algorithm="HS256")
     return token
 
 
-def verify_token(token: str) -> Optional[int]:
+def decode_token(token: str) -> Optional[dict]:
     """
-    Verify JWT token and return user ID.
+    Verify JWT token and return its payload.
     
     Args:
         token: JWT token
     
     Returns:
-        Telegram user ID or None
+        Token payload or None
     """
+    import jwt
+    
     try:
-        payload = jwt.decode(token, get_secret_key(), algorithms=["HS256"])
-        return payload.get("telegram_user_id")
+        return jwt.decode(token, signing_key(), algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
 
-async def get_current_user(request: Request) -> dict:
+def verify_token(token: str) -> Optional[int]:
+    """
+    Verify JWT token and return user ID.
+    
+    Args:
+        token: JWT token
+    
+    Returns:
+        Telegram user ID or None
+    """
+    payload = decode_token(token)
+    return payload.get("telegram_user_id") if payload else None
+
+
+def _identity(user) -> Optional[dict]:
+    """Identity of a user allowed to authenticate (None if missing or banned)."""
+    if not user or user.is_banned:
+        return None
+    return {"id": user.id, "telegram_user_id": user.telegram_user_id}
+
+
+def _token_claims(token: str) -> Optional[Tuple[int, Optional[float]]]:
+    """(Telegram user ID, expiry) of a valid JWT."""
+    payload = decode_token(token)
+    if not payload or not payload.get("telegram_user_id"):
+        return None
+    return payload["telegram_user_id"], payload.get("exp")
+
+
+def _init_data_claims(init_data: str) -> Optional[Tuple[int, Optional[float]]]:
+    """(Telegram user ID, expiry) of verified Mini App init data."""
+    verified = get_init_data_verifier().verify(init_data)
+    if not verified:
+        return None
+    return verified["user"]["id"], verified["expires_at"]
+
+
+def _resolve(credential: str, claims: Claims, db: Session) -> Optional[dict]:
+    """Resolve a credential through the identity cache, loading the user on a miss."""
+    cache = get_identity_cache()
+    identity = cache.get(credential)
+    if identity is not None:
+        return identity
+    
+    claimed = claims(credential)
+    if not claimed:
+        return None
+    
+    identity = _identity(UserRepository(db).get_by_telegram_id(claimed[0]))
+    if identity:
+        cache.put(credential, identity, claimed[1])
+    return identity
+
+
+async def _resolve_async(credential: str, claims: Claims, db: AsyncSession) -> Optional[dict]:
+    """Like _resolve, loading the user on an async session."""
+    cache = get_identity_cache()
+    identity = cache.get(credential)
+    if identity is not None:
+        return identity
+    
+    claimed = claims(credential)
+    if not claimed:
+        return None
+    
+    identity = _identity(await AsyncUserRepository(db).get_by_telegram_id(claimed[0]))
+    if identity:
+        cache.put(credential, identity, claimed[1])
+    return identity
+
+
+def resolve_token(token: str, db: Session) -> Optional[dict]:
+    """
+    Resolve a JWT to the user it was issued for, through the identity cache.
+    
+    On a cache hit this is a dict lookup; otherwise the token is decoded,
+    the user loaded and the result cached until the token expires or the
+    cache TTL passes, whichever is first.
+    
+    Args:
+        token: JWT token
+        db: Database session (only used on a cache miss)
+    
+    Returns:
+        User data or None
+    """
+    return _resolve(token, _token_claims, db)
+
+
+async def authenticate_token(token: str) -> Optional[dict]:
+    """
+    Resolve a JWT to the user it was issued for.
+    
+    A cache hit never touches the database; a miss loads the user on an
+    async session, so WebSocket handlers can call this on the event loop.
+    
+    Args:
+        token: JWT token
+    
+    Returns:
+        User data or None
+    """
+    identity = get_identity_cache().get(token)
+    if identity is not None:
+        return identity
+    
+    async with AsyncSessionLocal() as db:
+        return await _resolve_async(token, _token_claims, db)
+
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict:
     """
     Get current authenticated user.
     
     Args:
         request: FastAPI request
+        db: Request-scoped async database session
     
     Returns:
         User data
@@ -74,61 +201,18 @@ async def get_current_user(request: Request) -> dict:
     # Try to get token from Authorization header
     authorization = request.headers.get("Authorization")
     if authorization and authorization.startswith("Bearer "):
-        token = authorization.split(" ")[1]
-        telegram_user_id = verify_token(token)
-        if telegram_user_id:
-            db = next(get_db())
-            user_repo = UserRepository(db)
-            user = user_repo.get_by_telegram_id(telegram_user_id)
-            if user:
-                return {"id": user.id, "telegram_user_id": user.telegram_user_id}
+        identity = await _resolve_async(authorization[7:], _token_claims, db)
+        if identity:
+            return identity
     
     # Try to get from Telegram Mini App init data
     init_data = request.headers.get("X-Telegram-Init-Data")
     if init_data:
-        # Parse Telegram init data
-        # In production, would verify signature
-        # Placeholder implementation
-        user_data = parse_telegram_init_data(init_data)
-        if user_data:
-            db = next(get_db())
-            user_repo = UserRepository(db)
-            user = user_repo.get_by_telegram_id(user_data["id"])
-            if user:
-                return {"id": user.id, "telegram_user_id": user.telegram_user_id}
+        identity = await _resolve_async(init_data, _init_data_claims, db)
+        if identity:
+            return identity
     
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Not authenticated"
     )
-
-
-def parse_telegram_init_data(init_data: str) -> Optional[dict]:
-    """
-    Parse Telegram Mini App init data.
-    
-    Args:
-        init_data: Telegram init data string
-    
-    Returns:
-        User data or None
-    """
-    # In production, would verify signature using bot token
-    # Placeholder implementation
-    try:
-        # Parse query string format: key=value&key2=value2
-        data = {}
-        for pair in init_data.split("&"):
-            if "=" in pair:
-                key, value = pair.split("=", 1)
-                data[key] = value
-        
-        # Extract user data from JSON
-        if "user" in data:
-            import json
-            user_data = json.loads(data["user"])
-            return user_data
-    except Exception:
-        pass
-    
-    return None
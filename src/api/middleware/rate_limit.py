@@ -1,18 +1,72 @@
 """Rate limiting middleware."""
-from fastapi import Request, HTTPException, status
-from typing import Dict
-from datetime import datetime, timedelta
-from collections import defaultdict
-import asyncio
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
 
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
 
-class RateLimiter:
-    """Simple rate limiter."""
+from src.services.identity import get_identity_cache
+from src.services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RatePolicy:
+    """A token bucket: bursts of max_requests, refilled over window_seconds."""
     
-    def __init__(self):
-        """Initialize rate limiter."""
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.lock = asyncio.Lock()
+    __slots__ = ("name", "max_requests", "window_seconds", "rate")
+    
+    def __init__(self, name: str, max_requests: int, window_seconds: float):
+        """
+        Initialize rate policy.
+        
+        Args:
+            name: Policy name (part of the bucket key)
+            max_requests: Bucket capacity
+            window_seconds: Seconds to refill an empty bucket
+        """
+        self.name = name
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.rate = max_requests / window_seconds
+    
+    def __repr__(self) -> str:
+        return f"RatePolicy({self.name!r}, {self.max_requests}, {self.window_seconds})"
+
+
+class _Bucket:
+    """Tokens left and when they were counted."""
+    
+    __slots__ = ("tokens", "updated")
+    
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiterBackend(ABC):
+    """Base class of rate limiters."""
+    
+    # Whether limits hold across workers
+    distributed = False
+    
+    @abstractmethod
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        """
+        Take a token from a key's bucket.
+        
+        Args:
+            key: Rate limit key (e.g. user or IP, including the policy)
+            policy: Rate policy
+        
+        Returns:
+            0.0 if allowed, otherwise seconds until a token is available
+        """
     
     async def check_rate_limit(self, key: str, max_requests: int, window_seconds: int) -> bool:
         """
@@ -26,27 +80,213 @@ class RateLimiter:
         Returns:
             True if within limit, False otherwise
         """
-        async with self.lock:
-            now = datetime.utcnow()
-            window_start = now - timedelta(seconds=window_seconds)
-            
-            # Clean old requests
-            self.requests[key] = [
-                req_time for req_time in self.requests[key]
-                if req_time > window_start
-            ]
-            
-            # Check limit
-            if len(self.requests[key]) >= max_requests:
-                return False
+        policy = RatePolicy(f"{max_requests}/{window_seconds}", max_requests, window_seconds)
+        return await self.acquire(f"{policy.name}:{key}", policy) == 0.0
+    
+    async def close(self):
+        """Release the backend's resources."""
+
+
+class RateLimiter(RateLimiterBackend):
+    """
+    In-process token bucket rate limiter.
+    
+    Each key holds one two-slot bucket, refilled lazily on access, so a
+    check is O(1) whatever the request rate. Keys are spread over shards,
+    each with its own lock and LRU order; a shard over its share of
+    max_keys evicts its least recently used key. An evicted key was idle
+    longest, and a bucket idle for a full window is back to capacity
+    anyway, so eviction only forgets state that no longer matters as long
+    as max_keys covers the keys active within a window.
+    """
+    
+    def __init__(self, max_keys: int = 100_000, shards: int = 16,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_keys: Buckets kept before the least recently used are evicted
+            shards: Lock shards
+            clock: Monotonic clock in seconds
+        """
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self.clock = clock
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, _Bucket]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+    
+    def __len__(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+    
+    def try_acquire(self, key: str, policy: RatePolicy) -> float:
+        """
+        Take a token from a key's bucket.
+        
+        Args:
+            key: Rate limit key (e.g. user or IP, including the policy)
+            policy: Rate policy
+        
+        Returns:
+            0.0 if allowed, otherwise seconds until a token is available
+        """
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = self.clock()
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket(policy.max_requests, now)
+                if len(buckets) > self.max_keys_per_shard:
+                    buckets.popitem(last=False)
+            else:
+                buckets.move_to_end(key)
+                bucket.tokens = min(policy.max_requests,
+                                    bucket.tokens + (now - bucket.updated) * policy.rate)
+                bucket.updated = now
             
-            # Add current request
-            self.requests[key].append(now)
-            return True
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / policy.rate
+    
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        """Take a token (see try_acquire)."""
+        return self.try_acquire(key, policy)
+
+
+# KEYS[1]: bucket hash; ARGV: capacity, tokens per millisecond.
+# Returns milliseconds until a token is available (0 if one was taken).
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return wait
+"""
 
 
+class RedisRateLimiter(RateLimiterBackend):
+    """
+    Token bucket rate limiter shared by every worker through Redis.
+    
+    Each check is one EVALSHA of TOKEN_BUCKET_LUA, which refills and takes
+    a token atomically using the Redis clock; buckets expire once they
+    would be full again, so Redis memory is bounded by active keys. If
+    Redis is unreachable requests are allowed (and counted in metrics)
+    rather than failing the API.
+    """
+    
+    distributed = True
+    
+    def __init__(self, redis_url: str, prefix: str = "crash:ratelimit"):
+        """
+        Initialize Redis rate limiter.
+        
+        Args:
+            redis_url: Redis URL (see config.get_redis_url)
+            prefix: Key prefix of the buckets
+        """
+        import redis.asyncio as redis
+        
+        self.prefix = prefix
+        self._client = redis.from_url(redis_url)
+        self._script = self._client.register_script(TOKEN_BUCKET_LUA)
+    
+    async def acquire(self, key: str, policy: RatePolicy) -> float:
+        """Take a token from the shared bucket."""
+        try:
+            wait_ms = await self._script(keys=[f"{self.prefix}:{key}"],
+                                         args=[policy.max_requests, policy.rate / 1000])
+        except Exception as e:
+            get_metrics().increment("rate_limit_backend_errors")
+            logger.warning("Rate limit check failed, allowing request: %s", e)
+            return 0.0
+        return int(wait_ms) / 1000
+    
+    async def close(self):
+        """Close the Redis connection."""
+        await self._client.aclose()
+
+
+def create_rate_limiter(name: str, redis_url: str, max_keys: int = 100_000) -> RateLimiterBackend:
+    """
+    Create a rate limiter by backend name.
+    
+    Args:
+        name: "local" or "redis"
+        redis_url: Redis URL (used by the redis backend)
+        max_keys: Buckets kept by the local backend
+    
+    Returns:
+        Rate limiter
+    """
+    if name == "local":
+        return RateLimiter(max_keys=max_keys)
+    if name == "redis":
+        return RedisRateLimiter(redis_url)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+DEFAULT_POLICY = RatePolicy("default", 100, 60)
+
+# (method or None for any, path prefix, policy); the first match applies
+ROUTE_POLICIES: List[Tuple[Optional[str], str, RatePolicy]] = [
+    ("POST", "/game/bet", RatePolicy("bet", 5, 10)),
+    ("POST", "/payments/", RatePolicy("payments_write", 10, 60)),
+    (None, "/payments/", RatePolicy("payments", 30, 60)),
+]
+
+# Paths never rate limited
+EXEMPT_PATHS = frozenset(("/health", "/metrics"))
+
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+rate_limiter: RateLimiterBackend = RateLimiter()
+
+
+def use_rate_limiter(limiter: RateLimiterBackend):
+    """Replace the rate limiter used by the middleware."""
+    global rate_limiter
+    rate_limiter = limiter
+
+
+def route_policy(method: str, path: str) -> RatePolicy:
+    """Get the rate policy of a request."""
+    for route_method, prefix, policy in ROUTE_POLICIES:
+        if (route_method is None or route_method == method) and path.startswith(prefix):
+            return policy
+    return DEFAULT_POLICY
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Get the rate limit key of a request.
+    
+    Authentication runs after middleware, so a request counts against its
+    user when its bearer token is already in the identity cache and
+    against its IP otherwise.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        authorization = request.headers.get("Authorization")
+        if authorization and authorization.startswith("Bearer "):
+            identity = get_identity_cache().get(authorization[7:])
+            if identity:
+                user_id = identity["id"]
+    if user_id is not None:
+        return f"user_{user_id}"
+    return f"ip_{request.client.host if request.client else 'unknown'}"
 
 
 async def rate_limit_middleware(request: Request, call_next):
@@ -58,19 +298,20 @@ async def rate_limit_middleware(request: Request, call_next):
         call_next: Next middleware/handler
     
     Returns:
-        Response
+        Response (429 with Retry-After when the limit is exceeded)
     """
-    # Get rate limit key (user ID or IP)
-    user_id = request.state.get("user_id")
-    key = f"user_{user_id}" if user_id else f"ip_{request.client.host}"
-    
-    # Check rate limit (e.g., 100 requests per minute)
-    is_allowed = await rate_limiter.check_rate_limit(key, max_requests=100, window_seconds=60)
+    path = request.url.path
+    if path in EXEMPT_PATHS:
+        return await call_next(request)
     
-    if not is_allowed:
-        raise HTTPException(
+    policy = route_policy(request.method, path)
+    wait_s = await rate_limiter.acquire(f"{policy.name}:{rate_limit_key(request)}", policy)
+    if wait_s > 0:
+        get_metrics().increment("rate_limited_requests")
+        return JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Rate limit exceeded"
+            content={"detail": "Rate limit exceeded"},
+            headers={"Retry-After": str(math.ceil(wait_s))},
         )
     
     response = await call_next(request)
@@ -1,36 +1,77 @@
 """Game routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import json
+from typing import TYPE_CHECKING, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 
-from src.database.connection import get_db
+from src.database.async_connection import get_async_db
+from src.api.dependencies import get_round_manager
 from src.api.middleware.auth import get_current_user
 from src.api.schemas.game import (
     BetRequest, BetResponse, CashoutRequest, CashoutResponse,
-    RoundStatus, RoundHistory, ActiveBet
+    RoundStatus, RoundHistory, ActiveBet, SeedChainInfo, VerifyRequest
 )
-from src.game.engine.game_session import GameSession
+from src.database.repositories.game_repo import AsyncGameRoundRepository
+from src.game.engine.round_history import CrashedRound, get_round_history
+from src.services.realtime import RoundLoopUnavailable
+
+if TYPE_CHECKING:
+    from src.workers.game.round_manager import RoundManager
 
 router = APIRouter(prefix="/game", tags=["game"])
 
+ROUND_HISTORY_LIST = TypeAdapter(List[RoundHistory])
+
+
+def bet_response(bet_data: dict) -> BetResponse:
+    """Build the bet response from RoundManager.place_bet data."""
+    return BetResponse(
+        bet_id=bet_data["bet_id"],
+        round_id=bet_data["round_id"],
+        amount=bet_data["amount"],
+        currency=bet_data["currency"],
+        auto_cashout_multiplier=bet_data.get("auto_cashout_multiplier"),
+        status=bet_data["status"].value,
+        placed_at=bet_data["placed_at"]
+    )
+
+
+def cashout_response(cashout_data: dict) -> CashoutResponse:
+    """Build the cashout response from RoundManager.cashout data."""
+    return CashoutResponse(
+        bet_id=cashout_data["bet_id"],
+        multiplier=cashout_data["cashed_out_multiplier"],
+        payout=cashout_data["payout"],
+        currency=cashout_data["currency"],
+        cashed_out_at=cashout_data["cashed_out_at"]
+    )
+
 
 @router.get("/round/status", response_model=RoundStatus)
 async def get_round_status(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    round_manager: "RoundManager" = Depends(get_round_manager)
 ):
     """
     Get current round status.
     
     Args:
         current_user: Current authenticated user
-        db: Database session
+        round_manager: Process-wide round manager
     
     Returns:
         Round status
+    
+    Raises:
+        HTTPException: 404 before the first round starts
     """
-    game_session = GameSession(db)
-    status_data = game_session.get_round_status()
+    status_data = round_manager.get_round_status()
+    if status_data["status"] == "no_round":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No active round")
     
     return RoundStatus(**status_data)
 
@@ -39,7 +80,7 @@ async def get_round_status(
 async def place_bet(
     bet_request: BetRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    round_manager: "RoundManager" = Depends(get_round_manager)
 ):
     """
     Place a bet.
@@ -47,53 +88,43 @@ async def place_bet(
     Args:
         bet_request: Bet request data
         current_user: Current authenticated user
-        db: Database session
+        round_manager: Process-wide round manager
     
     Returns:
         Bet response
     """
-    game_session = GameSession(db)
-    
     try:
-        bet_data = game_session.place_bet(
+        bet_data = await round_manager.place_bet_async(
             current_user["id"],
             bet_request.amount,
             bet_request.currency,
             bet_request.auto_cashout
         )
         
-        return BetResponse(
-            bet_id=bet_data["bet_id"],
-            round_id=bet_data["round_id"],
-            amount=bet_data["amount"],
-            currency=bet_data["currency"],
-            auto_cashout_multiplier=bet_data.get("auto_cashout_multiplier"),
-            status=bet_data["status"].value,
-            placed_at=bet_data["placed_at"]
-        )
+        return bet_response(bet_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RoundLoopUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
 
 @router.post("/cashout", response_model=CashoutResponse)
 async def cashout(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    round_manager: "RoundManager" = Depends(get_round_manager)
 ):
     """
     Cash out current bet.
     
     Args:
         current_user: Current authenticated user
-        db: Database session
+        round_manager: Process-wide round manager
     
     Returns:
         Cashout response
     """
-    game_session = GameSession(db)
-    
     try:
-        cashout_data = game_session.cashout(current_user["id"])
+        cashout_data = await round_manager.cashout_async(current_user["id"])
         
         if not cashout_data:
             raise HTTPException(
@@ -101,46 +132,139 @@ async def cashout(
                 detail="No active bet to cash out"
             )
         
-        return CashoutResponse(
-            bet_id=cashout_data["bet_id"],
-            multiplier=cashout_data["cashed_out_multiplier"],
-            payout=cashout_data["payout"],
-            currency=cashout_data["currency"],
-            cashed_out_at=cashout_data["cashed_out_at"]
-        )
+        return cashout_response(cashout_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RoundLoopUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+def crashed_round(row) -> CrashedRound:
+    """Build a history entry from a get_round_history row."""
+    return CrashedRound(
+        round_id=row.id,
+        crash_multiplier=row.crash_multiplier or Decimal("0"),
+        started_at=row.started_at or row.created_at,
+        crashed_at=row.crashed_at or row.created_at,
+        total_bets=row.total_bets
+    )
+
+
+def encode_round_history(rounds: List[CrashedRound]) -> bytes:
+    """Encode history entries as the RoundHistory list response."""
+    return ROUND_HISTORY_LIST.dump_json([RoundHistory(**r._asdict()) for r in rounds])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
 
 
 @router.get("/history", response_model=list[RoundHistory])
 async def get_history(
+    request: Request,
     limit: int = 100,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get game history.
     
+    Served from the in-memory round history (backfilled from the database
+    in one query), encoded once per limit and crash. Clients polling with
+    If-None-Match get 304 until the next round crashes.
+    
     Args:
-        limit: Number of rounds to return
+        request: FastAPI request
+        limit: Number of rounds to return (at most ROUND_HISTORY_SIZE)
         current_user: Current authenticated user
-        db: Database session
+        db: Async database session
     
     Returns:
         Round history
     """
-    from src.database.repositories.game_repo import GameRoundRepository
-    
-    round_repo = GameRoundRepository(db)
-    rounds = round_repo.get_latest_rounds(limit)
-    
-    return [
-        RoundHistory(
-            round_id=r.id,
-            crash_multiplier=r.crash_multiplier or Decimal("0"),
-            started_at=r.started_at or r.created_at,
-            crashed_at=r.crashed_at or r.created_at,
-            total_bets=r.total_bets
+    history = get_round_history()
+    if history.needs_load():
+        rows = await AsyncGameRoundRepository(db).get_round_history(history.max_rounds)
+        history.load(crashed_round(row) for row in rows)
+    
+    etag, body = history.body(limit, encode_round_history)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/seed-chain", response_model=SeedChainInfo)
+async def get_seed_chain(
+    round_manager: "RoundManager" = Depends(get_round_manager)
+):
+    """
+    Get the published seed chain terminus.
+    
+    Every revealed server seed hashes to the previous round's seed, and
+    the first one to the terminus, so players can verify all rounds.
+    
+    Args:
+        round_manager: Process-wide round manager
+    
+    Returns:
+        Seed chain info
+    """
+    try:
+        seed_chain = await round_manager.get_seed_chain_info_async()
+    except RoundLoopUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if seed_chain is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Seed chain not ready"
         )
-        for r in rounds
-    ]
+    
+    return SeedChainInfo(**seed_chain)
+
+
+@router.post("/verify")
+async def verify_rounds(
+    verify_request: VerifyRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Verify a batch of rounds.
+    
+    Streams one JSON line per mismatching round, followed by a summary
+    line with the number of rounds verified.
+    
+    Args:
+        verify_request: Rounds to verify
+        current_user: Current authenticated user
+    
+    Returns:
+        NDJSON stream of mismatches
+    """
+    from src.game.engine.batch_verifier import iter_mismatches
+    
+    rounds = verify_request.rounds
+    batch_size = 10000
+    batches = (
+        (
+            [r.server_seed for r in rounds[start:start + batch_size]],
+            [r.client_seed for r in rounds[start:start + batch_size]],
+            [r.round_id for r in rounds[start:start + batch_size]],
+            [r.crash_multiplier for r in rounds[start:start + batch_size]],
+            [r.server_seed_hash for r in rounds[start:start + batch_size]],
+        )
+        for start in range(0, len(rounds), batch_size)
+    )
+    
+    def stream():
+        mismatches = 0
+        for mismatch in iter_mismatches(batches, workers=1):
+            mismatches += 1
+            yield json.dumps(mismatch) + "\n"
+        yield json.dumps({"verified": len(rounds), "mismatches": mismatches}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
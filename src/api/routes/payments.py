@@ -1,15 +1,21 @@
 """Payment routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from decimal import Decimal
 
-from src.database.connection import get_db
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.async_connection import get_async_db
+from src.database.pagination import split_page
 from src.api.middleware.auth import get_current_user
 from src.api.schemas.payments import (
     DepositRequest, DepositResponse, WithdrawalRequest,
     WithdrawalResponse, PaymentHistory
 )
-from src.database.repositories.payment_repo import PaymentRepository, PaymentType, PaymentMethod
-from src.payments.ton.transactions import TONTransactionProcessor
+from src.database.repositories.payment_repo import AsyncPaymentRepository, PaymentType, PaymentMethod
+from src.payments.ton.integration import TONIntegration
+from src.payments.ton.transactions import AsyncTONTransactionProcessor
 from src.payments.stars.integration import StarsIntegration
 
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -19,7 +25,7 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 async def create_deposit(
     deposit_request: DepositRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a deposit.
@@ -27,19 +33,18 @@ async def create_deposit(
     Args:
         deposit_request: Deposit request data
         current_user: Current authenticated user
-        db: Database session
+        db: Async database session
     
     Returns:
         Deposit response
     """
-    payment_repo = PaymentRepository(db)
+    payment_repo = AsyncPaymentRepository(db)
     
     if deposit_request.currency == "TON":
         # Create TON deposit
-        ton_processor = TONTransactionProcessor(db)
-        address = await ton_processor.ton_integration.create_deposit_address(current_user["id"])
+        address = await TONIntegration().create_deposit_address(current_user["id"])
         
-        payment = payment_repo.create_deposit(
+        payment = await payment_repo.create_deposit(
             current_user["id"],
             deposit_request.amount,
             deposit_request.currency,
@@ -64,7 +69,7 @@ async def create_deposit(
             deposit_request.amount
         )
         
-        payment = payment_repo.create_deposit(
+        payment = await payment_repo.create_deposit(
             current_user["id"],
             deposit_request.amount,
             deposit_request.currency,
@@ -92,7 +97,7 @@ async def create_deposit(
 async def create_withdrawal(
     withdrawal_request: WithdrawalRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a withdrawal.
@@ -100,12 +105,12 @@ async def create_withdrawal(
     Args:
         withdrawal_request: Withdrawal request data
         current_user: Current authenticated user
-        db: Database session
+        db: Async database session
     
     Returns:
         Withdrawal response
     """
-    payment_repo = PaymentRepository(db)
+    payment_repo = AsyncPaymentRepository(db)
     
     # Calculate fee (0.5-1% with minimum)
     fee_percent = Decimal("0.01")  # 1%
@@ -114,7 +119,7 @@ async def create_withdrawal(
     fee_amount = max(fee_amount, min_fee)
     
     if withdrawal_request.currency == "TON":
-        payment = payment_repo.create_withdrawal(
+        payment = await payment_repo.create_withdrawal(
             current_user["id"],
             withdrawal_request.amount,
             withdrawal_request.currency,
@@ -124,8 +129,9 @@ async def create_withdrawal(
         )
         
         # Process withdrawal
-        ton_processor = TONTransactionProcessor(db)
+        ton_processor = AsyncTONTransactionProcessor(db)
         tx_hash = await ton_processor.process_withdrawal(payment.id)
+        await db.refresh(payment)
         
         return WithdrawalResponse(
             payment_id=payment.id,
@@ -148,21 +154,39 @@ async def create_withdrawal(
 
 @router.get("/history", response_model=list[PaymentHistory])
 async def get_payment_history(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get payment history.
+    Get a page of payment history, newest first.
+    
+    The X-Next-Cursor response header holds the cursor of the next page
+    (absent on the last page).
     
     Args:
+        response: Response (for the X-Next-Cursor header)
+        limit: Page size
+        cursor: X-Next-Cursor of the previous page
         current_user: Current authenticated user
-        db: Database session
+        db: Async database session
     
     Returns:
         Payment history
     """
-    payment_repo = PaymentRepository(db)
-    payments = payment_repo.get_user_payments(current_user["id"])
+    payment_repo = AsyncPaymentRepository(db)
+    try:
+        payments, next_cursor = split_page(
+            await payment_repo.get_user_payments(current_user["id"], limit=limit + 1,
+                                                 cursor=cursor),
+            limit, "created_at"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return [
         PaymentHistory(
@@ -1,11 +1,19 @@
 """User routes."""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import Optional
 
-from src.database.connection import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.async_connection import get_async_db
 from src.api.middleware.auth import get_current_user
-from src.api.schemas.user import UserResponse, UserBalance, UserStatistics
-from src.database.repositories.user_repo import UserRepository
+from src.api.schemas.user import (
+    UserResponse, UserBalance, UserStatistics, BetHistory, TransactionHistory
+)
+from src.database.pagination import split_page
+from src.database.repositories.game_repo import AsyncBetRepository
+from src.database.repositories.transaction_repo import AsyncTransactionRepository
+from src.database.repositories.user_repo import AsyncUserRepository
 
 router = APIRouter(prefix="/user", tags=["user"])
 
@@ -13,20 +21,20 @@ router = APIRouter(prefix="/user", tags=["user"])
 @router.get("/balance", response_model=UserBalance)
 async def get_balance(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user balance.
     
     Args:
         current_user: Current authenticated user
-        db: Database session
+        db: Async database session
     
     Returns:
         User balance
     """
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(current_user["id"])
+    user_repo = AsyncUserRepository(db)
+    user = await user_repo.get_by_id(current_user["id"])
     
     return UserBalance(
         balance_ton=user.balance_ton,
@@ -37,20 +45,20 @@ async def get_balance(
 @router.get("/statistics", response_model=UserStatistics)
 async def get_statistics(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user statistics.
     
     Args:
         current_user: Current authenticated user
-        db: Database session
+        db: Async database session
     
     Returns:
         User statistics
     """
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(current_user["id"])
+    user_repo = AsyncUserRepository(db)
+    user = await user_repo.get_by_id(current_user["id"])
     
     # Calculate win rate
     total_games = user.total_bets
@@ -71,3 +79,103 @@ async def get_statistics(
         biggest_multiplier=user.biggest_multiplier,
         win_rate=win_rate
     )
+
+
+@router.get("/bets", response_model=list[BetHistory])
+async def get_bet_history(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a page of bet history, newest first.
+    
+    The X-Next-Cursor response header holds the cursor of the next page
+    (absent on the last page).
+    
+    Args:
+        response: Response (for the X-Next-Cursor header)
+        limit: Page size
+        cursor: X-Next-Cursor of the previous page
+        current_user: Current authenticated user
+        db: Async database session
+    
+    Returns:
+        Bet history
+    """
+    bet_repo = AsyncBetRepository(db)
+    try:
+        bets, next_cursor = split_page(
+            await bet_repo.get_user_bets(current_user["id"], limit=limit + 1, cursor=cursor),
+            limit, "placed_at"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return [
+        BetHistory(
+            bet_id=b.id,
+            round_id=b.round_id,
+            amount=b.amount_ton if b.currency == "TON" else b.amount_stars,
+            currency=b.currency,
+            status=b.status.value,
+            cashed_out_multiplier=b.cashed_out_multiplier,
+            payout=b.payout_ton if b.currency == "TON" else b.payout_stars,
+            placed_at=b.placed_at
+        )
+        for b in bets
+    ]
+
+
+@router.get("/transactions", response_model=list[TransactionHistory])
+async def get_transaction_history(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a page of transaction history, newest first.
+    
+    The X-Next-Cursor response header holds the cursor of the next page
+    (absent on the last page).
+    
+    Args:
+        response: Response (for the X-Next-Cursor header)
+        limit: Page size
+        cursor: X-Next-Cursor of the previous page
+        current_user: Current authenticated user
+        db: Async database session
+    
+    Returns:
+        Transaction history
+    """
+    transaction_repo = AsyncTransactionRepository(db)
+    try:
+        transactions, next_cursor = split_page(
+            await transaction_repo.get_user_transactions(current_user["id"], limit=limit + 1,
+                                                         cursor=cursor),
+            limit, "created_at"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return [
+        TransactionHistory(
+            transaction_id=t.id,
+            transaction_type=t.transaction_type.value,
+            amount=t.amount,
+            currency=t.currency,
+            balance_after=t.balance_after,
+            description=t.description,
+            created_at=t.created_at
+        )
+        for t in transactions
+    ]
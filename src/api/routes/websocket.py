@@ -1,35 +1,137 @@
 """WebSocket routes for real-time game updates."""
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from typing import Dict, List
-import json
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Union
 import asyncio
+import math
+import time
 from datetime import datetime
+from decimal import Decimal
 
-from src.game.engine.game_session import GameSession
-from src.database.connection import get_db
+import orjson
+
+from src.api.dependencies import get_round_manager
+from src.api.middleware import rate_limit
+from src.api.middleware.auth import authenticate_token
+from src.api.routes.game import bet_response, cashout_response
+from src.api.schemas import ws_frames
+from src.api.schemas.game import BetRequest
+from src.services.metrics import get_metrics
+from src.services.realtime import (
+    TOPIC_LIVE_BETS,
+    TOPIC_PERSONAL,
+    TOPIC_ROUND,
+    TOPIC_TOP_BETS,
+    ClientConnection,
+    ConnectionRegistry,
+    FanoutBackend,
+    LocalFanout,
+    RoundLoopUnavailable,
+)
+
+if TYPE_CHECKING:
+    from src.workers.game.round_manager import RoundManager
 
 router = APIRouter()
 
 
+def encode_frame(message: dict) -> str:
+    """
+    Serialize a message once for sending to many connections.
+    
+    Args:
+        message: Message data
+    
+    Returns:
+        JSON text frame
+    """
+    return orjson.dumps(message, default=_encode_default).decode()
+
+
+def _encode_default(value):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
 class ConnectionManager:
-    """Manage WebSocket connections."""
+    """
+    Manage WebSocket connections.
     
-    def __init__(self):
-        """Initialize connection manager."""
-        self.active_connections: List[WebSocket] = []
-        self.user_connections: Dict[int, WebSocket] = {}
+    Every connection gets a ClientConnection with its own bounded send
+    queue and writer task, so sending and broadcasting only enqueue.
+    Connections are kept in a ConnectionRegistry (O(1) connect and
+    disconnect, any number of sockets per user, topic subscriptions).
+    Broadcasts go through a fan-out backend, which relays them to the
+    connections of every worker.
+    """
     
-    async def connect(self, websocket: WebSocket, user_id: int):
+    def __init__(self, max_queue: int = 64, evict_after_s: float = 5.0,
+                 fanout: Optional[FanoutBackend] = None):
+        """
+        Initialize connection manager.
+        
+        Args:
+            max_queue: Event frames queued per connection before it counts as slow
+            evict_after_s: Seconds a slow connection is kept before it is closed
+            fanout: Fan-out backend (in-process if omitted)
+        """
+        self.max_queue = max_queue
+        self.evict_after_s = evict_after_s
+        self.registry = ConnectionRegistry()
+        # Latest binary phase frame, sent to binary clients joining mid-round
+        self.last_state_frame: Optional[bytes] = None
+        self.use_fanout(fanout or LocalFanout())
+    
+    def use_fanout(self, fanout: FanoutBackend):
+        """
+        Relay frames published on a fan-out backend to this worker's connections.
+        
+        Args:
+            fanout: Fan-out backend (started by the caller)
+        """
+        self.fanout = fanout
+        fanout.subscribe(self.broadcast_frame)
+    
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        """Connected WebSockets."""
+        return list(self.registry.by_socket)
+    
+    @property
+    def binary_connection_count(self) -> int:
+        """Number of connections using binary frames."""
+        return self.registry.binary_count
+    
+    @property
+    def json_connection_count(self) -> int:
+        """Number of connections using JSON frames."""
+        return len(self.registry) - self.registry.binary_count
+    
+    async def connect(self, websocket: WebSocket, user_id: int,
+                      subprotocol: Optional[str] = None) -> ClientConnection:
         """
         Connect a WebSocket.
         
         Args:
             websocket: WebSocket connection
             user_id: User ID
+            subprotocol: Negotiated subprotocol (ws_frames.BINARY_SUBPROTOCOL or None)
+        
+        Returns:
+            Client connection
         """
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        self.user_connections[user_id] = websocket
+        await websocket.accept(subprotocol=subprotocol)
+        connection = ClientConnection(
+            websocket, user_id,
+            binary=subprotocol == ws_frames.BINARY_SUBPROTOCOL,
+            max_queue=self.max_queue,
+            evict_after_s=self.evict_after_s,
+            on_close=self.registry.remove
+        )
+        self.registry.add(connection)
+        connection.start()
+        return connection
     
     def disconnect(self, websocket: WebSocket, user_id: int):
         """
@@ -39,10 +141,64 @@ class ConnectionManager:
             websocket: WebSocket connection
             user_id: User ID
         """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if user_id in self.user_connections:
-            del self.user_connections[user_id]
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            connection.close()
+    
+    def authenticate(self, websocket: WebSocket, user_id: int, token: Optional[str] = None):
+        """
+        Mark a connection as belonging to an authenticated user.
+        
+        Args:
+            websocket: WebSocket connection
+            user_id: Authenticated user ID
+            token: Token the user authenticated with (re-checked before game commands)
+        """
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            self.registry.set_user(connection, user_id)
+            connection.authenticated = True
+            connection.token = token
+    
+    def deauthenticate(self, websocket: WebSocket):
+        """
+        Revoke a connection's authentication (it keeps receiving public topics).
+        
+        Args:
+            websocket: WebSocket connection
+        """
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            self.registry.clear_user(connection)
+            connection.authenticated = False
+            connection.token = None
+    
+    def subscribe(self, websocket: WebSocket, topic: str):
+        """
+        Subscribe a connection to a topic.
+        
+        Args:
+            websocket: WebSocket connection
+            topic: One of TOPICS
+        
+        Raises:
+            ValueError: If the topic is unknown
+        """
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            self.registry.subscribe(connection, topic)
+    
+    def unsubscribe(self, websocket: WebSocket, topic: str):
+        """
+        Unsubscribe a connection from a topic.
+        
+        Args:
+            websocket: WebSocket connection
+            topic: Topic name
+        """
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            self.registry.unsubscribe(connection, topic)
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """
@@ -52,66 +208,224 @@ class ConnectionManager:
             message: Message data
             websocket: WebSocket connection
         """
-        await websocket.send_json(message)
+        self.send_frame(websocket, encode_frame(message))
+    
+    def send_frame(self, websocket: WebSocket, frame: Union[str, bytes]):
+        """
+        Queue a pre-serialized frame for one connection (guaranteed delivery).
+        
+        Args:
+            websocket: WebSocket connection
+            frame: Text or binary frame
+        """
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            connection.send_event(frame)
     
-    async def broadcast(self, message: dict):
+    def send_to_user(self, user_id: int, message: dict) -> int:
         """
-        Broadcast message to all connections.
+        Send an event message to every JSON socket of a user on this worker
+        that authenticated as the user and subscribes to personal events.
         
         Args:
+            user_id: User ID
             message: Message data
+        
+        Returns:
+            Number of sockets the message was queued on
         """
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
+        frame = encode_frame(message)
+        sent = 0
+        for connection in tuple(self.registry.user(user_id)):
+            if not connection.binary and TOPIC_PERSONAL in connection.topics:
+                connection.send_event(frame)
+                sent += 1
+        return sent
+    
+    async def broadcast(self, message: dict, topic: str = TOPIC_ROUND):
+        """
+        Broadcast an event message to the JSON subscribers of a topic on
+        every worker (guaranteed delivery).
         
-        # Remove disconnected connections
-        for conn in disconnected:
-            if conn in self.active_connections:
-                self.active_connections.remove(conn)
+        Args:
+            message: Message data
+            topic: Topic name
+        """
+        await self.publish(encode_frame(message), guaranteed=True, topic=topic)
+    
+    async def publish(self, frame: Union[str, bytes], guaranteed: bool = False,
+                      topic: str = TOPIC_ROUND):
+        """
+        Publish a pre-serialized frame to the subscribers of every worker.
+        
+        Args:
+            frame: JSON text frame or binary frame
+            guaranteed: Whether the frame is an event that must not be dropped
+            topic: Topic name
+        """
+        await self.fanout.publish(frame, guaranteed, topic)
+    
+    def broadcast_frame(self, frame: Union[str, bytes], guaranteed: bool = False,
+                        topic: str = TOPIC_ROUND):
+        """
+        Queue a pre-serialized frame on the local subscribers of a topic.
+        
+        Only connections of the frame's protocol are visited. Never waits
+        on a client: tick frames replace undelivered older ticks,
+        guaranteed frames are queued in order.
+        
+        Args:
+            frame: JSON text frame (see encode_frame) for JSON connections,
+                or binary frame (see ws_frames) for binary connections
+            guaranteed: Whether the frame is an event that must not be dropped
+            topic: Topic name
+        """
+        binary = isinstance(frame, bytes)
+        if binary and guaranteed and topic == TOPIC_ROUND:
+            self.last_state_frame = frame
+        # Copy: an evicted connection unregisters itself while we iterate
+        for connection in tuple(self.registry.subscribers(topic, binary)):
+            if guaranteed:
+                connection.send_event(frame)
+            else:
+                connection.send_tick(frame)
+    
+    def record_queue_metrics(self):
+        """Publish queue depth gauges."""
+        depths = [connection.depth for connection in self.registry]
+        metrics = get_metrics()
+        metrics.set_gauge("ws_connections", len(depths))
+        metrics.set_gauge("ws_queue_depth_total", sum(depths))
+        metrics.set_gauge("ws_queue_depth_max", max(depths, default=0))
 
 
 manager = ConnectionManager()
 
 
+async def run_round_ticker(round_manager: "RoundManager", sync_interval_ms: int = 1000,
+                           publish: bool = True):
+    """
+    Broadcast the round to every connection once per tick.
+    
+    Each frame is built and serialized once per tick, however many
+    connections there are, published once through the fan-out backend
+    and queued without waiting on any client. JSON connections get the
+    full status every tick; binary connections get a guaranteed frame
+    when the round changes phase and a sync frame every sync_interval_ms
+    in between. Bets and cashouts since the last tick go out as one
+    live_bets and one top_bets delta.
+    
+    Args:
+        round_manager: Process-wide round manager
+        sync_interval_ms: Milliseconds between binary sync frames
+        publish: Whether this process publishes the round (False on relay-only
+            workers, which only record queue metrics)
+    """
+    metrics = get_metrics()
+    last_state = None
+    last_sync_ns = 0
+    while True:
+        # Other workers' connections are unknown, so a distributed publisher
+        # builds every frame
+        distributed = manager.fanout.distributed
+        if publish and (distributed or manager.active_connections):
+            with metrics.timer("ws_broadcast_ms"):
+                if distributed or manager.json_connection_count:
+                    await manager.publish(encode_frame({
+                        "type": "round_update",
+                        "data": round_manager.get_round_status()
+                    }))
+                
+                if distributed or manager.binary_connection_count:
+                    curve = round_manager.get_round_curve()
+                    state = (curve["round_id"], curve["status"]) if curve else None
+                    now_ns = time.monotonic_ns()
+                    
+                    if state != last_state:
+                        frame = ws_frames.encode_state(curve)
+                        if frame:
+                            await manager.publish(frame, guaranteed=True)
+                        last_state, last_sync_ns = state, now_ns
+                    elif (state and state[1] == "active"
+                          and now_ns - last_sync_ns >= sync_interval_ms * 1_000_000):
+                        await manager.publish(ws_frames.encode_sync(curve))
+                        last_sync_ns = now_ns
+        if publish:
+            await publish_live_bets(round_manager, distributed)
+        manager.record_queue_metrics()
+        await asyncio.sleep(round_manager.tick_interval_ms / 1000)
+
+
+async def publish_live_bets(round_manager: "RoundManager", distributed: bool):
+    """
+    Publish the bets and cashouts since the last tick as feed deltas.
+    
+    Args:
+        round_manager: Process-wide round manager
+        distributed: Whether subscribers may be on other workers
+    """
+    delta = round_manager.bet_manager.live_feed.drain()
+    if delta is None:
+        return
+    
+    for topic, data in zip((TOPIC_LIVE_BETS, TOPIC_TOP_BETS), delta):
+        if distributed or manager.registry.subscribers(topic, False):
+            await manager.publish(encode_frame({"type": topic, "data": data}),
+                                  guaranteed=True, topic=topic)
+
+
 @router.websocket("/ws/game")
-async def websocket_game(websocket: WebSocket, user_id: int):
+async def websocket_game(websocket: WebSocket, user_id: int, token: Optional[str] = None):
     """
-    WebSocket endpoint for game updates.
+    WebSocket endpoint for game updates and commands.
+    
+    Clients offering the ws_frames.BINARY_SUBPROTOCOL subprotocol get
+    compact binary frames after the JSON confirmation; everyone else
+    gets JSON round updates. Clients authenticated with a JWT (token
+    query parameter or an auth message) can place bets and cash out
+    over the socket (see handle_client_message).
     
     Args:
         websocket: WebSocket connection
         user_id: User ID
+        token: JWT access token (optional)
     """
-    await manager.connect(websocket, user_id)
+    subprotocol = None
+    if ws_frames.BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+        subprotocol = ws_frames.BINARY_SUBPROTOCOL
+    await manager.connect(websocket, user_id, subprotocol)
     
     try:
+        user = await authenticate_token(token) if token else None
+        if user:
+            user_id = user["id"]
+            manager.authenticate(websocket, user_id, token)
+        
         # Send initial connection confirmation
         await manager.send_personal_message({
             "type": "connected",
             "user_id": user_id,
+            "authenticated": user is not None,
             "timestamp": datetime.utcnow().isoformat()
         }, websocket)
         
-        # Start game update loop
-        db = next(get_db())
-        game_session = GameSession(db)
+        if subprotocol:
+            # Clients joining mid-round can extrapolate right away; relay-only
+            # workers have no round of their own and use the last relayed phase
+            frame = (ws_frames.encode_state(get_round_manager().get_round_curve())
+                     or manager.last_state_frame)
+            if frame:
+                manager.send_frame(websocket, frame)
         
+        # Round updates come from the broadcast ticker; the client sends
+        # commands
         while True:
-            # Get round status
-            status = game_session.get_round_status()
-            
-            # Send update
-            await manager.send_personal_message({
-                "type": "round_update",
-                "data": status
-            }, websocket)
-            
-            # Wait before next update
-            await asyncio.sleep(0.1)  # 10 updates per second
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            payload = message.get("text") or message.get("bytes")
+            if payload:
+                await handle_client_message(websocket, payload)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket, user_id)
@@ -120,6 +434,144 @@ async def websocket_game(websocket: WebSocket, user_id: int):
         print(f"WebSocket error: {e}")
 
 
+def server_time_ms() -> int:
+    """Current server time in Unix milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+async def _require_user(connection: ClientConnection) -> int:
+    """
+    Get the authenticated user of a connection, re-checking its token.
+    
+    On a cache hit this is a dict lookup. Bans and expiry evict the token
+    from the identity cache of every worker, so the miss resolves to None
+    and a banned user's open sockets lose access on their next command.
+    """
+    if connection.authenticated and connection.token is not None:
+        user = await authenticate_token(connection.token)
+        if not user or user["id"] != connection.user_id:
+            manager.deauthenticate(connection.websocket)
+    if not connection.authenticated:
+        raise ValueError("Not authenticated")
+    return connection.user_id
+
+
+async def _auth_command(connection: ClientConnection, message: dict) -> dict:
+    """Authenticate the connection with a JWT."""
+    token = message.get("token") or ""
+    user = await authenticate_token(token)
+    if not user:
+        raise ValueError("Invalid token")
+    manager.authenticate(connection.websocket, user["id"], token)
+    return {"user_id": user["id"]}
+
+
+async def _subscribe_command(connection: ClientConnection, message: dict) -> dict:
+    """Subscribe to a topic (live bet feeds answer with a snapshot to apply deltas to)."""
+    topic = message.get("topic")
+    manager.subscribe(connection.websocket, topic)
+    if topic in (TOPIC_LIVE_BETS, TOPIC_TOP_BETS):
+        return {"topic": topic,
+                "snapshot": await get_round_manager().get_live_bets_snapshot_async()}
+    return {"topic": topic}
+
+
+async def _unsubscribe_command(connection: ClientConnection, message: dict) -> dict:
+    """Unsubscribe from a topic."""
+    manager.unsubscribe(connection.websocket, message.get("topic"))
+    return {"topic": message.get("topic")}
+
+
+async def _place_bet_command(connection: ClientConnection, message: dict) -> dict:
+    """Place a bet in the current round (same validation as POST /game/bet)."""
+    user_id = await _require_user(connection)
+    bet_request = BetRequest(
+        amount=message.get("amount"),
+        currency=message.get("currency"),
+        auto_cashout=message.get("auto_cashout")
+    )
+    bet_data = await get_round_manager().place_bet_async(
+        user_id, bet_request.amount, bet_request.currency, bet_request.auto_cashout
+    )
+    return bet_response(bet_data).model_dump(mode="json")
+
+
+async def _cashout_command(connection: ClientConnection, message: dict) -> dict:
+    """Cash out the current bet (same as POST /game/cashout)."""
+    user_id = await _require_user(connection)
+    cashout_data = await get_round_manager().cashout_async(user_id)
+    if not cashout_data:
+        raise ValueError("No active bet to cash out")
+    return cashout_response(cashout_data).model_dump(mode="json")
+
+
+# Message type -> async handler(connection, message) returning the ack data
+CLIENT_COMMANDS: Dict[str, Callable[[ClientConnection, dict], Awaitable[dict]]] = {
+    "auth": _auth_command,
+    "subscribe": _subscribe_command,
+    "unsubscribe": _unsubscribe_command,
+    "place_bet": _place_bet_command,
+    "cashout": _cashout_command,
+}
+
+# Commands counted against the rate policy of their HTTP route (same buckets)
+RATE_LIMITED_COMMANDS = {
+    "place_bet": rate_limit.route_policy("POST", "/game/bet"),
+    "cashout": rate_limit.route_policy("POST", "/game/cashout"),
+}
+
+
+async def handle_client_message(websocket: WebSocket, text: Union[str, bytes]):
+    """
+    Handle a command from a client and push the ack on the same socket.
+    
+    Commands are JSON objects {"type": <command>, "request_id": <any>, ...}
+    (see CLIENT_COMMANDS). Every command is answered with
+    {"type": "<command>_ack", "request_id", "ok", "data" | "error",
+    "received_at", "sent_at"}, server times in Unix milliseconds. Bets
+    and cashouts share the rate limits of their HTTP routes; a limited
+    command is refused with "retry_after" seconds.
+    
+    Args:
+        websocket: WebSocket connection
+        text: Message text (JSON, in a text or binary frame)
+    """
+    received_at = server_time_ms()
+    connection = manager.registry.get(websocket)
+    if connection is None:
+        return
+    
+    try:
+        message = orjson.loads(text)
+        message_type = message.get("type")
+    except (orjson.JSONDecodeError, AttributeError) as e:
+        manager.send_frame(websocket, encode_frame({"type": "error", "message": str(e)}))
+        return
+    
+    command = CLIENT_COMMANDS.get(message_type)
+    ack = {"type": f"{message_type}_ack", "request_id": message.get("request_id")}
+    policy = RATE_LIMITED_COMMANDS.get(message_type)
+    wait_s = 0.0
+    if policy is not None and connection.authenticated:
+        wait_s = await rate_limit.rate_limiter.acquire(
+            f"{policy.name}:user_{connection.user_id}", policy
+        )
+    if command is None:
+        ack.update(type="error", ok=False, error=f"Unknown message type: {message_type}")
+    elif wait_s > 0:
+        get_metrics().increment("rate_limited_requests")
+        ack.update(ok=False, error="Rate limit exceeded", retry_after=math.ceil(wait_s))
+    else:
+        with get_metrics().timer(f"ws_command_{message_type}_ms"):
+            try:
+                ack.update(ok=True, data=await command(connection, message))
+            except (ValueError, TypeError, RoundLoopUnavailable) as e:
+                ack.update(ok=False, error=str(e))
+    
+    ack.update(received_at=received_at, sent_at=server_time_ms())
+    manager.send_frame(websocket, encode_frame(ack))
+
+
 async def broadcast_round_update(update_data: dict):
     """
     Broadcast round update to all connected clients.
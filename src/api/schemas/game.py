@@ -4,12 +4,16 @@ from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
 
+from src.game.engine.fixed_point import MAX_CRASH_HUNDREDTHS
+
 
 class BetRequest(BaseModel):
     """Bet request schema."""
     amount: Decimal = Field(..., gt=0, description="Bet amount")
     currency: str = Field(..., pattern="^(TON|STARS)$", description="Currency")
-    auto_cashout: Optional[Decimal] = Field(None, gt=1.0, description="Auto cashout multiplier")
+    auto_cashout: Optional[Decimal] = Field(
+        None, gt=1.0, le=MAX_CRASH_HUNDREDTHS // 100, description="Auto cashout multiplier"
+    )
 
 
 class BetResponse(BaseModel):
@@ -67,3 +71,24 @@ class ActiveBet(BaseModel):
     currency: str
     auto_cashout_multiplier: Optional[Decimal]
     placed_at: datetime
+
+
+class SeedChainInfo(BaseModel):
+    """Published seed chain schema."""
+    terminus: str  # Hash of the first seed played from the chain
+    length: int
+    rounds_played: int
+
+
+class VerifyRound(BaseModel):
+    """Round to verify."""
+    round_id: int
+    server_seed: str
+    client_seed: Optional[str] = None
+    crash_multiplier: Decimal
+    server_seed_hash: Optional[str] = None
+
+
+class VerifyRequest(BaseModel):
+    """Batch verification request schema."""
+    rounds: List[VerifyRound] = Field(..., max_length=100000)
@@ -54,3 +54,26 @@ class UserStatistics(BaseModel):
     biggest_win_stars: Decimal
     biggest_multiplier: Decimal
     win_rate: Decimal
+
+
+class BetHistory(BaseModel):
+    """Bet history schema."""
+    bet_id: int
+    round_id: int
+    amount: Decimal
+    currency: str
+    status: str
+    cashed_out_multiplier: Optional[Decimal] = None
+    payout: Optional[Decimal] = None
+    placed_at: datetime
+
+
+class TransactionHistory(BaseModel):
+    """Transaction history schema."""
+    transaction_id: int
+    transaction_type: str
+    amount: Decimal
+    currency: str
+    balance_after: Decimal
+    description: Optional[str] = None
+    created_at: datetime
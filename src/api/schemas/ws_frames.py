@@ -0,0 +1,101 @@
+"""Binary WebSocket frames for /ws/game.
+
+Clients that negotiate the BINARY_SUBPROTOCOL receive fixed-width
+little-endian frames instead of JSON round updates. The multiplier is
+deterministic, so a client extrapolates it locally from a round started
+frame:
+
+    multiplier = 1 + round(elapsed_ms / base_speed_ms) / 100
+
+with elapsed_ms measured against server_time_ms of the latest sync frame
+to cancel clock skew. Frame layouts (all integers, times in Unix ms):
+
+    COUNTDOWN  type:u8 round_id:i64 countdown_ends_at:i64            (17 bytes)
+    STARTED    type:u8 round_id:i64 started_at:i64 base_speed_ms:u16 (19 bytes)
+    SYNC       type:u8 round_id:i64 server_time:i64 multiplier:u32   (21 bytes)
+    CRASH      type:u8 round_id:i64 crashed_at:i64 crash_point:u32   (21 bytes)
+
+Multipliers are in hundredths (250 == 2.50x).
+"""
+import struct
+from typing import Dict, Optional
+
+BINARY_SUBPROTOCOL = "crash.v1.bin"
+
+COUNTDOWN = 1
+STARTED = 2
+SYNC = 3
+CRASH = 4
+
+_COUNTDOWN = struct.Struct("<Bqq")
+_STARTED = struct.Struct("<BqqH")
+_SYNC = struct.Struct("<BqqI")
+_CRASH = struct.Struct("<BqqI")
+
+
+def encode_sync(curve: Dict) -> bytes:
+    """
+    Encode a keepalive/sync frame.
+    
+    Args:
+        curve: Round curve (see RoundManager.get_round_curve)
+    
+    Returns:
+        Frame bytes
+    """
+    return _SYNC.pack(SYNC, curve["round_id"], curve["server_time_ms"],
+                      curve["multiplier_hundredths"])
+
+
+def encode_state(curve: Optional[Dict]) -> Optional[bytes]:
+    """
+    Encode the frame announcing the round's current phase.
+    
+    Args:
+        curve: Round curve (see RoundManager.get_round_curve)
+    
+    Returns:
+        Countdown, started or crash frame; None if there is no round
+    """
+    if curve is None:
+        return None
+    
+    status = curve["status"]
+    if status == "countdown":
+        return _COUNTDOWN.pack(COUNTDOWN, curve["round_id"], curve["countdown_ends_at_ms"])
+    if status == "active":
+        return _STARTED.pack(STARTED, curve["round_id"], curve["started_at_ms"],
+                             curve["base_speed_ms"])
+    if status == "crashed":
+        return _CRASH.pack(CRASH, curve["round_id"], curve["crashed_at_ms"],
+                           curve["crash_hundredths"])
+    return None
+
+
+def decode(frame: bytes) -> Dict:
+    """
+    Decode a binary frame (used by tests and load generators).
+    
+    Args:
+        frame: Frame bytes
+    
+    Returns:
+        Frame fields
+    """
+    frame_type = frame[0]
+    if frame_type == COUNTDOWN:
+        _, round_id, ends_at = _COUNTDOWN.unpack(frame)
+        return {"type": "countdown", "round_id": round_id, "countdown_ends_at_ms": ends_at}
+    if frame_type == STARTED:
+        _, round_id, started_at, base_speed_ms = _STARTED.unpack(frame)
+        return {"type": "started", "round_id": round_id, "started_at_ms": started_at,
+                "base_speed_ms": base_speed_ms}
+    if frame_type == SYNC:
+        _, round_id, server_time, multiplier = _SYNC.unpack(frame)
+        return {"type": "sync", "round_id": round_id, "server_time_ms": server_time,
+                "multiplier_hundredths": multiplier}
+    if frame_type == CRASH:
+        _, round_id, crashed_at, crash_point = _CRASH.unpack(frame)
+        return {"type": "crash", "round_id": round_id, "crashed_at_ms": crashed_at,
+                "crash_hundredths": crash_point}
+    raise ValueError(f"Unknown frame type: {frame_type}")
@@ -1,7 +1,6 @@
 """Load config from settings.yaml and .env."""
 from pathlib import Path
 import os
-import yaml
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,6 +15,8 @@ def load_settings():
     path = CONFIG_DIR / "settings.yaml"
     if not path.exists():
         return {}
+    import yaml
+    
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f) or {}
 
@@ -54,6 +55,21 @@ def get_redis_url() -> str:
     return os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 
+def get_ws_fanout_backend() -> str:
+    """WebSocket fan-out backend: "local" (one worker), "unix" (one host) or "redis"."""
+    return os.getenv("WS_FANOUT_BACKEND", "local").strip().lower()
+
+
+def get_db_init_on_startup() -> bool:
+    """Whether the API creates missing tables and indexes when it starts."""
+    return os.getenv("DB_INIT_ON_STARTUP", "true").strip().lower() == "true"
+
+
+def get_round_manager_enabled() -> bool:
+    """Whether this process runs the authoritative round loop."""
+    return os.getenv("ROUND_MANAGER_ENABLED", "true").strip().lower() == "true"
+
+
 def get_secret_key() -> str:
     """Get secret key for JWT and encryption."""
     key = os.getenv("SECRET_KEY", "")
@@ -70,3 +86,48 @@ def get_ton_api_key() -> str:
 def get_ton_wallet_mnemonic() -> str:
     """Get TON wallet mnemonic."""
     return os.getenv("TON_WALLET_MNEMONIC", "").strip()
+
+
+def get_seed_chain_path() -> Path:
+    """Path of the pre-generated server seed chain."""
+    return Path(os.getenv("SEED_CHAIN_PATH", str(DATA_DIR / "seed_chain.bin")))
+
+
+def get_seed_chain_length() -> int:
+    """Number of seeds generated when the seed chain is missing."""
+    return int(os.getenv("SEED_CHAIN_LENGTH", "10000000"))
+
+
+def get_round_journal_path() -> Path:
+    """Path of the round event journal."""
+    return Path(os.getenv("ROUND_JOURNAL_PATH", str(DATA_DIR / "round_journal.bin")))
+
+
+def get_round_history_size() -> int:
+    """Crashed rounds kept in memory for the round history endpoint."""
+    return int(os.getenv("ROUND_HISTORY_SIZE", "1000"))
+
+
+def get_auth_cache_ttl_seconds() -> float:
+    """Seconds a resolved access token is trusted without a database lookup."""
+    return float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+
+
+def get_auth_cache_max_entries() -> int:
+    """Access tokens kept in the identity cache (least recently used are evicted)."""
+    return int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "100000"))
+
+
+def get_telegram_init_data_max_age_seconds() -> int:
+    """Seconds after auth_date that Mini App init data is accepted."""
+    return int(os.getenv("TELEGRAM_INIT_DATA_MAX_AGE_SECONDS", "86400"))
+
+
+def get_rate_limit_backend() -> str:
+    """Rate limit backend: "local" (per worker) or "redis" (shared by all workers)."""
+    return os.getenv("RATE_LIMIT_BACKEND", "local").strip().lower()
+
+
+def get_rate_limit_max_keys() -> int:
+    """Rate limit buckets kept in memory by the local backend."""
+    return int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
@@ -0,0 +1,72 @@
+"""Async database engine and session management."""
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.connection import DATABASE_URL, engine
+
+# Async driver for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    Get the async driver URL of a database URL.
+    
+    Args:
+        url: Database URL (sqlite:// or postgresql://)
+    
+    Returns:
+        URL using aiosqlite or asyncpg
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine for DATABASE_URL.
+    
+    Created on first use, so only processes serving async routes load
+    the async driver. Both engines see the same data for a SQLite file or
+    Postgres; an in-memory SQLite database is private to each engine.
+    """
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        url = async_database_url(DATABASE_URL)
+        kwargs = {"echo": engine.echo}
+        if url.startswith("sqlite") and ":memory:" in url:
+            kwargs["poolclass"] = StaticPool
+        elif not url.startswith("sqlite"):
+            kwargs["pool_pre_ping"] = True
+        _async_engine = create_async_engine(url, **kwargs)
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Create an async session (the counterpart of SessionLocal)."""
+    get_async_engine()
+    return _async_sessionmaker()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for FastAPI to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Close the async engine's connections (on shutdown)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_sessionmaker = None
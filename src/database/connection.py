@@ -47,5 +47,9 @@ def get_db() -> Generator[Session, None, None]:
 
 
 def init_db():
-    """Initialize database - create all tables."""
+    """Initialize database - create all tables and any indexes added since."""
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, including their new indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -1,5 +1,5 @@
 """Game models for crash game."""
-from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -85,6 +85,10 @@ class GameRound(Base):
 class Bet(Base):
     """Bet model representing a user's bet in a game round."""
     __tablename__ = "bets"
+    __table_args__ = (
+        # Keyset pagination of a user's history (see database.pagination)
+        Index("ix_bets_user_placed_at_id", "user_id", "placed_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -110,7 +114,9 @@ class Bet(Base):
     status = Column(SQLEnum(BetStatus), default=BetStatus.PENDING, nullable=False, index=True)
     
     # Timestamps
-    placed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set client side so SQLite stores one text format (see database.pagination)
+    placed_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(),
+                       nullable=False)
     cashed_out_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
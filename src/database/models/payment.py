@@ -1,5 +1,5 @@
 """Payment models for deposits and withdrawals."""
-from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -33,6 +33,10 @@ class PaymentMethod(str, enum.Enum):
 class Payment(Base):
     """Payment model for deposits and withdrawals."""
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination of a user's history (see database.pagination)
+        Index("ix_payments_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -69,7 +73,9 @@ class Payment(Base):
     max_retries = Column(Integer, default=3, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set client side so SQLite stores one text format (see database.pagination)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(),
+                        nullable=False)
     processed_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     failed_at = Column(DateTime(timezone=True), nullable=True)
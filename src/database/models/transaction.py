@@ -1,5 +1,5 @@
 """Transaction model for tracking all balance changes."""
-from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, DateTime, Boolean, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -25,6 +25,10 @@ class TransactionType(str, enum.Enum):
 class Transaction(Base):
     """Transaction model for tracking all balance changes."""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Keyset pagination of a user's history (see database.pagination)
+        Index("ix_transactions_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -44,7 +48,9 @@ class Transaction(Base):
     metadata_json = Column(Text, nullable=True)  # JSON string with additional data
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Set client side so SQLite stores one text format (see database.pagination)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(),
+                        nullable=False, index=True)
     
     # Relationships
     user = relationship("User", back_populates="transactions")
@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination of per-user history queries.
+
+Pages are ordered by (timestamp, id) descending and a cursor holds the
+last row's pair. The timestamps are set client side: SQLite compares
+them as text, and its CURRENT_TIMESTAMP default ("YYYY-MM-DD HH:MM:SS")
+would not compare equal to the same instant bound by SQLAlchemy (which
+always writes six fraction digits).
+"""
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import desc, tuple_
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode the position after a row as an opaque cursor.
+    
+    Args:
+        timestamp: Row timestamp (the first sort key)
+        row_id: Row ID (the tie breaker)
+    
+    Returns:
+        URL-safe cursor
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor from encode_cursor.
+    
+    Args:
+        cursor: Cursor
+    
+    Returns:
+        (timestamp, row_id)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_page(query, timestamp_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Order a query newest first and start it after a cursor.
+    
+    Served by an index on (user_id, timestamp, id): every page is one
+    index range scan of limit rows, however deep it is.
+    
+    Args:
+        query: Select filtered to one user
+        timestamp_column: First sort key (created_at or placed_at)
+        id_column: Primary key (tie breaker)
+        cursor: Cursor of the previous page's last row (None for the first page)
+        limit: Maximum number of rows
+    
+    Returns:
+        Query
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(timestamp_column, id_column) < (timestamp, row_id))
+    return query.order_by(desc(timestamp_column), desc(id_column)).limit(limit)
+
+
+def split_page(rows: List[Any], limit: int, timestamp_attr: str) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split rows fetched with limit + 1 into a page and the next cursor.
+    
+    Args:
+        rows: Rows fetched with limit + 1 (the extra row shows there is a next page)
+        limit: Page size
+        timestamp_attr: Name of the timestamp attribute of the rows
+    
+    Returns:
+        (page rows, cursor of the next page or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(getattr(last, timestamp_attr), last.id)
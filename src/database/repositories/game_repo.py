@@ -1,11 +1,13 @@
 """Game repository for database operations."""
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import Optional, List
+from sqlalchemy import Row, and_, or_, desc, func, select, update, bindparam
+from typing import Optional, List, Dict
 from decimal import Decimal
 from datetime import datetime
 
 from src.database.models.game import GameRound, Bet, GameRoundStatus, BetStatus
+from src.database.pagination import keyset_page
 
 
 class GameRoundRepository:
@@ -79,6 +81,64 @@ class GameRoundRepository:
         self.db.refresh(round_obj)
         return round_obj
     
+    def settle_round(self, round_id: int, crash_multiplier: Decimal,
+                    server_seed: str, duration_ms: int) -> dict:
+        """
+        Crash a round and settle its bets in one transaction.
+        
+        Remaining active bets are marked crashed with a single UPDATE, the
+        round totals are aggregated in one pass over its bets, and the round
+        row is updated with the crash data and totals.
+        
+        Returns:
+            {"crashed_bets", "total_bets", "total_bet_amount_ton",
+             "total_bet_amount_stars", "total_payout_ton", "total_payout_stars",
+             "crashed_at"}
+        """
+        try:
+            crashed = self.db.execute(
+                update(Bet)
+                .where(and_(Bet.round_id == round_id, Bet.status == BetStatus.ACTIVE))
+                .values(status=BetStatus.CRASHED)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            
+            totals = self.db.execute(
+                select(
+                    func.count(Bet.id).label("total_bets"),
+                    func.coalesce(func.sum(Bet.amount_ton), 0).label("total_bet_amount_ton"),
+                    func.coalesce(func.sum(Bet.amount_stars), 0).label("total_bet_amount_stars"),
+                    func.coalesce(func.sum(Bet.payout_ton), 0).label("total_payout_ton"),
+                    func.coalesce(func.sum(Bet.payout_stars), 0).label("total_payout_stars"),
+                ).where(Bet.round_id == round_id)
+            ).one()._asdict()
+            
+            crashed_at = datetime.utcnow()
+            updated = self.db.execute(
+                update(GameRound)
+                .where(GameRound.id == round_id)
+                .values(
+                    status=GameRoundStatus.CRASHED,
+                    crash_multiplier=crash_multiplier,
+                    server_seed=server_seed,
+                    duration_ms=duration_ms,
+                    crashed_at=crashed_at,
+                    **totals,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not updated:
+                raise ValueError(f"Round {round_id} not found")
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        totals["crashed_bets"] = crashed
+        totals["crashed_at"] = crashed_at
+        return totals
+    
     def update_statistics(self, round_id: int, **kwargs) -> GameRound:
         """Update round statistics."""
         round_obj = self.get_by_id(round_id)
@@ -119,11 +179,19 @@ class BetRepository:
             )
         ).all()
     
-    def get_user_bets(self, user_id: int, limit: int = 100) -> List[Bet]:
-        """Get user's bets."""
-        return self.db.query(Bet).filter(
-            Bet.user_id == user_id
-        ).order_by(desc(Bet.placed_at)).limit(limit).all()
+    def get_user_bets(self, user_id: int, limit: int = 100,
+                      cursor: Optional[str] = None) -> List[Bet]:
+        """Get user's bets, newest first, after a pagination cursor."""
+        query = self.db.query(Bet).filter(Bet.user_id == user_id)
+        return keyset_page(query, Bet.placed_at, Bet.id, cursor, limit).all()
+    
+    def get_cashed_out_ids(self, bet_ids: List[int]) -> set:
+        """Get which of the given bets are already cashed out."""
+        if not bet_ids:
+            return set()
+        return set(self.db.scalars(
+            select(Bet.id).where(Bet.id.in_(bet_ids), Bet.status == BetStatus.CASHED_OUT)
+        ))
     
     def create(self, user_id: int, round_id: int, amount_ton: Optional[Decimal],
               amount_stars: Optional[Decimal], currency: str,
@@ -155,6 +223,17 @@ class BetRepository:
         self.db.refresh(bet)
         return bet
     
+    def activate_round_bets(self, round_id: int) -> int:
+        """Activate all pending bets of a round when it starts."""
+        count = self.db.query(Bet).filter(
+            and_(
+                Bet.round_id == round_id,
+                Bet.status == BetStatus.PENDING
+            )
+        ).update({Bet.status: BetStatus.ACTIVE}, synchronize_session=False)
+        self.db.commit()
+        return count
+    
     def cashout_bet(self, bet_id: int, multiplier: Decimal,
                    payout_ton: Optional[Decimal], payout_stars: Optional[Decimal]) -> Bet:
         """Cash out a bet."""
@@ -178,6 +257,24 @@ class BetRepository:
         self.db.refresh(bet)
         return bet
     
+    def cashout_bets(self, cashouts: List[Dict]):
+        """
+        Cash out many bets with one executemany UPDATE.
+        
+        Runs in the caller's transaction (no commit).
+        
+        Args:
+            cashouts: {"bet_id", "cashed_out_multiplier", "payout_ton",
+                "payout_stars", "profit_ton", "profit_stars", "cashed_out_at"} dicts
+        """
+        bets = Bet.__table__
+        self.db.execute(
+            update(bets)
+            .where(bets.c.id == bindparam("bet_id"))
+            .values(status=BetStatus.CASHED_OUT),
+            cashouts
+        )
+    
     def crash_bet(self, bet_id: int) -> Bet:
         """Mark bet as crashed."""
         bet = self.get_by_id(bet_id)
@@ -188,3 +285,78 @@ class BetRepository:
         self.db.commit()
         self.db.refresh(bet)
         return bet
+
+
+class AsyncGameRoundRepository:
+    """Repository for game round reads on an async session (API routes)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, round_id: int) -> Optional[GameRound]:
+        """Get round by ID."""
+        return await self.db.get(GameRound, round_id)
+    
+    async def get_active_round(self) -> Optional[GameRound]:
+        """Get currently active round."""
+        return await self.db.scalar(
+            select(GameRound).where(GameRound.status == GameRoundStatus.ACTIVE).limit(1)
+        )
+    
+    async def get_latest_rounds(self, limit: int = 100) -> List[GameRound]:
+        """Get latest completed rounds."""
+        result = await self.db.scalars(
+            select(GameRound)
+            .where(GameRound.status == GameRoundStatus.CRASHED)
+            .order_by(desc(GameRound.crashed_at))
+            .limit(limit)
+        )
+        return list(result)
+    
+    async def get_round_history(self, limit: int = 1000) -> List[Row]:
+        """
+        Get the history columns of the latest completed rounds in one query.
+        
+        Returns:
+            Rows of (id, crash_multiplier, started_at, crashed_at, created_at,
+            total_bets), newest first
+        """
+        result = await self.db.execute(
+            select(GameRound.id, GameRound.crash_multiplier, GameRound.started_at,
+                   GameRound.crashed_at, GameRound.created_at, GameRound.total_bets)
+            .where(GameRound.status == GameRoundStatus.CRASHED)
+            .order_by(desc(GameRound.crashed_at))
+            .limit(limit)
+        )
+        return list(result)
+
+
+class AsyncBetRepository:
+    """Repository for bet reads on an async session (API routes)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, bet_id: int) -> Optional[Bet]:
+        """Get bet by ID."""
+        return await self.db.get(Bet, bet_id)
+    
+    async def get_by_user_and_round(self, user_id: int, round_id: int) -> Optional[Bet]:
+        """Get bet by user and round."""
+        return await self.db.scalar(
+            select(Bet).where(Bet.user_id == user_id, Bet.round_id == round_id).limit(1)
+        )
+    
+    async def get_active_bets_by_round(self, round_id: int) -> List[Bet]:
+        """Get all active bets for a round."""
+        result = await self.db.scalars(
+            select(Bet).where(Bet.round_id == round_id, Bet.status == BetStatus.ACTIVE)
+        )
+        return list(result)
+    
+    async def get_user_bets(self, user_id: int, limit: int = 100,
+                            cursor: Optional[str] = None) -> List[Bet]:
+        """Get user's bets, newest first, after a pagination cursor."""
+        query = select(Bet).where(Bet.user_id == user_id)
+        result = await self.db.scalars(keyset_page(query, Bet.placed_at, Bet.id, cursor, limit))
+        return list(result)
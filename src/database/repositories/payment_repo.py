@@ -1,11 +1,13 @@
 """Payment repository for database operations."""
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
 
 from src.database.models.payment import Payment, PaymentType, PaymentStatus, PaymentMethod
+from src.database.pagination import keyset_page
 
 
 class PaymentRepository:
@@ -27,14 +29,14 @@ class PaymentRepository:
         return self.db.query(Payment).filter(Payment.stars_payment_id == payment_id).first()
     
     def get_user_payments(self, user_id: int, payment_type: Optional[PaymentType] = None,
-                         limit: int = 100) -> List[Payment]:
-        """Get user's payments."""
+                         limit: int = 100, cursor: Optional[str] = None) -> List[Payment]:
+        """Get user's payments, newest first, after a pagination cursor."""
         query = self.db.query(Payment).filter(Payment.user_id == user_id)
         
         if payment_type:
             query = query.filter(Payment.payment_type == payment_type)
         
-        return query.order_by(desc(Payment.created_at)).limit(limit).all()
+        return keyset_page(query, Payment.created_at, Payment.id, cursor, limit).all()
     
     def get_pending_payments(self, payment_method: Optional[PaymentMethod] = None) -> List[Payment]:
         """Get pending payments."""
@@ -115,3 +117,113 @@ class PaymentRepository:
         self.db.commit()
         self.db.refresh(payment)
         return payment
+
+
+class AsyncPaymentRepository:
+    """Repository for payment operations on an async session (API routes)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, payment_id: int) -> Optional[Payment]:
+        """Get payment by ID."""
+        return await self.db.get(Payment, payment_id)
+    
+    async def get_by_external_tx_hash(self, tx_hash: str) -> Optional[Payment]:
+        """Get payment by external transaction hash."""
+        return await self.db.scalar(select(Payment).where(Payment.external_tx_hash == tx_hash))
+    
+    async def get_user_payments(self, user_id: int, payment_type: Optional[PaymentType] = None,
+                                limit: int = 100, cursor: Optional[str] = None) -> List[Payment]:
+        """Get user's payments, newest first, after a pagination cursor."""
+        query = select(Payment).where(Payment.user_id == user_id)
+        
+        if payment_type:
+            query = query.where(Payment.payment_type == payment_type)
+        
+        result = await self.db.scalars(
+            keyset_page(query, Payment.created_at, Payment.id, cursor, limit)
+        )
+        return list(result)
+    
+    async def get_pending_payments(self, payment_method: Optional[PaymentMethod] = None
+                                   ) -> List[Payment]:
+        """Get pending payments."""
+        query = select(Payment).where(Payment.status == PaymentStatus.PENDING)
+        
+        if payment_method:
+            query = query.where(Payment.payment_method == payment_method)
+        
+        result = await self.db.scalars(query.order_by(Payment.created_at))
+        return list(result)
+    
+    async def create_deposit(self, user_id: int, amount: Decimal, currency: str,
+                             payment_method: PaymentMethod, ton_address: Optional[str] = None,
+                             stars_invoice_id: Optional[str] = None) -> Payment:
+        """Create a deposit payment."""
+        payment = Payment(
+            user_id=user_id,
+            payment_type=PaymentType.DEPOSIT,
+            payment_method=payment_method,
+            amount=amount,
+            currency=currency,
+            fee_amount=Decimal("0.0"),  # No fee for deposits
+            net_amount=amount,
+            status=PaymentStatus.PENDING,
+            ton_address=ton_address,
+            stars_invoice_id=stars_invoice_id,
+        )
+        self.db.add(payment)
+        await self.db.commit()
+        await self.db.refresh(payment)
+        return payment
+    
+    async def create_withdrawal(self, user_id: int, amount: Decimal, currency: str,
+                                payment_method: PaymentMethod, fee_amount: Decimal,
+                                ton_address: Optional[str] = None) -> Payment:
+        """Create a withdrawal payment."""
+        payment = Payment(
+            user_id=user_id,
+            payment_type=PaymentType.WITHDRAWAL,
+            payment_method=payment_method,
+            amount=amount,
+            currency=currency,
+            fee_amount=fee_amount,
+            net_amount=amount - fee_amount,
+            status=PaymentStatus.PENDING,
+            ton_address=ton_address,
+        )
+        self.db.add(payment)
+        await self.db.commit()
+        await self.db.refresh(payment)
+        return payment
+    
+    async def update_status(self, payment_id: int, status: PaymentStatus,
+                            external_tx_hash: Optional[str] = None,
+                            error_message: Optional[str] = None) -> Payment:
+        """Update payment status."""
+        payment = await self.get_by_id(payment_id)
+        if not payment:
+            raise ValueError(f"Payment {payment_id} not found")
+        
+        payment.status = status
+        
+        if external_tx_hash:
+            payment.external_tx_hash = external_tx_hash
+            if payment.payment_method == PaymentMethod.TON:
+                payment.ton_tx_hash = external_tx_hash
+        
+        if error_message:
+            payment.error_message = error_message
+            payment.retry_count += 1
+        
+        if status == PaymentStatus.PROCESSING:
+            payment.processed_at = datetime.utcnow()
+        elif status == PaymentStatus.COMPLETED:
+            payment.completed_at = datetime.utcnow()
+        elif status == PaymentStatus.FAILED:
+            payment.failed_at = datetime.utcnow()
+        
+        await self.db.commit()
+        await self.db.refresh(payment)
+        return payment
@@ -1,12 +1,14 @@
 """Transaction repository for database operations."""
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import Optional, List
+from sqlalchemy import and_, or_, desc, func, insert, select
+from typing import Optional, List, Dict
 from decimal import Decimal
 from datetime import datetime
 import json
 
 from src.database.models.transaction import Transaction, TransactionType
+from src.database.pagination import keyset_page
 
 
 class TransactionRepository:
@@ -20,8 +22,9 @@ class TransactionRepository:
         return self.db.query(Transaction).filter(Transaction.id == transaction_id).first()
     
     def get_user_transactions(self, user_id: int, transaction_type: Optional[TransactionType] = None,
-                            currency: Optional[str] = None, limit: int = 100) -> List[Transaction]:
-        """Get user's transactions."""
+                            currency: Optional[str] = None, limit: int = 100,
+                            cursor: Optional[str] = None) -> List[Transaction]:
+        """Get user's transactions, newest first, after a pagination cursor."""
         query = self.db.query(Transaction).filter(Transaction.user_id == user_id)
         
         if transaction_type:
@@ -30,7 +33,7 @@ class TransactionRepository:
         if currency:
             query = query.filter(Transaction.currency == currency)
         
-        return query.order_by(desc(Transaction.created_at)).limit(limit).all()
+        return keyset_page(query, Transaction.created_at, Transaction.id, cursor, limit).all()
     
     def create(self, user_id: int, transaction_type: TransactionType, currency: str,
               amount: Decimal, balance_before: Decimal, balance_after: Decimal,
@@ -56,6 +59,18 @@ class TransactionRepository:
         self.db.refresh(transaction)
         return transaction
     
+    def create_many(self, rows: List[Dict]):
+        """
+        Insert many transactions with one executemany INSERT.
+        
+        Runs in the caller's transaction (no commit).
+        
+        Args:
+            rows: Column dicts (user_id, transaction_type, currency, amount,
+                balance_before, balance_after, description, bet_id, round_id)
+        """
+        self.db.execute(insert(Transaction.__table__), rows)
+    
     def get_user_balance_history(self, user_id: int, currency: str,
                                 start_date: Optional[datetime] = None,
                                 end_date: Optional[datetime] = None) -> List[Transaction]:
@@ -73,3 +88,68 @@ class TransactionRepository:
             query = query.filter(Transaction.created_at <= end_date)
         
         return query.order_by(Transaction.created_at).all()
+
+
+class AsyncTransactionRepository:
+    """Repository for transaction operations on an async session (API routes)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, transaction_id: int) -> Optional[Transaction]:
+        """Get transaction by ID."""
+        return await self.db.get(Transaction, transaction_id)
+    
+    async def get_user_transactions(self, user_id: int,
+                                    transaction_type: Optional[TransactionType] = None,
+                                    currency: Optional[str] = None,
+                                    limit: int = 100,
+                                    cursor: Optional[str] = None) -> List[Transaction]:
+        """Get user's transactions, newest first, after a pagination cursor."""
+        query = select(Transaction).where(Transaction.user_id == user_id)
+        
+        if transaction_type:
+            query = query.where(Transaction.transaction_type == transaction_type)
+        
+        if currency:
+            query = query.where(Transaction.currency == currency)
+        
+        result = await self.db.scalars(
+            keyset_page(query, Transaction.created_at, Transaction.id, cursor, limit)
+        )
+        return list(result)
+    
+    async def create(self, user_id: int, transaction_type: TransactionType, currency: str,
+                     amount: Decimal, balance_before: Decimal, balance_after: Decimal,
+                     description: Optional[str] = None, payment_id: Optional[int] = None,
+                     bet_id: Optional[int] = None, round_id: Optional[int] = None,
+                     metadata: Optional[dict] = None) -> Transaction:
+        """Create a new transaction."""
+        transaction = Transaction(
+            user_id=user_id,
+            payment_id=payment_id,
+            bet_id=bet_id,
+            round_id=round_id,
+            transaction_type=transaction_type,
+            currency=currency,
+            amount=amount,
+            balance_before=balance_before,
+            balance_after=balance_after,
+            description=description,
+            metadata_json=json.dumps(metadata) if metadata else None,
+        )
+        self.db.add(transaction)
+        await self.db.commit()
+        await self.db.refresh(transaction)
+        return transaction
+    
+    async def create_many(self, rows: List[Dict]):
+        """
+        Insert many transactions with one executemany INSERT.
+        
+        Runs in the caller's transaction (no commit).
+        
+        Args:
+            rows: Column dicts (see TransactionRepository.create_many)
+        """
+        await self.db.execute(insert(Transaction.__table__), rows)
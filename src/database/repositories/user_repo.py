@@ -1,7 +1,8 @@
 """User repository for database operations."""
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import Optional, List
+from sqlalchemy import and_, or_, desc, func, select, update, bindparam
+from typing import Optional, List, Dict, Iterable, Tuple
 from decimal import Decimal
 
 from src.database.models.user import User
@@ -62,6 +63,33 @@ class UserRepository:
         self.db.refresh(user)
         return user
     
+    def get_balances(self, user_ids: Iterable[int]) -> Dict[int, Tuple[Decimal, Decimal]]:
+        """Get {user_id: (balance_ton, balance_stars)} for many users in one query."""
+        rows = self.db.query(User.id, User.balance_ton, User.balance_stars).filter(
+            User.id.in_(list(user_ids))
+        ).all()
+        return {row.id: (row.balance_ton, row.balance_stars) for row in rows}
+    
+    def increment_balances(self, increments: List[Dict]):
+        """
+        Add balance increments with one executemany UPDATE.
+        
+        Runs in the caller's transaction (no commit).
+        
+        Args:
+            increments: {"user_id", "amount_ton", "amount_stars"} dicts
+        """
+        users = User.__table__
+        self.db.execute(
+            update(users)
+            .where(users.c.id == bindparam("user_id"))
+            .values(
+                balance_ton=users.c.balance_ton + bindparam("amount_ton"),
+                balance_stars=users.c.balance_stars + bindparam("amount_stars"),
+            ),
+            increments
+        )
+    
     def update_statistics(self, user_id: int, **kwargs) -> User:
         """Update user statistics."""
         user = self.get_by_id(user_id)
@@ -76,20 +104,6 @@ class UserRepository:
         self.db.refresh(user)
         return user
     
-    def ban_user(self, user_id: int, reason: str) -> User:
-        """Ban a user."""
-        user = self.get_by_id(user_id)
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-        
-        user.is_banned = True
-        user.ban_reason = reason
-        user.is_active = False
-        
-        self.db.commit()
-        self.db.refresh(user)
-        return user
-    
     def unban_user(self, user_id: int) -> User:
         """Unban a user."""
         user = self.get_by_id(user_id)
@@ -127,3 +141,107 @@ class UserRepository:
         return self.db.query(User).filter(
             User.referred_by_id == referrer_id
         ).all()
+
+
+class AsyncUserRepository:
+    """Repository for user operations on an async session (API routes)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return await self.db.get(User, user_id)
+    
+    async def get_by_telegram_id(self, telegram_user_id: int) -> Optional[User]:
+        """Get user by Telegram ID."""
+        return await self.db.scalar(select(User).where(User.telegram_user_id == telegram_user_id))
+    
+    async def get_by_referral_code(self, referral_code: str) -> Optional[User]:
+        """Get user by referral code."""
+        return await self.db.scalar(select(User).where(User.referral_code == referral_code))
+    
+    async def create(self, telegram_user_id: int, username: Optional[str] = None,
+                     first_name: Optional[str] = None, last_name: Optional[str] = None,
+                     referral_code: Optional[str] = None) -> User:
+        """Create a new user."""
+        user = User(
+            telegram_user_id=telegram_user_id,
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            referral_code=referral_code,
+        )
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+    
+    async def get_balances(self, user_ids: Iterable[int]) -> Dict[int, Tuple[Decimal, Decimal]]:
+        """Get {user_id: (balance_ton, balance_stars)} for many users in one query."""
+        rows = await self.db.execute(
+            select(User.id, User.balance_ton, User.balance_stars).where(User.id.in_(list(user_ids)))
+        )
+        return {row.id: (row.balance_ton, row.balance_stars) for row in rows}
+    
+    async def update_balance(self, user_id: int, amount_ton: Decimal = Decimal("0"),
+                             amount_stars: Decimal = Decimal("0")) -> User:
+        """Update user balance atomically."""
+        user = await self.get_by_id(user_id)
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+        
+        # Use database-level update for atomicity
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                balance_ton=User.balance_ton + amount_ton,
+                balance_stars=User.balance_stars + amount_stars,
+            )
+        )
+        
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+    
+    async def update_statistics(self, user_id: int, **kwargs) -> User:
+        """Update user statistics."""
+        user = await self.get_by_id(user_id)
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+        
+        for key, value in kwargs.items():
+            if hasattr(user, key):
+                setattr(user, key, value)
+        
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+    
+    async def ban_user(self, user_id: int, reason: str) -> User:
+        """
+        Persist a ban.
+        
+        Ban through AsyncUserService.ban_user, which also drops the user's
+        cached credentials on every worker.
+        """
+        user = await self.get_by_id(user_id)
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+        
+        user.is_banned = True
+        user.ban_reason = reason
+        user.is_active = False
+        
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+    
+    async def get_top_earners(self, limit: int = 100, currency: str = "TON") -> List[User]:
+        """Get top earners by total won."""
+        column = User.total_won_ton if currency == "TON" else User.total_won_stars
+        result = await self.db.scalars(
+            select(User).where(User.is_banned == False).order_by(desc(column)).limit(limit)
+        )
+        return list(result)
@@ -1,56 +1,73 @@
-"""Economics module."""
-from src.economics.core import (
-    HouseEdgeCalculator,
-    CommissionCalculator,
-    BonusCalculator,
-    PayoutCalculator,
-    ProfitTracker,
-)
-from src.economics.bonuses import (
-    FirstDepositBonus,
-    DailyBonus,
-    ActivityBonus,
-    StreakBonus,
-    VIPBonus,
-    BonusManager,
-    BonusValidator,
-    BonusHistory,
-)
-from src.economics.referrals import (
-    ReferralManager,
-    ReferralCalculator,
-    ReferralTracker,
-    ReferralPayout,
-    ReferralStatistics,
-    ReferralValidator,
-)
-from src.economics.commissions import (
-    WithdrawalCommission,
-    DepositCommission,
-    CommissionCalculator,
-    CommissionTracker,
-)
-from src.economics.limits import (
-    BetLimits,
-    WithdrawalLimits,
-    DepositLimits,
-    LimitsValidator,
-    LimitsManager,
-)
-from src.economics.game import (
-    MultiplierDistribution,
-    CrashProbability,
-    RoundEconomics,
-    PayoutEconomics,
-    HouseProfit,
-)
-from src.economics.analytics import (
-    RevenueTracker,
-    ProfitAnalyzer,
-    UserLifetimeValue,
-    GameStatistics,
-    FinancialReports,
-)
+"""
+Economics module.
+
+The classes are imported from their subpackages on first access (PEP 562),
+so importing one subpackage does not load the others.
+"""
+import importlib
+
+# Public name -> subpackage defining it
+_EXPORTS = {
+    # Core
+    "HouseEdgeCalculator": "src.economics.core",
+    "BonusCalculator": "src.economics.core",
+    "PayoutCalculator": "src.economics.core",
+    "ProfitTracker": "src.economics.core",
+    # Bonuses
+    "FirstDepositBonus": "src.economics.bonuses",
+    "DailyBonus": "src.economics.bonuses",
+    "ActivityBonus": "src.economics.bonuses",
+    "StreakBonus": "src.economics.bonuses",
+    "VIPBonus": "src.economics.bonuses",
+    "BonusManager": "src.economics.bonuses",
+    "BonusValidator": "src.economics.bonuses",
+    "BonusHistory": "src.economics.bonuses",
+    # Referrals
+    "ReferralManager": "src.economics.referrals",
+    "ReferralCalculator": "src.economics.referrals",
+    "ReferralTracker": "src.economics.referrals",
+    "ReferralPayout": "src.economics.referrals",
+    "ReferralStatistics": "src.economics.referrals",
+    "ReferralValidator": "src.economics.referrals",
+    # Commissions (its CommissionCalculator shadows the core one)
+    "CommissionCalculator": "src.economics.commissions",
+    "WithdrawalCommission": "src.economics.commissions",
+    "DepositCommission": "src.economics.commissions",
+    "CommissionTracker": "src.economics.commissions",
+    # Limits
+    "BetLimits": "src.economics.limits",
+    "WithdrawalLimits": "src.economics.limits",
+    "DepositLimits": "src.economics.limits",
+    "LimitsValidator": "src.economics.limits",
+    "LimitsManager": "src.economics.limits",
+    # Game
+    "MultiplierDistribution": "src.economics.game",
+    "CrashProbability": "src.economics.game",
+    "RoundEconomics": "src.economics.game",
+    "PayoutEconomics": "src.economics.game",
+    "HouseProfit": "src.economics.game",
+    # Analytics
+    "RevenueTracker": "src.economics.analytics",
+    "ProfitAnalyzer": "src.economics.analytics",
+    "UserLifetimeValue": "src.economics.analytics",
+    "GameStatistics": "src.economics.analytics",
+    "FinancialReports": "src.economics.analytics",
+}
+
+
+def __getattr__(name: str):
+    """Import an exported class from its subpackage on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exported names alongside the module globals."""
+    return sorted(set(globals()) | set(_EXPORTS))
 
 __all__ = [
     # Core
@@ -1,14 +1,43 @@
-"""Game economics module."""
+"""
+Game economics module.
+
+CrashSimulator is imported on first access (PEP 562): it loads numpy,
+which the other game economics classes do not need.
+"""
+import importlib
+
 from src.economics.game.multiplier_distribution import MultiplierDistribution
 from src.economics.game.crash_probability import CrashProbability
 from src.economics.game.round_economics import RoundEconomics
 from src.economics.game.payout_economics import PayoutEconomics
 from src.economics.game.house_profit import HouseProfit
 
+# Public name -> module defining it, imported on first access
+_LAZY_EXPORTS = {
+    "CrashSimulator": "src.economics.game.crash_simulator",
+}
+
+
+def __getattr__(name: str):
+    """Import a lazily exported class from its module on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the lazily exported names alongside the module globals."""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 __all__ = [
     "MultiplierDistribution",
     "CrashProbability",
     "RoundEconomics",
     "PayoutEconomics",
     "HouseProfit",
+    "CrashSimulator",
 ]
@@ -0,0 +1,270 @@
+"""Monte Carlo simulation of the crash point distribution."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.game.engine.batch_verifier import crash_points_hundredths
+from src.game.engine.fixed_point import MAX_CRASH_HUNDREDTHS, from_hundredths
+
+# Multipliers (in hundredths) shown in the compact report
+REPORT_CHECKPOINTS = (101, 150, 200, 201, 250, 300, 500, 1000, 2000, 5000, 10000, 50000, 99999)
+
+
+def _simulate_task(args) -> np.ndarray:
+    """
+    Simulate one task's rounds (process pool entry point).
+    
+    Args:
+        args: (seed_sequence, rounds, chunk_size, house_edge)
+    
+    Returns:
+        Crash point counts indexed by hundredths
+    """
+    seed_sequence, rounds, chunk_size, house_edge = args
+    rng = np.random.default_rng(seed_sequence)
+    counts = np.zeros(MAX_CRASH_HUNDREDTHS + 1, dtype=np.int64)
+    
+    while rounds > 0:
+        size = min(chunk_size, rounds)
+        # The formula only reads the first 64 bits of a SHA-256 digest,
+        # which are uniform, so uniform integers stand in for seed hashes
+        seed_ints = rng.integers(0, 2 ** 64, size=size, dtype=np.uint64)
+        counts += np.bincount(
+            crash_points_hundredths(seed_ints, house_edge), minlength=MAX_CRASH_HUNDREDTHS + 1
+        )
+        rounds -= size
+    
+    return counts
+
+
+class CrashSimulator:
+    """
+    Simulate crash points with the production formula.
+    
+    Crash points are drawn in NumPy chunks across a process pool and kept
+    as a histogram over the 0.01x grid, from which the empirical CDF,
+    the realised house edge of every cash-out target and the tail at the
+    1000x cap are derived.
+    """
+    
+    def __init__(self, house_edge: Decimal = Decimal("0.01"), workers: Optional[int] = None,
+                 chunk_size: int = 1_000_000, task_size: int = 25_000_000):
+        """
+        Initialize crash simulator.
+        
+        Args:
+            house_edge: House edge passed to the crash formula
+            workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+            chunk_size: Rounds generated per NumPy call
+            task_size: Rounds per pool task
+        """
+        self.house_edge = house_edge
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.task_size = task_size
+        self.counts = np.zeros(MAX_CRASH_HUNDREDTHS + 1, dtype=np.int64)
+    
+    @property
+    def rounds(self) -> int:
+        """Number of simulated rounds."""
+        return int(self.counts.sum())
+    
+    def simulate(self, rounds: int, seed: Optional[int] = None) -> "CrashSimulator":
+        """
+        Simulate rounds and add them to the histogram.
+        
+        Args:
+            rounds: Number of rounds
+            seed: Random seed (random if omitted)
+        
+        Returns:
+            The simulator
+        """
+        task_count = max(-(-rounds // self.task_size), self.workers)
+        sizes = [rounds // task_count + (i < rounds % task_count) for i in range(task_count)]
+        tasks = [
+            (seed_sequence, size, self.chunk_size, self.house_edge)
+            for seed_sequence, size in zip(np.random.SeedSequence(seed).spawn(task_count), sizes)
+            if size
+        ]
+        
+        if self.workers == 1:
+            for counts in map(_simulate_task, tasks):
+                self.counts += counts
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for counts in executor.map(_simulate_task, tasks):
+                    self.counts += counts
+        
+        return self
+    
+    def cdf(self) -> np.ndarray:
+        """Empirical P(crash <= m), indexed by multiplier hundredths."""
+        return np.cumsum(self.counts) / self.rounds
+    
+    def survival(self) -> np.ndarray:
+        """
+        Empirical P(crash > m), indexed by multiplier hundredths.
+        
+        A cash-out target m pays out only if the round crashes above it.
+        """
+        return 1.0 - self.cdf()
+    
+    def realised_house_edge(self) -> np.ndarray:
+        """Realised house edge of a cash-out at m, indexed by multiplier hundredths."""
+        multipliers = np.arange(MAX_CRASH_HUNDREDTHS + 1) / 100
+        return 1.0 - multipliers * self.survival()
+    
+    def tail_exposure(self) -> Dict:
+        """
+        Get the tail at the 1000x cap.
+        
+        Returns:
+            Rounds ending at the cap and the return of the highest target
+        """
+        cap_rounds = int(self.counts[MAX_CRASH_HUNDREDTHS])
+        top_target = MAX_CRASH_HUNDREDTHS - 1
+        return {
+            "cap": str(from_hundredths(MAX_CRASH_HUNDREDTHS)),
+            "cap_rounds": cap_rounds,
+            "cap_probability": cap_rounds / self.rounds,
+            "top_target": str(from_hundredths(top_target)),
+            "top_target_return": top_target / 100 * float(self.survival()[top_target]),
+        }
+    
+    def claims(self) -> Dict:
+        """
+        Compare hard-coded distributions with the simulated one.
+        
+        Returns:
+            {source: {bucket: {"claimed", "simulated"}}}
+        """
+        from src.economics.game.crash_probability import CrashProbability
+        from src.economics.game.multiplier_distribution import MultiplierDistribution
+        from src.game.engine.provably_fair import ProvablyFair
+        
+        cdf = self.cdf()
+        
+        def between(low: int, high: Optional[int]) -> float:
+            upper = cdf[high - 1] if high else 1.0
+            return float(upper - cdf[low - 1])
+        
+        buckets = {
+            "1.00x - 2.00x": (100, 200),
+            "2.00x - 5.00x": (200, 500),
+            "5.00x - 10.00x": (500, 1000),
+            "10.00x+": (1000, None),
+        }
+        provably_fair = {
+            name: {"claimed": claimed, "simulated": between(*buckets[name])}
+            for name, claimed in ProvablyFair.get_crash_probability_distribution().items()
+        }
+        
+        distribution_buckets = {"before_2x": (100, 200), "2x_to_5x": (200, 500), "above_5x": (500, None)}
+        multiplier_distribution = {
+            name: {"claimed": float(claimed), "simulated": between(*distribution_buckets[name])}
+            for name, claimed in MultiplierDistribution().get_distribution_weights().items()
+        }
+        
+        crash_probability = CrashProbability(self.house_edge)
+        crash_probability_claims = {
+            str(from_hundredths(point)): {
+                "claimed": float(crash_probability.calculate_crash_probability(from_hundredths(point))),
+                "simulated": float(cdf[point]),
+            }
+            for point in REPORT_CHECKPOINTS
+        }
+        
+        return {
+            "ProvablyFair.get_crash_probability_distribution": provably_fair,
+            "MultiplierDistribution": multiplier_distribution,
+            "CrashProbability.calculate_crash_probability": crash_probability_claims,
+        }
+    
+    def report(self) -> Dict:
+        """
+        Get a compact report of the simulation.
+        
+        Returns:
+            Report dictionary (JSON serializable)
+        """
+        hundredths = np.flatnonzero(self.counts)
+        cdf = self.cdf()
+        edge = self.realised_house_edge()
+        targets = np.arange(101, MAX_CRASH_HUNDREDTHS)
+        negative = targets[edge[targets] < 0]
+        
+        def quantile(q: float) -> str:
+            return str(from_hundredths(int(np.searchsorted(cdf, q))))
+        
+        return {
+            "rounds": self.rounds,
+            "house_edge": str(self.house_edge),
+            "min_crash_point": str(from_hundredths(int(hundredths[0]))),
+            "max_crash_point": str(from_hundredths(int(hundredths[-1]))),
+            "mean_crash_point": float(np.dot(np.arange(len(self.counts)), self.counts) / self.rounds / 100),
+            "quantiles": {name: quantile(q) for name, q in
+                          (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999))},
+            "cdf": {str(from_hundredths(point)): float(cdf[point]) for point in REPORT_CHECKPOINTS},
+            "realised_house_edge": {
+                str(from_hundredths(point)): float(edge[point]) for point in REPORT_CHECKPOINTS
+            },
+            "negative_edge_targets": {
+                "count": len(negative),
+                "from": str(from_hundredths(int(negative[0]))) if len(negative) else None,
+                "to": str(from_hundredths(int(negative[-1]))) if len(negative) else None,
+            },
+            "tail": self.tail_exposure(),
+            "claims": self.claims(),
+        }
+    
+    def write_arrow(self, path: Path):
+        """
+        Write the per-multiplier table as an Arrow IPC file.
+        
+        Columns: multiplier_hundredths, count, cdf, survival, house_edge.
+        
+        Args:
+            path: Output file path
+        """
+        import pyarrow as pa
+        
+        multipliers = np.arange(100, MAX_CRASH_HUNDREDTHS + 1)
+        table = pa.table(
+            {
+                "multiplier_hundredths": multipliers.astype(np.int32),
+                "count": self.counts[multipliers],
+                "cdf": self.cdf()[multipliers],
+                "survival": self.survival()[multipliers],
+                "house_edge": self.realised_house_edge()[multipliers],
+            },
+            metadata={"rounds": str(self.rounds), "house_edge": str(self.house_edge)},
+        )
+        
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    
+    @classmethod
+    def compare(cls, house_edges: List[Decimal], rounds: int, seed: Optional[int] = None,
+                **kwargs) -> Dict[str, Dict]:
+        """
+        Simulate several house edges (on the same random stream when seeded).
+        
+        Args:
+            house_edges: House edges to try
+            rounds: Rounds per house edge
+            seed: Random seed
+            **kwargs: CrashSimulator arguments
+        
+        Returns:
+            {house_edge: report}
+        """
+        return {
+            str(house_edge): cls(house_edge, **kwargs).simulate(rounds, seed).report()
+            for house_edge in house_edges
+        }
@@ -1,10 +1,38 @@
-"""Game engine package."""
-from src.game.engine.crash_engine import CrashEngine, RoundState
-from src.game.engine.provably_fair import ProvablyFair
-from src.game.engine.multiplier_calculator import MultiplierCalculator
-from src.game.engine.bet_manager import BetManager
-from src.game.engine.balance_manager import BalanceManager
-from src.game.engine.game_session import GameSession
+"""
+Game engine package.
+
+The classes are imported from their modules on first access (PEP 562):
+the bet manager loads numpy, which routes importing a light module such as
+fixed_point or round_history should not pay for.
+"""
+import importlib
+
+# Public name -> module defining it
+_EXPORTS = {
+    "CrashEngine": "src.game.engine.crash_engine",
+    "RoundState": "src.game.engine.crash_engine",
+    "ProvablyFair": "src.game.engine.provably_fair",
+    "MultiplierCalculator": "src.game.engine.multiplier_calculator",
+    "BetManager": "src.game.engine.bet_manager",
+    "BalanceManager": "src.game.engine.balance_manager",
+    "GameSession": "src.game.engine.game_session",
+}
+
+
+def __getattr__(name: str):
+    """Import an exported class from its module on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exported names alongside the module globals."""
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     "CrashEngine",
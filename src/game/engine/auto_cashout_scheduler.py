@@ -0,0 +1,185 @@
+"""Auto cashout scheduler for crash game."""
+import heapq
+import math
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.game.engine.multiplier_calculator import MultiplierCalculator
+
+
+class AutoCashoutScheduler:
+    """
+    Min-heap of auto cashout targets for the running round.
+    
+    Entries are keyed by target multiplier in hundredths, so each tick only
+    pops the bets whose target was crossed. Because the multiplier curve is
+    deterministic, every entry also carries the elapsed millisecond at which
+    its target is first shown, which lets the round loop fire exactly on it.
+    
+    Cancelled entries are skipped lazily when they reach the top of the heap.
+    """
+    
+    def __init__(self, multiplier_calculator: Optional[MultiplierCalculator] = None):
+        """
+        Initialize auto cashout scheduler.
+        
+        Args:
+            multiplier_calculator: Calculator used for trigger times
+        """
+        self.multiplier_calculator = multiplier_calculator or MultiplierCalculator()
+        
+        # Heap entries: (target_hundredths, trigger_ms, user_id)
+        self._heap: List[Tuple[int, int, int]] = []
+        # Scheduled target per user, used to skip stale heap entries
+        self._targets: dict = {}
+    
+    @staticmethod
+    def to_hundredths(target: Decimal) -> int:
+        """
+        Convert a target multiplier to hundredths.
+        
+        Multipliers move on a 0.01x grid, so a target between two grid
+        points is first reached at the next one.
+        
+        Args:
+            target: Target multiplier
+        
+        Returns:
+            Target in hundredths (250 == 2.50x)
+        """
+        return math.ceil(target * 100)
+    
+    def __len__(self) -> int:
+        """Number of scheduled auto cashouts."""
+        return len(self._targets)
+    
+    def schedule(self, user_id: int, target: Decimal):
+        """
+        Schedule an auto cashout.
+        
+        Args:
+            user_id: User ID
+            target: Auto cashout multiplier
+        """
+        target_hundredths = self.to_hundredths(target)
+        trigger_ms = self.multiplier_calculator.get_trigger_ms(target_hundredths)
+        self._targets[user_id] = target_hundredths
+        heapq.heappush(self._heap, (target_hundredths, trigger_ms, user_id))
+    
+    def schedule_many(self, entries: List[Tuple[int, Decimal]]):
+        """
+        Schedule many auto cashouts at once.
+        
+        Args:
+            entries: (user_id, target) pairs
+        """
+        for user_id, target in entries:
+            target_hundredths = self.to_hundredths(target)
+            self._targets[user_id] = target_hundredths
+            self._heap.append((
+                target_hundredths,
+                self.multiplier_calculator.get_trigger_ms(target_hundredths),
+                user_id,
+            ))
+        heapq.heapify(self._heap)
+    
+    def schedule_array(self, user_ids: np.ndarray, target_hundredths: np.ndarray):
+        """
+        Schedule many auto cashouts given as arrays (vectorized trigger times).
+        
+        Args:
+            user_ids: User IDs
+            target_hundredths: Targets in hundredths
+        """
+        steps = target_hundredths.astype(np.int64) - 100
+        numerator = (2 * steps - 1) * self.multiplier_calculator.base_speed_ms
+        trigger_ms = (numerator + 1) // 2 + ((numerator % 2 == 0) & (steps % 2 == 1))
+        trigger_ms[steps <= 0] = 0
+        
+        targets = target_hundredths.tolist()
+        users = user_ids.tolist()
+        self._targets.update(zip(users, targets))
+        self._heap.extend(zip(targets, trigger_ms.tolist(), users))
+        heapq.heapify(self._heap)
+    
+    def cancel(self, user_id: int):
+        """
+        Cancel a user's auto cashout (e.g. after a manual cashout).
+        
+        Args:
+            user_id: User ID
+        """
+        self._targets.pop(user_id, None)
+    
+    def clear(self):
+        """Drop all scheduled auto cashouts."""
+        self._heap.clear()
+        self._targets.clear()
+    
+    def _prune(self):
+        """Drop cancelled entries from the top of the heap."""
+        heap = self._heap
+        while heap and self._targets.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+    
+    def peek_trigger_ms(self) -> Optional[int]:
+        """
+        Get the trigger time of the next auto cashout.
+        
+        Returns:
+            Elapsed milliseconds of the next trigger or None
+        """
+        self._prune()
+        return self._heap[0][1] if self._heap else None
+    
+    def pop_due(self, current_multiplier: Decimal) -> List[Tuple[int, int]]:
+        """
+        Pop auto cashouts whose target was crossed.
+        
+        Args:
+            current_multiplier: Current multiplier
+        
+        Returns:
+            (user_id, target_hundredths) pairs in target order
+        """
+        current_hundredths = int(current_multiplier * 100)
+        due = []
+        heap = self._heap
+        
+        self._prune()
+        while heap and heap[0][0] <= current_hundredths:
+            target_hundredths, _, user_id = heapq.heappop(heap)
+            del self._targets[user_id]
+            due.append((user_id, target_hundredths))
+            self._prune()
+        
+        return due
+    
+    def pop_due_at(self, elapsed_ms: int,
+                   crash_point: Optional[Decimal] = None) -> List[Tuple[int, int]]:
+        """
+        Pop auto cashouts whose trigger time has passed.
+        
+        Args:
+            elapsed_ms: Milliseconds since round start
+            crash_point: Crash multiplier; targets at or above it never fire
+        
+        Returns:
+            (user_id, target_hundredths) pairs in target order
+        """
+        crash_hundredths = int(crash_point * 100) if crash_point is not None else None
+        due = []
+        heap = self._heap
+        
+        self._prune()
+        while heap and heap[0][1] <= elapsed_ms:
+            if crash_hundredths is not None and heap[0][0] >= crash_hundredths:
+                break
+            target_hundredths, _, user_id = heapq.heappop(heap)
+            del self._targets[user_id]
+            due.append((user_id, target_hundredths))
+            self._prune()
+        
+        return due
@@ -1,12 +1,15 @@
 """Balance manager for crash game."""
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from src.database.models.user import User
 from src.database.models.transaction import Transaction, TransactionType
+from src.database.repositories.game_repo import BetRepository
 from src.database.repositories.user_repo import UserRepository
 from src.database.repositories.transaction_repo import TransactionRepository
+from src.services.metrics import get_metrics
 
 
 class BalanceManager:
@@ -22,6 +25,7 @@ class BalanceManager:
         self.db = db
         self.user_repo = UserRepository(db)
         self.transaction_repo = TransactionRepository(db)
+        self.bet_repo = BetRepository(db)
     
     def get_balance(self, user_id: int, currency: str) -> Decimal:
         """
@@ -149,6 +153,95 @@ class BalanceManager:
         
         return balance_after
     
+    def settle_cashouts(self, cashouts: List[Dict], label: str = "Cashout") -> Dict[int, Decimal]:
+        """
+        Credit a batch of cashouts in one transaction.
+        
+        Balances are read with one query, then balance increments, WIN
+        ledger rows and bet updates are each written with one executemany
+        statement and committed together.
+        
+        Args:
+            cashouts: Cashed out bet dicts from the bet manager
+            label: Transaction description prefix
+        
+        Returns:
+            {user_id: new balance in the cashout currency}
+        """
+        if not cashouts:
+            return {}
+        
+        with get_metrics().timer("cashout_settlement_ms"):
+            balances = {
+                user_id: {"TON": ton, "STARS": stars}
+                for user_id, (ton, stars) in self.user_repo.get_balances(
+                    {bet["user_id"] for bet in cashouts}
+                ).items()
+            }
+            
+            increments = []
+            ledger = []
+            bet_updates = []
+            new_balances = {}
+            now = datetime.utcnow()
+            
+            for bet in cashouts:
+                user_id = bet["user_id"]
+                payout = bet["payout"]
+                currency = bet["currency"]
+                multiplier = bet["cashed_out_multiplier"]
+                
+                if user_id not in balances:
+                    raise ValueError(f"User {user_id} not found")
+                if currency not in ("TON", "STARS"):
+                    raise ValueError(f"Invalid currency: {currency}")
+                
+                balance_before = balances[user_id][currency]
+                balance_after = balance_before + payout
+                balances[user_id][currency] = balance_after
+                new_balances[user_id] = balance_after
+                
+                increments.append({
+                    "user_id": user_id,
+                    "amount_ton": payout if currency == "TON" else Decimal("0"),
+                    "amount_stars": payout if currency == "STARS" else Decimal("0"),
+                })
+                ledger.append({
+                    "user_id": user_id,
+                    "transaction_type": TransactionType.WIN,
+                    "currency": currency,
+                    "amount": payout,
+                    "balance_before": balance_before,
+                    "balance_after": balance_after,
+                    "description": f"{label}: {payout} {currency} at {multiplier}x",
+                    "bet_id": bet.get("bet_id"),
+                    "round_id": bet.get("round_id"),
+                })
+                if bet.get("bet_id"):
+                    profit = payout - bet["amount"]
+                    bet_updates.append({
+                        "bet_id": bet["bet_id"],
+                        "cashed_out_multiplier": multiplier,
+                        "payout_ton": payout if currency == "TON" else None,
+                        "payout_stars": payout if currency == "STARS" else None,
+                        "profit_ton": profit if currency == "TON" else None,
+                        "profit_stars": profit if currency == "STARS" else None,
+                        "cashed_out_at": bet.get("cashed_out_at") or now,
+                    })
+            
+            try:
+                self.user_repo.increment_balances(increments)
+                self.transaction_repo.create_many(ledger)
+                if bet_updates:
+                    self.bet_repo.cashout_bets(bet_updates)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        
+        get_metrics().observe("cashout_batch_size", len(cashouts))
+        return new_balances
+    
     def has_sufficient_balance(self, user_id: int, amount: Decimal, currency: str) -> bool:
         """
         Check if user has sufficient balance.
@@ -0,0 +1,186 @@
+"""Batch provably fair round verifier."""
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.game.engine import fixed_point
+
+# (server_seeds, client_seeds, round_ids, crash_multipliers, server_seed_hashes)
+RoundBatch = Tuple[Sequence[str], Sequence[Optional[str]], Sequence[int],
+                   Sequence, Optional[Sequence[Optional[str]]]]
+
+# Vectorized float results closer than this to a .5 tie (in hundredths) are
+# recomputed with the exact integer formula
+_TIE_GUARD = 1e-6
+
+
+def crash_points_hundredths(seed_ints: np.ndarray,
+                            house_edge: Decimal = Decimal("0.01")) -> np.ndarray:
+    """
+    Calculate crash points for many seeds at once.
+    
+    Evaluates the crash formula in float64 over the whole array and falls
+    back to fixed_point.crash_point_hundredths for the rare values next to
+    a rounding tie, so results equal the scalar formula.
+    
+    Args:
+        seed_ints: First 64 bits of each combined seed (uint64)
+        house_edge: House edge
+    
+    Returns:
+        Crash points in hundredths (int64)
+    """
+    normalized = seed_ints.astype(np.float64) / 2.0 ** 64
+    edge_factor = 1.0 / (1.0 - float(house_edge))
+    exact = 100.0 + 100.0 * edge_factor / (1.0 - normalized + 1e-7)
+    
+    near_tie = np.abs(exact - np.floor(exact) - 0.5) < _TIE_GUARD
+    hundredths = np.minimum(np.floor(exact + 0.5), fixed_point.MAX_CRASH_HUNDREDTHS).astype(np.int64)
+    
+    for index in np.flatnonzero(near_tie):
+        hundredths[index] = fixed_point.crash_point_hundredths(
+            f"{int(seed_ints[index]):016x}", house_edge
+        )
+    
+    return hundredths
+
+
+def _hash_batch(server_seeds: Sequence[str], client_seeds: Sequence[Optional[str]],
+                round_ids: Sequence[int],
+                server_seed_hashes: Optional[Sequence[Optional[str]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash a batch of rounds.
+    
+    Returns:
+        (seed_ints, hash_ok) arrays
+    """
+    sha256 = hashlib.sha256
+    seed_ints = np.empty(len(server_seeds), dtype=np.uint64)
+    hash_ok = np.ones(len(server_seeds), dtype=bool)
+    
+    for i, (server_seed, client_seed, round_id) in enumerate(zip(server_seeds, client_seeds, round_ids)):
+        combined = sha256(f"{server_seed}{client_seed or ''}{round_id}".encode()).digest()
+        seed_ints[i] = int.from_bytes(combined[:8], "big")
+        if server_seed_hashes is not None and server_seed_hashes[i] is not None:
+            hash_ok[i] = sha256(server_seed.encode()).hexdigest() == server_seed_hashes[i]
+    
+    return seed_ints, hash_ok
+
+
+def verify_batch(server_seeds: Sequence[str], client_seeds: Sequence[Optional[str]],
+                 round_ids: Sequence[int], crash_multipliers: Sequence,
+                 server_seed_hashes: Optional[Sequence[Optional[str]]] = None,
+                 house_edge: Decimal = Decimal("0.01")) -> List[Dict]:
+    """
+    Verify one batch of rounds in the current process.
+    
+    Args:
+        server_seeds: Revealed server seeds
+        client_seeds: Client seeds (None if unused)
+        round_ids: Round IDs
+        crash_multipliers: Recorded crash multipliers
+        server_seed_hashes: Published seed hashes (optional, checked when given)
+        house_edge: House edge
+    
+    Returns:
+        Mismatches as {"round_id", "reason", "computed_crash_point", "recorded_crash_point"}
+    """
+    if not len(server_seeds):
+        return []
+    
+    seed_ints, hash_ok = _hash_batch(server_seeds, client_seeds, round_ids, server_seed_hashes)
+    computed = crash_points_hundredths(seed_ints, house_edge)
+    recorded = np.rint(np.asarray(crash_multipliers, dtype=np.float64) * 100).astype(np.int64)
+    
+    mismatches = []
+    for index in np.flatnonzero(~hash_ok | (computed != recorded)):
+        mismatches.append({
+            "round_id": int(round_ids[index]),
+            "reason": "crash_point_mismatch" if hash_ok[index] else "server_seed_hash_mismatch",
+            "computed_crash_point": str(fixed_point.from_hundredths(int(computed[index]))),
+            "recorded_crash_point": str(fixed_point.from_hundredths(int(recorded[index]))),
+        })
+    return mismatches
+
+
+def _verify_batch_args(args: Tuple) -> List[Dict]:
+    """Process pool entry point."""
+    return verify_batch(*args)
+
+
+def iter_mismatches(batches: Iterable[RoundBatch], workers: Optional[int] = None,
+                    house_edge: Decimal = Decimal("0.01")) -> Iterator[Dict]:
+    """
+    Verify batches of rounds in a process pool, yielding mismatches in order.
+    
+    At most two batches per worker are in flight, so batches can be
+    streamed from the database without loading every round.
+    
+    Args:
+        batches: Round batches
+        workers: Worker processes (defaults to the CPU count; 1 verifies in-process)
+        house_edge: House edge
+    
+    Yields:
+        Mismatch dicts (see verify_batch)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for batch in batches:
+            yield from verify_batch(*batch, house_edge=house_edge)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(executor.submit(_verify_batch_args, (*batch, house_edge)))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def verify_rounds(server_seeds: Sequence[str], client_seeds: Sequence[Optional[str]],
+                  round_ids: Sequence[int], crash_multipliers: Sequence,
+                  server_seed_hashes: Optional[Sequence[Optional[str]]] = None,
+                  house_edge: Decimal = Decimal("0.01"),
+                  workers: Optional[int] = None,
+                  batch_size: int = 50000) -> List[Dict]:
+    """
+    Verify many rounds, returning only the mismatches.
+    
+    Batches up to batch_size are verified in-process; larger inputs are
+    split across a process pool.
+    
+    Args:
+        server_seeds: Revealed server seeds
+        client_seeds: Client seeds (None if unused)
+        round_ids: Round IDs
+        crash_multipliers: Recorded crash multipliers
+        server_seed_hashes: Published seed hashes (optional)
+        house_edge: House edge
+        workers: Worker processes
+        batch_size: Rounds per batch
+    
+    Returns:
+        Mismatch dicts (see verify_batch)
+    """
+    if len(server_seeds) <= batch_size:
+        workers = 1
+    
+    batches = (
+        (
+            server_seeds[start:start + batch_size],
+            client_seeds[start:start + batch_size],
+            round_ids[start:start + batch_size],
+            crash_multipliers[start:start + batch_size],
+            server_seed_hashes[start:start + batch_size] if server_seed_hashes is not None else None,
+        )
+        for start in range(0, len(server_seeds), batch_size)
+    )
+    return list(iter_mismatches(batches, workers, house_edge))
@@ -1,9 +1,13 @@
 """Bet manager for crash game."""
 from decimal import Decimal
 from typing import List, Dict, Optional
-from datetime import datetime
 
-from src.database.models.game import BetStatus
+from src.game.engine.auto_cashout_scheduler import AutoCashoutScheduler
+from src.game.engine.bet_store import (
+    ACTIVE, RoundBetStore, to_auto_cashout_hundredths, to_minor_units
+)
+from src.game.engine.live_bets_feed import LiveBetsFeed
+from src.game.engine.multiplier_calculator import MultiplierCalculator
 
 
 class BetManager:
@@ -12,7 +16,8 @@ class BetManager:
     def __init__(self, min_bet_ton: Decimal = Decimal("0.01"),
                  max_bet_ton: Decimal = Decimal("100.0"),
                  min_bet_stars: Decimal = Decimal("1.0"),
-                 max_bet_stars: Decimal = Decimal("10000.0")):
+                 max_bet_stars: Decimal = Decimal("10000.0"),
+                 multiplier_calculator: Optional[MultiplierCalculator] = None):
         """
         Initialize bet manager.
         
@@ -21,17 +26,25 @@ class BetManager:
             max_bet_ton: Maximum bet in TON
             min_bet_stars: Minimum bet in Stars
             max_bet_stars: Maximum bet in Stars
+            multiplier_calculator: Calculator used for auto cashout trigger times
         """
         self.min_bet_ton = min_bet_ton
         self.max_bet_ton = max_bet_ton
         self.min_bet_stars = min_bet_stars
         self.max_bet_stars = max_bet_stars
         
-        # Active bets: {user_id: [bet_dict, ...]}
-        self.active_bets: Dict[int, List[Dict]] = {}
+        # Columnar bet stores: {round_id: RoundBetStore}
+        self.round_stores: Dict[int, RoundBetStore] = {}
+        
+        # Auto cashout targets of active bets, ordered by multiplier
+        self.auto_cashout_scheduler = AutoCashoutScheduler(multiplier_calculator)
+        
+        # Bets and cashouts of the latest round, drained once per tick
+        self.live_feed = LiveBetsFeed()
     
     def validate_bet(self, user_id: int, amount: Decimal, currency: str,
-                    user_balance: Decimal) -> tuple[bool, Optional[str]]:
+                    user_balance: Optional[Decimal],
+                    auto_cashout: Optional[Decimal] = None) -> tuple[bool, Optional[str]]:
         """
         Validate a bet.
         
@@ -39,7 +52,8 @@ class BetManager:
             user_id: User ID
             amount: Bet amount
             currency: Currency ("TON" or "STARS")
-            user_balance: User's current balance
+            user_balance: User's current balance (None to skip the balance check)
+            auto_cashout: Auto cashout multiplier (optional)
         
         Returns:
             (is_valid, error_message)
@@ -58,12 +72,18 @@ class BetManager:
         else:
             return False, f"Invalid currency: {currency}"
         
+        try:
+            to_minor_units(amount, currency)
+            to_auto_cashout_hundredths(auto_cashout)
+        except ValueError as e:
+            return False, str(e)
+        
         # Check balance
-        if amount > user_balance:
+        if user_balance is not None and amount > user_balance:
             return False, "Insufficient balance"
         
         # Check if user already has active bet in this round
-        if user_id in self.active_bets and len(self.active_bets[user_id]) > 0:
+        if any(store.open_slot(user_id) is not None for store in self.round_stores.values()):
             return False, "You already have an active bet in this round"
         
         return True, None
@@ -83,59 +103,117 @@ class BetManager:
         Returns:
             Bet data dictionary
         """
-        bet_data = {
-            "user_id": user_id,
-            "round_id": round_id,
-            "amount": amount,
-            "currency": currency,
-            "auto_cashout_multiplier": auto_cashout,
-            "status": BetStatus.PENDING,
-            "placed_at": datetime.utcnow(),
-            "cashed_out": False,
-            "cashed_out_multiplier": None,
-            "payout": None,
-        }
+        store = self.round_stores.get(round_id)
+        if store is None:
+            store = self.round_stores[round_id] = RoundBetStore(round_id)
         
-        if user_id not in self.active_bets:
-            self.active_bets[user_id] = []
+        slot = store.add(user_id, amount, currency, auto_cashout)
+        self.live_feed.bet_placed(store, slot)
         
-        self.active_bets[user_id].append(bet_data)
+        return store.to_dict(slot)
+    
+    def set_bet_id(self, user_id: int, round_id: int, bet_id: int):
+        """
+        Record the database ID of a placed bet.
         
-        return bet_data
+        Args:
+            user_id: User ID
+            round_id: Round ID
+            bet_id: Bet ID
+        """
+        store = self.round_stores[round_id]
+        store.bet_id[store.slots[user_id]] = bet_id
     
     def activate_bets(self, round_id: int):
         """Activate all pending bets for a round."""
-        for user_id, bets in self.active_bets.items():
-            for bet in bets:
-                if bet["round_id"] == round_id and bet["status"] == BetStatus.PENDING:
-                    bet["status"] = BetStatus.ACTIVE
+        store = self.round_stores.get(round_id)
+        if store is None:
+            return
+        
+        activated = store.activate()
+        with_target = activated[store.auto_cashout[activated] > 0]
+        self.auto_cashout_scheduler.schedule_array(
+            store.user_id[with_target], store.auto_cashout[with_target]
+        )
+    
+    def restore_round_store(self, store: RoundBetStore):
+        """
+        Install a round's bet store rebuilt from the round journal.
+        
+        Auto cashout targets of active bets are scheduled again.
+        
+        Args:
+            store: Rebuilt round bet store
+        """
+        self.round_stores[store.round_id] = store
+        self.live_feed.restore(store)
+        
+        active = store.active_slots()
+        with_target = active[store.auto_cashout[active] > 0]
+        self.auto_cashout_scheduler.schedule_array(
+            store.user_id[with_target], store.auto_cashout[with_target]
+        )
     
     def check_auto_cashouts(self, current_multiplier: Decimal) -> List[Dict]:
         """
         Check and process auto cashouts.
         
+        Only bets whose target was crossed are visited; they are cashed out
+        at the current multiplier.
+        
         Args:
             current_multiplier: Current multiplier
         
         Returns:
             List of cashed out bets
         """
-        cashed_out = []
+        multiplier_hundredths = int(current_multiplier * 100)
         
-        for user_id, bets in list(self.active_bets.items()):
-            for bet in bets[:]:  # Copy list to modify during iteration
-                if bet["status"] != BetStatus.ACTIVE:
-                    continue
-                
-                auto_cashout = bet.get("auto_cashout_multiplier")
-                if auto_cashout and current_multiplier >= auto_cashout:
-                    bet["cashed_out"] = True
-                    bet["cashed_out_multiplier"] = current_multiplier
-                    bet["payout"] = bet["amount"] * current_multiplier
-                    bet["status"] = BetStatus.CASHED_OUT
-                    cashed_out.append(bet)
-                    self.active_bets[user_id].remove(bet)
+        return self._cashout_users(
+            (user_id, multiplier_hundredths)
+            for user_id, _ in self.auto_cashout_scheduler.pop_due(current_multiplier)
+        )
+    
+    def fire_due_auto_cashouts(self, elapsed_ms: int,
+                               crash_point: Optional[Decimal] = None) -> List[Dict]:
+        """
+        Process auto cashouts whose trigger time has passed.
+        
+        Each bet is cashed out at exactly its target multiplier; targets at
+        or above the crash point never fire.
+        
+        Args:
+            elapsed_ms: Milliseconds since round start
+            crash_point: Crash multiplier of the round
         
+        Returns:
+            List of cashed out bets
+        """
+        return self._cashout_users(
+            self.auto_cashout_scheduler.pop_due_at(elapsed_ms, crash_point)
+        )
+    
+    def next_auto_cashout_ms(self) -> Optional[int]:
+        """Get elapsed milliseconds of the next scheduled auto cashout."""
+        return self.auto_cashout_scheduler.peek_trigger_ms()
+    
+    def _find_active(self, user_id: int):
+        """Find the store and slot of a user's active bet."""
+        for store in self.round_stores.values():
+            slot = store.slots.get(user_id)
+            if slot is not None and store.status[slot] == ACTIVE:
+                return store, slot
+        return None, None
+    
+    def _cashout_users(self, entries) -> List[Dict]:
+        """Cash out (user_id, multiplier_hundredths) entries that are still active."""
+        cashed_out = []
+        for user_id, multiplier_hundredths in entries:
+            store, slot = self._find_active(user_id)
+            if store is not None:
+                store.cashout(slot, multiplier_hundredths)
+                self.live_feed.cashed_out(store, slot)
+                cashed_out.append(store.to_dict(slot))
         return cashed_out
     
     def cashout_bet(self, user_id: int, current_multiplier: Decimal) -> Optional[Dict]:
@@ -149,41 +227,22 @@ class BetManager:
         Returns:
             Cashed out bet or None if no active bet
         """
-        if user_id not in self.active_bets:
-            return None
-        
-        bets = self.active_bets[user_id]
-        if not bets:
-            return None
-        
-        # Find active bet
-        active_bet = None
-        for bet in bets:
-            if bet["status"] == BetStatus.ACTIVE:
-                active_bet = bet
-                break
-        
-        if not active_bet:
+        store, slot = self._find_active(user_id)
+        if store is None:
             return None
         
-        # Cash out
-        active_bet["cashed_out"] = True
-        active_bet["cashed_out_multiplier"] = current_multiplier
-        active_bet["payout"] = active_bet["amount"] * current_multiplier
-        active_bet["status"] = BetStatus.CASHED_OUT
-        
-        # Remove from active bets
-        self.active_bets[user_id].remove(active_bet)
+        store.cashout(slot, int(current_multiplier * 100))
+        self.live_feed.cashed_out(store, slot)
+        self.auto_cashout_scheduler.cancel(user_id)
         
-        return active_bet
+        return store.to_dict(slot)
     
     def crash_all_bets(self, round_id: int):
         """Mark all active bets as crashed."""
-        for user_id, bets in self.active_bets.items():
-            for bet in bets[:]:
-                if bet["round_id"] == round_id and bet["status"] == BetStatus.ACTIVE:
-                    bet["status"] = BetStatus.CRASHED
-                    self.active_bets[user_id].remove(bet)
+        self.auto_cashout_scheduler.clear()
+        store = self.round_stores.get(round_id)
+        if store is not None:
+            store.crash()
     
     def get_active_bets(self, round_id: Optional[int] = None) -> List[Dict]:
         """
@@ -196,30 +255,23 @@ class BetManager:
             List of active bets
         """
         all_bets = []
-        for bets in self.active_bets.values():
-            for bet in bets:
-                if bet["status"] == BetStatus.ACTIVE:
-                    if round_id is None or bet["round_id"] == round_id:
-                        all_bets.append(bet)
+        for store_round_id, store in self.round_stores.items():
+            if round_id is None or store_round_id == round_id:
+                all_bets.extend(store.to_dicts(store.active_slots()))
         return all_bets
     
     def get_user_bet(self, user_id: int, round_id: int) -> Optional[Dict]:
         """Get user's bet for a round."""
-        if user_id not in self.active_bets:
+        store = self.round_stores.get(round_id)
+        if store is None or user_id not in store.slots:
             return None
         
-        for bet in self.active_bets[user_id]:
-            if bet["round_id"] == round_id:
-                return bet
-        
-        return None
+        return store.to_dict(store.slots[user_id])
+    
+    def get_round_store(self, round_id: int) -> Optional[RoundBetStore]:
+        """Get the columnar store of a round."""
+        return self.round_stores.get(round_id)
     
     def clear_round_bets(self, round_id: int):
         """Clear all bets for a round."""
-        for user_id in list(self.active_bets.keys()):
-            self.active_bets[user_id] = [
-                bet for bet in self.active_bets[user_id]
-                if bet["round_id"] != round_id
-            ]
-            if not self.active_bets[user_id]:
-                del self.active_bets[user_id]
+        self.round_stores.pop(round_id, None)
@@ -0,0 +1,291 @@
+"""Columnar bet store for crash game rounds."""
+import math
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.database.models.game import BetStatus
+from src.game.engine.fixed_point import MAX_CRASH_HUNDREDTHS
+
+# Currency codes and minor units (match the Numeric scales of the bets table)
+CURRENCIES = ("TON", "STARS")
+CURRENCY_CODES = {currency: code for code, currency in enumerate(CURRENCIES)}
+MINOR_UNIT_EXPONENTS = (9, 2)
+
+# Status codes
+STATUSES = (
+    BetStatus.PENDING,
+    BetStatus.ACTIVE,
+    BetStatus.CASHED_OUT,
+    BetStatus.CRASHED,
+    BetStatus.CANCELLED,
+)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+PENDING = STATUS_CODES[BetStatus.PENDING]
+ACTIVE = STATUS_CODES[BetStatus.ACTIVE]
+CASHED_OUT = STATUS_CODES[BetStatus.CASHED_OUT]
+CRASHED = STATUS_CODES[BetStatus.CRASHED]
+
+
+def to_minor_units(amount: Decimal, currency: str) -> int:
+    """
+    Convert an amount to integer minor units.
+    
+    Args:
+        amount: Amount
+        currency: Currency ("TON" or "STARS")
+    
+    Returns:
+        Amount in minor units (nanotons for TON, hundredths for Stars)
+    
+    Raises:
+        ValueError: If the amount is finer than the currency's minor unit
+    """
+    minor = amount.scaleb(MINOR_UNIT_EXPONENTS[CURRENCY_CODES[currency]])
+    if minor != minor.to_integral_value():
+        raise ValueError(f"Too many decimal places for {currency}: {amount}")
+    return int(minor)
+
+
+def to_auto_cashout_hundredths(auto_cashout: Optional[Decimal]) -> int:
+    """
+    Convert an auto cashout target to integer hundredths.
+    
+    Multipliers move on a 0.01x grid, so targets are rounded up to it.
+    
+    Args:
+        auto_cashout: Auto cashout multiplier (None or 0 for none)
+    
+    Returns:
+        Target in hundredths (0 for none)
+    
+    Raises:
+        ValueError: If the target is not above 1.00x or above the crash cap
+    """
+    if not auto_cashout:
+        return 0
+    hundredths = math.ceil(auto_cashout * 100)
+    if hundredths <= 100:
+        raise ValueError("Auto cashout must be above 1.00x")
+    if hundredths > MAX_CRASH_HUNDREDTHS:
+        raise ValueError(f"Maximum auto cashout is {MAX_CRASH_HUNDREDTHS // 100}x")
+    return hundredths
+
+
+def from_minor_units(minor: int, currency_code: int) -> Decimal:
+    """Convert integer minor units back to a Decimal amount."""
+    return Decimal(int(minor)).scaleb(-MINOR_UNIT_EXPONENTS[currency_code])
+
+
+class RoundBetStore:
+    """
+    Struct-of-arrays store of one round's bets.
+    
+    Every bet occupies one slot across parallel NumPy columns; amounts are
+    integer minor units and multipliers integer hundredths (250 == 2.50x).
+    A user_id -> slot index gives O(1) lookups, while activation, crash
+    settlement and "all active bets" queries are vectorized over the
+    status column. Bet dicts are only built at the API boundary.
+    """
+    
+    _COLUMNS = (
+        "user_id", "bet_id", "amount", "currency", "auto_cashout",
+        "cashout_multiplier", "status", "placed_at_ns",
+    )
+    
+    def __init__(self, round_id: int, capacity: int = 1024):
+        """
+        Initialize bet store.
+        
+        Args:
+            round_id: Round ID
+            capacity: Initial number of slots (grows by doubling)
+        """
+        self.round_id = round_id
+        self.size = 0
+        self.slots: Dict[int, int] = {}
+        
+        self.user_id = np.zeros(capacity, dtype=np.int64)
+        self.bet_id = np.zeros(capacity, dtype=np.int64)  # 0 until persisted
+        self.amount = np.zeros(capacity, dtype=np.int64)
+        self.currency = np.zeros(capacity, dtype=np.uint8)
+        self.auto_cashout = np.zeros(capacity, dtype=np.int32)  # 0 == none
+        self.cashout_multiplier = np.zeros(capacity, dtype=np.int32)
+        self.status = np.zeros(capacity, dtype=np.uint8)
+        self.placed_at_ns = np.zeros(capacity, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        """Number of bets in the round."""
+        return self.size
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in self._COLUMNS)
+    
+    def _grow(self):
+        """Double the capacity of every column."""
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def add(self, user_id: int, amount: Decimal, currency: str,
+            auto_cashout: Optional[Decimal] = None) -> int:
+        """
+        Add a pending bet.
+        
+        Args:
+            user_id: User ID
+            amount: Bet amount
+            currency: Currency
+            auto_cashout: Auto cashout multiplier (optional)
+        
+        Returns:
+            Slot index
+        
+        Raises:
+            ValueError: If the user already bet, or the amount or target is invalid
+        """
+        if user_id in self.slots:
+            raise ValueError(f"User {user_id} already has a bet in round {self.round_id}")
+        # Converted before any column is written, so a rejected bet leaves no trace
+        minor_amount = to_minor_units(amount, currency)
+        auto_cashout_hundredths = to_auto_cashout_hundredths(auto_cashout)
+        
+        if self.size == len(self.status):
+            self._grow()
+        
+        slot = self.size
+        self.user_id[slot] = user_id
+        self.amount[slot] = minor_amount
+        self.currency[slot] = CURRENCY_CODES[currency]
+        self.auto_cashout[slot] = auto_cashout_hundredths
+        self.status[slot] = PENDING
+        self.placed_at_ns[slot] = time.time_ns()
+        
+        self.slots[user_id] = slot
+        self.size += 1
+        return slot
+    
+    def activate(self) -> np.ndarray:
+        """
+        Activate all pending bets.
+        
+        Returns:
+            Slots that were activated
+        """
+        status = self.status[:self.size]
+        activated = np.flatnonzero(status == PENDING)
+        status[activated] = ACTIVE
+        return activated
+    
+    def cashout(self, slot: int, multiplier_hundredths: int) -> int:
+        """
+        Cash out an active bet.
+        
+        Args:
+            slot: Slot index
+            multiplier_hundredths: Cashout multiplier in hundredths
+        
+        Returns:
+            Payout in minor units
+        """
+        if self.status[slot] != ACTIVE:
+            raise ValueError("Bet is not active")
+        
+        self.status[slot] = CASHED_OUT
+        self.cashout_multiplier[slot] = multiplier_hundredths
+        return int(self.amount[slot]) * multiplier_hundredths // 100
+    
+    def crash(self) -> np.ndarray:
+        """
+        Mark all active bets as crashed.
+        
+        Returns:
+            Slots that were crashed
+        """
+        status = self.status[:self.size]
+        crashed = np.flatnonzero(status == ACTIVE)
+        status[crashed] = CRASHED
+        return crashed
+    
+    def active_slots(self) -> np.ndarray:
+        """Get slots of all active bets."""
+        return np.flatnonzero(self.status[:self.size] == ACTIVE)
+    
+    def open_slot(self, user_id: int) -> Optional[int]:
+        """Get a user's slot if the bet is still pending or active."""
+        slot = self.slots.get(user_id)
+        if slot is None or self.status[slot] not in (PENDING, ACTIVE):
+            return None
+        return slot
+    
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-currency totals of stakes and payouts in minor units.
+        
+        Returns:
+            {currency: {"count", "amount", "payout"}}
+        """
+        size = self.size
+        currency = self.currency[:size]
+        amount = self.amount[:size]
+        payout = amount * self.cashout_multiplier[:size] // 100
+        
+        totals = {}
+        for code, name in enumerate(CURRENCIES):
+            mask = currency == code
+            totals[name] = {
+                "count": int(np.count_nonzero(mask)),
+                "amount": int(amount[mask].sum()),
+                "payout": int(payout[mask].sum()),
+            }
+        return totals
+    
+    def to_dict(self, slot: int) -> Dict:
+        """
+        Build the bet dict for a slot.
+        
+        Args:
+            slot: Slot index
+        
+        Returns:
+            Bet data dictionary
+        """
+        currency_code = int(self.currency[slot])
+        amount = from_minor_units(self.amount[slot], currency_code)
+        status = STATUSES[self.status[slot]]
+        auto_cashout = int(self.auto_cashout[slot])
+        cashout_multiplier = int(self.cashout_multiplier[slot])
+        bet_id = int(self.bet_id[slot])
+        
+        payout = None
+        multiplier = None
+        if status == BetStatus.CASHED_OUT:
+            multiplier = Decimal(cashout_multiplier).scaleb(-2)
+            payout = from_minor_units(
+                int(self.amount[slot]) * cashout_multiplier // 100, currency_code
+            )
+        
+        return {
+            "user_id": int(self.user_id[slot]),
+            "round_id": self.round_id,
+            "bet_id": bet_id or None,
+            "amount": amount,
+            "currency": CURRENCIES[currency_code],
+            "auto_cashout_multiplier": Decimal(auto_cashout).scaleb(-2) if auto_cashout else None,
+            "status": status,
+            "placed_at": datetime.utcfromtimestamp(int(self.placed_at_ns[slot]) / 1e9),
+            "cashed_out": status == BetStatus.CASHED_OUT,
+            "cashed_out_multiplier": multiplier,
+            "payout": payout,
+        }
+    
+    def to_dicts(self, slots: np.ndarray) -> List[Dict]:
+        """Build bet dicts for many slots."""
+        return [self.to_dict(int(slot)) for slot in slots]
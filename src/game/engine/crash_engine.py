@@ -1,9 +1,11 @@
 """Main crash game engine."""
+import time
 from decimal import Decimal
 from datetime import datetime
 from typing import Optional, List, Dict, Callable
 from enum import Enum
 
+from src.game.engine import fixed_point
 from src.game.engine.provably_fair import ProvablyFair
 from src.game.engine.multiplier_calculator import MultiplierCalculator
 from src.database.models.game import GameRoundStatus, BetStatus
@@ -45,7 +47,8 @@ class CrashEngine:
         self.on_round_crash: Optional[Callable] = None
     
     def start_new_round(self, round_id: int, server_seed_hash: str,
-                       client_seed: Optional[str] = None) -> Dict:
+                       client_seed: Optional[str] = None,
+                       server_seed: Optional[str] = None) -> Dict:
         """
         Start a new game round.
         
@@ -53,12 +56,18 @@ class CrashEngine:
             round_id: Round ID
             server_seed_hash: Hash of server seed
             client_seed: Optional client seed
+            server_seed: Server seed whose hash was published
         
         Returns:
             Round data dictionary
+        
+        Raises:
+            ValueError: If the server seed is missing or does not match the hash
         """
-        # Generate server seed (in production, this should be stored securely)
-        server_seed = ProvablyFair.generate_server_seed()
+        # The crash point is derived from the seed behind the published hash,
+        # so the caller must supply it (e.g. from SeedChain.next())
+        if server_seed is None:
+            raise ValueError("Server seed is required to start a round")
         
         # Verify hash matches
         if ProvablyFair.hash_seed(server_seed) != server_seed_hash:
@@ -68,7 +77,7 @@ class CrashEngine:
         combined_seed = ProvablyFair.combine_seeds(server_seed, client_seed, round_id)
         
         # Calculate crash point
-        crash_point = ProvablyFair.calculate_crash_point(combined_seed, self.house_edge)
+        crash_hundredths = fixed_point.crash_point_hundredths(combined_seed, self.house_edge)
         
         # Create round data
         self.current_round = {
@@ -77,9 +86,12 @@ class CrashEngine:
             "server_seed": server_seed,  # Will be revealed after crash
             "client_seed": client_seed,
             "combined_seed": combined_seed,
-            "crash_point": crash_point,
+            "crash_point": fixed_point.from_hundredths(crash_hundredths),
+            "crash_hundredths": crash_hundredths,
             "start_time": None,
             "crash_time": None,
+            "start_ns": None,
+            "crash_ns": None,
             "status": RoundState.COUNTDOWN,
         }
         
@@ -101,6 +113,7 @@ class CrashEngine:
             raise ValueError(f"Round not in countdown state: {self.round_state}")
         
         self.current_round["start_time"] = datetime.utcnow()
+        self.current_round["start_ns"] = time.monotonic_ns()
         self.current_round["status"] = RoundState.ACTIVE
         self.round_state = RoundState.ACTIVE
         
@@ -109,6 +122,44 @@ class CrashEngine:
         
         return self.current_round
     
+    def restore_round(self, round_id: int, server_seed: str,
+                      client_seed: Optional[str] = None,
+                      started_at_ns: Optional[int] = None,
+                      crashed_at_ns: Optional[int] = None) -> Dict:
+        """
+        Restore an interrupted round (e.g. from the round journal).
+        
+        Wall clock timestamps are mapped onto the monotonic clock, so an
+        active round resumes at the multiplier it would have reached.
+        
+        Args:
+            round_id: Round ID
+            server_seed: Server seed of the round
+            client_seed: Optional client seed
+            started_at_ns: Wall clock time the round began (None if in countdown)
+            crashed_at_ns: Wall clock time the round crashed (None if not crashed)
+        
+        Returns:
+            Round data dictionary
+        """
+        self.start_new_round(round_id, ProvablyFair.hash_seed(server_seed), client_seed, server_seed)
+        if started_at_ns is None:
+            return self.current_round
+        
+        offset_ns = time.monotonic_ns() - time.time_ns()
+        self.current_round["start_time"] = datetime.utcfromtimestamp(started_at_ns / 1e9)
+        self.current_round["start_ns"] = started_at_ns + offset_ns
+        self.current_round["status"] = RoundState.ACTIVE
+        self.round_state = RoundState.ACTIVE
+        
+        if crashed_at_ns is not None:
+            self.current_round["crash_time"] = datetime.utcfromtimestamp(crashed_at_ns / 1e9)
+            self.current_round["crash_ns"] = crashed_at_ns + offset_ns
+            self.current_round["status"] = RoundState.CRASHED
+            self.round_state = RoundState.CRASHED
+        
+        return self.current_round
+    
     def get_current_multiplier(self) -> Optional[Decimal]:
         """
         Get current multiplier.
@@ -116,22 +167,48 @@ class CrashEngine:
         Returns:
             Current multiplier or None if no active round
         """
-        if not self.current_round or self.round_state != RoundState.ACTIVE:
+        hundredths = self.get_current_multiplier_hundredths()
+        if hundredths is None:
             return None
         
-        start_time = self.current_round["start_time"]
-        crash_point = self.current_round["crash_point"]
+        return fixed_point.from_hundredths(hundredths)
+    
+    def get_current_multiplier_hundredths(self) -> Optional[int]:
+        """
+        Get current multiplier in hundredths, crashing the round when reached.
         
-        current_multiplier = self.multiplier_calculator.calculate_current_multiplier(
-            crash_point, start_time
+        Returns:
+            Current multiplier in hundredths or None if no active round
+        """
+        if not self.current_round or self.round_state != RoundState.ACTIVE:
+            return None
+        
+        crash_hundredths = self.current_round["crash_hundredths"]
+        current = fixed_point.multiplier_at(
+            crash_hundredths,
+            time.monotonic_ns() - self.current_round["start_ns"],
+            self.multiplier_calculator.base_speed_ms
         )
         
         # Check if crashed
-        if current_multiplier >= crash_point:
+        if current >= crash_hundredths:
             self._crash_round()
-            return crash_point
+            return crash_hundredths
+        
+        return current
+    
+    def get_elapsed_ms(self) -> Optional[int]:
+        """
+        Get milliseconds elapsed since the round began.
+        
+        Returns:
+            Elapsed milliseconds or None if the round has not begun
+        """
+        if not self.current_round or not self.current_round["start_ns"]:
+            return None
         
-        return current_multiplier
+        end_ns = self.current_round["crash_ns"] or time.monotonic_ns()
+        return (end_ns - self.current_round["start_ns"]) // fixed_point.NS_PER_MS
     
     def _crash_round(self):
         """Crash the current round."""
@@ -139,6 +216,7 @@ class CrashEngine:
             return
         
         self.current_round["crash_time"] = datetime.utcnow()
+        self.current_round["crash_ns"] = time.monotonic_ns()
         self.current_round["status"] = RoundState.CRASHED
         self.round_state = RoundState.CRASHED
         
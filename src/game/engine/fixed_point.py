@@ -0,0 +1,122 @@
+"""Integer fixed-point crash game math.
+
+Multipliers are integer hundredths (250 == 2.50x) and elapsed time is
+integer nanoseconds. Results equal the Decimal formulas in ProvablyFair;
+Decimal is only used at the API boundary.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Tuple
+
+MAX_CRASH_HUNDREDTHS = 100000  # 1000.00x
+NS_PER_MS = 1_000_000
+
+# The published formula goes through float and 28-digit Decimal steps, which
+# move the exact value by less than 1e-7 hundredths below the cap. Values this
+# close to a rounding tie are recomputed with the reference formula.
+_TIE_GUARD = 10 ** 6
+
+
+def round_half_even(numerator: int, denominator: int) -> int:
+    """
+    Divide and round half to even (Decimal's default rounding).
+    
+    Args:
+        numerator: Numerator
+        denominator: Positive denominator
+    
+    Returns:
+        Rounded quotient
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def to_hundredths(multiplier: Decimal) -> int:
+    """Convert a multiplier on the 0.01x grid to hundredths."""
+    return int(multiplier.scaleb(2))
+
+
+def from_hundredths(hundredths: int) -> Decimal:
+    """Convert hundredths to a Decimal multiplier (e.g. 250 -> 2.50)."""
+    return Decimal(hundredths).scaleb(-2)
+
+
+@lru_cache(maxsize=16)
+def _crash_coefficients(house_edge: Decimal) -> Tuple[int, int]:
+    """
+    Precompute the integer form of the crash formula for a house edge.
+    
+    With x = seed_int / 2^64 the formula is
+    100 * (1 + 1 / (1 - x + 1e-7) / (1 - house_edge)) hundredths, which is
+    100 + numerator / ((edge_den - edge_num) * (2^64 * (10^7 + 1) - seed_int * 10^7)).
+    
+    Returns:
+        (numerator, edge_den - edge_num)
+    """
+    edge_num, edge_den = house_edge.as_integer_ratio()
+    return 100 * edge_den * 2 ** 64 * 10 ** 7, edge_den - edge_num
+
+
+def crash_point_hundredths(combined_seed: str,
+                           house_edge: Decimal = Decimal("0.01")) -> int:
+    """
+    Calculate the crash point of a combined seed in hundredths.
+    
+    Args:
+        combined_seed: Combined seed hash (hex)
+        house_edge: House edge
+    
+    Returns:
+        Crash point in hundredths, capped at 1000.00x
+    """
+    numerator, edge_factor = _crash_coefficients(house_edge)
+    if edge_factor <= 0:
+        return _reference_hundredths(combined_seed, house_edge)
+    
+    seed_int = int(combined_seed[:16], 16)
+    denominator = edge_factor * ((2 ** 64) * (10 ** 7 + 1) - seed_int * 10 ** 7)
+    
+    quotient, remainder = divmod(numerator, denominator)
+    if 100 + quotient >= MAX_CRASH_HUNDREDTHS:
+        return MAX_CRASH_HUNDREDTHS
+    
+    # Distance of the fractional part from one half, in units of 1/(2 * denominator)
+    if abs(2 * remainder - denominator) * _TIE_GUARD <= denominator:
+        return _reference_hundredths(combined_seed, house_edge)
+    
+    hundredths = 100 + quotient + (2 * remainder > denominator)
+    return min(hundredths, MAX_CRASH_HUNDREDTHS)
+
+
+def _reference_hundredths(combined_seed: str, house_edge: Decimal) -> int:
+    """Crash point from the published Decimal formula, in hundredths."""
+    from src.game.engine.provably_fair import ProvablyFair
+    
+    crash_point = ProvablyFair.calculate_crash_point_reference(combined_seed, house_edge)
+    return int(crash_point.scaleb(2))
+
+
+def multiplier_at(crash_hundredths: int, elapsed_ns: int, base_speed_ms: int = 100) -> int:
+    """
+    Calculate the multiplier after an elapsed time.
+    
+    The multiplier rises 0.01x every base_speed_ms and is capped at the
+    crash point.
+    
+    Args:
+        crash_hundredths: Crash point in hundredths
+        elapsed_ns: Nanoseconds since round start
+        base_speed_ms: Milliseconds per 0.01x
+    
+    Returns:
+        Multiplier in hundredths
+    """
+    period_ns = base_speed_ms * NS_PER_MS
+    # 1 + elapsed / base_speed * 0.01 >= crash point, compared exactly
+    if 100 * period_ns + elapsed_ns >= crash_hundredths * period_ns:
+        return crash_hundredths
+    return 100 + round_half_even(elapsed_ns, period_ns)
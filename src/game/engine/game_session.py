@@ -7,8 +7,10 @@ from sqlalchemy.orm import Session
 from src.game.engine.crash_engine import CrashEngine, RoundState
 from src.game.engine.bet_manager import BetManager
 from src.game.engine.balance_manager import BalanceManager
+from src.game.engine.round_history import CrashedRound, get_round_history
 from src.database.models.game import GameRoundStatus, BetStatus
 from src.database.repositories.game_repo import GameRoundRepository, BetRepository
+from src.services.metrics import get_metrics
 
 
 class GameSession:
@@ -32,13 +34,15 @@ class GameSession:
         self.current_round_id: Optional[int] = None
     
     def start_new_round(self, server_seed_hash: str,
-                       client_seed: Optional[str] = None) -> Dict:
+                       client_seed: Optional[str] = None,
+                       server_seed: Optional[str] = None) -> Dict:
         """
         Start a new round.
         
         Args:
             server_seed_hash: Server seed hash
             client_seed: Optional client seed
+            server_seed: Server seed matching the published hash
         
         Returns:
             Round data
@@ -49,7 +53,7 @@ class GameSession:
         
         # Start round in engine
         round_data = self.crash_engine.start_new_round(
-            round_obj.id, server_seed_hash, client_seed
+            round_obj.id, server_seed_hash, client_seed, server_seed
         )
         
         return round_data
@@ -70,6 +74,7 @@ class GameSession:
         
         # Activate bets
         self.bet_manager.activate_bets(self.current_round_id)
+        self.bet_repo.activate_round_bets(self.current_round_id)
     
     def place_bet(self, user_id: int, amount: Decimal, currency: str,
                  auto_cashout: Optional[Decimal] = None) -> Dict:
@@ -91,7 +96,9 @@ class GameSession:
         
         # Validate bet
         balance = self.balance_manager.get_balance(user_id, currency)
-        is_valid, error = self.bet_manager.validate_bet(user_id, amount, currency, balance)
+        is_valid, error = self.bet_manager.validate_bet(
+            user_id, amount, currency, balance, auto_cashout
+        )
         if not is_valid:
             raise ValueError(error)
         
@@ -117,6 +124,7 @@ class GameSession:
             auto_cashout_multiplier=auto_cashout
         )
         
+        self.bet_manager.set_bet_id(user_id, self.current_round_id, bet.id)
         bet_data["bet_id"] = bet.id
         
         return bet_data
@@ -179,26 +187,8 @@ class GameSession:
         # Check auto cashouts
         auto_cashouts = self.bet_manager.check_auto_cashouts(current_multiplier)
         
-        # Process auto cashouts
-        for bet_data in auto_cashouts:
-            user_id = bet_data["user_id"]
-            payout = bet_data["payout"]
-            currency = bet_data["currency"]
-            
-            self.balance_manager.add_balance(
-                user_id, payout, currency,
-                description=f"Auto cashout: {payout} {currency} at {bet_data['cashed_out_multiplier']}x",
-                bet_id=bet_data.get("bet_id"),
-                round_id=self.current_round_id
-            )
-            
-            if bet_data.get("bet_id"):
-                self.bet_repo.cashout_bet(
-                    bet_data["bet_id"],
-                    bet_data["cashed_out_multiplier"],
-                    payout if currency == "TON" else None,
-                    payout if currency == "STARS" else None
-                )
+        # Settle the tick's auto cashouts in one transaction
+        self.balance_manager.settle_cashouts(auto_cashouts, label="Auto cashout")
         
         # Check if crashed
         if self.crash_engine.round_state == RoundState.CRASHED:
@@ -220,21 +210,22 @@ class GameSession:
         server_seed = round_data["server_seed"]
         duration_ms = int((round_data["crash_time"] - round_data["start_time"]).total_seconds() * 1000)
         
-        # Update database
-        self.round_repo.crash_round(
-            self.current_round_id,
-            crash_multiplier,
-            server_seed,
-            duration_ms
-        )
-        
         # Crash all remaining bets
         self.bet_manager.crash_all_bets(self.current_round_id)
         
-        # Update bet statuses in database
-        active_bets = self.bet_repo.get_active_bets_by_round(self.current_round_id)
-        for bet in active_bets:
-            self.bet_repo.crash_bet(bet.id)
+        # Settle round and bets in one transaction
+        with get_metrics().timer("round_settlement_ms"):
+            totals = self.round_repo.settle_round(
+                self.current_round_id,
+                crash_multiplier,
+                server_seed,
+                duration_ms
+            )
+        
+        get_round_history().append(CrashedRound(
+            self.current_round_id, crash_multiplier, round_data["start_time"],
+            totals["crashed_at"], totals["total_bets"]
+        ))
     
     def get_round_status(self) -> Dict:
         """Get current round status."""
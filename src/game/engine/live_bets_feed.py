@@ -0,0 +1,197 @@
+"""Live "players in round" feed built from bet events."""
+import heapq
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.game.engine.bet_store import CASHED_OUT, CURRENCIES, RoundBetStore, from_minor_units
+
+
+class LiveBetsFeed:
+    """
+    Coalesce a round's bet events into one delta per tick.
+    
+    BetManager reports every placed bet and cashout; the feed keeps the
+    slots changed since the last drain, running per-currency totals and
+    the top_n largest bets per currency (a min-heap), so a tick costs
+    O(changes * log top_n) however many players the round has.
+    """
+    
+    def __init__(self, top_n: int = 20):
+        """
+        Initialize live bets feed.
+        
+        Args:
+            top_n: Bets per currency kept in the "top by amount" view
+        """
+        self.top_n = top_n
+        self.round_id: Optional[int] = None
+        self.store: Optional[RoundBetStore] = None
+        self.sequence = 0
+        self._reset(None, None)
+    
+    def _reset(self, round_id: Optional[int], store: Optional[RoundBetStore]):
+        """Start an empty feed for a round."""
+        self.round_id = round_id
+        self.store = store
+        # Minor-unit totals: {currency_code: [bets, amount, cashouts, payout]}
+        self.totals = [[0, 0, 0, 0] for _ in CURRENCIES]
+        # (amount, slot) min-heaps and their slot sets, per currency code
+        self.top: List[List[Tuple[int, int]]] = [[] for _ in CURRENCIES]
+        self.top_slots: List[Set[int]] = [set() for _ in CURRENCIES]
+        self._new_bets: List[int] = []
+        self._cashouts: List[int] = []
+        self._top_added: List[int] = []
+        self._top_removed: List[int] = []
+    
+    def bet_placed(self, store: RoundBetStore, slot: int):
+        """
+        Record a placed bet.
+        
+        Args:
+            store: Round bet store
+            slot: Slot of the bet
+        """
+        if store.round_id != self.round_id:
+            self._reset(store.round_id, store)
+        
+        code = int(store.currency[slot])
+        amount = int(store.amount[slot])
+        totals = self.totals[code]
+        totals[0] += 1
+        totals[1] += amount
+        self._new_bets.append(slot)
+        
+        top, top_slots = self.top[code], self.top_slots[code]
+        if len(top) < self.top_n:
+            heapq.heappush(top, (amount, slot))
+        elif top and amount > top[0][0]:
+            _, evicted = heapq.heapreplace(top, (amount, slot))
+            top_slots.discard(evicted)
+            self._top_removed.append(evicted)
+        else:
+            return
+        top_slots.add(slot)
+        self._top_added.append(slot)
+    
+    def cashed_out(self, store: RoundBetStore, slot: int):
+        """
+        Record a cashout.
+        
+        Args:
+            store: Round bet store
+            slot: Slot of the bet
+        """
+        if store.round_id != self.round_id:
+            return
+        
+        totals = self.totals[int(store.currency[slot])]
+        totals[2] += 1
+        totals[3] += int(store.amount[slot]) * int(store.cashout_multiplier[slot]) // 100
+        self._cashouts.append(slot)
+    
+    def restore(self, store: RoundBetStore):
+        """
+        Rebuild the feed from a round's bets (after recovery).
+        
+        Args:
+            store: Round bet store
+        """
+        self._reset(store.round_id, store)
+        for slot in range(len(store)):
+            self.bet_placed(store, slot)
+            if store.status[slot] == CASHED_OUT:
+                self.cashed_out(store, slot)
+    
+    def _bet(self, slot: int) -> Dict:
+        """Feed entry of a bet."""
+        store = self.store
+        code = int(store.currency[slot])
+        auto_cashout = int(store.auto_cashout[slot])
+        return {
+            "user_id": int(store.user_id[slot]),
+            "amount": from_minor_units(store.amount[slot], code),
+            "currency": CURRENCIES[code],
+            "auto_cashout": Decimal(auto_cashout).scaleb(-2) if auto_cashout else None,
+        }
+    
+    def _cashout(self, slot: int) -> Dict:
+        """Feed entry of a cashout."""
+        store = self.store
+        code = int(store.currency[slot])
+        multiplier = int(store.cashout_multiplier[slot])
+        return {
+            "user_id": int(store.user_id[slot]),
+            "multiplier": Decimal(multiplier).scaleb(-2),
+            "payout": from_minor_units(int(store.amount[slot]) * multiplier // 100, code),
+            "currency": CURRENCIES[code],
+        }
+    
+    def _totals(self) -> Dict[str, Dict]:
+        """Per-currency totals."""
+        return {
+            currency: {
+                "bets": bets,
+                "amount": from_minor_units(amount, code),
+                "cashouts": cashouts,
+                "payout": from_minor_units(payout, code),
+            }
+            for code, (currency, (bets, amount, cashouts, payout))
+            in enumerate(zip(CURRENCIES, self.totals))
+        }
+    
+    def _is_top(self, slot: int) -> bool:
+        """Whether a bet is in the top view of its currency."""
+        return slot in self.top_slots[int(self.store.currency[slot])]
+    
+    def drain(self) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Take the changes since the last drain.
+        
+        Returns:
+            (full delta, top delta) or None if nothing changed. The full
+            delta lists every new bet and cashout; the top delta only the
+            bets entering or leaving the top view and cashouts of top bets.
+            Both carry the round's totals and a sequence number.
+        """
+        if not self._new_bets and not self._cashouts:
+            return None
+        
+        self.sequence += 1
+        totals = self._totals()
+        header = {"round_id": self.round_id, "seq": self.sequence, "totals": totals}
+        
+        # A bet that entered and left the top view within one tick is not reported
+        added_now, removed_now = set(self._top_added), set(self._top_removed)
+        full = {
+            **header,
+            "bets": [self._bet(slot) for slot in self._new_bets],
+            "cashouts": [self._cashout(slot) for slot in self._cashouts],
+        }
+        top = {
+            **header,
+            "added": [self._bet(slot) for slot in self._top_added if slot not in removed_now],
+            "removed": [int(self.store.user_id[slot]) for slot in self._top_removed
+                        if slot not in added_now],
+            "cashouts": [self._cashout(slot) for slot in self._cashouts if self._is_top(slot)],
+        }
+        
+        self._new_bets, self._cashouts = [], []
+        self._top_added, self._top_removed = [], []
+        return full, top
+    
+    def snapshot(self) -> Dict:
+        """
+        Get the current totals and top view (sent to new subscribers).
+        
+        Returns:
+            {"round_id", "seq", "totals", "top": {currency: [bets, largest first]}}
+        """
+        top = {}
+        for code, currency in enumerate(CURRENCIES):
+            top[currency] = [
+                {**self._bet(slot), "cashout": (self._cashout(slot)
+                                                if self.store.status[slot] == CASHED_OUT else None)}
+                for _, slot in sorted(self.top[code], reverse=True)
+            ]
+        return {"round_id": self.round_id, "seq": self.sequence, "totals": self._totals(),
+                "top": top}
@@ -87,6 +87,32 @@ class MultiplierCalculator:
         
         return ms_needed - elapsed_ms
     
+    def get_trigger_ms(self, target_hundredths: int) -> int:
+        """
+        Calculate the first elapsed millisecond at which a multiplier is shown.
+        
+        Exact inverse of calculate_multiplier_at_time (ignoring the crash cap),
+        including its half-even rounding to 0.01x.
+        
+        Args:
+            target_hundredths: Target multiplier in hundredths (250 == 2.50x)
+        
+        Returns:
+            Milliseconds since round start
+        """
+        steps = target_hundredths - 100
+        if steps <= 0:
+            return 0
+        
+        # elapsed / base_speed must round to at least `steps`
+        numerator = (2 * steps - 1) * self.base_speed_ms
+        trigger_ms = (numerator + 1) // 2
+        if numerator % 2 == 0 and steps % 2 == 1:
+            # Exact tie rounds down to the even neighbour
+            trigger_ms += 1
+        
+        return trigger_ms
+    
     def get_multiplier_at_time(self, crash_point: Decimal, elapsed_ms: int) -> Decimal:
         """
         Get multiplier at specific elapsed time.
@@ -4,6 +4,8 @@ import secrets
 from typing import Optional, Tuple
 from decimal import Decimal
 
+from src.game.engine import fixed_point
+
 
 class ProvablyFair:
     """Provably Fair system for generating fair random multipliers."""
@@ -34,6 +36,26 @@ class ProvablyFair:
         """
         Calculate crash point from seed.
         
+        Evaluated in integer hundredths (see fixed_point); equal to
+        calculate_crash_point_reference for every seed.
+        
+        Args:
+            combined_seed: Combined seed string
+            house_edge: House edge (default 1%)
+        
+        Returns:
+            Crash multiplier (e.g., 2.5 means crash at 2.5x)
+        """
+        return fixed_point.from_hundredths(
+            fixed_point.crash_point_hundredths(combined_seed, house_edge)
+        )
+    
+    @staticmethod
+    def calculate_crash_point_reference(combined_seed: str,
+                                        house_edge: Decimal = Decimal("0.01")) -> Decimal:
+        """
+        Calculate crash point from seed with the published Decimal formula.
+        
         Formula: multiplier = 1 + (hash(seed) / 2^64) * max_multiplier_factor
         Crash probability increases exponentially with multiplier.
         
@@ -126,6 +148,38 @@ class ProvablyFair:
         """
         Calculate current multiplier at given time.
         
+        Evaluated in integer hundredths when the crash point is on the 0.01x
+        grid; equal to calculate_multiplier_at_time_reference.
+        
+        Args:
+            crash_point: Final crash multiplier
+            elapsed_ms: Milliseconds elapsed since round start
+            base_speed: Base speed of multiplier increase (ms per 0.01x)
+        
+        Returns:
+            Current multiplier
+        """
+        crash_hundredths = crash_point.scaleb(2)
+        if crash_hundredths != crash_hundredths.to_integral_value():
+            return ProvablyFair.calculate_multiplier_at_time_reference(
+                crash_point, elapsed_ms, base_speed
+            )
+        
+        crash_hundredths = int(crash_hundredths)
+        multiplier = fixed_point.multiplier_at(
+            crash_hundredths, elapsed_ms * fixed_point.NS_PER_MS, base_speed
+        )
+        if multiplier == crash_hundredths:
+            return crash_point
+        
+        return fixed_point.from_hundredths(multiplier)
+    
+    @staticmethod
+    def calculate_multiplier_at_time_reference(crash_point: Decimal, elapsed_ms: int,
+                                               base_speed: int = 100) -> Decimal:
+        """
+        Calculate current multiplier at given time with Decimal arithmetic.
+        
         Args:
             crash_point: Final crash multiplier
             elapsed_ms: Milliseconds elapsed since round start
@@ -0,0 +1,149 @@
+"""In-memory history of crashed rounds."""
+import threading
+import time
+from collections import deque
+from itertools import islice
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.config import get_round_history_size
+
+
+class CrashedRound(NamedTuple):
+    """One crashed round as served by the history endpoint."""
+    round_id: int
+    crash_multiplier: Decimal
+    started_at: datetime
+    crashed_at: datetime
+    total_bets: int
+
+
+class RoundHistoryCache:
+    """
+    Ring buffer of the last crashed rounds, newest first.
+    
+    The round loop appends each round as it crashes, so history only
+    changes once per round. Encoded response bodies are kept per limit
+    until the next crash, together with an ETag made of the newest round
+    id and the number of rounds, which is the same on every worker
+    serving the same rounds.
+    
+    A worker that does not run the round loop never sees crashes; there
+    refresh_seconds makes the cache reload from the database once it is
+    that old.
+    """
+    
+    def __init__(self, max_rounds: int = 1000, refresh_seconds: Optional[float] = 1.0,
+                 max_bodies: int = 8, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize round history cache.
+        
+        Args:
+            max_rounds: Crashed rounds kept (the largest limit served from memory)
+            refresh_seconds: Age after which the rounds are reloaded (None
+                when this process runs the round loop and appends every crash)
+            max_bodies: Encoded bodies kept per version (distinct limits)
+            clock: Monotonic clock in seconds
+        """
+        self.max_rounds = max_rounds
+        self.refresh_seconds = refresh_seconds
+        self.max_bodies = max_bodies
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rounds: "deque[CrashedRound]" = deque(maxlen=max_rounds)
+        self._loaded_at: Optional[float] = None
+        # Bumped whenever the rounds change
+        self._version = 0
+        # limit -> (etag, body) of the current version
+        self._bodies: Dict[int, Tuple[str, bytes]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._rounds)
+    
+    def needs_load(self) -> bool:
+        """Whether the rounds must be (re)loaded from the database."""
+        if self._loaded_at is None:
+            return True
+        return (self.refresh_seconds is not None
+                and self.clock() - self._loaded_at >= self.refresh_seconds)
+    
+    def load(self, rounds: Iterable[CrashedRound]):
+        """
+        Replace the rounds with a backfill from the database.
+        
+        Args:
+            rounds: Latest crashed rounds, newest first
+        """
+        rounds = list(rounds)[:self.max_rounds]
+        with self._lock:
+            # Keep rounds appended while the backfill query ran
+            newest = rounds[0].round_id if rounds else 0
+            appended = [r for r in self._rounds if r.round_id > newest]
+            self._rounds = deque(appended + rounds, maxlen=self.max_rounds)
+            self._loaded_at = self.clock()
+            self._changed()
+    
+    def append(self, crashed_round: CrashedRound):
+        """
+        Add a round that just crashed.
+        
+        Args:
+            crashed_round: The round
+        """
+        with self._lock:
+            self._rounds.appendleft(crashed_round)
+            self._changed()
+    
+    def _changed(self):
+        """Drop the encoded bodies of the previous rounds (lock held)."""
+        self._version += 1
+        self._bodies = {}
+    
+    def latest(self, limit: int) -> List[CrashedRound]:
+        """Get the latest crashed rounds, newest first."""
+        with self._lock:
+            return list(islice(self._rounds, max(0, limit)))
+    
+    def body(self, limit: int, encode: Callable[[List[CrashedRound]], bytes]) -> Tuple[str, bytes]:
+        """
+        Get the encoded latest limit rounds.
+        
+        Args:
+            limit: Number of rounds
+            encode: Encoder of a list of rounds (called once per limit and crash)
+        
+        Returns:
+            (ETag, body)
+        """
+        cached = self._bodies.get(limit)
+        if cached is not None:
+            return cached
+        
+        with self._lock:
+            rounds = list(islice(self._rounds, max(0, limit)))
+            version = self._version
+        cached = (f'"{rounds[0].round_id if rounds else 0}-{len(rounds)}"', encode(rounds))
+        with self._lock:
+            # Only keep it if no round crashed while encoding
+            if version == self._version and len(self._bodies) < self.max_bodies:
+                self._bodies[limit] = cached
+        return cached
+    
+    def clear(self):
+        """Forget every round (the next request reloads them)."""
+        with self._lock:
+            self._rounds.clear()
+            self._loaded_at = None
+            self._changed()
+
+
+_round_history: Optional[RoundHistoryCache] = None
+
+
+def get_round_history() -> RoundHistoryCache:
+    """Get the process-wide round history cache."""
+    global _round_history
+    if _round_history is None:
+        _round_history = RoundHistoryCache(get_round_history_size())
+    return _round_history
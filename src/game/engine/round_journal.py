@@ -0,0 +1,393 @@
+"""Append-only binary journal of round events."""
+import os
+import struct
+import threading
+import time
+import zlib
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.game.engine.bet_store import ACTIVE, CASHED_OUT, CRASHED, PENDING, RoundBetStore
+
+RECORD_SIZE = 64
+
+# Header: type, currency, flags, crc32, round_id, timestamp_ns
+# Bet payload: user_id, bet_id, amount (minor units), multiplier (hundredths), aux
+_BET_RECORD = struct.Struct("<BBHIqqqqqii8x")
+# Round created payload: server seed (32 raw bytes), crash point (hundredths)
+_SEED_RECORD = struct.Struct("<BBHIqq32si4x")
+
+# Flags
+HAS_CLIENT_SEED = 1
+
+# Records are decoded in bulk with NumPy
+RECORD_DTYPE = np.dtype([
+    ("type", "u1"), ("currency", "u1"), ("flags", "<u2"), ("crc", "<u4"),
+    ("round_id", "<i8"), ("timestamp_ns", "<i8"), ("user_id", "<i8"),
+    ("bet_id", "<i8"), ("amount", "<i8"), ("multiplier", "<i4"),
+    ("aux", "<i4"), ("pad", "V8"),
+])
+_SEED_DTYPE = np.dtype([("header", "V24"), ("server_seed", "V32"),
+                        ("crash_hundredths", "<i4"), ("pad", "V4")])
+
+
+class EventType(IntEnum):
+    """Journal event types."""
+    ROUND_CREATED = 1
+    ROUND_STARTED = 2
+    BET_PLACED = 3
+    CASHOUT = 4
+    CASHOUTS_SETTLED = 5
+    CRASH = 6
+    ROUND_SETTLED = 7
+
+
+def _checksum(record: bytes) -> int:
+    """CRC32 of a record, skipping the crc field itself."""
+    return zlib.crc32(record[8:], zlib.crc32(record[:4]))
+
+
+class RoundJournal:
+    """
+    Buffered writer of fixed-size round event records.
+    
+    Records are appended to an in-memory buffer and written with one
+    write + fsync per flush, so the bet path only packs 64 bytes. The
+    round loop flushes once per tick; round and settlement events are
+    flushed immediately.
+    """
+    
+    def __init__(self, path: Path, segment_bytes: int = 64 * 1024 * 1024,
+                 max_buffered: int = 4096):
+        """
+        Open (or create) a journal.
+        
+        Args:
+            path: Journal file path
+            segment_bytes: Size after which the next round starts a new file
+            max_buffered: Records buffered before a flush is forced
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.max_buffered = max_buffered
+        
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file = self._open()
+    
+    def _open(self):
+        """Open the journal file, dropping torn records at its end."""
+        valid = len(read_records(self.path)) * RECORD_SIZE if self.path.exists() else 0
+        f = open(self.path, "ab")
+        if f.tell() != valid:
+            f.truncate(valid)
+            f.seek(0, os.SEEK_END)
+        return f
+    
+    @property
+    def records(self) -> int:
+        """Number of records written (including buffered ones)."""
+        return (self._file.tell() + len(self._buffer)) // RECORD_SIZE
+    
+    def _append(self, record: bytearray):
+        """Seal a packed record with its checksum and buffer it."""
+        struct.pack_into("<I", record, 4, _checksum(record))
+        with self._lock:
+            self._buffer += record
+            full = len(self._buffer) >= self.max_buffered * RECORD_SIZE
+        if full:
+            self.flush()
+    
+    def _append_bet_record(self, event_type: EventType, round_id: int, user_id: int = 0,
+                           bet_id: int = 0, amount: int = 0, multiplier: int = 0,
+                           aux: int = 0, currency: int = 0, timestamp_ns: Optional[int] = None):
+        """Pack and buffer a record with the bet payload layout."""
+        record = bytearray(RECORD_SIZE)
+        _BET_RECORD.pack_into(
+            record, 0, event_type, currency, 0, 0, round_id,
+            timestamp_ns or time.time_ns(), user_id, bet_id, amount, multiplier, aux
+        )
+        self._append(record)
+    
+    def round_created(self, round_id: int, server_seed: str, crash_hundredths: int,
+                      has_client_seed: bool = False):
+        """
+        Record a new round.
+        
+        Client seeds have no fixed size and are stored with the round in
+        the database; only their presence is journaled.
+        
+        Args:
+            round_id: Round ID
+            server_seed: Server seed (64 hex chars)
+            crash_hundredths: Crash point in hundredths
+            has_client_seed: Whether the round uses a client seed
+        """
+        if self._file.tell() + len(self._buffer) >= self.segment_bytes:
+            self.rotate()
+        
+        record = bytearray(RECORD_SIZE)
+        _SEED_RECORD.pack_into(
+            record, 0, EventType.ROUND_CREATED, 0, HAS_CLIENT_SEED if has_client_seed else 0,
+            0, round_id, time.time_ns(), bytes.fromhex(server_seed), crash_hundredths
+        )
+        self._append(record)
+        self.flush()
+    
+    def round_started(self, round_id: int):
+        """Record the end of the countdown."""
+        self._append_bet_record(EventType.ROUND_STARTED, round_id)
+        self.flush()
+    
+    def bet_placed(self, store: RoundBetStore, slot: int):
+        """
+        Record a placed bet.
+        
+        Args:
+            store: Round bet store
+            slot: Slot of the bet
+        """
+        self._append_bet_record(
+            EventType.BET_PLACED, store.round_id,
+            user_id=int(store.user_id[slot]),
+            bet_id=int(store.bet_id[slot]),
+            amount=int(store.amount[slot]),
+            aux=int(store.auto_cashout[slot]),
+            currency=int(store.currency[slot]),
+            timestamp_ns=int(store.placed_at_ns[slot]),
+        )
+    
+    def cashout(self, round_id: int, user_id: int, multiplier_hundredths: int):
+        """Record an acknowledged cashout."""
+        self._append_bet_record(EventType.CASHOUT, round_id, user_id=user_id,
+                                multiplier=multiplier_hundredths)
+    
+    def cashouts_settled(self, round_id: int, count: int):
+        """Record that the next count journaled cashouts were persisted."""
+        self._append_bet_record(EventType.CASHOUTS_SETTLED, round_id, aux=count)
+        self.flush()
+    
+    def crash(self, round_id: int, crash_hundredths: int):
+        """Record a crash."""
+        self._append_bet_record(EventType.CRASH, round_id, multiplier=crash_hundredths)
+    
+    def round_settled(self, round_id: int):
+        """Record that the crash was persisted."""
+        self._append_bet_record(EventType.ROUND_SETTLED, round_id)
+        self.flush()
+    
+    def flush(self, fsync: bool = True):
+        """
+        Write buffered records.
+        
+        Args:
+            fsync: Whether to fsync after writing
+        """
+        with self._lock:
+            if not self._buffer:
+                return
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+    
+    def rotate(self):
+        """Archive the current file and start a new one."""
+        self.flush()
+        with self._lock:
+            self._file.close()
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.{time.time_ns()}"))
+            self._file = self._open()
+    
+    def close(self):
+        """Flush and close the journal."""
+        self.flush()
+        self._file.close()
+
+
+def read_records(path: Path) -> np.ndarray:
+    """
+    Read the valid records of a journal file.
+    
+    Reading stops at the first record whose checksum does not match (a
+    torn write at the end of the file). Records are only appended, and a
+    ROUND_CREATED record is flushed on its own, so everything before the
+    last intact ROUND_CREATED was written before it: checksums are only
+    verified from there on, and the cost of opening and replaying the
+    journal follows the size of the last round, not of the segment.
+    
+    Args:
+        path: Journal file path
+    
+    Returns:
+        Structured array of RECORD_DTYPE
+    """
+    data = Path(path).read_bytes()
+    data = data[:len(data) - len(data) % RECORD_SIZE]
+    records = np.frombuffer(data, dtype=RECORD_DTYPE)
+    
+    view = memoryview(data)
+    crcs = records["crc"]
+    
+    start = 0
+    for index in np.flatnonzero(records["type"] == EventType.ROUND_CREATED)[::-1].tolist():
+        offset = index * RECORD_SIZE
+        if _checksum(view[offset:offset + RECORD_SIZE]) == crcs[index]:
+            start = index + 1
+            break
+    
+    for index in range(start, len(records)):
+        offset = index * RECORD_SIZE
+        if _checksum(view[offset:offset + RECORD_SIZE]) != crcs[index]:
+            return records[:index]
+    return records
+
+
+def describe(record) -> Dict:
+    """
+    Convert a record to a readable dict.
+    
+    Args:
+        record: Element of a RECORD_DTYPE array
+    
+    Returns:
+        Event dictionary
+    """
+    event_type = EventType(int(record["type"]))
+    event = {
+        "type": event_type.name.lower(),
+        "round_id": int(record["round_id"]),
+        "timestamp_ns": int(record["timestamp_ns"]),
+    }
+    if event_type == EventType.ROUND_CREATED:
+        seed = np.frombuffer(record.tobytes(), dtype=_SEED_DTYPE)[0]
+        event["server_seed"] = seed["server_seed"].tobytes().hex()
+        event["crash_hundredths"] = int(seed["crash_hundredths"])
+        event["has_client_seed"] = bool(record["flags"] & HAS_CLIENT_SEED)
+    elif event_type == EventType.BET_PLACED:
+        event.update(user_id=int(record["user_id"]), bet_id=int(record["bet_id"]),
+                     amount=int(record["amount"]), currency=int(record["currency"]),
+                     auto_cashout=int(record["aux"]))
+    elif event_type == EventType.CASHOUT:
+        event.update(user_id=int(record["user_id"]), multiplier=int(record["multiplier"]))
+    elif event_type == EventType.CRASH:
+        event["crash_hundredths"] = int(record["multiplier"])
+    elif event_type == EventType.CASHOUTS_SETTLED:
+        event["count"] = int(record["aux"])
+    return event
+
+
+class ReplayState:
+    """State of the last round in a journal, rebuilt by replay()."""
+    
+    def __init__(self):
+        """Initialize an empty state."""
+        self.offset = 0
+        self.round_id: Optional[int] = None
+        self.server_seed: Optional[str] = None
+        self.has_client_seed = False
+        self.crash_hundredths: Optional[int] = None
+        self.created_at_ns: Optional[int] = None
+        self.started_at_ns: Optional[int] = None
+        self.crashed_at_ns: Optional[int] = None
+        self.settled = False
+        self.store: Optional[RoundBetStore] = None
+        # Slots of cashouts not covered by the CASHOUTS_SETTLED counts
+        self.unsettled_cashouts: List[int] = []
+    
+    @property
+    def in_flight(self) -> bool:
+        """Whether the round was interrupted before it was settled."""
+        return self.round_id is not None and not self.settled
+
+
+def replay(path: Path, stop: Optional[int] = None) -> ReplayState:
+    """
+    Rebuild the state of the last round up to a record offset.
+    
+    Args:
+        path: Journal file path
+        stop: Number of records to replay (all if omitted)
+    
+    Returns:
+        Replayed state
+    """
+    records = read_records(path)[:stop]
+    state = ReplayState()
+    state.offset = len(records)
+    
+    created = np.flatnonzero(records["type"] == EventType.ROUND_CREATED)
+    if not len(created):
+        return state
+    
+    start = int(created[-1])
+    head = describe(records[start])
+    state.round_id = head["round_id"]
+    state.server_seed = head["server_seed"]
+    state.crash_hundredths = head["crash_hundredths"]
+    state.has_client_seed = head["has_client_seed"]
+    state.created_at_ns = head["timestamp_ns"]
+    
+    records = records[start:]
+    types = records["type"]
+    
+    for event_type, attribute in ((EventType.ROUND_STARTED, "started_at_ns"),
+                                  (EventType.CRASH, "crashed_at_ns")):
+        found = np.flatnonzero(types == event_type)
+        if len(found):
+            setattr(state, attribute, int(records["timestamp_ns"][found[0]]))
+    state.settled = bool(np.any(types == EventType.ROUND_SETTLED))
+    
+    # Bets, in placement order
+    bets = records[types == EventType.BET_PLACED]
+    store = RoundBetStore(state.round_id, capacity=max(1024, len(bets)))
+    size = len(bets)
+    store.size = size
+    store.user_id[:size] = bets["user_id"]
+    store.bet_id[:size] = bets["bet_id"]
+    store.amount[:size] = bets["amount"]
+    store.currency[:size] = bets["currency"]
+    store.auto_cashout[:size] = bets["aux"]
+    store.placed_at_ns[:size] = bets["timestamp_ns"]
+    store.status[:size] = ACTIVE if state.started_at_ns is not None else PENDING
+    store.slots = dict(zip(store.user_id[:size].tolist(), range(size)))
+    
+    # Cashouts, and the ones not yet persisted
+    cashout_index = np.flatnonzero(types == EventType.CASHOUT)
+    # Batches commit in acknowledgement order, so the settled ones are a prefix
+    settled_count = int(records["aux"][types == EventType.CASHOUTS_SETTLED].sum())
+    
+    slots = np.array([store.slots[user_id] for user_id in records["user_id"][cashout_index].tolist()],
+                     dtype=np.int64)
+    if len(slots):
+        store.status[slots] = CASHED_OUT
+        store.cashout_multiplier[slots] = records["multiplier"][cashout_index]
+    state.unsettled_cashouts = slots[settled_count:].tolist()
+    
+    if state.crashed_at_ns is not None:
+        status = store.status[:size]
+        status[status == ACTIVE] = CRASHED
+    
+    state.store = store
+    return state
+
+
+def iter_events(path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Iterate over journal events as dicts.
+    
+    Args:
+        path: Journal file path
+        start: First record offset
+        stop: Record offset to stop at
+    
+    Yields:
+        Event dictionaries
+    """
+    for record in read_records(path)[start:stop]:
+        yield describe(record)
@@ -0,0 +1,186 @@
+"""Pre-generated provably fair seed chain."""
+import hashlib
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.game.engine.provably_fair import ProvablyFair
+
+DIGEST_SIZE = 32
+
+
+class SeedChainExhausted(ValueError):
+    """Every seed of the chain was handed out; a new chain is needed."""
+
+
+def generate_chain(path: Path, length: int, root_seed: Optional[str] = None,
+                   batch_size: int = 65536) -> str:
+    """
+    Generate a reverse hash chain file.
+    
+    Entry 0 is a random root seed and every following entry is
+    ProvablyFair.hash_seed of the previous one, stored as raw 32-byte
+    digests. Rounds consume the file from the end, so each round's seed
+    hashes to the previous round's seed and the first round's seed hashes
+    to the terminus.
+    
+    Args:
+        path: Chain file path
+        length: Number of seeds
+        root_seed: 64 hex char root seed (random if omitted)
+        batch_size: Digests written per file write
+    
+    Returns:
+        Chain terminus (hash of the first seed to be played)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    
+    digest = bytes.fromhex(root_seed or ProvablyFair.generate_server_seed())
+    sha256 = hashlib.sha256
+    
+    with open(tmp_path, "wb") as f:
+        batch = bytearray()
+        for _ in range(length):
+            batch += digest
+            digest = sha256(digest.hex().encode()).digest()
+            if len(batch) >= batch_size * DIGEST_SIZE:
+                f.write(batch)
+                batch.clear()
+        f.write(batch)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    os.replace(tmp_path, path)
+    SeedChain.position_path_for(path).unlink(missing_ok=True)
+    
+    return digest.hex()
+
+
+class SeedChain:
+    """
+    Memory-mapped reverse hash chain of server seeds.
+    
+    Hands out the next (server_seed, server_seed_hash) pair in O(1). The
+    position is persisted before a seed is handed out, so a restart never
+    replays a seed.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Open a chain file.
+        
+        Args:
+            path: Chain file written by generate_chain
+        """
+        self.path = Path(path)
+        self.position_path = self.position_path_for(self.path)
+        self._lock = threading.Lock()
+        
+        size = self.path.stat().st_size
+        if size == 0 or size % DIGEST_SIZE:
+            raise ValueError(f"Invalid seed chain file: {self.path}")
+        self.length = size // DIGEST_SIZE
+        
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        self.position = 0
+        if self.position_path.exists():
+            self.position = int(self.position_path.read_text().strip() or 0)
+    
+    @staticmethod
+    def position_path_for(path: Path) -> Path:
+        """Get the file storing the chain position."""
+        path = Path(path)
+        return path.with_name(path.name + ".pos")
+    
+    def seed_at(self, index: int) -> str:
+        """
+        Get the server seed of the index-th round played from this chain.
+        
+        Args:
+            index: Round index (0 is the first round)
+        
+        Returns:
+            Server seed (64 hex chars)
+        """
+        if not 0 <= index < self.length:
+            raise IndexError(f"Seed index out of range: {index}")
+        
+        offset = (self.length - 1 - index) * DIGEST_SIZE
+        return self._mmap[offset:offset + DIGEST_SIZE].hex()
+    
+    @property
+    def terminus(self) -> str:
+        """Hash of the first seed; published so every round can be verified."""
+        return ProvablyFair.hash_seed(self.seed_at(0))
+    
+    @property
+    def remaining(self) -> int:
+        """Number of seeds not handed out yet."""
+        return self.length - self.position
+    
+    def _save_position(self):
+        """Persist the chain position atomically and durably."""
+        tmp_path = self.position_path.with_name(self.position_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(str(self.position))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.position_path)
+        
+        # The rename only survives a crash once the directory is synced
+        dir_fd = os.open(self.position_path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
+    def next(self) -> Tuple[str, str]:
+        """
+        Take the next seed.
+        
+        Returns:
+            (server_seed, server_seed_hash)
+        
+        Raises:
+            SeedChainExhausted: If every seed was handed out
+        """
+        with self._lock:
+            if self.position >= self.length:
+                raise SeedChainExhausted(f"Seed chain exhausted: {self.path}")
+            
+            seed = self.seed_at(self.position)
+            self.position += 1
+            self._save_position()
+        
+        return seed, ProvablyFair.hash_seed(seed)
+    
+    def close(self):
+        """Close the memory map."""
+        self._mmap.close()
+        self._file.close()
+    
+    @staticmethod
+    def verify_seed(server_seed: str, terminus: str, max_steps: int) -> Optional[int]:
+        """
+        Verify a revealed seed belongs to a published chain.
+        
+        Args:
+            server_seed: Revealed server seed
+            terminus: Published chain terminus
+            max_steps: Maximum number of hashes to try (chain length)
+        
+        Returns:
+            Round index of the seed within the chain, or None
+        """
+        current = server_seed
+        for index in range(max_steps):
+            current = ProvablyFair.hash_seed(current)
+            if current == terminus:
+                return index
+        return None
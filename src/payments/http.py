@@ -0,0 +1,19 @@
+"""HTTP client of the payment integrations."""
+
+
+def client_session(**kwargs):
+    """
+    Open an aiohttp client session.
+    
+    aiohttp is slow to load and only payment calls use it, so it is
+    imported here on first use instead of when the API process starts.
+    
+    Args:
+        **kwargs: aiohttp.ClientSession arguments
+    
+    Returns:
+        Client session (an async context manager)
+    """
+    import aiohttp
+    
+    return aiohttp.ClientSession(**kwargs)
@@ -2,12 +2,12 @@
 from decimal import Decimal
 from typing import Optional, Dict
 from datetime import datetime
-import aiohttp
 import hmac
 import hashlib
 import json
 
 from src.config import get_telegram_config
+from src.payments.http import client_session
 
 
 class StarsIntegration:
@@ -52,7 +52,7 @@ class StarsIntegration:
             }]
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with client_session() as session:
             async with session.post(url, json=payload) as response:
                 data = await response.json()
                 if data.get("ok"):
@@ -136,7 +136,7 @@ class StarsIntegration:
             "ok": True
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with client_session() as session:
             async with session.post(url, json=payload) as response:
                 data = await response.json()
                 return data.get("ok", False)
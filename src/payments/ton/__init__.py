@@ -1,10 +1,11 @@
 """TON payment integration package."""
 from src.payments.ton.integration import TONIntegration
 from src.payments.ton.wallet import TONWallet
-from src.payments.ton.transactions import TONTransactionProcessor
+from src.payments.ton.transactions import AsyncTONTransactionProcessor, TONTransactionProcessor
 
 __all__ = [
     "TONIntegration",
     "TONWallet",
     "TONTransactionProcessor",
+    "AsyncTONTransactionProcessor",
 ]
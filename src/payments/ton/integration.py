@@ -3,9 +3,9 @@ from decimal import Decimal
 from typing import Optional, Dict, List
 from datetime import datetime
 import asyncio
-import aiohttp
 
 from src.config import get_ton_api_key, get_ton_wallet_mnemonic
+from src.payments.http import client_session
 
 
 class TONIntegration:
@@ -54,7 +54,7 @@ class TONIntegration:
         Returns:
             Balance in TON
         """
-        async with aiohttp.ClientSession() as session:
+        async with client_session() as session:
             url = f"{self.api_url}/getAddressInformation"
             params = {"address": address}
             if self.api_key:
@@ -104,7 +104,7 @@ class TONIntegration:
         Returns:
             Transaction data or None
         """
-        async with aiohttp.ClientSession() as session:
+        async with client_session() as session:
             url = f"{self.api_url}/getTransactions"
             params = {"hash": tx_hash}
             if self.api_key:
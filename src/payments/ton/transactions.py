@@ -2,15 +2,18 @@
 from decimal import Decimal
 from typing import Optional, Dict, List
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.payments.ton.integration import TONIntegration
 from src.payments.ton.wallet import TONWallet
 from src.database.models.payment import Payment, PaymentStatus, PaymentMethod
 from src.database.models.transaction import Transaction, TransactionType
-from src.database.repositories.payment_repo import PaymentRepository
-from src.database.repositories.transaction_repo import TransactionRepository
-from src.database.repositories.user_repo import UserRepository
+from src.database.repositories.payment_repo import AsyncPaymentRepository, PaymentRepository
+from src.database.repositories.transaction_repo import (
+    AsyncTransactionRepository, TransactionRepository
+)
+from src.database.repositories.user_repo import AsyncUserRepository, UserRepository
 
 
 class TONTransactionProcessor:
@@ -235,3 +238,126 @@ class TONTransactionProcessor:
                         break
         
         await self.ton_integration.monitor_address(address, handle_deposit)
+
+
+class AsyncTONTransactionProcessor:
+    """Process TON withdrawals on an async session (API routes)."""
+    
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize transaction processor.
+        
+        Args:
+            db: Async database session
+        """
+        self.db = db
+        self.ton_integration = TONIntegration()
+        self.payment_repo = AsyncPaymentRepository(db)
+        self.transaction_repo = AsyncTransactionRepository(db)
+        self.user_repo = AsyncUserRepository(db)
+    
+    async def process_withdrawal(self, payment_id: int) -> Optional[str]:
+        """
+        Process a withdrawal transaction.
+        
+        Args:
+            payment_id: Payment ID
+        
+        Returns:
+            Transaction hash or None if failed
+        """
+        payment = await self.payment_repo.get_by_id(payment_id)
+        if not payment:
+            return None
+        
+        if payment.status != PaymentStatus.PENDING:
+            return None
+        
+        if not payment.ton_address:
+            await self.payment_repo.update_status(
+                payment_id, PaymentStatus.FAILED,
+                error_message="No withdrawal address provided"
+            )
+            return None
+        
+        # Check user balance
+        user = await self.user_repo.get_by_id(payment.user_id)
+        if not user:
+            await self.payment_repo.update_status(
+                payment_id, PaymentStatus.FAILED,
+                error_message="User not found"
+            )
+            return None
+        
+        balance = user.balance_ton if payment.currency == "TON" else user.balance_stars
+        if balance < payment.amount:
+            await self.payment_repo.update_status(
+                payment_id, PaymentStatus.FAILED,
+                error_message="Insufficient balance"
+            )
+            return None
+        
+        # Update payment status
+        await self.payment_repo.update_status(payment_id, PaymentStatus.PROCESSING)
+        
+        # Deduct balance
+        if payment.currency == "TON":
+            await self.user_repo.update_balance(payment.user_id, amount_ton=-payment.amount)
+        else:
+            await self.user_repo.update_balance(payment.user_id, amount_stars=-payment.amount)
+        
+        # Create transaction record
+        balance_before = balance
+        balance_after = balance_before - payment.amount
+        
+        await self.transaction_repo.create(
+            user_id=payment.user_id,
+            transaction_type=TransactionType.WITHDRAWAL,
+            currency=payment.currency,
+            amount=-payment.amount,
+            balance_before=balance_before,
+            balance_after=balance_after,
+            description=f"TON withdrawal: {payment.net_amount} {payment.currency}",
+            payment_id=payment_id,
+        )
+        
+        # Send transaction
+        try:
+            tx_hash = await self.ton_integration.send_transaction(
+                payment.ton_address,
+                payment.net_amount,
+                comment=f"Withdrawal for user {payment.user_id}"
+            )
+            
+            # Update payment with transaction hash
+            await self.payment_repo.update_status(
+                payment_id, PaymentStatus.COMPLETED,
+                external_tx_hash=tx_hash
+            )
+            
+            # Update user statistics
+            if payment.currency == "TON":
+                await self.user_repo.update_statistics(
+                    payment.user_id,
+                    total_withdrawn_ton=user.total_withdrawn_ton + payment.amount
+                )
+            else:
+                await self.user_repo.update_statistics(
+                    payment.user_id,
+                    total_withdrawn_stars=user.total_withdrawn_stars + payment.amount
+                )
+            
+            return tx_hash
+        
+        except Exception as e:
+            # Refund balance on failure
+            if payment.currency == "TON":
+                await self.user_repo.update_balance(payment.user_id, amount_ton=payment.amount)
+            else:
+                await self.user_repo.update_balance(payment.user_id, amount_stars=payment.amount)
+            
+            await self.payment_repo.update_status(
+                payment_id, PaymentStatus.FAILED,
+                error_message=str(e)
+            )
+            return None
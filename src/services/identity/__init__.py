@@ -0,0 +1,10 @@
+"""Authenticated identity caching."""
+from src.services.identity.identity_cache import (
+    TOPIC_IDENTITY,
+    IdentityCache,
+    get_identity_cache,
+    invalidate_user_everywhere,
+)
+from src.services.identity.telegram_init_data import InitDataVerifier, get_init_data_verifier
+__all__ = ["TOPIC_IDENTITY", "IdentityCache", "get_identity_cache", "invalidate_user_everywhere",
+           "InitDataVerifier", "get_init_data_verifier"]
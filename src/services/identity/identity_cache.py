@@ -0,0 +1,144 @@
+"""In-memory cache of resolved access tokens."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from src.config import get_auth_cache_max_entries, get_auth_cache_ttl_seconds
+from src.services.realtime.fanout import get_fanout_backend
+
+# Fan-out topic of identity invalidations (no socket subscribes to it)
+TOPIC_IDENTITY = "identity"
+
+
+class IdentityCache:
+    """
+    Map access tokens to the user they resolve to, with a TTL and LRU bound.
+    
+    A hit costs one dict lookup instead of a JWT decode and a user query.
+    Entries never outlive their token and are dropped for a user when the
+    user is banned, on every worker (see invalidate_user_everywhere), so a
+    ban takes effect on the next request.
+    """
+    
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 300.0):
+        """
+        Initialize identity cache.
+        
+        Args:
+            max_entries: Tokens kept before the least recently used are evicted
+            ttl_seconds: Seconds an entry is trusted
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # token -> (monotonic expiry, identity), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        # telegram_user_id -> cached tokens
+        self._tokens: Dict[int, Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Get the identity a token resolved to.
+        
+        Args:
+            token: Access token
+        
+        Returns:
+            {"id", "telegram_user_id"} or None if not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(token)
+                return None
+            self._entries.move_to_end(token)
+            return entry[1]
+    
+    def put(self, token: str, identity: Dict, expires_at: Optional[float] = None):
+        """
+        Cache the identity of a token.
+        
+        Args:
+            token: Access token
+            identity: {"id", "telegram_user_id"}
+            expires_at: Unix time the token expires at (caps the TTL)
+        """
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (time.monotonic() + ttl, identity)
+            self._tokens.setdefault(identity["telegram_user_id"], set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+    
+    def invalidate_user(self, telegram_user_id: int) -> int:
+        """
+        Drop every cached token of a user.
+        
+        Args:
+            telegram_user_id: Telegram user ID
+        
+        Returns:
+            Number of tokens dropped
+        """
+        with self._lock:
+            tokens = self._tokens.pop(telegram_user_id, ())
+            for token in tokens:
+                self._entries.pop(token, None)
+            return len(tokens)
+    
+    def deliver_invalidation(self, frame: str, guaranteed: bool, topic: str):
+        """Fan-out subscriber dropping the tokens of a user invalidated on any worker."""
+        if topic == TOPIC_IDENTITY:
+            self.invalidate_user(int(frame))
+    
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens.clear()
+    
+    def _drop(self, token: str):
+        """Remove a token from both indexes (lock held)."""
+        _, identity = self._entries.pop(token)
+        tokens = self._tokens.get(identity["telegram_user_id"])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens[identity["telegram_user_id"]]
+
+
+_identity_cache: Optional[IdentityCache] = None
+
+
+def get_identity_cache() -> IdentityCache:
+    """Get the process-wide identity cache."""
+    global _identity_cache
+    if _identity_cache is None:
+        _identity_cache = IdentityCache(get_auth_cache_max_entries(), get_auth_cache_ttl_seconds())
+    return _identity_cache
+
+
+async def invalidate_user_everywhere(telegram_user_id: int):
+    """
+    Drop a user's cached tokens on this worker and, through the fan-out
+    backend, on every other worker.
+    
+    Args:
+        telegram_user_id: Telegram user ID
+    """
+    get_identity_cache().invalidate_user(telegram_user_id)
+    await get_fanout_backend().publish(str(telegram_user_id), guaranteed=True,
+                                       topic=TOPIC_IDENTITY)
@@ -0,0 +1,136 @@
+"""Telegram Mini App init data verification."""
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import parse_qsl
+
+from src.config import (
+    get_auth_cache_max_entries,
+    get_telegram_config,
+    get_telegram_init_data_max_age_seconds,
+)
+
+
+def derive_secret_key(bot_token: str) -> bytes:
+    """WebApp secret key: HMAC-SHA256 of the bot token keyed with "WebAppData"."""
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
+
+def sign_init_data(fields: Dict[str, str], secret_key: bytes) -> str:
+    """
+    Compute the hash of init data fields (the data-check-string HMAC).
+    
+    Args:
+        fields: Init data fields other than hash
+        secret_key: Key from derive_secret_key
+    
+    Returns:
+        Hex digest
+    """
+    data_check_string = "\n".join(f"{key}={value}" for key, value in sorted(fields.items()))
+    return hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+
+
+class InitDataVerifier:
+    """
+    Verify X-Telegram-Init-Data headers and remember the verified ones.
+    
+    The secret key is derived once from the bot token. Verified init data
+    is cached by a digest of the raw header until its auth_date expires
+    (LRU-bounded), so repeat requests skip the HMAC and the JSON parse.
+    """
+    
+    def __init__(self, bot_token: str, max_age_seconds: int = 86400,
+                 max_entries: int = 100_000):
+        """
+        Initialize init data verifier.
+        
+        Args:
+            bot_token: Telegram bot token (empty rejects all init data)
+            max_age_seconds: Seconds after auth_date the data is accepted
+            max_entries: Verified headers kept before the least recently used are evicted
+        """
+        self.secret_key = derive_secret_key(bot_token) if bot_token else None
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # header digest -> {"user", "auth_date", "expires_at"}, least recently used first
+        self._verified: "OrderedDict[bytes, Dict]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._verified)
+    
+    def verify(self, init_data: str) -> Optional[Dict]:
+        """
+        Verify init data.
+        
+        Args:
+            init_data: Raw query string from the Mini App
+        
+        Returns:
+            {"user": Telegram user data, "auth_date", "expires_at"} (Unix
+            times) or None if the signature is wrong or the data expired
+        """
+        digest = hashlib.blake2b(init_data.encode(), digest_size=16).digest()
+        now = time.time()
+        with self._lock:
+            verified = self._verified.get(digest)
+            if verified is not None:
+                if verified["expires_at"] > now:
+                    self._verified.move_to_end(digest)
+                    return verified
+                del self._verified[digest]
+        
+        verified = self._check(init_data, now)
+        if verified is None:
+            return None
+        
+        with self._lock:
+            self._verified[digest] = verified
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+        return verified
+    
+    def _check(self, init_data: str, now: float) -> Optional[Dict]:
+        """Check the signature and age of init data and parse the user."""
+        if self.secret_key is None:
+            return None
+        
+        fields = dict(parse_qsl(init_data, keep_blank_values=True))
+        received_hash = fields.pop("hash", "").encode()
+        if not hmac.compare_digest(sign_init_data(fields, self.secret_key).encode(), received_hash):
+            return None
+        
+        try:
+            auth_date = int(fields["auth_date"])
+            user = json.loads(fields["user"])
+        except (KeyError, ValueError):
+            return None
+        expires_at = auth_date + self.max_age_seconds
+        if expires_at <= now or not isinstance(user, dict) or "id" not in user:
+            return None
+        return {"user": user, "auth_date": auth_date, "expires_at": expires_at}
+    
+    def clear(self):
+        """Forget every verified header."""
+        with self._lock:
+            self._verified.clear()
+
+
+_init_data_verifier: Optional[InitDataVerifier] = None
+
+
+def get_init_data_verifier() -> InitDataVerifier:
+    """Get the process-wide init data verifier."""
+    global _init_data_verifier
+    if _init_data_verifier is None:
+        _init_data_verifier = InitDataVerifier(
+            get_telegram_config()["bot_token"],
+            get_telegram_init_data_max_age_seconds(),
+            get_auth_cache_max_entries(),
+        )
+    return _init_data_verifier
@@ -0,0 +1,3 @@
+"""Metrics services."""
+from src.services.metrics.metrics_service import MetricsService, get_metrics
+__all__ = ["MetricsService", "get_metrics"]
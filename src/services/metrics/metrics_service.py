@@ -0,0 +1,113 @@
+"""In-process metrics service."""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class MetricsService:
+    """
+    Collect counters, gauges and timing summaries in memory.
+    
+    Summaries keep count, sum, min, max and the last observation, which is
+    enough for dashboards polling /metrics without a metrics backend.
+    """
+    
+    def __init__(self):
+        """Initialize metrics service."""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, Dict[str, float]] = {}
+    
+    def increment(self, name: str, value: float = 1):
+        """
+        Increment a counter.
+        
+        Args:
+            name: Metric name
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def set_gauge(self, name: str, value: float):
+        """
+        Set a gauge.
+        
+        Args:
+            name: Metric name
+            value: Current value
+        """
+        with self._lock:
+            self._gauges[name] = value
+    
+    def observe(self, name: str, value: float):
+        """
+        Record an observation in a summary.
+        
+        Args:
+            name: Metric name
+            value: Observed value
+        """
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = {
+                    "count": 1, "sum": value, "min": value, "max": value, "last": value,
+                }
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+    
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Observe the duration of a block in milliseconds.
+        
+        Args:
+            name: Metric name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+    
+    def get_summary(self, name: str) -> Optional[Dict[str, float]]:
+        """Get a copy of a summary or None if nothing was observed."""
+        with self._lock:
+            summary = self._summaries.get(name)
+            return dict(summary) if summary else None
+    
+    def snapshot(self) -> Dict:
+        """
+        Get all metrics.
+        
+        Returns:
+            {"counters", "gauges", "summaries"}
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {name: dict(s) for name, s in self._summaries.items()},
+            }
+    
+    def reset(self):
+        """Drop all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+_metrics = MetricsService()
+
+
+def get_metrics() -> MetricsService:
+    """Get the process-wide metrics service."""
+    return _metrics
@@ -0,0 +1,49 @@
+"""Realtime connection services."""
+from src.services.realtime.client_connection import ClientConnection
+from src.services.realtime.connection_registry import (
+    TOPIC_LEADERBOARD,
+    TOPIC_LIVE_BETS,
+    TOPIC_PERSONAL,
+    TOPIC_ROUND,
+    TOPIC_TOP_BETS,
+    TOPICS,
+    ConnectionRegistry,
+)
+from src.services.realtime.fanout import (
+    FanoutBackend,
+    LocalFanout,
+    RedisFanout,
+    UnixSocketFanout,
+    create_fanout_backend,
+    get_fanout_backend,
+    use_fanout_backend,
+)
+from src.services.realtime.round_commands import (
+    TOPIC_ROUND_COMMANDS,
+    TOPIC_ROUND_REPLIES,
+    RemoteRoundManager,
+    RoundCommandServer,
+    RoundLoopUnavailable,
+)
+__all__ = [
+    "ClientConnection",
+    "ConnectionRegistry",
+    "TOPICS",
+    "TOPIC_LEADERBOARD",
+    "TOPIC_LIVE_BETS",
+    "TOPIC_PERSONAL",
+    "TOPIC_ROUND",
+    "TOPIC_TOP_BETS",
+    "FanoutBackend",
+    "LocalFanout",
+    "RedisFanout",
+    "UnixSocketFanout",
+    "create_fanout_backend",
+    "get_fanout_backend",
+    "use_fanout_backend",
+    "TOPIC_ROUND_COMMANDS",
+    "TOPIC_ROUND_REPLIES",
+    "RemoteRoundManager",
+    "RoundCommandServer",
+    "RoundLoopUnavailable",
+]
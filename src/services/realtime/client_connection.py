@@ -0,0 +1,169 @@
+"""Outbound queue and writer task of one WebSocket connection."""
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional, Union
+
+from src.services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to evicted slow consumers ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ClientConnection:
+    """
+    Bounded send queue of one WebSocket, drained by its own writer task.
+    
+    Enqueueing never awaits, so a stalled client only delays itself.
+    Tick frames are coalesced: a newer tick replaces an undelivered one.
+    Event frames (bets, crashes) are always delivered, in order with the
+    ticks around them. A connection that cannot keep up (events past the
+    queue size or ticks being dropped) for longer than evict_after_s is
+    closed.
+    """
+    
+    def __init__(self, websocket, user_id: int, binary: bool = False,
+                 max_queue: int = 64, evict_after_s: float = 5.0,
+                 on_close: Optional[Callable[["ClientConnection"], None]] = None):
+        """
+        Initialize client connection.
+        
+        Args:
+            websocket: Accepted WebSocket
+            user_id: User ID
+            binary: Whether the client negotiated the binary protocol
+            max_queue: Event frames queued before the client counts as slow
+            evict_after_s: Seconds a client may stay slow before it is closed
+            on_close: Called once when the connection closes
+        """
+        self.websocket = websocket
+        self.user_id = user_id
+        self.binary = binary
+        self.max_queue = max_queue
+        self.evict_after_s = evict_after_s
+        self.on_close = on_close
+        # Set by ConnectionRegistry
+        self.connection_id: Optional[int] = None
+        self.topics = set()
+        # Whether user_id was proven with a token (required for game commands)
+        self.authenticated = False
+        # Token that proved user_id, re-resolved before each game command
+        self.token: Optional[str] = None
+        
+        # (sequence, frame) entries; ticks only keep the latest
+        self.events = deque()
+        self.tick = None
+        self._sequence = 0
+        self._wakeup = asyncio.Event()
+        
+        self.slow_since: Optional[float] = None
+        self.dropped = 0
+        self.closed = False
+        self._writer: Optional[asyncio.Task] = None
+    
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting to be sent."""
+        return len(self.events) + (self.tick is not None)
+    
+    def start(self):
+        """Start the writer task."""
+        self._writer = asyncio.create_task(self._run())
+    
+    def send_tick(self, frame: Union[str, bytes]):
+        """
+        Queue a tick frame, replacing an undelivered older one.
+        
+        Args:
+            frame: Pre-serialized frame
+        """
+        if self.closed:
+            return
+        if self.tick is not None:
+            self.dropped += 1
+            get_metrics().increment("ws_frames_dropped")
+            self._mark_slow()
+        self._sequence += 1
+        self.tick = (self._sequence, frame)
+        self._wakeup.set()
+    
+    def send_event(self, frame: Union[str, bytes]):
+        """
+        Queue a frame that must be delivered.
+        
+        Args:
+            frame: Pre-serialized frame
+        """
+        if self.closed:
+            return
+        self._sequence += 1
+        self.events.append((self._sequence, frame))
+        if len(self.events) > self.max_queue:
+            self._mark_slow()
+        self._wakeup.set()
+    
+    def _mark_slow(self):
+        """Track how long the client has been unable to keep up."""
+        now = time.monotonic()
+        if self.slow_since is None:
+            self.slow_since = now
+        elif now - self.slow_since > self.evict_after_s:
+            get_metrics().increment("ws_evictions")
+            logger.info("Evicting slow WebSocket client of user %s (%d frames queued)",
+                        self.user_id, self.depth)
+            self.close(SLOW_CONSUMER_CLOSE_CODE)
+    
+    def _next_frame(self):
+        """Pop the oldest queued frame."""
+        if self.tick is not None and (not self.events or self.tick[0] < self.events[0][0]):
+            frame, self.tick = self.tick[1], None
+            return frame
+        return self.events.popleft()[1]
+    
+    async def _run(self):
+        """Send queued frames until the connection closes."""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self.events or self.tick is not None:
+                    frame = self._next_frame()
+                    if isinstance(frame, bytes):
+                        await self.websocket.send_bytes(frame)
+                    else:
+                        await self.websocket.send_text(frame)
+                self.slow_since = None
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            get_metrics().increment("ws_send_errors")
+            self.close()
+    
+    def close(self, code: Optional[int] = None):
+        """
+        Stop the writer and unregister the connection.
+        
+        Args:
+            code: Close code to send to the client (None if it already left)
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.events.clear()
+        self.tick = None
+        
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+        if self.on_close is not None:
+            self.on_close(self)
+    
+    async def _close_socket(self, code: int):
+        """Close the socket without waiting on a stalled client for long."""
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self.websocket.close(code=code), timeout=1.0)
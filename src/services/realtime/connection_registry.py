@@ -0,0 +1,168 @@
+"""Index of the WebSocket connections of one worker."""
+import itertools
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from src.services.realtime.client_connection import ClientConnection
+
+# Round updates and crashes
+TOPIC_ROUND = "round"
+# Bets, cashouts and balance changes of the connected user
+TOPIC_PERSONAL = "personal"
+# Leaderboard changes
+TOPIC_LEADERBOARD = "leaderboard"
+# Every bet and cashout of the round, one delta per tick
+TOPIC_LIVE_BETS = "live_bets"
+# Largest bets of the round only, one delta per tick
+TOPIC_TOP_BETS = "top_bets"
+
+TOPICS = frozenset((TOPIC_ROUND, TOPIC_PERSONAL, TOPIC_LEADERBOARD,
+                    TOPIC_LIVE_BETS, TOPIC_TOP_BETS))
+DEFAULT_TOPICS = (TOPIC_ROUND, TOPIC_PERSONAL)
+
+
+class ConnectionRegistry:
+    """
+    Connections indexed by id, socket, user and topic.
+    
+    Every operation is O(1) (O(k) for the k sockets of a user), so mass
+    reconnects cost linear time overall. Users may hold several sockets
+    (one per tab). Only authenticated connections are indexed by user:
+    the user_id a client connects with is unproven, so personal events
+    must not reach it. Topic subscribers are kept per protocol, so a
+    broadcast only visits the connections that will send the frame.
+    """
+    
+    def __init__(self):
+        """Initialize connection registry."""
+        self._ids = itertools.count(1)
+        self.connections: Dict[int, ClientConnection] = {}
+        self.by_socket: Dict[object, ClientConnection] = {}
+        self.users: Dict[int, Set[ClientConnection]] = {}
+        # (topic, binary) -> subscribed connections
+        self.topics: Dict[Tuple[str, bool], Set[ClientConnection]] = {}
+        self.binary_count = 0
+    
+    def __len__(self) -> int:
+        return len(self.connections)
+    
+    def __iter__(self) -> Iterator[ClientConnection]:
+        return iter(self.connections.values())
+    
+    def add(self, connection: ClientConnection, topics=DEFAULT_TOPICS) -> int:
+        """
+        Register a connection.
+        
+        Args:
+            connection: Client connection
+            topics: Topics to subscribe it to
+        
+        Returns:
+            Connection ID
+        """
+        connection.connection_id = next(self._ids)
+        self.connections[connection.connection_id] = connection
+        self.by_socket[connection.websocket] = connection
+        if connection.authenticated:
+            self.users.setdefault(connection.user_id, set()).add(connection)
+        if connection.binary:
+            self.binary_count += 1
+        for topic in topics:
+            self.subscribe(connection, topic)
+        return connection.connection_id
+    
+    def remove(self, connection: ClientConnection) -> bool:
+        """
+        Unregister a connection.
+        
+        Args:
+            connection: Client connection
+        
+        Returns:
+            True if it was registered
+        """
+        if self.connections.pop(connection.connection_id, None) is None:
+            return False
+        self.by_socket.pop(connection.websocket, None)
+        self._unindex_user(connection)
+        
+        if connection.binary:
+            self.binary_count -= 1
+        for topic in tuple(connection.topics):
+            self.unsubscribe(connection, topic)
+        return True
+    
+    def set_user(self, connection: ClientConnection, user_id: int):
+        """
+        Index a connection under its authenticated user.
+        
+        Args:
+            connection: Registered client connection
+            user_id: User ID
+        """
+        self._unindex_user(connection)
+        connection.user_id = user_id
+        self.users.setdefault(user_id, set()).add(connection)
+    
+    def clear_user(self, connection: ClientConnection):
+        """
+        Stop indexing a connection under its user (it keeps its topics).
+        
+        Args:
+            connection: Registered client connection
+        """
+        self._unindex_user(connection)
+    
+    def _unindex_user(self, connection: ClientConnection):
+        """Drop a connection from the sockets of its user."""
+        sockets = self.users.get(connection.user_id)
+        if sockets is not None:
+            sockets.discard(connection)
+            if not sockets:
+                del self.users[connection.user_id]
+    
+    def get(self, websocket) -> Optional[ClientConnection]:
+        """Get the connection of a socket."""
+        return self.by_socket.get(websocket)
+    
+    def user(self, user_id: int) -> Set[ClientConnection]:
+        """Get the authenticated connections of a user."""
+        return self.users.get(user_id, set())
+    
+    def subscribe(self, connection: ClientConnection, topic: str):
+        """
+        Subscribe a connection to a topic.
+        
+        Args:
+            connection: Client connection
+            topic: One of TOPICS
+        """
+        if topic not in TOPICS:
+            raise ValueError(f"Unknown topic: {topic}")
+        connection.topics.add(topic)
+        self.topics.setdefault((topic, connection.binary), set()).add(connection)
+    
+    def unsubscribe(self, connection: ClientConnection, topic: str):
+        """
+        Unsubscribe a connection from a topic.
+        
+        Args:
+            connection: Client connection
+            topic: Topic name
+        """
+        connection.topics.discard(topic)
+        subscribers = self.topics.get((topic, connection.binary))
+        if subscribers is not None:
+            subscribers.discard(connection)
+    
+    def subscribers(self, topic: str, binary: bool) -> Set[ClientConnection]:
+        """
+        Get the connections of one protocol subscribed to a topic.
+        
+        Args:
+            topic: Topic name
+            binary: Whether to return binary or JSON connections
+        
+        Returns:
+            Subscribed connections (do not mutate)
+        """
+        return self.topics.get((topic, binary), set())
@@ -0,0 +1,381 @@
+"""Fan-out of WebSocket frames across worker processes.
+
+The process running the round loop publishes every frame once; each
+worker subscribes and relays frames to its own sockets, so clients on
+any worker get the same stream.
+"""
+import asyncio
+import contextlib
+import logging
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple, Union
+
+from src.services.metrics import get_metrics
+from src.services.realtime.connection_registry import TOPIC_ROUND
+
+logger = logging.getLogger(__name__)
+
+# deliver(frame, guaranteed, topic)
+Deliver = Callable[[Union[str, bytes], bool, str], None]
+
+_BINARY = 0x01
+_GUARANTEED = 0x02
+
+# Length prefix of packed frames on a UNIX socket stream
+_LENGTH = struct.Struct(">I")
+
+
+def pack_frame(frame: Union[str, bytes], guaranteed: bool = False,
+               topic: str = TOPIC_ROUND) -> bytes:
+    """
+    Pack a frame for the wire: a flags byte, the topic length and topic,
+    then the payload.
+    
+    Args:
+        frame: JSON text frame or binary frame
+        guaranteed: Whether the frame is an event that must not be dropped
+        topic: Topic the frame is sent to
+    
+    Returns:
+        Packed message
+    """
+    binary = isinstance(frame, bytes)
+    flags = (_BINARY if binary else 0) | (_GUARANTEED if guaranteed else 0)
+    topic_bytes = topic.encode()
+    return (bytes((flags, len(topic_bytes))) + topic_bytes
+            + (frame if binary else frame.encode()))
+
+
+def unpack_frame(message: bytes) -> Tuple[Union[str, bytes], bool, str]:
+    """
+    Unpack a message built by pack_frame.
+    
+    Args:
+        message: Packed message
+    
+    Returns:
+        (frame, guaranteed, topic)
+    """
+    flags, topic_length = message[0], message[1]
+    topic = message[2:2 + topic_length].decode()
+    payload = message[2 + topic_length:]
+    frame = payload if flags & _BINARY else payload.decode()
+    return frame, bool(flags & _GUARANTEED), topic
+
+
+class FanoutBackend(ABC):
+    """Base class of fan-out backends."""
+    
+    # Whether frames reach other processes (publishers cannot skip
+    # building frames just because they have no local sockets)
+    distributed = False
+    
+    def __init__(self):
+        """Initialize fan-out backend."""
+        self.subscribers: List[Deliver] = []
+    
+    def subscribe(self, deliver: Deliver):
+        """
+        Register a callback receiving every published frame.
+        
+        Args:
+            deliver: Callback taking (frame, guaranteed, topic)
+        """
+        self.subscribers.append(deliver)
+    
+    def _deliver(self, frame: Union[str, bytes], guaranteed: bool, topic: str):
+        """Hand a frame to every subscriber."""
+        for deliver in self.subscribers:
+            deliver(frame, guaranteed, topic)
+    
+    async def start(self):
+        """Connect the backend."""
+    
+    @abstractmethod
+    async def publish(self, frame: Union[str, bytes], guaranteed: bool = False,
+                      topic: str = TOPIC_ROUND):
+        """
+        Publish a frame to every subscribed process.
+        
+        Args:
+            frame: JSON text frame or binary frame
+            guaranteed: Whether the frame is an event that must not be dropped
+            topic: Topic the frame is sent to
+        """
+    
+    async def stop(self):
+        """Disconnect the backend."""
+
+
+class LocalFanout(FanoutBackend):
+    """
+    In-process fan-out.
+    
+    Frames go straight to the subscribers of this backend, which covers a
+    single worker and tests (several ConnectionManagers sharing one
+    LocalFanout behave like workers sharing a Redis channel).
+    """
+    
+    async def publish(self, frame: Union[str, bytes], guaranteed: bool = False,
+                      topic: str = TOPIC_ROUND):
+        """Deliver a frame to the local subscribers."""
+        self._deliver(frame, guaranteed, topic)
+
+
+class RedisFanout(FanoutBackend):
+    """
+    Fan-out over a Redis pub/sub channel.
+    
+    Every worker subscribes to the channel, including the publisher, so
+    all workers see frames in the same order.
+    """
+    
+    distributed = True
+    
+    def __init__(self, redis_url: str, channel: str = "crash:ws:frames",
+                 reconnect_delay_s: float = 1.0):
+        """
+        Initialize Redis fan-out.
+        
+        Args:
+            redis_url: Redis URL (see config.get_redis_url)
+            channel: Pub/sub channel
+            reconnect_delay_s: Seconds to wait before resubscribing after an error
+        """
+        super().__init__()
+        self.redis_url = redis_url
+        self.channel = channel
+        self.reconnect_delay_s = reconnect_delay_s
+        self._client = None
+        self._reader: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Connect to Redis and start relaying the channel."""
+        import redis.asyncio as redis
+        
+        self._client = redis.from_url(self.redis_url)
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self._reader = asyncio.create_task(self._read(pubsub))
+    
+    async def publish(self, frame: Union[str, bytes], guaranteed: bool = False,
+                      topic: str = TOPIC_ROUND):
+        """Publish a frame on the channel."""
+        try:
+            await self._client.publish(self.channel, pack_frame(frame, guaranteed, topic))
+        except Exception as e:
+            get_metrics().increment("ws_fanout_publish_errors")
+            logger.warning("Failed to publish WebSocket frame: %s", e)
+    
+    async def _read(self, pubsub):
+        """Relay channel messages to the subscribers until stopped."""
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._deliver(*unpack_frame(message["data"]))
+            except asyncio.CancelledError:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+                raise
+            except Exception as e:
+                get_metrics().increment("ws_fanout_reconnects")
+                logger.warning("WebSocket fan-out subscription failed: %s", e)
+                await asyncio.sleep(self.reconnect_delay_s)
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                with contextlib.suppress(Exception):
+                    await pubsub.subscribe(self.channel)
+    
+    async def stop(self):
+        """Stop relaying and close the connection."""
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+        if self._client is not None:
+            await self._client.aclose()
+
+
+class UnixSocketFanout(FanoutBackend):
+    """
+    Fan-out between the workers of one host over a UNIX socket.
+    
+    The worker running the round loop is the hub: it listens on the
+    socket and every other worker connects to it. Frames the hub publishes
+    are delivered locally and written to every connected worker; frames a
+    worker publishes go to the hub, which handles them the same way, so
+    all workers (the publisher included) see frames in the same order.
+    """
+    
+    distributed = True
+    
+    def __init__(self, path: Path, hub: bool, reconnect_delay_s: float = 1.0,
+                 max_buffer_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize UNIX socket fan-out.
+        
+        Args:
+            path: Socket path shared by the workers
+            hub: Whether this worker listens (the round loop leader) or connects
+            reconnect_delay_s: Seconds to wait before reconnecting to the hub
+            max_buffer_bytes: Unsent bytes a worker may lag behind before the
+                hub drops its connection (it reconnects)
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.hub = hub
+        self.reconnect_delay_s = reconnect_delay_s
+        self.max_buffer_bytes = max_buffer_bytes
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Hub: connected workers; worker: the connection to the hub
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Listen on the socket (hub) or start relaying from the hub."""
+        if self.hub:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # The hub holds the round loop lock, so a socket file left behind
+            # belongs to a hub that has exited
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+            self._server = await asyncio.start_unix_server(self._serve, path=str(self.path))
+        else:
+            connection = await self._connect()
+            self._reader = asyncio.create_task(self._read(connection))
+    
+    async def publish(self, frame: Union[str, bytes], guaranteed: bool = False,
+                      topic: str = TOPIC_ROUND):
+        """Relay a frame (hub) or send it to the hub."""
+        message = pack_frame(frame, guaranteed, topic)
+        if self.hub:
+            self._relay(message)
+            return
+        try:
+            if self._writer is None:
+                raise ConnectionError(f"not connected to {self.path}")
+            self._writer.write(_LENGTH.pack(len(message)) + message)
+            await self._writer.drain()
+        except Exception as e:
+            get_metrics().increment("ws_fanout_publish_errors")
+            logger.warning("Failed to publish WebSocket frame: %s", e)
+    
+    def _relay(self, message: bytes):
+        """Deliver a message locally and write it to every connected worker (hub)."""
+        self._deliver(*unpack_frame(message))
+        data = _LENGTH.pack(len(message)) + message
+        for peer in tuple(self._peers):
+            if peer.transport.get_write_buffer_size() > self.max_buffer_bytes:
+                get_metrics().increment("ws_fanout_dropped_peers")
+                logger.warning("Dropping a WebSocket fan-out worker that stopped reading")
+                self._peers.discard(peer)
+                peer.close()
+            else:
+                peer.write(data)
+    
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Relay the frames of one connected worker until it disconnects (hub)."""
+        self._peers.add(writer)
+        try:
+            while True:
+                self._relay(await _read_message(reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+    
+    async def _connect(self) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        """Connect to the hub (None if it is not listening yet)."""
+        try:
+            connection = await asyncio.open_unix_connection(str(self.path))
+        except OSError:
+            return None
+        self._writer = connection[1]
+        return connection
+    
+    async def _read(self, connection):
+        """Relay hub messages to the subscribers until stopped, reconnecting on errors."""
+        while True:
+            if connection is None:
+                await asyncio.sleep(self.reconnect_delay_s)
+                connection = await self._connect()
+                continue
+            reader, writer = connection
+            try:
+                while True:
+                    self._deliver(*unpack_frame(await _read_message(reader)))
+            except asyncio.CancelledError:
+                writer.close()
+                raise
+            except Exception as e:
+                get_metrics().increment("ws_fanout_reconnects")
+                logger.warning("WebSocket fan-out connection to %s failed: %s", self.path, e)
+                self._writer = None
+                writer.close()
+                connection = None
+    
+    async def stop(self):
+        """Stop relaying and close the socket."""
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+        if self._server is not None:
+            self._server.close()
+            for peer in tuple(self._peers):
+                peer.close()
+            await self._server.wait_closed()
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+
+
+async def _read_message(reader: asyncio.StreamReader) -> bytes:
+    """Read one length-prefixed message from a UNIX socket stream."""
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return await reader.readexactly(length)
+
+
+_fanout: Optional[FanoutBackend] = None
+
+
+def get_fanout_backend() -> FanoutBackend:
+    """Get the process-wide fan-out backend (in-process until the app starts one)."""
+    global _fanout
+    if _fanout is None:
+        _fanout = LocalFanout()
+    return _fanout
+
+
+def use_fanout_backend(fanout: FanoutBackend):
+    """Replace the process-wide fan-out backend (started by the caller)."""
+    global _fanout
+    _fanout = fanout
+
+
+def create_fanout_backend(name: str, redis_url: str, socket_path: Optional[Path] = None,
+                          hub: bool = False) -> FanoutBackend:
+    """
+    Create a fan-out backend by name.
+    
+    Args:
+        name: "local", "unix" or "redis"
+        redis_url: Redis URL (used by the redis backend)
+        socket_path: Socket path (used by the unix backend)
+        hub: Whether this process is the unix backend's hub (the round loop leader)
+    
+    Returns:
+        Fan-out backend
+    """
+    if name == "local":
+        return LocalFanout()
+    if name == "unix":
+        return UnixSocketFanout(socket_path, hub)
+    if name == "redis":
+        return RedisFanout(redis_url)
+    raise ValueError(f"Unknown WebSocket fan-out backend: {name}")
@@ -0,0 +1,191 @@
+"""Round commands of workers that do not run the round loop.
+
+Only the round loop leader holds the round in memory. Other workers
+serve the same command API through a RemoteRoundManager, which sends
+each command to the leader over the fan-out backend and waits for the
+reply; the leader answers with a RoundCommandServer. Round status is
+served from the round updates the leader publishes every tick.
+"""
+import asyncio
+import uuid
+from decimal import Decimal
+from typing import Dict, Optional, Set, Union
+
+import orjson
+
+from src.database.models.game import BetStatus
+from src.services.realtime.connection_registry import TOPIC_ROUND
+from src.services.realtime.fanout import FanoutBackend
+
+# Fan-out topics of commands and their replies (no socket subscribes to them)
+TOPIC_ROUND_COMMANDS = "round_commands"
+TOPIC_ROUND_REPLIES = "round_replies"
+
+
+class RoundLoopUnavailable(RuntimeError):
+    """The round loop leader did not answer a command in time."""
+
+
+def _encode_default(value):
+    """Serialize the Decimals of bet data."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _encode(message: dict) -> str:
+    """Serialize a command or reply."""
+    return orjson.dumps(message, default=_encode_default).decode()
+
+
+def _decimal(value) -> Optional[Decimal]:
+    """Parse an optional decimal string."""
+    return Decimal(value) if value is not None else None
+
+
+def _bet_data(data: Optional[Dict]) -> Optional[Dict]:
+    """Restore the bet status of bet data received from the leader."""
+    if data is None:
+        return None
+    return {**data, "status": BetStatus(data["status"])}
+
+
+class RoundCommandServer:
+    """
+    Run the commands of other workers on the leader's round manager.
+    
+    Replies are published to every worker; only the sender waits for
+    them. Commands fail the same way they do on the leader (ValueError
+    messages are sent back and raised again by the sender).
+    """
+    
+    def __init__(self, round_manager, fanout: FanoutBackend):
+        """
+        Initialize round command server.
+        
+        Args:
+            round_manager: The leader's RoundManager
+            fanout: Fan-out backend the commands arrive on (started by the caller)
+        """
+        self.round_manager = round_manager
+        self.fanout = fanout
+        self._tasks: Set[asyncio.Task] = set()
+        fanout.subscribe(self.deliver)
+    
+    def deliver(self, frame: Union[str, bytes], guaranteed: bool, topic: str):
+        """Fan-out subscriber starting a task per command."""
+        if topic != TOPIC_ROUND_COMMANDS:
+            return
+        task = asyncio.create_task(self._handle(orjson.loads(frame)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _handle(self, request: dict):
+        """Run a command and publish the reply."""
+        reply = {"id": request["id"]}
+        try:
+            reply.update(ok=True, data=await self._run(request["command"], request["args"]))
+        except (ValueError, TypeError) as e:
+            reply.update(ok=False, error=str(e))
+        await self.fanout.publish(_encode(reply), guaranteed=True, topic=TOPIC_ROUND_REPLIES)
+    
+    async def _run(self, command: str, args: dict):
+        """Call the round manager method of a command."""
+        round_manager = self.round_manager
+        if command == "place_bet":
+            return await round_manager.place_bet_async(
+                args["user_id"], Decimal(args["amount"]), args["currency"],
+                _decimal(args["auto_cashout"])
+            )
+        if command == "cashout":
+            return await round_manager.cashout_async(args["user_id"])
+        if command == "live_bets_snapshot":
+            return await round_manager.get_live_bets_snapshot_async()
+        if command == "seed_chain_info":
+            return await round_manager.get_seed_chain_info_async()
+        raise ValueError(f"Unknown round command: {command}")
+
+
+class RemoteRoundManager:
+    """
+    Command API of a worker that does not run the round loop.
+    
+    Mirrors the RoundManager methods the routes use. Commands wait up to
+    timeout_s for the leader and raise RoundLoopUnavailable after that; a
+    bet or cashout that timed out may still have been applied by the
+    leader, which clients see in the round updates and their balance.
+    """
+    
+    def __init__(self, fanout: FanoutBackend, timeout_s: float = 5.0,
+                 tick_interval_ms: int = 100):
+        """
+        Initialize remote round manager.
+        
+        Args:
+            fanout: Distributed fan-out backend shared with the leader (started by the caller)
+            timeout_s: Seconds to wait for the leader's reply
+            tick_interval_ms: Milliseconds between this worker's ticker runs
+        """
+        self.fanout = fanout
+        self.timeout_s = timeout_s
+        self.tick_interval_ms = tick_interval_ms
+        # Data of the latest round update published by the leader
+        self.status: Optional[Dict] = None
+        # Request ID -> future of the reply
+        self._pending: Dict[str, asyncio.Future] = {}
+        fanout.subscribe(self.deliver)
+    
+    def deliver(self, frame: Union[str, bytes], guaranteed: bool, topic: str):
+        """Fan-out subscriber tracking the round and completing pending commands."""
+        if topic == TOPIC_ROUND_REPLIES:
+            reply = orjson.loads(frame)
+            future = self._pending.pop(reply["id"], None)
+            if future is not None and not future.done():
+                future.set_result(reply)
+        elif topic == TOPIC_ROUND and isinstance(frame, str) and '"round_update"' in frame[:32]:
+            self.status = orjson.loads(frame)["data"]
+    
+    async def _call(self, command: str, **args):
+        """Send a command to the leader and return its result."""
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self.fanout.publish(_encode({"id": request_id, "command": command, "args": args}),
+                                      guaranteed=True, topic=TOPIC_ROUND_COMMANDS)
+            reply = await asyncio.wait_for(future, self.timeout_s)
+        except asyncio.TimeoutError:
+            raise RoundLoopUnavailable("The round loop did not answer, try again")
+        finally:
+            self._pending.pop(request_id, None)
+        if not reply["ok"]:
+            raise ValueError(reply["error"])
+        return reply["data"]
+    
+    async def place_bet_async(self, user_id: int, amount: Decimal, currency: str,
+                              auto_cashout: Optional[Decimal] = None) -> Dict:
+        """Place a bet in the leader's round (see RoundManager.place_bet_async)."""
+        return _bet_data(await self._call(
+            "place_bet", user_id=user_id, amount=amount, currency=currency,
+            auto_cashout=auto_cashout
+        ))
+    
+    async def cashout_async(self, user_id: int) -> Optional[Dict]:
+        """Cash out a bet in the leader's round (see RoundManager.cashout_async)."""
+        return _bet_data(await self._call("cashout", user_id=user_id))
+    
+    async def get_live_bets_snapshot_async(self) -> Dict:
+        """Get the leader's live bets snapshot."""
+        return await self._call("live_bets_snapshot")
+    
+    async def get_seed_chain_info_async(self) -> Optional[Dict]:
+        """Get the leader's seed chain info."""
+        return await self._call("seed_chain_info")
+    
+    def get_round_status(self) -> Dict:
+        """Get the round status of the latest round update."""
+        return self.status or {"status": "no_round"}
+    
+    def get_round_curve(self) -> Optional[Dict]:
+        """No curve: new binary clients get the last relayed phase frame instead."""
+        return None
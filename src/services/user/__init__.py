@@ -1,5 +1,5 @@
 """User services module."""
-from src.services.user.user_service import UserService
+from src.services.user.user_service import AsyncUserService, UserService
 from src.services.user.user_statistics import UserStatisticsService
 from src.services.user.user_validation import UserValidationService
 from src.services.user.user_analytics import UserAnalyticsService
@@ -8,6 +8,7 @@ from src.services.user.user_history import UserHistoryService
 
 __all__ = [
     "UserService",
+    "AsyncUserService",
     "UserStatisticsService",
     "UserValidationService",
     "UserAnalyticsService",
@@ -1,5 +1,5 @@
 """User history service."""
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 
@@ -7,6 +7,7 @@ from src.database.repositories.user_repo import UserRepository
 from src.database.repositories.transaction_repo import TransactionRepository
 from src.database.repositories.game_repo import BetRepository
 from src.database.repositories.payment_repo import PaymentRepository
+from src.database.pagination import split_page
 
 
 class UserHistoryService:
@@ -28,21 +29,30 @@ class UserHistoryService:
     def get_transaction_history(
         self,
         user_id: int,
-        limit: int = 100
-    ) -> List[Dict]:
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict:
         """
-        Get user transaction history.
+        Get a page of user transaction history, newest first.
         
         Args:
             user_id: User ID
             limit: Maximum number of records
+            cursor: next_cursor of the previous page (None for the first page)
         
         Returns:
-            List of transactions
+            {"items": list of transactions, "next_cursor": cursor of the next page
+            or None on the last page}
+        
+        Raises:
+            ValueError: If the cursor is invalid
         """
-        transactions = self.transaction_repo.get_user_transactions(user_id, limit=limit)
+        transactions, next_cursor = split_page(
+            self.transaction_repo.get_user_transactions(user_id, limit=limit + 1, cursor=cursor),
+            limit, "created_at"
+        )
         
-        return [
+        items = [
             {
                 "id": t.id,
                 "type": t.transaction_type.value if t.transaction_type else None,
@@ -55,25 +65,35 @@ class UserHistoryService:
             }
             for t in transactions
         ]
+        return {"items": items, "next_cursor": next_cursor}
     
     def get_bet_history(
         self,
         user_id: int,
-        limit: int = 100
-    ) -> List[Dict]:
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict:
         """
-        Get user bet history.
+        Get a page of user bet history, newest first.
         
         Args:
             user_id: User ID
             limit: Maximum number of records
+            cursor: next_cursor of the previous page (None for the first page)
         
         Returns:
-            List of bets
+            {"items": list of bets, "next_cursor": cursor of the next page
+            or None on the last page}
+        
+        Raises:
+            ValueError: If the cursor is invalid
         """
-        bets = self.bet_repo.get_user_bets(user_id, limit=limit)
+        bets, next_cursor = split_page(
+            self.bet_repo.get_user_bets(user_id, limit=limit + 1, cursor=cursor),
+            limit, "placed_at"
+        )
         
-        return [
+        items = [
             {
                 "id": bet.id,
                 "round_id": bet.round_id,
@@ -92,25 +112,35 @@ class UserHistoryService:
             }
             for bet in bets
         ]
+        return {"items": items, "next_cursor": next_cursor}
     
     def get_payment_history(
         self,
         user_id: int,
-        limit: int = 100
-    ) -> List[Dict]:
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict:
         """
-        Get user payment history.
+        Get a page of user payment history, newest first.
         
         Args:
             user_id: User ID
             limit: Maximum number of records
+            cursor: next_cursor of the previous page (None for the first page)
         
         Returns:
-            List of payments
+            {"items": list of payments, "next_cursor": cursor of the next page
+            or None on the last page}
+        
+        Raises:
+            ValueError: If the cursor is invalid
         """
-        payments = self.payment_repo.get_user_payments(user_id, limit=limit)
+        payments, next_cursor = split_page(
+            self.payment_repo.get_user_payments(user_id, limit=limit + 1, cursor=cursor),
+            limit, "created_at"
+        )
         
-        return [
+        items = [
             {
                 "id": p.id,
                 "type": p.payment_type.value if p.payment_type else None,
@@ -124,3 +154,4 @@ class UserHistoryService:
             }
             for p in payments
         ]
+        return {"items": items, "next_cursor": next_cursor}
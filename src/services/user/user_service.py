@@ -1,9 +1,11 @@
 """User service - main user operations."""
 from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database.repositories.user_repo import UserRepository
+from src.database.repositories.user_repo import AsyncUserRepository, UserRepository
 from src.database.models.user import User
+from src.services.identity import invalidate_user_everywhere
 
 
 class UserService:
@@ -105,3 +107,36 @@ class UserService:
             )
         
         return user
+
+
+class AsyncUserService:
+    """User operations on an async session (API routes and workers)."""
+    
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize user service.
+        
+        Args:
+            db: Async database session
+        """
+        self.db = db
+        self.user_repo = AsyncUserRepository(db)
+    
+    async def ban_user(self, user_id: int, reason: str) -> User:
+        """
+        Ban a user.
+        
+        This is the only ban entry point: after the ban is committed, the
+        user's cached credentials are dropped on every worker, so the ban
+        takes effect on their next request or command.
+        
+        Args:
+            user_id: User ID
+            reason: Ban reason
+        
+        Returns:
+            Banned user
+        """
+        user = await self.user_repo.ban_user(user_id, reason)
+        await invalidate_user_everywhere(user.telegram_user_id)
+        return user
@@ -1,17 +1,791 @@
 """Round manager worker."""
+import asyncio
+import fcntl
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Optional, Dict, List, Set, Tuple
 from sqlalchemy.orm import Session
-from src.database.repositories.game_repo import GameRoundRepository
+
+from src.database.connection import SessionLocal
+from src.database.repositories.game_repo import GameRoundRepository, BetRepository
+from src.game.engine.crash_engine import CrashEngine, RoundState
+from src.game.engine.bet_manager import BetManager
+from src.game.engine.balance_manager import BalanceManager
+from src.game.engine.provably_fair import ProvablyFair
+from src.game.engine.round_history import CrashedRound, get_round_history
+from src.game.engine.round_journal import RoundJournal, replay
+from src.game.engine.seed_chain import SeedChain, SeedChainExhausted, generate_chain
+from src.services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
 
 
 class RoundManager:
-    """Manage game rounds."""
+    """
+    Manage game rounds.
     
-    def __init__(self, db: Session):
-        """Initialize round manager."""
+    One long-lived instance per process owns the authoritative
+    CrashEngine/BetManager pair and drives the countdown -> active -> crash
+    cycle on an asyncio timer. Routes talk to it through the command API
+    (place_bet_async, cashout_async, get_round_status); cashouts and status reads
+    are served from memory and persisted by the round loop on the next tick.
+    The loop and place_bet_async use the session on a dedicated database
+    thread only, so commits never block the event loop. Workers that do not
+    run the loop send their commands here through a RemoteRoundManager.
+    """
+    
+    def __init__(self, db: Session,
+                 crash_engine: Optional[CrashEngine] = None,
+                 bet_manager: Optional[BetManager] = None,
+                 tick_interval_ms: int = 100,
+                 crash_delay_seconds: float = 3.0,
+                 seed_chain: Optional[SeedChain] = None,
+                 journal: Optional[RoundJournal] = None):
+        """
+        Initialize round manager.
+        
+        Args:
+            db: Database session owned by the round loop
+            crash_engine: Crash engine (created if omitted)
+            bet_manager: Bet manager (created if omitted)
+            tick_interval_ms: Milliseconds between multiplier updates
+            crash_delay_seconds: Pause after a crash before the next countdown
+            seed_chain: Server seed chain (random seeds per round if omitted)
+            journal: Round event journal used for crash recovery (optional)
+        """
         self.db = db
         self.round_repo = GameRoundRepository(db)
+        self.bet_repo = BetRepository(db)
+        self.balance_manager = BalanceManager(db)
+        self.crash_engine = crash_engine or CrashEngine()
+        self.bet_manager = bet_manager or BetManager()
+        self.tick_interval_ms = tick_interval_ms
+        self.crash_delay_seconds = crash_delay_seconds
+        self.seed_chain = seed_chain
+        self.journal = journal
+        
+        # Current round
+        self.current_round_id: Optional[int] = None
+        self.countdown_ends_at: Optional[datetime] = None
+        self.last_multiplier: Optional[Decimal] = None
+        
+        # Cashouts acknowledged in memory, persisted on the next tick
+        self.pending_cashouts: List[Dict] = []
+        
+        self._running = False
+        # Whether the current round was created but not settled yet
+        self._round_open = False
+        # Whether the current round still accepts bets
+        self._betting_open = False
+        # Users whose bet is being persisted
+        self._placing: Set[int] = set()
+        
+        # Single thread for the session, which the async variants never touch on the loop
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="round-db")
+    
+    # ========== Round lifecycle ==========
+    #
+    # Each step is split into database phases, which the async variants run
+    # on the round manager's database thread, and in-memory phases, which
+    # always run on the caller's thread. The sync variants run both inline.
+    
+    async def _in_db_thread(self, fn, *args):
+        """
+        Run a database phase on the round manager's database thread.
+        
+        The thread is shared by every database phase of the round loop
+        and the command API, so they run one at a time, in submission order,
+        and never block the event loop.
+        
+        Args:
+            fn: Function using the round manager's session
+            *args: Positional arguments for fn
+        
+        Returns:
+            The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, functools.partial(fn, *args))
+    
+    def _create_round(self, client_seed: Optional[str]) -> Tuple[int, str, str]:
+        """Draw the server seed and insert the round row."""
+        if self.seed_chain is not None:
+            server_seed, server_seed_hash = self.seed_chain.next()
+        else:
+            server_seed = ProvablyFair.generate_server_seed()
+            server_seed_hash = ProvablyFair.hash_seed(server_seed)
+        
+        round_obj = self.round_repo.create(server_seed_hash, client_seed)
+        return round_obj.id, server_seed, server_seed_hash
+    
+    def _enter_countdown(self, round_id: int, server_seed: str, server_seed_hash: str,
+                         client_seed: Optional[str]) -> Dict:
+        """Start the created round in memory and open betting."""
+        round_data = self.crash_engine.start_new_round(
+            round_id, server_seed_hash, client_seed, server_seed
+        )
+        
+        if self.journal is not None:
+            self.journal.round_created(
+                round_id, server_seed, round_data["crash_hundredths"], client_seed is not None
+            )
+        
+        self.current_round_id = round_id
+        self.countdown_ends_at = datetime.utcnow() + timedelta(
+            seconds=self.crash_engine.countdown_seconds
+        )
+        self.last_multiplier = None
+        self._round_open = True
+        self._betting_open = True
+        
+        return round_data
+    
+    def start_round(self, client_seed: Optional[str] = None) -> Dict:
+        """
+        Create a new round and enter the countdown.
+        
+        Args:
+            client_seed: Optional client seed
+        
+        Returns:
+            Round data
+        """
+        created = self._create_round(client_seed)
+        return self._enter_countdown(*created, client_seed)
+    
+    async def start_round_async(self, client_seed: Optional[str] = None) -> Dict:
+        """Create a new round and enter the countdown, off the event loop."""
+        created = await self._in_db_thread(self._create_round, client_seed)
+        return self._enter_countdown(*created, client_seed)
+    
+    def _close_betting(self):
+        """Stop accepting bets for the current round."""
+        if not self.current_round_id:
+            raise ValueError("No round started")
+        self._betting_open = False
+    
+    def _persist_round_start(self):
+        """Mark the round and its bets active in the database."""
+        self.round_repo.start_round(
+            self.current_round_id,
+            self.crash_engine.current_round["combined_seed"]
+        )
+        self.bet_repo.activate_round_bets(self.current_round_id)
+    
+    def _enter_active(self):
+        """Start the round in memory."""
+        self.crash_engine.begin_round()
+        if self.journal is not None:
+            self.journal.round_started(self.current_round_id)
+        self.bet_manager.activate_bets(self.current_round_id)
+        self.countdown_ends_at = None
+        self.last_multiplier = Decimal("1.00")
+    
+    def begin_round(self):
+        """
+        Begin the current round (after countdown).
+        
+        Betting closes first and the database is updated before memory, so
+        a failed write leaves the round in its countdown and begin_round can
+        simply be retried.
+        """
+        self._close_betting()
+        self._persist_round_start()
+        self._enter_active()
+    
+    async def begin_round_async(self):
+        """
+        Begin the current round (after countdown), off the event loop.
+        
+        Bets already submitted to the database thread are persisted before
+        the round start, so they are activated with it.
+        """
+        self._close_betting()
+        await self._in_db_thread(self._persist_round_start)
+        self._enter_active()
+    
+    def _advance(self) -> List[Dict]:
+        """Compute the multiplier and fire due auto cashouts."""
+        current_multiplier = self.crash_engine.get_current_multiplier()
+        if current_multiplier is not None:
+            self.last_multiplier = current_multiplier
+        
+        # Auto cashouts fire at exactly their target, before any crash
+        auto_cashouts = self.bet_manager.fire_due_auto_cashouts(
+            self.crash_engine.get_elapsed_ms(),
+            self.crash_engine.current_round["crash_point"]
+        )
+        self.pending_cashouts.extend(auto_cashouts)
+        if self.journal is not None:
+            for bet in auto_cashouts:
+                self.journal.cashout(
+                    self.current_round_id, bet["user_id"], int(bet["cashed_out_multiplier"] * 100)
+                )
+        
+        return auto_cashouts
+    
+    def _tick_update(self, auto_cashouts: List[Dict]) -> Dict:
+        """Flush the journal and build the round update."""
+        if self.journal is not None:
+            self.journal.flush()
+        
+        return {
+            "round_id": self.current_round_id,
+            "multiplier": float(self.last_multiplier) if self.last_multiplier else None,
+            "auto_cashouts": len(auto_cashouts),
+            "status": self.crash_engine.round_state.value,
+        }
+    
+    def tick(self) -> Dict:
+        """
+        Advance the active round by one step.
+        
+        Computes the multiplier, fires due auto cashouts, persists pending
+        cashouts and settles the round if it crashed.
+        
+        Returns:
+            Round update data
+        """
+        auto_cashouts = self._advance()
+        
+        self.flush_cashouts()
+        
+        if self.crash_engine.round_state == RoundState.CRASHED:
+            self.settle_crash()
+        
+        return self._tick_update(auto_cashouts)
+    
+    async def tick_async(self) -> Dict:
+        """
+        Advance the active round by one step, off the event loop.
+        
+        Cashouts acknowledged while a batch is being persisted are flushed
+        again before the crash is settled, so none is marked crashed.
+        
+        Returns:
+            Round update data
+        """
+        auto_cashouts = self._advance()
+        
+        await self.flush_cashouts_async()
+        
+        if self.crash_engine.round_state == RoundState.CRASHED:
+            await self.flush_cashouts_async()
+            await self.settle_crash_async()
+        
+        return self._tick_update(auto_cashouts)
+    
+    def _cashouts_flushed(self, count: int):
+        """Drop the first count pending cashouts once they were persisted."""
+        del self.pending_cashouts[:count]
+        if self.journal is not None:
+            self.journal.cashouts_settled(self.current_round_id, count)
+    
+    def flush_cashouts(self):
+        """
+        Persist cashouts acknowledged since the last tick.
+        
+        They stay pending until the commit succeeds, so a failed batch is
+        retried on the next tick.
+        """
+        if not self.pending_cashouts:
+            return
+        
+        pending = list(self.pending_cashouts)
+        self.balance_manager.settle_cashouts(pending)
+        self._cashouts_flushed(len(pending))
+    
+    async def flush_cashouts_async(self):
+        """
+        Persist cashouts acknowledged since the last tick, off the event loop.
+        
+        Cashouts acknowledged while the batch is committed are appended
+        after it and stay pending for the next flush.
+        """
+        if not self.pending_cashouts:
+            return
+        
+        pending = list(self.pending_cashouts)
+        await self._in_db_thread(self.balance_manager.settle_cashouts, pending)
+        self._cashouts_flushed(len(pending))
+    
+    def _crash_round(self) -> Dict:
+        """Record the crash and mark the remaining bets lost in memory."""
+        round_data = self.crash_engine.get_round_data()
+        
+        if self.journal is not None:
+            self.journal.crash(self.current_round_id, round_data["crash_hundredths"])
+        
+        self.bet_manager.crash_all_bets(self.current_round_id)
+        return round_data
+    
+    def _persist_crash(self, round_data: Dict) -> Dict:
+        """Persist the crash and settle the remaining bets in the database."""
+        duration_ms = int(
+            (round_data["crash_time"] - round_data["start_time"]).total_seconds() * 1000
+        )
+        
+        with get_metrics().timer("round_settlement_ms"):
+            return self.round_repo.settle_round(
+                self.current_round_id,
+                round_data["crash_point"],
+                round_data["server_seed"],
+                duration_ms
+            )
+    
+    def _close_round(self, round_data: Dict, totals: Dict):
+        """Record the settled round in the journal and the round history."""
+        if self.journal is not None:
+            self.journal.round_settled(self.current_round_id)
+        
+        get_round_history().append(CrashedRound(
+            self.current_round_id, round_data["crash_point"], round_data["start_time"],
+            totals["crashed_at"], totals["total_bets"]
+        ))
+        
+        self.last_multiplier = round_data["crash_point"]
+        self._round_open = False
+    
+    def settle_crash(self):
+        """Persist the crash and mark all remaining bets as lost."""
+        round_data = self._crash_round()
+        self._close_round(round_data, self._persist_crash(round_data))
+    
+    async def settle_crash_async(self):
+        """Persist the crash and mark all remaining bets as lost, off the event loop."""
+        round_data = self._crash_round()
+        totals = await self._in_db_thread(self._persist_crash, round_data)
+        self._close_round(round_data, totals)
+    
+    def next_tick_delay(self) -> float:
+        """
+        Get seconds until the next tick.
+        
+        Normally one tick interval, shortened so the loop wakes up exactly
+        when the next auto cashout target is reached.
+        
+        Returns:
+            Delay in seconds
+        """
+        delay_ms = self.tick_interval_ms
+        next_trigger_ms = self.bet_manager.next_auto_cashout_ms()
+        elapsed_ms = self.crash_engine.get_elapsed_ms()
+        
+        if next_trigger_ms is not None and elapsed_ms is not None:
+            delay_ms = max(0, min(delay_ms, next_trigger_ms - elapsed_ms))
+        
+        return delay_ms / 1000
+    
+    async def run_round(self):
+        """Run one full countdown -> active -> crash cycle."""
+        await self.start_round_async()
+        await self.play_round()
+    
+    async def play_round(self):
+        """Play the current round on from its state (countdown, active or crashed)."""
+        if self.crash_engine.round_state == RoundState.COUNTDOWN:
+            await asyncio.sleep(
+                max(0.0, (self.countdown_ends_at - datetime.utcnow()).total_seconds())
+            )
+            await self.begin_round_async()
+        
+        while True:
+            update = await self.tick_async()
+            if update["status"] == RoundState.CRASHED.value:
+                break
+            await asyncio.sleep(self.next_tick_delay())
+        
+        await asyncio.sleep(self.crash_delay_seconds)
+        self.bet_manager.clear_round_bets(self.current_round_id)
+    
+    async def process_rounds(self):
+        """
+        Process rounds until stopped.
+        
+        A round whose tick fails is resumed from its in-memory state (its
+        bets, pending cashouts and auto cashout triggers are still there)
+        instead of being abandoned, so it is always settled before the next
+        round starts. An exhausted seed chain stops the loop.
+        """
+        self._running = True
+        while self._running:
+            try:
+                if self._round_open:
+                    await self.play_round()
+                else:
+                    await self.run_round()
+            except asyncio.CancelledError:
+                raise
+            except SeedChainExhausted:
+                # Retrying cannot help: no round can start until a new chain is generated
+                logger.critical("Seed chain exhausted, stopping the round loop; generate a "
+                                "new chain at %s and restart", self.seed_chain.path)
+                self._running = False
+            except Exception:
+                logger.exception("Round %s failed, resuming it", self.current_round_id)
+                await self._in_db_thread(self.db.rollback)
+                await asyncio.sleep(self.crash_delay_seconds)
+    
+    async def load_seed_chain(self, path: Path, length: int):
+        """
+        Switch to a pre-generated seed chain.
+        
+        A missing chain is generated in a worker thread; rounds keep using
+        random seeds until it is ready.
+        
+        Args:
+            path: Chain file path
+            length: Number of seeds to generate if the file is missing
+        """
+        try:
+            if not path.exists():
+                logger.info("Generating seed chain of %d seeds at %s", length, path)
+                terminus = await asyncio.to_thread(generate_chain, path, length)
+                logger.info("Seed chain ready, terminus %s", terminus)
+            
+            self.seed_chain = SeedChain(path)
+        except (OSError, ValueError):
+            logger.exception("Could not load seed chain %s", path)
+    
+    def recover(self) -> bool:
+        """
+        Resume the round interrupted by a restart, from the journal.
+        
+        Bets, cashouts and the round timeline are rebuilt from the journal;
+        cashouts that were acknowledged but not persisted are queued again
+        unless the database already has them.
+        
+        Returns:
+            True if an in-flight round was restored
+        """
+        if self.journal is None:
+            return False
+        
+        self.journal.flush()
+        state = replay(self.journal.path)
+        if not state.in_flight:
+            return False
+        
+        client_seed = None
+        if state.has_client_seed:
+            client_seed = self.round_repo.get_by_id(state.round_id).client_seed
+        
+        round_data = self.crash_engine.restore_round(
+            state.round_id, state.server_seed, client_seed,
+            state.started_at_ns, state.crashed_at_ns
+        )
+        if round_data["crash_hundredths"] != state.crash_hundredths:
+            raise ValueError(f"Journal crash point mismatch for round {state.round_id}")
+        
+        self.bet_manager.restore_round_store(state.store)
+        self.current_round_id = state.round_id
+        self.last_multiplier = None
+        self.countdown_ends_at = None
+        if state.started_at_ns is None:
+            created_at = datetime.utcfromtimestamp(state.created_at_ns / 1e9)
+            self.countdown_ends_at = created_at + timedelta(
+                seconds=self.crash_engine.countdown_seconds
+            )
+        
+        pending = state.store.to_dicts(state.unsettled_cashouts)
+        persisted = self.bet_repo.get_cashed_out_ids(
+            [bet["bet_id"] for bet in pending if bet["bet_id"]]
+        )
+        self.pending_cashouts = [bet for bet in pending if bet["bet_id"] not in persisted]
+        if persisted:
+            # Batches commit in order, so the persisted ones are a prefix
+            self.journal.cashouts_settled(state.round_id, len(pending) - len(self.pending_cashouts))
+        
+        self._round_open = True
+        self._betting_open = state.started_at_ns is None
+        logger.info("Recovered round %s from journal (%d bets, %d records)",
+                    state.round_id, len(state.store), state.offset)
+        return True
+    
+    def stop(self):
+        """Stop after the current round."""
+        self._running = False
+    
+    # ========== Command API ==========
+    
+    def _check_bet(self, user_id: int, amount: Decimal, currency: str,
+                   auto_cashout: Optional[Decimal]):
+        """
+        Run the bet checks served from memory, so rejected bets never reach the database.
+        
+        Everything _record_bet needs is checked here, so a bet persisted by
+        _persist_bet is always recorded in memory too.
+        """
+        if self.crash_engine.round_state != RoundState.COUNTDOWN or not self._betting_open:
+            raise ValueError("Cannot place bet: round already started")
+        
+        if user_id in self._placing:
+            raise ValueError("You already have an active bet in this round")
+        is_valid, error = self.bet_manager.validate_bet(user_id, amount, currency, None, auto_cashout)
+        if not is_valid:
+            raise ValueError(error)
+    
+    def _persist_bet(self, user_id: int, round_id: int, amount: Decimal, currency: str,
+                     auto_cashout: Optional[Decimal]) -> int:
+        """Debit the stake and insert the bet row."""
+        if amount > self.balance_manager.get_balance(user_id, currency):
+            raise ValueError("Insufficient balance")
+        
+        self.balance_manager.deduct_balance(
+            user_id, amount, currency,
+            description=f"Bet: {amount} {currency}",
+            round_id=round_id
+        )
+        
+        bet = self.bet_repo.create(
+            user_id=user_id,
+            round_id=round_id,
+            amount_ton=amount if currency == "TON" else None,
+            amount_stars=amount if currency == "STARS" else None,
+            currency=currency,
+            auto_cashout_multiplier=auto_cashout
+        )
+        return bet.id
+    
+    def _record_bet(self, user_id: int, round_id: int, bet_id: int, amount: Decimal,
+                    currency: str, auto_cashout: Optional[Decimal]) -> Dict:
+        """Add the persisted bet to the round in memory."""
+        bet_data = self.bet_manager.place_bet(user_id, round_id, amount, currency, auto_cashout)
+        self.bet_manager.set_bet_id(user_id, round_id, bet_id)
+        bet_data["bet_id"] = bet_id
+        
+        if self.journal is not None:
+            store = self.bet_manager.get_round_store(round_id)
+            self.journal.bet_placed(store, store.slots[user_id])
+        
+        return bet_data
+    
+    def place_bet(self, user_id: int, amount: Decimal, currency: str,
+                 auto_cashout: Optional[Decimal] = None) -> Dict:
+        """
+        Place a bet in the current round.
+        
+        Bets are only accepted during the countdown. The stake is debited
+        before the bet is acknowledged.
+        
+        Args:
+            user_id: User ID
+            amount: Bet amount
+            currency: Currency
+            auto_cashout: Auto cashout multiplier
+        
+        Returns:
+            Bet data
+        """
+        self._check_bet(user_id, amount, currency, auto_cashout)
+        round_id = self.current_round_id
+        bet_id = self._persist_bet(user_id, round_id, amount, currency, auto_cashout)
+        return self._record_bet(user_id, round_id, bet_id, amount, currency, auto_cashout)
+    
+    async def place_bet_async(self, user_id: int, amount: Decimal, currency: str,
+                              auto_cashout: Optional[Decimal] = None) -> Dict:
+        """
+        Place a bet in the current round, off the event loop.
+        
+        The bet is persisted on the database thread ahead of the round
+        start, which waits behind it, so a bet accepted during the
+        countdown is always activated with its round.
+        
+        Args:
+            user_id: User ID
+            amount: Bet amount
+            currency: Currency
+            auto_cashout: Auto cashout multiplier
+        
+        Returns:
+            Bet data
+        """
+        self._check_bet(user_id, amount, currency, auto_cashout)
+        round_id = self.current_round_id
+        
+        self._placing.add(user_id)
+        try:
+            bet_id = await self._in_db_thread(
+                self._persist_bet, user_id, round_id, amount, currency, auto_cashout
+            )
+        finally:
+            self._placing.discard(user_id)
+        
+        return self._record_bet(user_id, round_id, bet_id, amount, currency, auto_cashout)
+    
+    def cashout(self, user_id: int) -> Optional[Dict]:
+        """
+        Cash out a user's bet at the current multiplier.
+        
+        Served from memory; the payout is persisted on the next tick.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            Cashout data or None if the user has no active bet
+        """
+        if not self.crash_engine.is_round_active():
+            raise ValueError("Round not active")
+        
+        current_multiplier = self.crash_engine.get_current_multiplier()
+        if not self.crash_engine.is_round_active():
+            raise ValueError("Round already crashed")
+        
+        bet_data = self.bet_manager.cashout_bet(user_id, current_multiplier)
+        if not bet_data:
+            return None
+        
+        bet_data["cashed_out_at"] = datetime.utcnow()
+        self.pending_cashouts.append(bet_data)
+        if self.journal is not None:
+            self.journal.cashout(self.current_round_id, user_id, int(current_multiplier * 100))
+        
+        return bet_data
+    
+    async def cashout_async(self, user_id: int) -> Optional[Dict]:
+        """
+        Cash out a user's bet (same as cashout, for the async command API
+        relay-only workers mirror, see RemoteRoundManager).
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            Cashout data or None if the user has no active bet
+        """
+        return self.cashout(user_id)
+    
+    async def get_live_bets_snapshot_async(self) -> Dict:
+        """Get the live bets feed snapshot sent to new feed subscribers."""
+        return self.bet_manager.live_feed.snapshot()
+    
+    async def get_seed_chain_info_async(self) -> Optional[Dict]:
+        """
+        Get the published seed chain terminus and the rounds played on it.
+        
+        Returns:
+            {"terminus", "length", "rounds_played"} or None until the chain is loaded
+        """
+        if self.seed_chain is None:
+            return None
+        return {
+            "terminus": self.seed_chain.terminus,
+            "length": self.seed_chain.length,
+            "rounds_played": self.seed_chain.position,
+        }
+    
+    def get_round_status(self) -> Dict:
+        """
+        Get current round status from memory.
+        
+        The crash point is only included once the round has crashed.
+        
+        Returns:
+            Round status data
+        """
+        round_data = self.crash_engine.current_round
+        if not self.current_round_id or not round_data:
+            return {"status": "no_round"}
+        
+        crashed = self.crash_engine.round_state == RoundState.CRASHED
+        start_time = round_data["start_time"]
+        
+        return {
+            "round_id": self.current_round_id,
+            "status": self.crash_engine.round_state.value,
+            "multiplier": float(self.last_multiplier) if self.last_multiplier else None,
+            "crash_point": float(round_data["crash_point"]) if crashed else None,
+            "start_time": start_time.isoformat() if start_time else None,
+            "time_until_crash": None,
+            "countdown_ends_at": (
+                self.countdown_ends_at.isoformat() if self.countdown_ends_at else None
+            ),
+        }
+    
+    def get_round_curve(self) -> Optional[Dict]:
+        """
+        Get the parameters clients need to extrapolate the multiplier.
+        
+        Times are Unix milliseconds and multipliers hundredths; the crash
+        point is only included once the round has crashed.
+        
+        Returns:
+            Round curve data or None if there is no round
+        """
+        round_data = self.crash_engine.current_round
+        if not self.current_round_id or not round_data:
+            return None
+        
+        def unix_ms(moment: Optional[datetime]) -> Optional[int]:
+            if moment is None:
+                return None
+            return int(moment.replace(tzinfo=timezone.utc).timestamp() * 1000)
+        
+        crashed = self.crash_engine.round_state == RoundState.CRASHED
+        return {
+            "round_id": self.current_round_id,
+            "status": self.crash_engine.round_state.value,
+            "server_time_ms": unix_ms(datetime.utcnow()),
+            "multiplier_hundredths": int(self.last_multiplier * 100) if self.last_multiplier else 100,
+            "base_speed_ms": self.crash_engine.multiplier_calculator.base_speed_ms,
+            "countdown_ends_at_ms": unix_ms(self.countdown_ends_at),
+            "started_at_ms": unix_ms(round_data["start_time"]),
+            "crashed_at_ms": unix_ms(round_data["crash_time"]),
+            "crash_hundredths": round_data["crash_hundredths"] if crashed else None,
+        }
+
+
+def acquire_round_loop_lock(path: Path) -> Optional[IO]:
+    """
+    Try to become the process that runs the round loop.
+    
+    The round loop owns the seed chain position and the round journal, so
+    only one process may run it against them: the first to take an
+    exclusive lock on the file wins, and the lock is released when the
+    file is closed or the process exits.
+    
+    Args:
+        path: Lock file path (next to the round journal)
+    
+    Returns:
+        The open lock file to keep while the loop runs, or None if
+        another process holds it
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(path, "a")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+_round_manager: Optional[RoundManager] = None
+
+
+def get_round_manager() -> RoundManager:
+    """Get the process-wide round manager."""
+    global _round_manager
+    if _round_manager is None:
+        _round_manager = RoundManager(SessionLocal())
+    return _round_manager
+
+
+def use_round_manager(round_manager):
+    """
+    Replace the process-wide round manager.
+    
+    Workers that do not run the round loop serve the routes from a
+    RemoteRoundManager forwarding commands to the one that does.
     
-    def process_rounds(self):
-        """Process active rounds."""
-        # TODO: Implement round processing
-        pass
+    Args:
+        round_manager: RoundManager or RemoteRoundManager
+    """
+    global _round_manager
+    _round_manager = round_manager
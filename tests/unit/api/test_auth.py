@@ -0,0 +1,230 @@
+"""Tests for token authentication and the identity cache."""
+import asyncio
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.middleware import auth
+from src.api.middleware.auth import create_access_token, resolve_token
+from src.database.connection import Base
+from src.database.repositories.user_repo import AsyncUserRepository, UserRepository
+from src.services.identity import (
+    IdentityCache,
+    InitDataVerifier,
+    get_identity_cache,
+)
+from src.services.identity.telegram_init_data import derive_secret_key, sign_init_data
+from src.services.realtime import LocalFanout
+from src.services.realtime import fanout as fanout_module
+from src.services.user.user_service import AsyncUserService
+
+BOT_TOKEN = "123456:test-bot-token"
+
+
+@pytest.fixture
+def db():
+    """In-memory database session with an empty identity cache."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    get_identity_cache().clear()
+    yield session
+    session.close()
+    get_identity_cache().clear()
+
+
+def run_with_async_session(test):
+    """Run an async test on a fresh in-memory database with an empty identity cache."""
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        get_identity_cache().clear()
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                await test(session)
+        finally:
+            get_identity_cache().clear()
+            await engine.dispose()
+    
+    asyncio.run(main())
+
+
+def bearer(token: str) -> Request:
+    """Build a request carrying a bearer token."""
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+def test_resolve_token_hits_cache_without_decoding(db, monkeypatch):
+    """A resolved token is served from the cache without a decode or query."""
+    user = UserRepository(db).create(telegram_user_id=111)
+    token = create_access_token(111)
+    
+    assert resolve_token(token, db) == {"id": user.id, "telegram_user_id": 111}
+    
+    def fail(token):
+        raise AssertionError("token decoded on a cache hit")
+    
+    monkeypatch.setattr(auth, "decode_token", fail)
+    assert resolve_token(token, None) == {"id": user.id, "telegram_user_id": 111}
+
+
+def test_ban_invalidates_cached_tokens():
+    """Banning a user drops their cached tokens and blocks re-resolution."""
+    async def test(session):
+        user = await AsyncUserRepository(session).create(telegram_user_id=222)
+        token = create_access_token(222)
+        assert await auth.get_current_user(bearer(token), session)
+        
+        await AsyncUserService(session).ban_user(user.id, "fraud")
+        
+        assert get_identity_cache().get(token) is None
+        with pytest.raises(HTTPException):
+            await auth.get_current_user(bearer(token), session)
+    
+    run_with_async_session(test)
+
+
+def test_ban_invalidates_tokens_on_every_worker(monkeypatch):
+    """A ban reaches the identity caches of other workers through the fan-out backend."""
+    fanout = LocalFanout()
+    monkeypatch.setattr(fanout_module, "_fanout", fanout)
+    other_worker = IdentityCache(ttl_seconds=60)
+    fanout.subscribe(other_worker.deliver_invalidation)
+    
+    async def test(session):
+        user = await AsyncUserRepository(session).create(telegram_user_id=223)
+        token = create_access_token(223)
+        other_worker.put(token, {"id": user.id, "telegram_user_id": 223})
+        
+        await AsyncUserService(session).ban_user(user.id, "fraud")
+        assert other_worker.get(token) is None
+    
+    run_with_async_session(test)
+
+
+def test_authenticate_token_loads_users_on_an_async_session(monkeypatch):
+    """WebSocket authentication resolves cache misses without a sync session."""
+    async def test(session):
+        monkeypatch.setattr(auth, "AsyncSessionLocal", async_sessionmaker(session.bind))
+        user = await AsyncUserRepository(session).create(telegram_user_id=224)
+        token = create_access_token(224)
+        
+        assert await auth.authenticate_token(token) == {"id": user.id, "telegram_user_id": 224}
+        assert get_identity_cache().get(token) is not None
+        
+        await AsyncUserService(session).ban_user(user.id, "fraud")
+        assert await auth.authenticate_token(token) is None
+    
+    run_with_async_session(test)
+
+
+def test_invalid_token_is_not_cached(db):
+    """Tokens that do not resolve are never cached."""
+    assert resolve_token("not-a-jwt", db) is None
+    assert resolve_token(create_access_token(333), db) is None
+    assert len(get_identity_cache()) == 0
+
+
+def test_identity_cache_evicts_least_recently_used():
+    """The cache keeps at most max_entries, dropping the least recently used."""
+    cache = IdentityCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", {"id": 1, "telegram_user_id": 10})
+    cache.put("b", {"id": 2, "telegram_user_id": 20})
+    cache.get("a")
+    cache.put("c", {"id": 3, "telegram_user_id": 30})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.invalidate_user(20) == 0
+    assert cache.invalidate_user(10) == 1 and len(cache) == 1
+
+
+def test_identity_cache_expiry_capped_by_token():
+    """Entries expire with the TTL or the token, whichever is first."""
+    cache = IdentityCache(max_entries=10, ttl_seconds=60)
+    cache.put("expired", {"id": 1, "telegram_user_id": 10}, expires_at=time.time() - 1)
+    cache.put("short", {"id": 2, "telegram_user_id": 20}, expires_at=time.time() + 0.05)
+    
+    assert cache.get("expired") is None
+    assert cache.get("short")
+    time.sleep(0.06)
+    assert cache.get("short") is None
+    assert len(cache) == 0
+
+
+def signed_init_data(user_id: int, bot_token: str = BOT_TOKEN, auth_date: int = None) -> str:
+    """Init data signed the way Telegram signs it."""
+    fields = {
+        "query_id": "AAE",
+        "user": json.dumps({"id": user_id, "first_name": "Test"}),
+        "auth_date": str(int(time.time()) if auth_date is None else auth_date),
+    }
+    fields["hash"] = sign_init_data(fields, derive_secret_key(bot_token))
+    return urlencode(fields)
+
+
+def test_init_data_signature_is_verified():
+    """Only init data signed with the bot's key and not expired is accepted."""
+    verifier = InitDataVerifier(BOT_TOKEN, max_age_seconds=3600)
+    
+    assert verifier.verify(signed_init_data(444))["user"]["id"] == 444
+    assert verifier.verify(signed_init_data(444, bot_token="999:other")) is None
+    assert verifier.verify(signed_init_data(444).replace("Test", "Evil")) is None
+    assert verifier.verify(signed_init_data(444, auth_date=int(time.time()) - 7200)) is None
+    assert InitDataVerifier("").verify(signed_init_data(444)) is None
+
+
+def test_verified_init_data_skips_hmac(monkeypatch):
+    """Repeat init data is served from the cache until auth_date expires."""
+    verifier = InitDataVerifier(BOT_TOKEN, max_age_seconds=3600, max_entries=1)
+    init_data = signed_init_data(555)
+    assert verifier.verify(init_data)
+    
+    def fail(init_data, now):
+        raise AssertionError("init data checked on a cache hit")
+    
+    monkeypatch.setattr(verifier, "_check", fail)
+    assert verifier.verify(init_data)["user"]["id"] == 555
+    assert len(verifier) == 1
+
+
+def test_init_data_header_resolves_to_user(monkeypatch):
+    """Verified init data resolves to the registered, unbanned user."""
+    monkeypatch.setattr(auth, "get_init_data_verifier", lambda: InitDataVerifier(BOT_TOKEN))
+    
+    def request(init_data):
+        return Request({"type": "http", "headers": [(b"x-telegram-init-data", init_data.encode())]})
+    
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        get_identity_cache().clear()
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                user = await AsyncUserRepository(session).create(telegram_user_id=666)
+                init_data = signed_init_data(666)
+                
+                assert await auth.get_current_user(request(init_data), session) == {
+                    "id": user.id, "telegram_user_id": 666
+                }
+                with pytest.raises(HTTPException):
+                    await auth.get_current_user(request(signed_init_data(777)), session)
+                
+                await AsyncUserService(session).ban_user(user.id, "fraud")
+                with pytest.raises(HTTPException):
+                    await auth.get_current_user(request(init_data), session)
+        finally:
+            get_identity_cache().clear()
+            await engine.dispose()
+    
+    asyncio.run(main())
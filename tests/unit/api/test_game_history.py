@@ -0,0 +1,94 @@
+"""Tests for the round history endpoint."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.middleware.auth import get_current_user
+from src.api.routes import game
+from src.database.async_connection import get_async_db
+from src.database.connection import Base
+from src.database.models.game import GameRound, GameRoundStatus
+from src.game.engine.round_history import CrashedRound, RoundHistoryCache
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """Round history cache and a client whose database holds three crashed rounds."""
+    path = tmp_path / "history.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    db.add_all(
+        GameRound(server_seed_hash="0" * 64, status=GameRoundStatus.CRASHED,
+                  crash_multiplier=Decimal("2.00") + i, started_at=start + timedelta(minutes=i),
+                  crashed_at=start + timedelta(minutes=i, seconds=5), total_bets=i)
+        for i in range(3)
+    )
+    db.add(GameRound(server_seed_hash="1" * 64, status=GameRoundStatus.ACTIVE))
+    db.commit()
+    db.close()
+    engine.dispose()
+    
+    async def async_db():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with AsyncSession(async_engine) as session:
+            yield session
+        await async_engine.dispose()
+    
+    cache = RoundHistoryCache(refresh_seconds=None)
+    monkeypatch.setattr(game, "get_round_history", lambda: cache)
+    app = FastAPI()
+    app.include_router(game.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "telegram_user_id": 1}
+    app.dependency_overrides[get_async_db] = async_db
+    return cache, TestClient(app)
+
+
+def test_history_backfills_once_and_matches_schema(history):
+    """The first request loads the crashed rounds; the body has the RoundHistory fields."""
+    cache, client = history
+    response = client.get("/game/history", params={"limit": 2})
+    
+    assert response.status_code == 200
+    assert response.json() == [
+        {"round_id": 3, "crash_multiplier": "4.00", "started_at": "2026-01-01T12:02:00",
+         "crashed_at": "2026-01-01T12:02:05", "total_bets": 2},
+        {"round_id": 2, "crash_multiplier": "3.00", "started_at": "2026-01-01T12:01:00",
+         "crashed_at": "2026-01-01T12:01:05", "total_bets": 1},
+    ]
+    assert response.headers["ETag"] == '"3-2"'
+    assert len(cache) == 3
+    assert not cache.needs_load()
+
+
+def test_if_none_match_returns_304_until_next_crash(history):
+    """Polling with the ETag gets 304 until a round crashes."""
+    cache, client = history
+    etag = client.get("/game/history").headers["ETag"]
+    
+    response = client.get("/game/history", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    at = datetime(2026, 1, 1, 13, 0, 0)
+    cache.append(CrashedRound(9, Decimal("1.00"), at, at, 0))
+    response = client.get("/game/history", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["round_id"] == 9
+    assert response.headers["ETag"] == '"9-4"'
+
+
+def test_etag_matches():
+    """If-None-Match lists, weak tags and * match."""
+    assert game.etag_matches('"3-2"', '"3-2"')
+    assert game.etag_matches('"1-1", W/"3-2"', '"3-2"')
+    assert game.etag_matches("*", '"3-2"')
+    assert not game.etag_matches('"3-1"', '"3-2"')
+    assert not game.etag_matches(None, '"3-2"')
@@ -0,0 +1,87 @@
+"""Tests for the rate limiter and its middleware."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middleware import rate_limit
+from src.api.middleware.rate_limit import (
+    DEFAULT_POLICY,
+    RateLimiter,
+    RatePolicy,
+    rate_limit_middleware,
+    route_policy,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_over_window():
+    """A bucket allows a burst, then one request per refilled token."""
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    policy = RatePolicy("test", 3, 30)
+
+    assert [limiter.try_acquire("k", policy) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.try_acquire("k", policy) == pytest.approx(10.0)
+
+    clock.now += 10
+    assert limiter.try_acquire("k", policy) == 0.0
+    assert limiter.try_acquire("k", policy) > 0
+
+    clock.now += 1000
+    assert [limiter.try_acquire("k", policy) for _ in range(4)][:3] == [0.0, 0.0, 0.0]
+
+
+def test_idle_keys_are_evicted_least_recently_used():
+    """Memory stays bounded: the least recently used keys are dropped."""
+    limiter = RateLimiter(max_keys=4, shards=1, clock=FakeClock())
+    policy = RatePolicy("test", 1, 60)
+    for key in "abcd":
+        limiter.try_acquire(key, policy)
+    limiter.try_acquire("a", policy)
+    limiter.try_acquire("e", policy)
+
+    assert len(limiter) == 4
+    # "b" was evicted, so it starts from a full bucket; "a" is still limited
+    assert limiter.try_acquire("b", policy) == 0.0
+    assert limiter.try_acquire("a", policy) > 0
+
+
+def test_route_policies():
+    """Bets and payments get stricter policies than other routes."""
+    assert route_policy("POST", "/game/bet").name == "bet"
+    assert route_policy("POST", "/payments/deposit").name == "payments_write"
+    assert route_policy("GET", "/payments/history").name == "payments"
+    assert route_policy("GET", "/game/history") is DEFAULT_POLICY
+
+
+def test_middleware_returns_429_with_retry_after(monkeypatch):
+    """Requests over the limit get 429 and Retry-After; exempt paths never do."""
+    monkeypatch.setattr(rate_limit, "rate_limiter", RateLimiter())
+    monkeypatch.setattr(rate_limit, "ROUTE_POLICIES",
+                        [("POST", "/game/bet", RatePolicy("bet", 2, 60))])
+    app = FastAPI()
+    app.middleware("http")(rate_limit_middleware)
+
+    @app.post("/game/bet")
+    async def bet():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    client = TestClient(app)
+    assert [client.post("/game/bet").status_code for _ in range(2)] == [200, 200]
+    response = client.post("/game/bet")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 30
+    assert all(client.get("/health").status_code == 200 for _ in range(5))
@@ -0,0 +1,109 @@
+"""Tests for game commands on workers that do not run the round loop."""
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.middleware import rate_limit
+from src.api.middleware.auth import get_current_user
+from src.api.middleware.rate_limit import RateLimiter
+from src.api.routes import game, websocket
+from src.api.routes.websocket import encode_frame
+from src.database.connection import Base
+from src.database.models.user import User
+from src.game.engine.crash_engine import CrashEngine
+from src.services.realtime import (
+    TOPIC_ROUND_COMMANDS,
+    LocalFanout,
+    RemoteRoundManager,
+    RoundCommandServer,
+    RoundLoopUnavailable,
+)
+from src.workers.game import round_manager as round_manager_module
+from src.workers.game.round_manager import RoundManager
+
+
+@pytest.fixture
+def relay(monkeypatch):
+    """Serve the game routes from a relay worker sharing a fan-out backend with the leader."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    users = [User(telegram_user_id=telegram_id, balance_ton=Decimal("10.0"))
+             for telegram_id in (601, 602)]
+    session.add_all(users)
+    session.commit()
+    
+    fanout = LocalFanout()
+    leader = RoundManager(session, crash_engine=CrashEngine(countdown_seconds=0))
+    RoundCommandServer(leader, fanout)
+    remote = RemoteRoundManager(fanout)
+    monkeypatch.setattr(round_manager_module, "_round_manager", remote)
+    monkeypatch.setattr(rate_limit, "rate_limiter", RateLimiter())
+    
+    async def authenticate_token(token):
+        return {"id": int(token), "telegram_user_id": 0}
+    
+    monkeypatch.setattr(websocket, "authenticate_token", authenticate_token)
+    
+    app = FastAPI()
+    app.include_router(game.router)
+    app.include_router(websocket.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": users[0].id, "telegram_user_id": 601}
+    yield TestClient(app), leader, fanout, [user.id for user in users]
+    session.close()
+
+
+def test_relay_worker_serves_bets_cashouts_and_status(relay):
+    """Test HTTP and WebSocket commands on a relay worker run on the leader's round."""
+    client, leader, fanout, (http_user, ws_user) = relay
+    
+    assert client.get("/game/round/status").status_code == 404
+    
+    leader.start_round()
+    # Published by the leader's ticker every tick
+    asyncio.run(fanout.publish(encode_frame({"type": "round_update",
+                                             "data": leader.get_round_status()})))
+    status = client.get("/game/round/status")
+    
+    with client.websocket_connect(f"/ws/game?user_id={ws_user}&token={ws_user}") as ws:
+        assert ws.receive_json()["authenticated"] is True
+        bet = client.post("/game/bet", json={"amount": "2.5", "currency": "TON"})
+        ws.send_json({"type": "place_bet", "request_id": 1, "amount": "1", "currency": "TON"})
+        ws_bet = ws.receive_json()
+        
+        leader.begin_round()
+        cashout = client.post("/game/cashout")
+        ws.send_json({"type": "cashout", "request_id": 2})
+        ws_cashout = ws.receive_json()
+        repeat = client.post("/game/cashout")
+    
+    assert status.status_code == 200
+    assert status.json()["round_id"] == leader.current_round_id
+    assert bet.status_code == 200, bet.json()
+    assert Decimal(bet.json()["amount"]) == Decimal("2.5")
+    assert ws_bet["ok"] is True and Decimal(ws_bet["data"]["amount"]) == 1
+    assert cashout.status_code == 200 and cashout.json()["bet_id"] == bet.json()["bet_id"]
+    assert ws_cashout["ok"] is True and ws_cashout["data"]["bet_id"] == ws_bet["data"]["bet_id"]
+    assert (repeat.status_code, repeat.json()["detail"]) == (400, "No active bet to cash out")
+    assert {pending["user_id"] for pending in leader.pending_cashouts} == {http_user, ws_user}
+
+
+@pytest.mark.asyncio
+async def test_relay_command_times_out_without_a_leader():
+    """Test a command nobody answers fails as unavailable instead of hanging."""
+    fanout = LocalFanout()
+    commands = []
+    fanout.subscribe(lambda frame, guaranteed, topic: commands.append(topic))
+    remote = RemoteRoundManager(fanout, timeout_s=0.01)
+    
+    with pytest.raises(RoundLoopUnavailable):
+        await remote.cashout_async(1)
+    assert commands == [TOPIC_ROUND_COMMANDS]
+    assert not remote._pending
@@ -0,0 +1,78 @@
+"""Tests for what importing the API process loads."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[3]
+
+# Loaded on first use only: HTTP client of the payment integrations, YAML
+# settings, economics subpackages no route needs at import, JWT, and the
+# round manager with the numpy-backed game engine (loaded by the lifespan)
+LAZY_MODULES = [
+    "aiohttp",
+    "yaml",
+    "jwt",
+    "numpy",
+    "src.game.engine.bet_manager",
+    "src.workers.game.round_manager",
+    "src.economics.analytics",
+    "src.economics.commissions",
+    "src.economics.game",
+    "src.economics.limits",
+]
+
+
+def test_import_api_is_lazy_and_creates_no_schema(tmp_path):
+    """Importing src.api.main loads no lazy modules and does not touch the database."""
+    db_path = tmp_path / "startup.db"
+    code = (
+        "import json, sys\n"
+        "import src.api.main\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True,
+        env={"DATABASE_URL": f"sqlite:///{db_path}", "PATH": ""}, check=True,
+    )
+    modules = set(json.loads(result.stdout.splitlines()[-1]))
+    
+    assert [m for m in LAZY_MODULES if m in modules] == []
+    assert not db_path.exists()
+
+
+def test_economics_exports_resolve_lazily():
+    """src.economics names are imported from their subpackage on first access."""
+    import src.economics as economics
+    from src.economics.commissions import CommissionCalculator
+    from src.economics.limits import LimitsManager
+    
+    assert economics.LimitsManager is LimitsManager
+    # The commissions calculator shadows the core one, as with eager imports
+    assert economics.CommissionCalculator is CommissionCalculator
+    assert set(economics.__all__) <= set(dir(economics))
+
+
+def test_game_engine_exports_resolve_lazily():
+    """src.game.engine names are imported from their module on first access."""
+    import src.game.engine as engine
+    from src.game.engine.bet_manager import BetManager
+    
+    assert engine.BetManager is BetManager
+    assert set(engine.__all__) <= set(dir(engine))
+
+
+def test_game_economics_load_numpy_only_for_the_simulator():
+    """src.economics.game exports load numpy only when CrashSimulator is accessed."""
+    code = (
+        "import sys\n"
+        "from src.economics.game import HouseProfit\n"
+        "print('numpy' in sys.modules)\n"
+        "from src.economics.game import CrashSimulator\n"
+        "print('numpy' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, check=True,
+    )
+    
+    assert result.stdout.split() == ["False", "True"]
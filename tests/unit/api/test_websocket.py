@@ -0,0 +1,504 @@
+"""Tests for WebSocket broadcasting."""
+import asyncio
+import json
+
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.middleware import rate_limit
+from src.api.middleware.rate_limit import RateLimiter
+from src.api.routes import websocket
+from src.api.routes.websocket import ConnectionManager, encode_frame, run_round_ticker
+from src.api.schemas import ws_frames
+from src.database.connection import Base
+from src.database.models.user import User
+from src.game.engine.bet_manager import BetManager
+from src.game.engine.crash_engine import CrashEngine
+from src.services.realtime import (
+    TOPIC_LEADERBOARD,
+    TOPIC_LIVE_BETS,
+    TOPIC_ROUND,
+    LocalFanout,
+    UnixSocketFanout,
+)
+from src.services.realtime.fanout import pack_frame, unpack_frame
+from src.workers.game.round_manager import RoundManager
+
+
+class FakeWebSocket:
+    """WebSocket stand-in recording sent frames."""
+    
+    def __init__(self, fail: bool = False, stalled: bool = False):
+        self.frames = []
+        self.fail = fail
+        self.stalled = stalled
+        self.close_code = None
+    
+    async def accept(self, subprotocol=None):
+        pass
+    
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.frames.append(data)
+    
+    async def send_bytes(self, data: bytes):
+        self.frames.append(data)
+    
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def drain(connections: ConnectionManager):
+    """Let writer tasks send everything queued."""
+    while any(connection.depth for connection in connections.registry):
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0)
+
+async def drain_one(socket: FakeWebSocket, frames: int):
+    """Wait until a socket has received a number of frames."""
+    while len(socket.frames) < frames:
+        await asyncio.sleep(0.001)
+
+
+class FakeRoundManager:
+    """Round manager stand-in counting status reads."""
+    
+    tick_interval_ms = 1
+    
+    def __init__(self):
+        self.calls = 0
+        self.bet_manager = BetManager()
+    
+    def get_round_status(self):
+        self.calls += 1
+        return {"round_id": 1, "status": "active", "multiplier": 1.5}
+    
+    def get_round_curve(self):
+        return {
+            "round_id": 1, "status": "active", "server_time_ms": 1_700_000_001_000,
+            "multiplier_hundredths": 150, "base_speed_ms": 100,
+            "countdown_ends_at_ms": None, "started_at_ms": 1_700_000_000_000,
+            "crashed_at_ms": None, "crash_hundredths": None,
+        }
+
+
+@pytest.mark.asyncio
+async def test_broadcast_frame_drops_failed_connections():
+    """Test one frame reaches every connection and dead ones are removed."""
+    connections = ConnectionManager()
+    alive, dead = FakeWebSocket(), FakeWebSocket(fail=True)
+    await connections.connect(alive, 1)
+    await connections.connect(dead, 2)
+    
+    await connections.broadcast({"type": "crash", "multiplier": 2.5})
+    await drain(connections)
+    
+    assert json.loads(alive.frames[0]) == {"type": "crash", "multiplier": 2.5}
+    assert connections.active_connections == [alive]
+
+
+@pytest.mark.asyncio
+async def test_ticker_builds_one_frame_per_tick(monkeypatch):
+    """Test the ticker reads the status once per tick for all connections."""
+    connections = ConnectionManager()
+    monkeypatch.setattr(websocket, "manager", connections)
+    sockets = [FakeWebSocket() for _ in range(50)]
+    for user_id, socket in enumerate(sockets):
+        await connections.connect(socket, user_id)
+    
+    round_manager = FakeRoundManager()
+    task = asyncio.create_task(run_round_ticker(round_manager))
+    while not sockets[-1].frames:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    
+    expected = encode_frame({"type": "round_update", "data": round_manager.get_round_status()})
+    assert sockets[0].frames[0] == expected
+    assert round_manager.calls - 1 == len(sockets[0].frames)
+    assert all(socket.frames[0] is sockets[0].frames[0] for socket in sockets)
+
+
+def test_websocket_confirms_connection():
+    """Test a client receives the connection confirmation."""
+    app = FastAPI()
+    app.include_router(websocket.router)
+    
+    with TestClient(app).websocket_connect("/ws/game?user_id=42") as ws:
+        message = ws.receive_json()
+    
+    assert message["type"] == "connected"
+    assert message["user_id"] == 42
+
+
+def test_binary_frames_are_fixed_width():
+    """Test binary frames round-trip and stay a few bytes long."""
+    curve = FakeRoundManager().get_round_curve()
+    started = ws_frames.encode_state(curve)
+    sync = ws_frames.encode_sync(curve)
+    crash = ws_frames.encode_state({**curve, "status": "crashed",
+                                    "crashed_at_ms": 1_700_000_002_000, "crash_hundredths": 250})
+    
+    assert (len(started), len(sync), len(crash)) == (19, 21, 21)
+    assert ws_frames.decode(started) == {
+        "type": "started", "round_id": 1, "started_at_ms": 1_700_000_000_000, "base_speed_ms": 100
+    }
+    assert ws_frames.decode(sync)["multiplier_hundredths"] == 150
+    assert ws_frames.decode(crash)["crash_hundredths"] == 250
+    assert ws_frames.encode_state(None) is None
+
+
+@pytest.mark.asyncio
+async def test_ticker_sends_binary_state_then_syncs(monkeypatch):
+    """Test binary clients get the phase frame once, then sync frames."""
+    connections = ConnectionManager()
+    monkeypatch.setattr(websocket, "manager", connections)
+    json_socket, binary_socket = FakeWebSocket(), FakeWebSocket()
+    await connections.connect(json_socket, 1)
+    await connections.connect(binary_socket, 2, ws_frames.BINARY_SUBPROTOCOL)
+    
+    task = asyncio.create_task(run_round_ticker(FakeRoundManager(), sync_interval_ms=5))
+    while len(binary_socket.frames) < 3:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    
+    types = [ws_frames.decode(frame)["type"] for frame in binary_socket.frames]
+    assert types[0] == "started"
+    assert set(types[1:]) == {"sync"}
+    assert all(isinstance(frame, str) for frame in json_socket.frames)
+    assert len(json_socket.frames) > len(binary_socket.frames)
+
+
+def test_websocket_negotiates_binary_protocol(monkeypatch):
+    """Test offering the binary subprotocol switches a client to binary frames."""
+    monkeypatch.setattr(websocket, "get_round_manager", FakeRoundManager)
+    app = FastAPI()
+    app.include_router(websocket.router)
+    
+    with TestClient(app).websocket_connect(
+        "/ws/game?user_id=7", subprotocols=[ws_frames.BINARY_SUBPROTOCOL]
+    ) as ws:
+        assert ws.accepted_subprotocol == ws_frames.BINARY_SUBPROTOCOL
+        assert ws.receive_json()["type"] == "connected"
+        assert ws_frames.decode(ws.receive_bytes())["type"] == "started"
+
+
+@pytest.mark.asyncio
+async def test_broadcast_does_not_wait_for_slow_clients():
+    """Test a stalled client keeps only the latest tick and events in order."""
+    connections = ConnectionManager()
+    fast, slow = FakeWebSocket(), FakeWebSocket(stalled=True)
+    await connections.connect(fast, 1)
+    await connections.connect(slow, 2)
+    await asyncio.sleep(0)
+    
+    for tick in range(10):
+        connections.broadcast_frame(encode_frame({"type": "round_update", "tick": tick}))
+        await connections.broadcast({"type": "bet", "tick": tick})
+        await drain_one(fast, 2 * (tick + 1))
+    
+    slow_connection = connections.registry.get(slow)
+    assert len(fast.frames) == 20
+    assert slow_connection.events[-1][1] == encode_frame({"type": "bet", "tick": 9})
+    assert slow_connection.tick[1] == encode_frame({"type": "round_update", "tick": 9})
+    assert slow_connection.dropped > 0
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_evicted():
+    """Test a client whose queue stays full is closed and unregistered."""
+    connections = ConnectionManager(max_queue=4, evict_after_s=0.01)
+    slow = FakeWebSocket(stalled=True)
+    await connections.connect(slow, 1)
+    await asyncio.sleep(0)
+    
+    for _ in range(5):
+        await connections.broadcast({"type": "bet"})
+    await asyncio.sleep(0.02)
+    await connections.broadcast({"type": "bet"})
+    await asyncio.sleep(0.01)
+    
+    assert connections.active_connections == []
+    assert connections.registry.users == {}
+    assert slow.close_code == 1013
+
+
+@pytest.mark.asyncio
+async def test_fanout_reaches_every_worker():
+    """Test a frame published by one worker reaches sockets on all of them."""
+    fanout = LocalFanout()
+    publisher, relay = ConnectionManager(fanout=fanout), ConnectionManager(fanout=fanout)
+    local, remote = FakeWebSocket(), FakeWebSocket()
+    await publisher.connect(local, 1)
+    await relay.connect(remote, 2)
+    
+    await publisher.broadcast({"type": "crash", "multiplier": 2.5})
+    await publisher.publish(b"\x04state", guaranteed=True)
+    await drain(publisher)
+    await drain(relay)
+    
+    assert local.frames == remote.frames == [encode_frame({"type": "crash", "multiplier": 2.5})]
+    assert relay.last_state_frame == b"\x04state"
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_fanout_reaches_every_worker(tmp_path):
+    """Test workers of one host share frames through the round loop leader's socket."""
+    path = tmp_path / "fanout.sock"
+    # The other worker may start first: it keeps retrying until the hub listens
+    worker = UnixSocketFanout(path, hub=False, reconnect_delay_s=0.01)
+    await worker.start()
+    hub = UnixSocketFanout(path, hub=True)
+    await hub.start()
+    leader, relay = ConnectionManager(fanout=hub), ConnectionManager(fanout=worker)
+    local, remote = FakeWebSocket(), FakeWebSocket()
+    await leader.connect(local, 1)
+    await relay.connect(remote, 2)
+    while not hub._peers:
+        await asyncio.sleep(0.01)
+    
+    await leader.broadcast({"type": "crash", "multiplier": 2.5})
+    await relay.broadcast({"type": "bet", "user_id": 2})
+    while len(local.frames) < 2 or len(remote.frames) < 2:
+        await asyncio.sleep(0.01)
+    await worker.stop()
+    await hub.stop()
+    
+    assert local.frames == remote.frames == [
+        encode_frame({"type": "crash", "multiplier": 2.5}),
+        encode_frame({"type": "bet", "user_id": 2}),
+    ]
+    assert not path.exists()
+
+
+def test_fanout_wire_format_round_trips():
+    """Test packed frames keep their type and delivery guarantee."""
+    assert unpack_frame(pack_frame('{"a":1}')) == ('{"a":1}', False, TOPIC_ROUND)
+    assert unpack_frame(pack_frame(b"\x03sync", True, TOPIC_LEADERBOARD)) == (
+        b"\x03sync", True, TOPIC_LEADERBOARD
+    )
+
+
+@pytest.mark.asyncio
+async def test_user_sockets_are_indexed_per_connection():
+    """Test a second tab does not replace the first and each tab leaves alone."""
+    connections = ConnectionManager()
+    first, second, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    for websocket, user_id in ((first, 1), (second, 1), (other, 2)):
+        await connections.connect(websocket, user_id)
+        connections.authenticate(websocket, user_id)
+    
+    assert connections.send_to_user(1, {"type": "balance"}) == 2
+    await drain(connections)
+    assert first.frames == second.frames == [encode_frame({"type": "balance"})]
+    assert other.frames == []
+    
+    connections.disconnect(first, 1)
+    assert connections.active_connections == [second, other]
+    assert {c.websocket for c in connections.registry.user(1)} == {second}
+    connections.disconnect(second, 1)
+    assert 1 not in connections.registry.users
+
+
+@pytest.mark.asyncio
+async def test_personal_events_need_authentication():
+    """Test a socket claiming a user_id it did not prove gets none of its events."""
+    connections = ConnectionManager()
+    owner, impostor = FakeWebSocket(), FakeWebSocket()
+    await connections.connect(owner, 1)
+    await connections.connect(impostor, 1)
+    assert connections.send_to_user(1, {"type": "balance"}) == 0
+    
+    connections.authenticate(owner, 1)
+    assert connections.send_to_user(1, {"type": "balance"}) == 1
+    await drain(connections)
+    assert owner.frames == [encode_frame({"type": "balance"})]
+    assert impostor.frames == []
+
+
+@pytest.mark.asyncio
+async def test_topic_broadcast_reaches_subscribers_only():
+    """Test topic frames go to subscribed connections of the frame's protocol."""
+    connections = ConnectionManager()
+    watcher, player = FakeWebSocket(), FakeWebSocket()
+    await connections.connect(watcher, 1)
+    await connections.connect(player, 2)
+    connections.subscribe(watcher, TOPIC_LEADERBOARD)
+    connections.unsubscribe(player, TOPIC_ROUND)
+    
+    await connections.broadcast({"type": "leaderboard"}, topic=TOPIC_LEADERBOARD)
+    await connections.broadcast({"type": "crash"})
+    await drain(connections)
+    
+    assert [json.loads(frame)["type"] for frame in watcher.frames] == ["leaderboard", "crash"]
+    assert player.frames == []
+    with pytest.raises(ValueError):
+        connections.subscribe(player, "everything")
+
+
+def test_websocket_subscribes_to_topics():
+    """Test clients manage their subscriptions over the socket."""
+    app = FastAPI()
+    app.include_router(websocket.router)
+    
+    with TestClient(app).websocket_connect("/ws/game?user_id=3") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "subscribe", "topic": TOPIC_LEADERBOARD})
+        ack = ws.receive_json()
+        assert (ack["type"], ack["ok"], ack["data"]) == (
+            "subscribe_ack", True, {"topic": TOPIC_LEADERBOARD}
+        )
+        ws.send_json({"type": "subscribe", "topic": "everything"})
+        assert ws.receive_json()["ok"] is False
+
+
+@pytest.fixture
+def game_round(monkeypatch):
+    """Serve /ws/game with a round in its countdown and a funded user."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(telegram_user_id=555, balance_ton=Decimal("10.0"))
+    session.add(user)
+    session.commit()
+    
+    round_manager = RoundManager(session, crash_engine=CrashEngine(countdown_seconds=0))
+    round_manager.start_round()
+    monkeypatch.setattr(websocket, "get_round_manager", lambda: round_manager)
+    monkeypatch.setattr(rate_limit, "rate_limiter", RateLimiter())
+    
+    async def authenticate_token(token):
+        return {"id": user.id, "telegram_user_id": 555} if token == "good" else None
+    
+    monkeypatch.setattr(websocket, "authenticate_token", authenticate_token)
+    
+    app = FastAPI()
+    app.include_router(websocket.router)
+    yield TestClient(app), round_manager, user.id
+    session.close()
+
+
+def test_websocket_bet_and_cashout(game_round):
+    """Test an authenticated socket places a bet and cashes out with timed acks."""
+    client, round_manager, user_id = game_round
+    
+    with client.websocket_connect(f"/ws/game?user_id={user_id}&token=good") as ws:
+        assert ws.receive_json()["authenticated"] is True
+        ws.send_json({"type": "place_bet", "request_id": 1, "amount": "2.5", "currency": "TON"})
+        bet_ack = ws.receive_json()
+        
+        round_manager.begin_round()
+        ws.send_json({"type": "cashout", "request_id": 2})
+        cashout_ack = ws.receive_json()
+        ws.send_json({"type": "cashout", "request_id": 3})
+        repeat_ack = ws.receive_json()
+    
+    assert (bet_ack["type"], bet_ack["request_id"], bet_ack["ok"]) == ("place_bet_ack", 1, True)
+    assert Decimal(bet_ack["data"]["amount"]) == Decimal("2.5")
+    assert bet_ack["received_at"] <= bet_ack["sent_at"]
+    assert (cashout_ack["type"], cashout_ack["ok"]) == ("cashout_ack", True)
+    assert cashout_ack["data"]["bet_id"] == bet_ack["data"]["bet_id"]
+    assert repeat_ack == {**repeat_ack, "ok": False, "error": "No active bet to cash out"}
+
+
+def test_websocket_commands_require_authentication(game_round):
+    """Test bets from an unauthenticated socket are refused until it authenticates."""
+    client, round_manager, user_id = game_round
+    
+    with client.websocket_connect(f"/ws/game?user_id={user_id}") as ws:
+        assert ws.receive_json()["authenticated"] is False
+        ws.send_json({"type": "place_bet", "amount": "1", "currency": "TON"})
+        refused = ws.receive_json()
+        ws.send_json({"type": "auth", "token": "bad"})
+        bad_token = ws.receive_json()
+        ws.send_json({"type": "auth", "token": "good"})
+        ws.receive_json()
+        ws.send_json({"type": "place_bet", "amount": "0", "currency": "TON"})
+        invalid = ws.receive_json()
+        ws.send_json({"type": "place_bet", "amount": "1", "currency": "TON",
+                      "auto_cashout": "30000000"})
+        over_cap = ws.receive_json()
+    
+    assert (refused["ok"], refused["error"]) == (False, "Not authenticated")
+    assert (bad_token["ok"], bad_token["error"]) == (False, "Invalid token")
+    assert invalid["ok"] is False
+    assert over_cap["ok"] is False
+    assert round_manager.bet_manager.get_user_bet(user_id, round_manager.current_round_id) is None
+
+
+def test_banned_user_loses_an_open_socket(game_round, monkeypatch):
+    """Test a ban (the token no longer resolving) refuses the next command on a live socket."""
+    client, round_manager, user_id = game_round
+    
+    with client.websocket_connect(f"/ws/game?user_id={user_id}&token=good") as ws:
+        assert ws.receive_json()["authenticated"] is True
+        
+        async def banned(token):
+            return None
+        
+        monkeypatch.setattr(websocket, "authenticate_token", banned)
+        ws.send_json({"type": "place_bet", "amount": "1", "currency": "TON"})
+        refused = ws.receive_json()
+        personal_sockets = len(websocket.manager.registry.user(user_id))
+    
+    assert (refused["ok"], refused["error"]) == (False, "Not authenticated")
+    assert personal_sockets == 0
+    assert round_manager.bet_manager.get_user_bet(user_id, round_manager.current_round_id) is None
+
+
+def test_websocket_bets_share_the_bet_rate_limit(game_round):
+    """Test bet commands are limited like POST /game/bet and refused before reaching the round."""
+    client, round_manager, user_id = game_round
+    policy = rate_limit.route_policy("POST", "/game/bet")
+    
+    with client.websocket_connect(f"/ws/game?user_id={user_id}&token=good") as ws:
+        ws.receive_json()
+        acks = []
+        for request_id in range(policy.max_requests + 1):
+            ws.send_json({"type": "place_bet", "request_id": request_id,
+                          "amount": "1", "currency": "TON"})
+            acks.append(ws.receive_json())
+    
+    assert acks[0]["ok"] is True
+    assert [ack["error"] for ack in acks[1:-1]] == (
+        ["You already have an active bet in this round"] * (policy.max_requests - 1)
+    )
+    assert (acks[-1]["ok"], acks[-1]["error"]) == (False, "Rate limit exceeded")
+    assert acks[-1]["retry_after"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_ticker_sends_one_live_bets_delta_per_tick(monkeypatch):
+    """Test many bets between ticks reach feed subscribers as one frame."""
+    connections = ConnectionManager()
+    monkeypatch.setattr(websocket, "manager", connections)
+    watcher, player = FakeWebSocket(), FakeWebSocket()
+    await connections.connect(watcher, 1)
+    await connections.connect(player, 2)
+    connections.subscribe(watcher, TOPIC_LIVE_BETS)
+    connections.unsubscribe(watcher, TOPIC_ROUND)
+    
+    round_manager = FakeRoundManager()
+    for user_id in range(100):
+        round_manager.bet_manager.place_bet(user_id, 1, Decimal("1"), "TON")
+    
+    task = asyncio.create_task(run_round_ticker(round_manager))
+    while not watcher.frames:
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0.01)
+    task.cancel()
+    
+    frames = [json.loads(frame) for frame in watcher.frames]
+    assert [frame["type"] for frame in frames] == [TOPIC_LIVE_BETS]
+    assert len(frames[0]["data"]["bets"]) == 100
+    assert Decimal(frames[0]["data"]["totals"]["TON"]["amount"]) == 100
+    assert all(json.loads(frame)["type"] == "round_update" for frame in player.frames)
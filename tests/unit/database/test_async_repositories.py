@@ -0,0 +1,104 @@
+"""Tests for the async repositories."""
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.async_connection import async_database_url
+from src.database.connection import Base
+from src.database.models.payment import PaymentMethod, PaymentStatus, PaymentType
+from src.database.models.user import User
+from src.database.repositories.payment_repo import AsyncPaymentRepository
+from src.database.repositories.user_repo import AsyncUserRepository
+from src.payments.ton.transactions import AsyncTONTransactionProcessor
+
+
+def run_with_session(test):
+    """Run an async test against a fresh in-memory database."""
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                await test(session)
+        finally:
+            await engine.dispose()
+    
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///data/crash_game.db", "sqlite+aiosqlite:///data/crash_game.db"),
+    ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+    ("postgresql://u:p@localhost/db", "postgresql+asyncpg://u:p@localhost/db"),
+    ("postgresql+asyncpg://u:p@localhost/db", "postgresql+asyncpg://u:p@localhost/db"),
+])
+def test_async_database_url(url, expected):
+    """Sync URLs are mapped to their async drivers."""
+    assert async_database_url(url) == expected
+
+
+def test_user_repository_create_and_lookup():
+    """Users created through the async repository can be read back."""
+    async def test(session):
+        repo = AsyncUserRepository(session)
+        user = await repo.create(telegram_user_id=42, username="alice")
+        
+        assert (await repo.get_by_id(user.id)).username == "alice"
+        assert (await repo.get_by_telegram_id(42)).id == user.id
+        assert await repo.get_by_telegram_id(43) is None
+    
+    run_with_session(test)
+
+
+def test_payment_repository_create_and_history():
+    """Deposits and withdrawals are created pending and listed per user."""
+    async def test(session):
+        user = User(telegram_user_id=7)
+        session.add(user)
+        await session.commit()
+        
+        repo = AsyncPaymentRepository(session)
+        deposit = await repo.create_deposit(user.id, Decimal("10"), "TON", PaymentMethod.TON)
+        withdrawal = await repo.create_withdrawal(user.id, Decimal("5"), "TON", PaymentMethod.TON,
+                                                  Decimal("0.1"), ton_address="EQ-test")
+        
+        assert deposit.status == PaymentStatus.PENDING
+        assert withdrawal.net_amount == Decimal("4.9")
+        payments = await repo.get_user_payments(user.id)
+        assert {p.id for p in payments} == {deposit.id, withdrawal.id}
+        deposits = await repo.get_user_payments(user.id, PaymentType.DEPOSIT)
+        assert [p.id for p in deposits] == [deposit.id]
+    
+    run_with_session(test)
+
+
+@pytest.mark.parametrize("sent, balance, status", [
+    (True, Decimal("5"), PaymentStatus.COMPLETED),
+    (False, Decimal("10"), PaymentStatus.FAILED),
+])
+def test_ton_withdrawal_on_async_session(sent, balance, status):
+    """Withdrawals debit the balance, and refund it when the transfer fails."""
+    async def test(session):
+        user = User(telegram_user_id=7, balance_ton=Decimal("10"))
+        session.add(user)
+        await session.commit()
+        
+        payment = await AsyncPaymentRepository(session).create_withdrawal(
+            user.id, Decimal("5"), "TON", PaymentMethod.TON, Decimal("0.1"), ton_address="EQ-test"
+        )
+        send = AsyncMock(return_value="tx-hash") if sent else AsyncMock(side_effect=OSError("down"))
+        with patch("src.payments.ton.integration.TONIntegration.send_transaction", send):
+            tx_hash = await AsyncTONTransactionProcessor(session).process_withdrawal(payment.id)
+        
+        await session.refresh(user)
+        assert tx_hash == ("tx-hash" if sent else None)
+        assert user.balance_ton == balance
+        assert user.total_withdrawn_ton == (Decimal("5") if sent else Decimal("0"))
+        assert payment.status == status
+    
+    run_with_session(test)
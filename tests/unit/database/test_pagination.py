@@ -0,0 +1,112 @@
+"""Tests for keyset pagination of per-user history."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from src.database.connection import Base
+from src.database.models.payment import Payment, PaymentMethod, PaymentStatus, PaymentType
+from src.database.models.transaction import Transaction, TransactionType
+from src.database.models.user import User
+from src.database.pagination import decode_cursor, encode_cursor, split_page
+from src.database.repositories.payment_repo import PaymentRepository
+from src.services.user import UserHistoryService
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+def add_payments(db, user_id, created_at):
+    """Add a deposit per timestamp (None uses the column default)."""
+    for at in created_at:
+        payment = Payment(user_id=user_id, payment_type=PaymentType.DEPOSIT,
+                          payment_method=PaymentMethod.TON, amount=Decimal("1"), currency="TON",
+                          net_amount=Decimal("1"), status=PaymentStatus.COMPLETED)
+        if at is not None:
+            payment.created_at = at
+        db.add(payment)
+    db.commit()
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Cursors decode to what was encoded; anything else is a ValueError."""
+    at = datetime(2026, 1, 2, 3, 4, 5, 678)
+    assert decode_cursor(encode_cursor(at, 42)) == (at, 42)
+    for cursor in ("", "not-a-cursor", encode_cursor(at, 42)[:-3]):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_pages_cover_every_row_once_with_ties(db_session):
+    """Paging visits each row once, newest first, across tied and mixed-precision timestamps."""
+    user = User(telegram_user_id=1)
+    other = User(telegram_user_id=2)
+    db_session.add_all([user, other])
+    db_session.commit()
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    # Whole-second and fractional timestamps, several rows per timestamp, and defaults
+    add_payments(db_session, user.id, [base] * 3 + [base + timedelta(microseconds=500)] * 2
+                 + [base + timedelta(seconds=1)] * 3 + [None] * 2)
+    add_payments(db_session, other.id, [base] * 4)
+    repo = PaymentRepository(db_session)
+    
+    expected = repo.get_user_payments(user.id, limit=1000)
+    seen, cursor = [], None
+    while True:
+        page, cursor = split_page(repo.get_user_payments(user.id, limit=4, cursor=cursor),
+                                  3, "created_at")
+        seen.extend(p.id for p in page)
+        if cursor is None:
+            break
+    
+    assert seen == [p.id for p in expected]
+    assert len(seen) == 10
+    keys = [(p.created_at, p.id) for p in expected]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_history_service_returns_next_cursor(db_session):
+    """UserHistoryService pages carry the cursor of the next page until the last one."""
+    user = User(telegram_user_id=1)
+    db_session.add(user)
+    db_session.commit()
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    db_session.add_all(
+        Transaction(user_id=user.id, transaction_type=TransactionType.BONUS, currency="TON",
+                    amount=Decimal(i), balance_before=Decimal(0), balance_after=Decimal(i),
+                    created_at=base + timedelta(minutes=i))
+        for i in range(5)
+    )
+    db_session.commit()
+    service = UserHistoryService(db_session)
+    
+    first = service.get_transaction_history(user.id, limit=2)
+    second = service.get_transaction_history(user.id, limit=2, cursor=first["next_cursor"])
+    last = service.get_transaction_history(user.id, limit=2, cursor=second["next_cursor"])
+    
+    assert [t["amount"] for t in first["items"]] == [4.0, 3.0]
+    assert [t["amount"] for t in second["items"]] == [2.0, 1.0]
+    assert [t["amount"] for t in last["items"]] == [0.0]
+    assert last["next_cursor"] is None
+
+
+def test_history_indexes_exist(db_session):
+    """Each paginated table has its (user_id, timestamp, id) index."""
+    inspector = inspect(db_session.get_bind())
+    indexes = {
+        table: {tuple(ix["column_names"]) for ix in inspector.get_indexes(table)}
+        for table in ("bets", "payments", "transactions")
+    }
+    assert ("user_id", "placed_at", "id") in indexes["bets"]
+    assert ("user_id", "created_at", "id") in indexes["payments"]
+    assert ("user_id", "created_at", "id") in indexes["transactions"]
@@ -0,0 +1,96 @@
+"""Tests for the auto cashout scheduler."""
+import pytest
+from decimal import Decimal
+
+from src.database.models.game import BetStatus
+from src.game.engine.auto_cashout_scheduler import AutoCashoutScheduler
+from src.game.engine.bet_manager import BetManager
+from src.game.engine.multiplier_calculator import MultiplierCalculator
+
+
+@pytest.fixture
+def bet_manager():
+    """Create a bet manager with active auto cashout bets."""
+    manager = BetManager()
+    targets = {1: Decimal("1.50"), 2: Decimal("2.00"), 3: Decimal("2.00"), 4: None}
+    for user_id, target in targets.items():
+        manager.place_bet(user_id, 1, Decimal("1.0"), "TON", target)
+    manager.activate_bets(1)
+    return manager
+
+
+@pytest.mark.parametrize("base_speed", [100, 37, 50, 1])
+def test_trigger_ms_matches_curve(base_speed):
+    """Test trigger time is the first millisecond the target is shown."""
+    calculator = MultiplierCalculator(base_speed)
+    never = Decimal("100000")
+    for target in range(101, 400):
+        trigger_ms = calculator.get_trigger_ms(target)
+        expected = Decimal(target).scaleb(-2)
+        assert calculator.get_multiplier_at_time(never, trigger_ms) >= expected
+        assert calculator.get_multiplier_at_time(never, trigger_ms - 1) < expected
+
+
+def test_to_hundredths_rounds_up():
+    """Test off-grid targets are reached at the next grid point."""
+    assert AutoCashoutScheduler.to_hundredths(Decimal("2.00")) == 200
+    assert AutoCashoutScheduler.to_hundredths(Decimal("2.001")) == 201
+
+
+def test_pop_due_only_crossed():
+    """Test only crossed targets are popped, in target order."""
+    scheduler = AutoCashoutScheduler()
+    scheduler.schedule(1, Decimal("3.0"))
+    scheduler.schedule(2, Decimal("1.5"))
+    scheduler.schedule(3, Decimal("2.0"))
+    
+    assert scheduler.pop_due(Decimal("1.49")) == []
+    assert scheduler.pop_due(Decimal("2.00")) == [(2, 150), (3, 200)]
+    assert len(scheduler) == 1
+
+
+def test_cancelled_entries_are_skipped():
+    """Test cancelled auto cashouts never fire."""
+    scheduler = AutoCashoutScheduler()
+    scheduler.schedule(1, Decimal("1.5"))
+    scheduler.schedule(2, Decimal("2.0"))
+    scheduler.cancel(1)
+    
+    assert scheduler.peek_trigger_ms() == MultiplierCalculator().get_trigger_ms(200)
+    assert scheduler.pop_due(Decimal("5.0")) == [(2, 200)]
+
+
+def test_pop_due_at_respects_crash_point():
+    """Test targets at or above the crash point never fire."""
+    scheduler = AutoCashoutScheduler()
+    scheduler.schedule(1, Decimal("1.5"))
+    scheduler.schedule(2, Decimal("2.0"))
+    
+    assert scheduler.pop_due_at(10 ** 9, Decimal("2.00")) == [(1, 150)]
+
+
+def test_check_auto_cashouts(bet_manager):
+    """Test auto cashouts cash out at the current multiplier."""
+    cashed_out = bet_manager.check_auto_cashouts(Decimal("2.01"))
+    
+    assert sorted(bet["user_id"] for bet in cashed_out) == [1, 2, 3]
+    assert all(bet["cashed_out_multiplier"] == Decimal("2.01") for bet in cashed_out)
+    assert [bet["user_id"] for bet in bet_manager.get_active_bets()] == [4]
+
+
+def test_fire_due_auto_cashouts_pays_target(bet_manager):
+    """Test exact-time auto cashouts pay the target multiplier."""
+    elapsed_ms = MultiplierCalculator().get_trigger_ms(150)
+    cashed_out = bet_manager.fire_due_auto_cashouts(elapsed_ms, Decimal("10.0"))
+    
+    assert [bet["user_id"] for bet in cashed_out] == [1]
+    assert cashed_out[0]["payout"] == Decimal("1.50")
+    assert bet_manager.next_auto_cashout_ms() == MultiplierCalculator().get_trigger_ms(200)
+
+
+def test_manual_cashout_cancels_auto_cashout(bet_manager):
+    """Test a manual cashout removes the scheduled auto cashout."""
+    bet = bet_manager.cashout_bet(1, Decimal("1.20"))
+    
+    assert bet["status"] == BetStatus.CASHED_OUT
+    assert [b["user_id"] for b in bet_manager.check_auto_cashouts(Decimal("1.5"))] == []
@@ -0,0 +1,70 @@
+"""Tests for the batch round verifier."""
+import hashlib
+import pytest
+import numpy as np
+from decimal import Decimal
+from fractions import Fraction
+
+from src.game.engine import fixed_point
+from src.game.engine.batch_verifier import crash_points_hundredths, verify_rounds
+from src.game.engine.provably_fair import ProvablyFair
+
+
+@pytest.fixture
+def rounds():
+    """Build 200 honestly played rounds."""
+    server_seeds = [hashlib.sha256(f"server{i}".encode()).hexdigest() for i in range(200)]
+    client_seeds = [None if i % 2 else f"client{i}" for i in range(200)]
+    round_ids = list(range(1, 201))
+    crash_points = [
+        ProvablyFair.calculate_crash_point(ProvablyFair.combine_seeds(s, c, r))
+        for s, c, r in zip(server_seeds, client_seeds, round_ids)
+    ]
+    seed_hashes = [ProvablyFair.hash_seed(s) for s in server_seeds]
+    return server_seeds, client_seeds, round_ids, crash_points, seed_hashes
+
+
+def test_honest_rounds_verify(rounds):
+    """Test honestly played rounds produce no mismatches."""
+    assert verify_rounds(*rounds) == []
+
+
+def test_mismatches_are_reported(rounds):
+    """Test tampered crash points and seed hashes are reported."""
+    server_seeds, client_seeds, round_ids, crash_points, seed_hashes = rounds
+    crash_points[10] = crash_points[10] + Decimal("0.01")
+    seed_hashes[20] = "0" * 64
+    
+    mismatches = verify_rounds(server_seeds, client_seeds, round_ids, crash_points, seed_hashes)
+    
+    assert [(m["round_id"], m["reason"]) for m in mismatches] == [
+        (11, "crash_point_mismatch"), (21, "server_seed_hash_mismatch")
+    ]
+    assert Decimal(mismatches[0]["recorded_crash_point"]) == crash_points[10]
+
+
+def test_process_pool_matches_in_process(rounds):
+    """Test the process pool yields the same mismatches in order."""
+    server_seeds, client_seeds, round_ids, crash_points, seed_hashes = rounds
+    crash_points[5] = Decimal("1.00")
+    crash_points[150] = Decimal("1.00")
+    
+    in_process = verify_rounds(*rounds, workers=1, batch_size=30)
+    pooled = verify_rounds(*rounds, workers=2, batch_size=30)
+    assert pooled == in_process
+    assert [m["round_id"] for m in pooled] == [6, 151]
+
+
+def test_vectorized_crash_points_match_scalar():
+    """Test vectorized crash points equal the scalar formula, including near ties."""
+    numerator, edge_factor = fixed_point._crash_coefficients(Decimal("0.01"))
+    seed_ints = [0, 1, 2 ** 63, 2 ** 64 - 2 ** 40, 2 ** 64 - 1]
+    seed_ints += [int(hashlib.sha256(str(i).encode()).hexdigest()[:16], 16) for i in range(5000)]
+    for hundredths in list(range(202, 260)) + list(range(1000, 100000, 4999)):
+        target = Fraction(2 * hundredths + 1, 2) - 100
+        seed_ints.append(int(Fraction(2 ** 64 * (10 ** 7 + 1), 10 ** 7)
+                             - Fraction(numerator, edge_factor * 10 ** 7) / target))
+    
+    vectorized = crash_points_hundredths(np.array(seed_ints, dtype=np.uint64))
+    scalar = [fixed_point.crash_point_hundredths(f"{s:016x}") for s in seed_ints]
+    assert vectorized.tolist() == scalar
@@ -0,0 +1,91 @@
+"""Tests for the columnar bet store."""
+import pytest
+from decimal import Decimal
+
+from src.database.models.game import BetStatus
+from src.game.engine.bet_store import (
+    RoundBetStore, to_auto_cashout_hundredths, to_minor_units, from_minor_units, CURRENCY_CODES
+)
+
+
+@pytest.fixture
+def store():
+    """Create a store with two TON bets and one Stars bet."""
+    store = RoundBetStore(round_id=1, capacity=2)
+    store.add(1, Decimal("1.5"), "TON", Decimal("2.00"))
+    store.add(2, Decimal("0.000000001"), "TON")
+    store.add(3, Decimal("10.25"), "STARS", Decimal("1.505"))
+    return store
+
+
+def test_minor_units_round_trip():
+    """Test amounts convert to minor units and back exactly."""
+    assert to_minor_units(Decimal("1.5"), "TON") == 1_500_000_000
+    assert to_minor_units(Decimal("10.25"), "STARS") == 1025
+    assert from_minor_units(1025, CURRENCY_CODES["STARS"]) == Decimal("10.25")
+
+
+def test_minor_units_reject_extra_precision():
+    """Test amounts finer than the minor unit are rejected."""
+    with pytest.raises(ValueError):
+        to_minor_units(Decimal("1.001"), "STARS")
+
+
+def test_auto_cashout_capped_at_max_crash():
+    """Test auto cashout targets above the crash cap are rejected before they are stored."""
+    assert to_auto_cashout_hundredths(Decimal("1000")) == 100000
+    store = RoundBetStore(round_id=1)
+    with pytest.raises(ValueError):
+        store.add(1, Decimal("1"), "TON", Decimal("30000000"))
+    
+    assert len(store) == 0
+    assert store.slots == {}
+
+
+def test_store_grows(store):
+    """Test the store grows past its initial capacity."""
+    assert len(store) == 3
+    assert len(store.status) == 4
+    assert store.to_dict(store.slots[3])["amount"] == Decimal("10.25")
+    assert store.to_dict(store.slots[3])["auto_cashout_multiplier"] == Decimal("1.51")
+
+
+def test_duplicate_bet_rejected(store):
+    """Test a user cannot hold two bets in one round."""
+    with pytest.raises(ValueError):
+        store.add(1, Decimal("1"), "TON")
+
+
+def test_activate_cashout_crash(store):
+    """Test the bet lifecycle over the status column."""
+    assert store.activate().tolist() == [0, 1, 2]
+    
+    payout = store.cashout(store.slots[1], 201)
+    assert payout == 3_015_000_000
+    with pytest.raises(ValueError):
+        store.cashout(store.slots[1], 250)
+    
+    assert store.crash().tolist() == [1, 2]
+    assert store.active_slots().tolist() == []
+    
+    bet = store.to_dict(store.slots[1])
+    assert bet["status"] == BetStatus.CASHED_OUT
+    assert bet["cashed_out_multiplier"] == Decimal("2.01")
+    assert bet["payout"] == Decimal("3.015")
+    assert store.to_dict(store.slots[2])["status"] == BetStatus.CRASHED
+
+
+def test_totals(store):
+    """Test per-currency totals in minor units."""
+    store.activate()
+    store.cashout(store.slots[3], 150)
+    
+    totals = store.totals()
+    assert totals["TON"] == {"count": 2, "amount": 1_500_000_001, "payout": 0}
+    assert totals["STARS"] == {"count": 1, "amount": 1025, "payout": 1537}
+
+
+def test_memory_per_bet():
+    """Test a bet costs a few dozen bytes of column storage."""
+    store = RoundBetStore(round_id=1, capacity=1024)
+    assert store.nbytes / 1024 <= 48
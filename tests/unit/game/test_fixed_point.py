@@ -0,0 +1,88 @@
+"""Tests for integer fixed-point crash math."""
+import hashlib
+import os
+import pytest
+from decimal import Decimal
+from fractions import Fraction
+
+from src.game.engine import fixed_point
+from src.game.engine.provably_fair import ProvablyFair
+
+# Set CRASH_EQUIVALENCE_SEEDS=10000000 for the full equivalence run
+EQUIVALENCE_SEEDS = int(os.getenv("CRASH_EQUIVALENCE_SEEDS", "20000"))
+HOUSE_EDGES = [Decimal("0"), Decimal("0.01"), Decimal("0.05")]
+
+
+def reference_hundredths(combined_seed: str, house_edge: Decimal) -> int:
+    """Crash point of the Decimal formula in hundredths."""
+    return fixed_point.to_hundredths(
+        ProvablyFair.calculate_crash_point_reference(combined_seed, house_edge)
+    )
+
+
+def seed_for(seed_int: int) -> str:
+    """Build a combined seed whose first 64 bits are seed_int."""
+    return f"{seed_int:016x}" + "0" * 48
+
+
+def test_round_half_even():
+    """Test ties round to the even neighbour like Decimal.quantize."""
+    assert [fixed_point.round_half_even(n, 2) for n in (1, 3, 5, -1)] == [0, 2, 2, 0]
+    assert fixed_point.round_half_even(7, 3) == 2
+
+
+def test_crash_point_equivalence():
+    """Test integer crash points equal the Decimal formula on hashed seeds."""
+    for i in range(EQUIVALENCE_SEEDS):
+        seed = hashlib.sha256(str(i).encode()).hexdigest()
+        assert fixed_point.crash_point_hundredths(seed) == reference_hundredths(seed, Decimal("0.01")), seed
+
+
+@pytest.mark.parametrize("house_edge", HOUSE_EDGES)
+@pytest.mark.parametrize("seed_int", [0, 1, 2 ** 63, 2 ** 64 - 2 ** 40, 2 ** 64 - 1])
+def test_crash_point_extremes(seed_int, house_edge):
+    """Test the smallest seeds and the 1000x cap."""
+    seed = seed_for(seed_int)
+    assert fixed_point.crash_point_hundredths(seed, house_edge) == reference_hundredths(seed, house_edge)
+
+
+@pytest.mark.parametrize("offset", [Fraction(0), Fraction(6, 10 ** 7), Fraction(-6, 10 ** 7)])
+def test_crash_point_near_rounding_ties(offset):
+    """Test seeds whose exact crash point sits on or next to a .xx5 tie."""
+    house_edge = Decimal("0.01")
+    numerator, edge_factor = fixed_point._crash_coefficients(house_edge)
+    for hundredths in list(range(202, 300)) + list(range(1000, 100000, 4999)):
+        target = Fraction(2 * hundredths + 1, 2) + offset - 100
+        seed_int = int(Fraction(2 ** 64 * (10 ** 7 + 1), 10 ** 7)
+                       - Fraction(numerator, edge_factor * 10 ** 7) / target)
+        for delta in (-1, 0, 1):
+            seed = seed_for(seed_int + delta)
+            assert fixed_point.crash_point_hundredths(seed, house_edge) == reference_hundredths(seed, house_edge)
+
+
+def test_calculate_crash_point_returns_decimal():
+    """Test the Decimal API is unchanged."""
+    seed = ProvablyFair.combine_seeds("server", "client", 1)
+    crash_point = ProvablyFair.calculate_crash_point(seed)
+    assert crash_point == ProvablyFair.calculate_crash_point_reference(seed)
+    assert crash_point.as_tuple().exponent == -2
+
+
+@pytest.mark.parametrize("base_speed", [100, 37, 1])
+@pytest.mark.parametrize("crash_hundredths", [101, 150, 250, 1000, 100000])
+def test_multiplier_equivalence(crash_hundredths, base_speed):
+    """Test integer multipliers equal the Decimal formula."""
+    crash_point = fixed_point.from_hundredths(crash_hundredths)
+    for elapsed_ms in range(0, 20000, 7):
+        expected = ProvablyFair.calculate_multiplier_at_time_reference(crash_point, elapsed_ms, base_speed)
+        hundredths = fixed_point.multiplier_at(
+            crash_hundredths, elapsed_ms * fixed_point.NS_PER_MS, base_speed
+        )
+        assert hundredths == fixed_point.to_hundredths(expected)
+        assert ProvablyFair.calculate_multiplier_at_time(crash_point, elapsed_ms, base_speed) == expected
+
+
+def test_multiplier_uses_nanoseconds():
+    """Test sub-millisecond time moves the multiplier past a tie."""
+    assert fixed_point.multiplier_at(1000, 50 * fixed_point.NS_PER_MS) == 100
+    assert fixed_point.multiplier_at(1000, 50 * fixed_point.NS_PER_MS + 1) == 101
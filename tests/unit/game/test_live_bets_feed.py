@@ -0,0 +1,81 @@
+"""Tests for the live bets feed."""
+from decimal import Decimal
+
+from src.game.engine.bet_manager import BetManager
+from src.game.engine.live_bets_feed import LiveBetsFeed
+
+
+def place(manager: BetManager, round_id: int, user_id: int, amount: str, currency: str = "TON"):
+    """Place a bet through the bet manager."""
+    return manager.place_bet(user_id, round_id, Decimal(amount), currency)
+
+
+def test_drain_coalesces_changes_since_last_tick():
+    """Test bets and cashouts come out once, with running totals."""
+    manager = BetManager()
+    feed = manager.live_feed
+    assert feed.drain() is None
+    
+    place(manager, 1, 10, "1.5")
+    place(manager, 1, 11, "2")
+    place(manager, 1, 12, "50", "STARS")
+    full, _ = feed.drain()
+    
+    assert [bet["user_id"] for bet in full["bets"]] == [10, 11, 12]
+    assert full["totals"]["TON"] == {"bets": 2, "amount": Decimal("3.5"), "cashouts": 0,
+                                     "payout": Decimal("0")}
+    assert feed.drain() is None
+    
+    manager.activate_bets(1)
+    manager.cashout_bet(11, Decimal("2.50"))
+    full, _ = feed.drain()
+    
+    assert full["bets"] == []
+    assert full["cashouts"] == [{"user_id": 11, "multiplier": Decimal("2.50"),
+                                 "payout": Decimal("5"), "currency": "TON"}]
+    assert full["totals"]["TON"]["payout"] == Decimal("5")
+    assert full["seq"] == 2
+
+
+def test_top_view_only_reports_changes_to_the_largest_bets():
+    """Test the top view tracks the top N bets per currency."""
+    manager = BetManager()
+    manager.live_feed = feed = LiveBetsFeed(top_n=2)
+    
+    place(manager, 1, 1, "1")
+    place(manager, 1, 2, "5")
+    feed.drain()
+    
+    place(manager, 1, 3, "0.5")
+    place(manager, 1, 4, "9")
+    place(manager, 1, 5, "7")
+    _, top = feed.drain()
+    
+    assert [bet["user_id"] for bet in top["added"]] == [4, 5]
+    assert top["removed"] == [1, 2]
+    assert top["totals"]["TON"]["bets"] == 5
+    
+    manager.activate_bets(1)
+    manager.cashout_bet(3, Decimal("2"))
+    manager.cashout_bet(4, Decimal("2"))
+    full, top = feed.drain()
+    
+    assert [cashout["user_id"] for cashout in full["cashouts"]] == [3, 4]
+    assert [cashout["user_id"] for cashout in top["cashouts"]] == [4]
+    snapshot = feed.snapshot()
+    assert [bet["user_id"] for bet in snapshot["top"]["TON"]] == [4, 5]
+    assert snapshot["top"]["TON"][0]["cashout"]["multiplier"] == Decimal("2.00")
+
+
+def test_new_round_resets_feed():
+    """Test the feed starts over when bets arrive for the next round."""
+    manager = BetManager()
+    place(manager, 1, 1, "1")
+    manager.live_feed.drain()
+    
+    place(manager, 2, 2, "3")
+    full, top = manager.live_feed.drain()
+    
+    assert full["round_id"] == 2
+    assert full["totals"]["TON"]["bets"] == 1
+    assert [bet["user_id"] for bet in top["added"]] == [2]
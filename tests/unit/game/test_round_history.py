@@ -0,0 +1,72 @@
+"""Tests for the in-memory round history."""
+from datetime import datetime
+from decimal import Decimal
+
+from src.game.engine.round_history import CrashedRound, RoundHistoryCache
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def crashed(round_id: int) -> CrashedRound:
+    """A crashed round with the given id."""
+    at = datetime(2026, 1, 1, 12, 0, round_id % 60)
+    return CrashedRound(round_id, Decimal("1.50"), at, at, round_id % 7)
+
+
+def test_ring_buffer_keeps_newest_rounds_first():
+    """Appended rounds go first and the oldest fall off past max_rounds."""
+    history = RoundHistoryCache(max_rounds=3)
+    history.load([crashed(2), crashed(1)])
+    history.append(crashed(3))
+    history.append(crashed(4))
+    
+    assert [r.round_id for r in history.latest(10)] == [4, 3, 2]
+    assert [r.round_id for r in history.latest(2)] == [4, 3]
+
+
+def test_bodies_are_encoded_once_per_limit_and_crash():
+    """A body is reused until a round crashes; the ETag follows the rounds."""
+    history = RoundHistoryCache()
+    history.load([crashed(2), crashed(1)])
+    calls = []
+    
+    def encode(rounds):
+        calls.append(len(rounds))
+        return str([r.round_id for r in rounds]).encode()
+    
+    assert history.body(10, encode) == ('"2-2"', b"[2, 1]")
+    assert history.body(10, encode) == ('"2-2"', b"[2, 1]")
+    assert history.body(1, encode) == ('"2-1"', b"[2]")
+    assert calls == [2, 1]
+    
+    history.append(crashed(3))
+    assert history.body(10, encode) == ('"3-3"', b"[3, 2, 1]")
+    assert calls == [2, 1, 3]
+
+
+def test_reload_after_refresh_seconds_keeps_appended_rounds():
+    """Relay workers reload when stale; rounds appended meanwhile are kept."""
+    clock = FakeClock()
+    history = RoundHistoryCache(refresh_seconds=1.0, clock=clock)
+    assert history.needs_load()
+    
+    history.load([crashed(1)])
+    assert not history.needs_load()
+    clock.now += 1.0
+    assert history.needs_load()
+    
+    history.append(crashed(3))
+    history.load([crashed(2), crashed(1)])
+    assert [r.round_id for r in history.latest(10)] == [3, 2, 1]
+    
+    history.refresh_seconds = None
+    clock.now += 1000
+    assert not history.needs_load()
@@ -0,0 +1,139 @@
+"""Tests for the round event journal."""
+import pytest
+from decimal import Decimal
+
+from src.game.engine.bet_store import RoundBetStore, CASHED_OUT, CRASHED, ACTIVE
+from src.game.engine.provably_fair import ProvablyFair
+from src.game.engine.round_journal import (
+    RECORD_SIZE,
+    EventType,
+    RoundJournal,
+    iter_events,
+    read_records,
+    replay,
+)
+
+
+SERVER_SEED = "cd" * 32
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Write a journal with one round: three bets, two cashouts, a crash."""
+    path = tmp_path / "round_journal.bin"
+    journal = RoundJournal(path)
+    journal.round_created(7, SERVER_SEED, 345)
+    
+    store = RoundBetStore(7)
+    for user_id, target in ((1, None), (2, Decimal("2.5")), (3, None)):
+        slot = store.add(user_id, Decimal("1.5"), "TON", target)
+        store.bet_id[slot] = 100 + user_id
+        journal.bet_placed(store, slot)
+    
+    journal.round_started(7)
+    journal.cashout(7, 1, 150)
+    journal.cashouts_settled(7, 1)
+    journal.cashout(7, 2, 250)
+    journal.crash(7, 345)
+    journal.close()
+    return path
+
+
+def test_records_are_fixed_size(journal_path):
+    """Test every event is one fixed-size record."""
+    assert journal_path.stat().st_size == 9 * RECORD_SIZE
+    assert read_records(journal_path)["type"].tolist() == [
+        EventType.ROUND_CREATED, EventType.BET_PLACED, EventType.BET_PLACED,
+        EventType.BET_PLACED, EventType.ROUND_STARTED, EventType.CASHOUT,
+        EventType.CASHOUTS_SETTLED, EventType.CASHOUT, EventType.CRASH,
+    ]
+
+
+def test_replay_rebuilds_round(journal_path):
+    """Test replay rebuilds bets, cashouts and the crash."""
+    state = replay(journal_path)
+    store = state.store
+    
+    assert state.in_flight
+    assert state.round_id == 7
+    assert state.server_seed == SERVER_SEED
+    assert state.crash_hundredths == 345
+    assert state.started_at_ns is not None
+    assert state.crashed_at_ns is not None
+    assert len(store) == 3
+    assert store.bet_id[store.slots[2]] == 102
+    assert store.auto_cashout[store.slots[2]] == 250
+    assert store.status[store.slots[1]] == CASHED_OUT
+    assert store.status[store.slots[3]] == CRASHED
+    assert state.unsettled_cashouts == [store.slots[2]]
+
+
+def test_replay_at_offset(journal_path):
+    """Test replay stops at a record offset."""
+    state = replay(journal_path, stop=5)
+    
+    assert state.offset == 5
+    assert state.crashed_at_ns is None
+    assert len(state.store) == 3
+    assert (state.store.status[:3] == ACTIVE).all()
+    assert state.unsettled_cashouts == []
+
+
+def test_torn_tail_is_ignored(journal_path):
+    """Test a partial or corrupt trailing record is dropped."""
+    data = journal_path.read_bytes()
+    journal_path.write_bytes(data[:-RECORD_SIZE] + b"\x00" * RECORD_SIZE + data[-RECORD_SIZE:][:20])
+    
+    assert len(read_records(journal_path)) == 8
+    
+    journal = RoundJournal(journal_path)
+    journal.round_settled(7)
+    journal.close()
+    assert journal_path.stat().st_size == 9 * RECORD_SIZE
+    assert not replay(journal_path).in_flight
+
+
+def test_settled_round_is_not_in_flight(journal_path):
+    """Test a settled round needs no recovery."""
+    journal = RoundJournal(journal_path)
+    journal.round_settled(7)
+    journal.close()
+    
+    assert not replay(journal_path).in_flight
+    assert list(iter_events(journal_path))[-1]["type"] == "round_settled"
+
+
+def test_rotate_on_new_round(tmp_path):
+    """Test a full segment is archived when the next round starts."""
+    path = tmp_path / "round_journal.bin"
+    journal = RoundJournal(path, segment_bytes=2 * RECORD_SIZE)
+    journal.round_created(1, SERVER_SEED, 200)
+    journal.round_settled(1)
+    journal.round_created(2, ProvablyFair.hash_seed(SERVER_SEED), 300)
+    journal.close()
+    
+    assert len(list(tmp_path.glob("round_journal.bin.*"))) == 1
+    assert replay(path).round_id == 2
+
+
+def test_checksums_verified_from_last_round(tmp_path):
+    """Test only the records of the last round are checksummed."""
+    path = tmp_path / "round_journal.bin"
+    journal = RoundJournal(path)
+    journal.round_created(1, SERVER_SEED, 200)
+    journal.round_settled(1)
+    journal.round_created(2, ProvablyFair.hash_seed(SERVER_SEED), 300)
+    journal.round_started(2)
+    journal.close()
+    
+    data = bytearray(path.read_bytes())
+    # Flip a byte of round 1's settlement (already verified when round 2 was written)
+    data[RECORD_SIZE + 20] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert len(read_records(path)) == 4
+    
+    # A corrupt record in the last round still cuts the journal there
+    data[3 * RECORD_SIZE + 20] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert len(read_records(path)) == 3
+    assert replay(path).round_id == 2
@@ -0,0 +1,434 @@
+"""Tests for the round manager worker."""
+import asyncio
+import threading
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database.connection import Base
+from src.database.models.game import GameRound, Bet, GameRoundStatus, BetStatus
+from src.database.models.transaction import Transaction, TransactionType
+from src.database.models.user import User
+from src.game.engine.crash_engine import CrashEngine, RoundState
+from src.game.engine.provably_fair import ProvablyFair
+from src.game.engine.round_journal import RoundJournal, replay
+from src.game.engine.seed_chain import SeedChain, generate_chain
+from src.services.metrics import get_metrics
+from src.workers.game.round_manager import RoundManager, acquire_round_loop_lock
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session, shared with the round manager's database thread."""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def user(db_session):
+    """Create a user with a TON balance."""
+    user = User(telegram_user_id=123456789, balance_ton=Decimal("10.0"))
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def manager(db_session):
+    """Create a round manager without countdown delay."""
+    return RoundManager(db_session, crash_engine=CrashEngine(countdown_seconds=0))
+
+
+def test_start_round_persists_hash(manager, db_session):
+    """Test starting a round stores the published seed hash."""
+    round_data = manager.start_round()
+    round_obj = db_session.get(GameRound, manager.current_round_id)
+    
+    assert manager.crash_engine.round_state == RoundState.COUNTDOWN
+    assert round_obj.server_seed_hash == round_data["server_seed_hash"]
+    assert ProvablyFair.hash_seed(round_data["server_seed"]) == round_obj.server_seed_hash
+
+
+def test_start_round_uses_seed_chain(db_session, tmp_path):
+    """Test rounds take their seeds from the seed chain."""
+    path = tmp_path / "seed_chain.bin"
+    generate_chain(path, 3)
+    chain = SeedChain(path)
+    manager = RoundManager(db_session, seed_chain=chain)
+    
+    round_data = manager.start_round()
+    assert round_data["server_seed"] == chain.seed_at(0)
+    assert round_data["server_seed_hash"] == chain.terminus
+
+
+def test_place_bet_debits_balance(manager, db_session, user):
+    """Test placing a bet debits the stake and records the bet."""
+    manager.start_round()
+    bet_data = manager.place_bet(user.id, Decimal("1.0"), "TON")
+    
+    db_session.refresh(user)
+    assert user.balance_ton == Decimal("9.0")
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.PENDING
+
+
+def test_place_bet_rejected_after_start(manager, user):
+    """Test bets are only accepted during the countdown."""
+    manager.start_round()
+    manager.begin_round()
+    
+    with pytest.raises(ValueError):
+        manager.place_bet(user.id, Decimal("1.0"), "TON")
+
+
+def test_cashout_is_acknowledged_before_persisting(manager, db_session, user):
+    """Test cashout is served from memory and persisted on the next tick."""
+    manager.start_round()
+    bet_data = manager.place_bet(user.id, Decimal("1.0"), "TON")
+    manager.begin_round()
+    
+    cashout = manager.cashout(user.id)
+    assert cashout["status"] == BetStatus.CASHED_OUT
+    assert manager.pending_cashouts == [cashout]
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.ACTIVE
+    
+    manager.tick()
+    db_session.refresh(user)
+    assert manager.pending_cashouts == []
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.CASHED_OUT
+    assert user.balance_ton == Decimal("9.0") + cashout["payout"]
+
+
+def test_tick_settles_cashouts_in_one_batch(manager, db_session, user):
+    """Test all cashouts of a tick are credited with ledger rows."""
+    other = User(telegram_user_id=987654321, balance_stars=Decimal("100.0"))
+    db_session.add(other)
+    db_session.commit()
+    
+    manager.start_round()
+    ton_bet = manager.place_bet(user.id, Decimal("1.0"), "TON")
+    stars_bet = manager.place_bet(other.id, Decimal("10.0"), "STARS")
+    manager.begin_round()
+    ton_cashout = manager.cashout(user.id)
+    stars_cashout = manager.cashout(other.id)
+    
+    manager.tick()
+    db_session.refresh(user)
+    db_session.refresh(other)
+    wins = db_session.query(Transaction).filter(
+        Transaction.transaction_type == TransactionType.WIN
+    ).order_by(Transaction.id).all()
+    
+    assert user.balance_ton == Decimal("9.0") + ton_cashout["payout"]
+    assert other.balance_stars == Decimal("90.0") + stars_cashout["payout"]
+    assert [(w.user_id, w.bet_id) for w in wins] == [
+        (user.id, ton_bet["bet_id"]), (other.id, stars_bet["bet_id"])
+    ]
+    assert wins[1].balance_after == wins[1].balance_before + stars_cashout["payout"]
+    
+    bet = db_session.get(Bet, stars_bet["bet_id"])
+    assert bet.status == BetStatus.CASHED_OUT
+    assert bet.payout_stars == stars_cashout["payout"]
+    assert bet.profit_stars == stars_cashout["payout"] - Decimal("10.0")
+
+
+def test_cashout_without_bet(manager):
+    """Test cashout returns None when the user has no bet."""
+    manager.start_round()
+    manager.begin_round()
+    assert manager.cashout(999) is None
+
+
+def test_tick_settles_crash(manager, db_session, user):
+    """Test the tick after a crash settles the round and remaining bets."""
+    manager.start_round()
+    bet_data = manager.place_bet(user.id, Decimal("1.0"), "TON")
+    manager.begin_round()
+    manager.crash_engine.crash_round_manually()
+    
+    update = manager.tick()
+    round_obj = db_session.get(GameRound, manager.current_round_id)
+    
+    assert update["status"] == RoundState.CRASHED.value
+    assert round_obj.status == GameRoundStatus.CRASHED
+    assert round_obj.server_seed is not None
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.CRASHED
+
+
+def test_settlement_aggregates_round_totals(manager, db_session, user):
+    """Test crash settlement stores round totals and reports its duration."""
+    other = User(telegram_user_id=987654321, balance_ton=Decimal("10.0"))
+    db_session.add(other)
+    db_session.commit()
+    
+    manager.start_round()
+    manager.place_bet(user.id, Decimal("1.0"), "TON")
+    manager.place_bet(other.id, Decimal("2.0"), "TON")
+    manager.begin_round()
+    cashout = manager.cashout(user.id)
+    manager.crash_engine.crash_round_manually()
+    
+    count_before = (get_metrics().get_summary("round_settlement_ms") or {}).get("count", 0)
+    manager.tick()
+    round_obj = db_session.get(GameRound, manager.current_round_id)
+    
+    assert round_obj.total_bets == 2
+    assert round_obj.total_bet_amount_ton == Decimal("3.0")
+    assert round_obj.total_payout_ton == cashout["payout"]
+    assert get_metrics().get_summary("round_settlement_ms")["count"] == count_before + 1
+
+
+def test_status_hides_crash_point_until_crash(manager):
+    """Test the crash point is not revealed while the round runs."""
+    assert manager.get_round_status() == {"status": "no_round"}
+    
+    manager.start_round()
+    manager.begin_round()
+    assert manager.get_round_status()["crash_point"] is None
+    
+    manager.crash_engine.crash_round_manually()
+    manager.tick()
+    assert manager.get_round_status()["crash_point"] is not None
+
+
+def test_recover_resumes_round_from_journal(db_session, user, tmp_path):
+    """Test a restarted manager resumes the in-flight round from the journal."""
+    path = tmp_path / "round_journal.bin"
+    manager = RoundManager(db_session, crash_engine=CrashEngine(countdown_seconds=0),
+                           journal=RoundJournal(path))
+    manager.start_round()
+    bet_data = manager.place_bet(user.id, Decimal("1.0"), "TON")
+    manager.begin_round()
+    cashout = manager.cashout(user.id)
+    manager.journal.flush()
+    
+    # Restart before the cashout was persisted
+    restarted = RoundManager(db_session, crash_engine=CrashEngine(countdown_seconds=0),
+                             journal=RoundJournal(path))
+    assert restarted.recover()
+    assert restarted.current_round_id == manager.current_round_id
+    assert restarted.crash_engine.round_state == RoundState.ACTIVE
+    assert restarted.crash_engine.current_round["crash_point"] == (
+        manager.crash_engine.current_round["crash_point"]
+    )
+    assert [bet["bet_id"] for bet in restarted.pending_cashouts] == [bet_data["bet_id"]]
+    
+    restarted.crash_engine.crash_round_manually()
+    restarted.tick()
+    db_session.refresh(user)
+    assert user.balance_ton == Decimal("9.0") + cashout["payout"]
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.CASHED_OUT
+    assert not RoundManager(db_session, journal=RoundJournal(path)).recover()
+
+
+def test_round_curve_follows_round_phases(manager):
+    """Test the curve exposes start time and speed, and the crash point only after the crash."""
+    assert manager.get_round_curve() is None
+    
+    manager.start_round()
+    assert manager.get_round_curve()["status"] == "countdown"
+    assert manager.get_round_curve()["countdown_ends_at_ms"] is not None
+    
+    manager.begin_round()
+    curve = manager.get_round_curve()
+    assert curve["started_at_ms"] <= curve["server_time_ms"]
+    assert curve["base_speed_ms"] == 100
+    assert curve["crash_hundredths"] is None
+    
+    manager.crash_engine.crash_round_manually()
+    manager.tick()
+    curve = manager.get_round_curve()
+    assert curve["status"] == "crashed"
+    assert curve["crash_hundredths"] == manager.crash_engine.current_round["crash_hundredths"]
+
+
+def test_failed_round_is_resumed_and_settled(db_session, user):
+    """Test a round whose settlement fails is retried before a new round starts."""
+    manager = RoundManager(db_session, crash_engine=CrashEngine(countdown_seconds=0),
+                           crash_delay_seconds=0)
+    manager.start_round()
+    bet_data = manager.place_bet(user.id, Decimal("1.0"), "TON", auto_cashout=Decimal("50.0"))
+    manager.begin_round()
+    round_id = manager.current_round_id
+    manager.crash_engine.crash_round_manually()
+    
+    settle_round = manager.round_repo.settle_round
+    calls = []
+    
+    def flaky_settle_round(*args):
+        calls.append(args[0])
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        manager.stop()
+        return settle_round(*args)
+    
+    manager.round_repo.settle_round = flaky_settle_round
+    asyncio.run(asyncio.wait_for(manager.process_rounds(), timeout=5))
+    
+    assert calls == [round_id, round_id]
+    assert db_session.get(GameRound, round_id).status == GameRoundStatus.CRASHED
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.CRASHED
+    assert manager.bet_manager.get_round_store(round_id) is None
+    assert manager.bet_manager.next_auto_cashout_ms() is None
+
+
+def test_failed_cashout_batch_stays_pending(manager, db_session, user):
+    """Test acknowledged cashouts are kept and retried when their commit fails."""
+    manager.start_round()
+    manager.place_bet(user.id, Decimal("1.0"), "TON")
+    manager.begin_round()
+    cashout = manager.cashout(user.id)
+    
+    settle_cashouts = manager.balance_manager.settle_cashouts
+    
+    def failing_settle_cashouts(cashouts):
+        raise RuntimeError("database unavailable")
+    
+    manager.balance_manager.settle_cashouts = failing_settle_cashouts
+    with pytest.raises(RuntimeError):
+        manager.tick()
+    assert manager.pending_cashouts == [cashout]
+    
+    manager.balance_manager.settle_cashouts = settle_cashouts
+    manager.tick()
+    db_session.refresh(user)
+    assert manager.pending_cashouts == []
+    assert user.balance_ton == Decimal("9.0") + cashout["payout"]
+
+
+def test_round_loop_lock_is_exclusive(tmp_path):
+    """Test only one holder of the round loop lock at a time."""
+    path = tmp_path / "round_journal.lock"
+    leader = acquire_round_loop_lock(path)
+    assert leader is not None
+    assert acquire_round_loop_lock(path) is None
+    
+    leader.close()
+    follower = acquire_round_loop_lock(path)
+    assert follower is not None
+    follower.close()
+
+
+def test_async_round_persists_on_the_database_thread(manager, db_session, user):
+    """Test the async round steps commit on the round manager's database thread."""
+    threads = []
+    settle_round = manager.round_repo.settle_round
+    
+    def recording_settle_round(*args):
+        threads.append(threading.current_thread().name)
+        return settle_round(*args)
+    
+    manager.round_repo.settle_round = recording_settle_round
+    
+    async def play():
+        await manager.start_round_async()
+        bet_data = await manager.place_bet_async(user.id, Decimal("1.0"), "TON")
+        await manager.begin_round_async()
+        manager.crash_engine.crash_round_manually()
+        await manager.tick_async()
+        return bet_data
+    
+    bet_data = asyncio.run(play())
+    db_session.refresh(user)
+    
+    assert len(threads) == 1 and threads[0].startswith("round-db")
+    assert db_session.get(GameRound, manager.current_round_id).status == GameRoundStatus.CRASHED
+    assert db_session.get(Bet, bet_data["bet_id"]).status == BetStatus.CRASHED
+    assert user.balance_ton == Decimal("9.0")
+
+
+def test_concurrent_bets_debit_once(manager, db_session, user):
+    """Test a second bet submitted while the first is persisted is rejected."""
+    manager.start_round()
+    
+    async def place_twice():
+        return await asyncio.gather(
+            manager.place_bet_async(user.id, Decimal("1.0"), "TON"),
+            manager.place_bet_async(user.id, Decimal("1.0"), "TON"),
+            return_exceptions=True
+        )
+    
+    first, second = asyncio.run(place_twice())
+    db_session.refresh(user)
+    
+    assert first["bet_id"]
+    assert isinstance(second, ValueError)
+    assert user.balance_ton == Decimal("9.0")
+
+
+def test_cashout_during_flush_stays_pending(db_session, user, tmp_path):
+    """Test a cashout acknowledged while a batch is committed is left for the next flush."""
+    other = User(telegram_user_id=987654321, balance_ton=Decimal("10.0"))
+    db_session.add(other)
+    db_session.commit()
+    
+    journal = RoundJournal(tmp_path / "round_journal.bin")
+    manager = RoundManager(db_session, crash_engine=CrashEngine(countdown_seconds=0),
+                           journal=journal)
+    manager.start_round()
+    manager.place_bet(user.id, Decimal("1.0"), "TON")
+    manager.place_bet(other.id, Decimal("1.0"), "TON")
+    manager.begin_round()
+    manager.cashout(user.id)
+    
+    started, release = threading.Event(), threading.Event()
+    settle_cashouts = manager.balance_manager.settle_cashouts
+    
+    def slow_settle_cashouts(cashouts):
+        started.set()
+        release.wait(5)
+        return settle_cashouts(cashouts)
+    
+    manager.balance_manager.settle_cashouts = slow_settle_cashouts
+    
+    async def cashout_during_flush():
+        flush = asyncio.create_task(manager.flush_cashouts_async())
+        await asyncio.to_thread(started.wait, 5)
+        second = manager.cashout(other.id)
+        release.set()
+        await flush
+        return second
+    
+    second = asyncio.run(cashout_during_flush())
+    journal.flush()
+    store = manager.bet_manager.get_round_store(manager.current_round_id)
+    
+    assert manager.pending_cashouts == [second]
+    assert replay(journal.path).unsettled_cashouts == [store.slots[other.id]]
+    journal.close()
+
+
+def test_exhausted_seed_chain_stops_the_round_loop(db_session, tmp_path):
+    """Test the round loop stops instead of retrying when the seed chain runs out."""
+    path = tmp_path / "seed_chain.bin"
+    generate_chain(path, 1)
+    chain = SeedChain(path)
+    chain.next()
+    manager = RoundManager(db_session, crash_engine=CrashEngine(countdown_seconds=0),
+                           crash_delay_seconds=0, seed_chain=chain)
+    
+    asyncio.run(asyncio.wait_for(manager.process_rounds(), timeout=5))
+    
+    assert manager.current_round_id is None
+    assert db_session.query(GameRound).count() == 0
+
+
+def test_invalid_auto_cashout_is_rejected_before_debiting(manager, db_session, user):
+    """Test a bet that cannot be recorded in memory is rejected before it is persisted."""
+    manager.start_round()
+    
+    with pytest.raises(ValueError):
+        asyncio.run(manager.place_bet_async(user.id, Decimal("1.0"), "TON",
+                                            auto_cashout=Decimal("30000000")))
+    db_session.refresh(user)
+    
+    assert user.balance_ton == Decimal("10.0")
+    assert db_session.query(Bet).count() == 0
+    assert manager.bet_manager.get_round_store(manager.current_round_id) is None
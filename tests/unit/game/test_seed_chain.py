@@ -0,0 +1,109 @@
+"""Tests for the pre-generated seed chain."""
+import pytest
+
+from src.game.engine.crash_engine import CrashEngine
+from src.game.engine.provably_fair import ProvablyFair
+from src.game.engine.seed_chain import SeedChain, SeedChainExhausted, generate_chain, DIGEST_SIZE
+
+
+ROOT_SEED = "ab" * 32
+
+
+@pytest.fixture
+def chain_path(tmp_path):
+    """Generate a small chain file."""
+    path = tmp_path / "seed_chain.bin"
+    generate_chain(path, 100, root_seed=ROOT_SEED, batch_size=7)
+    return path
+
+
+def test_chain_file_layout(chain_path):
+    """Test the chain is stored as raw 32-byte digests."""
+    data = chain_path.read_bytes()
+    assert len(data) == 100 * DIGEST_SIZE
+    assert data[:DIGEST_SIZE].hex() == ROOT_SEED
+    assert data[DIGEST_SIZE:2 * DIGEST_SIZE].hex() == ProvablyFair.hash_seed(ROOT_SEED)
+
+
+def test_generate_returns_terminus(tmp_path):
+    """Test the returned terminus matches the opened chain."""
+    path = tmp_path / "chain.bin"
+    terminus = generate_chain(path, 10)
+    assert SeedChain(path).terminus == terminus
+
+
+def test_each_seed_hashes_to_previous(chain_path):
+    """Test every round's seed hashes to the previous round's seed."""
+    chain = SeedChain(chain_path)
+    previous_hash = chain.terminus
+    for _ in range(chain.length):
+        seed, seed_hash = chain.next()
+        assert seed_hash == previous_hash
+        previous_hash = seed
+    
+    assert chain.seed_at(chain.length - 1) == ROOT_SEED
+    with pytest.raises(ValueError):
+        chain.next()
+
+
+def test_position_survives_reopen(chain_path):
+    """Test a reopened chain never hands out a seed twice."""
+    chain = SeedChain(chain_path)
+    first, _ = chain.next()
+    chain.close()
+    
+    reopened = SeedChain(chain_path)
+    second, second_hash = reopened.next()
+    assert reopened.position == 2
+    assert second != first
+    assert second_hash == first
+
+
+def test_position_is_synced_before_a_seed_is_handed_out(chain_path, monkeypatch):
+    """Test the position file and its directory are fsynced on every seed."""
+    synced = []
+    monkeypatch.setattr("os.fsync", synced.append)
+    
+    SeedChain(chain_path).next()
+    assert len(synced) == 2
+
+
+def test_exhausted_chain(tmp_path):
+    """Test an exhausted chain raises SeedChainExhausted."""
+    path = tmp_path / "seed_chain.bin"
+    generate_chain(path, 1)
+    chain = SeedChain(path)
+    chain.next()
+    
+    with pytest.raises(SeedChainExhausted):
+        chain.next()
+    assert chain.position == 1
+
+
+def test_regenerating_resets_position(chain_path):
+    """Test a new chain starts from its first seed."""
+    SeedChain(chain_path).next()
+    generate_chain(chain_path, 5)
+    assert SeedChain(chain_path).position == 0
+
+
+def test_verify_seed(chain_path):
+    """Test revealed seeds are located by hashing to the terminus."""
+    chain = SeedChain(chain_path)
+    assert SeedChain.verify_seed(chain.seed_at(42), chain.terminus, chain.length) == 42
+    assert SeedChain.verify_seed("00" * 32, chain.terminus, chain.length) is None
+
+
+def test_engine_accepts_chain_seed(chain_path):
+    """Test the crash engine accepts a seed with its published hash."""
+    seed, seed_hash = SeedChain(chain_path).next()
+    round_data = CrashEngine().start_new_round(1, seed_hash, server_seed=seed)
+    
+    assert round_data["server_seed"] == seed
+    assert ProvablyFair.verify_round(seed_hash, seed, None, 1, round_data["crash_point"])
+
+
+def test_engine_requires_server_seed():
+    """Test starting a round without the seed behind the hash fails."""
+    with pytest.raises(ValueError):
+        CrashEngine().start_new_round(1, ProvablyFair.hash_seed(ROOT_SEED))
@@ -0,0 +1,69 @@
+"""Unit tests for the crash point simulator."""
+import pytest
+from decimal import Decimal
+
+import numpy as np
+
+from src.economics.game.crash_simulator import CrashSimulator
+from src.game.engine.fixed_point import MAX_CRASH_HUNDREDTHS
+from src.game.engine.provably_fair import ProvablyFair
+
+
+class TestCrashSimulator:
+    """Test crash simulator."""
+    
+    def test_simulate_is_reproducible(self):
+        """Test the same seed gives the same histogram."""
+        first = CrashSimulator(workers=1, chunk_size=10_000).simulate(50_000, seed=7)
+        second = CrashSimulator(workers=1, chunk_size=10_000).simulate(50_000, seed=7)
+        
+        assert first.rounds == 50_000
+        assert np.array_equal(first.counts, second.counts)
+    
+    def test_distribution_matches_formula(self):
+        """Test simulated crash points follow the production formula."""
+        simulator = CrashSimulator(workers=1).simulate(200_000, seed=1)
+        cdf = simulator.cdf()
+        
+        # Sampled seed hashes through the scalar formula
+        points = [
+            int(ProvablyFair.calculate_crash_point(ProvablyFair.hash_seed(str(i))) * 100)
+            for i in range(20_000)
+        ]
+        
+        for threshold in (250, 300, 500, 1000):
+            expected = sum(point <= threshold for point in points) / len(points)
+            assert cdf[threshold] == pytest.approx(expected, abs=0.015)
+    
+    def test_report_shows_minimum_crash_point(self):
+        """Test the report exposes the 2.01x minimum of the formula."""
+        report = CrashSimulator(workers=1).simulate(100_000, seed=3).report()
+        
+        assert report["rounds"] == 100_000
+        assert report["min_crash_point"] == "2.01"
+        assert report["cdf"]["2.00"] == 0.0
+        assert report["realised_house_edge"]["2.00"] == pytest.approx(-1.0)
+        assert report["negative_edge_targets"]["from"] == "1.01"
+        assert report["claims"]["MultiplierDistribution"]["before_2x"]["simulated"] == 0.0
+    
+    def test_tail_exposure(self):
+        """Test rounds at the cap are counted."""
+        simulator = CrashSimulator(workers=1).simulate(100_000, seed=5)
+        tail = simulator.tail_exposure()
+        
+        assert tail["cap"] == "1000.00"
+        assert tail["cap_rounds"] == simulator.counts[MAX_CRASH_HUNDREDTHS]
+        assert tail["cap_probability"] == pytest.approx(0.001, abs=0.0005)
+    
+    def test_write_arrow(self, tmp_path):
+        """Test the per-multiplier table is written as an Arrow file."""
+        pa = pytest.importorskip("pyarrow")
+        simulator = CrashSimulator(Decimal("0.02"), workers=1).simulate(10_000, seed=2)
+        path = tmp_path / "distribution.arrow"
+        
+        simulator.write_arrow(path)
+        table = pa.ipc.open_file(str(path)).read_all()
+        
+        assert table.num_rows == MAX_CRASH_HUNDREDTHS - 99
+        assert sum(table.column("count").to_pylist()) == 10_000
+        assert table.schema.metadata[b"house_edge"] == b"0.02"